@@ -0,0 +1,227 @@
+import threading
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Boolean, Float, Integer
+
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.dictionary_encoding import rowid_source
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import Base, MatchDataParticipants, MatchDataTeams, MatchTimeline
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+try:
+    import pyarrow
+except ImportError:  # optional dependency, speeds up loading
+    pyarrow = None
+
+
+class DuckDBMirror:
+    """
+    Incremental, columnar copy of the analytical tables in a DuckDB file.
+
+    Heavy aggregations (win rates, ward statistics, gold distributions) run on
+    DuckDB's vectorized engine instead of scanning the SQLite file the writer
+    is committing to. sync() copies only rows whose SQLite rowid is above the
+    per-table watermark stored in the mirror, so repeated syncs cost as much
+    as the rows added since the last one. Attached to a GroupCommitWriter with
+    attach_to(), the mirror syncs the committed tables right after each commit.
+
+    Rows are read with CASTs to the declared column types (SQLite columns may
+    hold mixed types) and loaded through Arrow when pyarrow is installed, or
+    with executemany otherwise. Deletes and updates in SQLite are not mirrored,
+    and tables rebuilt as WITHOUT ROWID cannot be mirrored incrementally.
+
+    Attributes:
+        sqlite_url (str): SQLAlchemy URL of the source SQLite database.
+        duckdb_path (Path): Path of the DuckDB mirror file.
+        tables (List[Type[Base]]): Models mirrored by sync().
+        logger (Logger): Logger instance for sync progress.
+        chunk_size (int): Rows read from SQLite per chunk.
+        connection: DuckDB connection to the mirror.
+
+    Raises:
+        ImportError: If the duckdb package is not installed.
+    """
+
+    WATERMARK_TABLE = "_mirror_watermarks"
+    DEFAULT_TABLES = (MatchDataParticipants, MatchDataTeams, MatchTimeline)
+
+    def __init__(self, logger: Logger,
+                 sqlite_url: Optional[str] = None,
+                 duckdb_path: Union[str, Path] = Paths.DUCKDB_MIRROR,
+                 tables: Sequence[Type[Base]] = DEFAULT_TABLES,
+                 chunk_size: int = 100_000) -> None:
+        if duckdb is None:
+            raise ImportError("DuckDBMirror requires the optional 'duckdb' package")
+
+        self.sqlite_url = sqlite_url or DatabaseConfiguration.url.value.format(
+            location=Paths.DATA, name=DatabaseName.DATABASE_NAME.value)
+        self.duckdb_path = Path(duckdb_path)
+        self.tables = list(tables)
+        self.logger = logger
+        self.chunk_size = chunk_size
+
+        self.duckdb_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = duckdb.connect(str(self.duckdb_path))
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    @staticmethod
+    def _column_types(table: Type[Base]) -> Dict[str, Tuple[str, str]]:
+        """
+        Map each column to its (DuckDB type, SQLite CAST type) pair.
+        """
+        types = {}
+        for column in table.__table__.columns:
+            if isinstance(column.type, Boolean):
+                types[column.name] = ("BOOLEAN", "INTEGER")
+            elif isinstance(column.type, Integer):
+                types[column.name] = ("BIGINT", "INTEGER")
+            elif isinstance(column.type, Float):
+                types[column.name] = ("DOUBLE", "REAL")
+            else:
+                types[column.name] = ("VARCHAR", "TEXT")
+        return types
+
+    def _create_schema(self) -> None:
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.WATERMARK_TABLE}" '
+                                f'(table_name VARCHAR PRIMARY KEY, last_rowid BIGINT)')
+        for table in self.tables:
+            types = self._column_types(table)
+            columns = ", ".join(f'"{name}" {duck_type}' for name, (duck_type, _) in types.items())
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{table.__tablename__}" ({columns})')
+            # Columns added to the model since the mirror was created (e.g. victimPuuId) are appended,
+            # which keeps the mirror's column order that of the model.
+            for name, (duck_type, _) in types.items():
+                self.connection.execute(f'ALTER TABLE "{table.__tablename__}" ADD COLUMN IF NOT EXISTS '
+                                        f'"{name}" {duck_type}')
+
+    def watermark(self, table: Type[Base]) -> int:
+        """
+        Return the highest SQLite rowid already mirrored for the table.
+        """
+        row = self.connection.execute(f'SELECT last_rowid FROM "{self.WATERMARK_TABLE}" WHERE table_name = ?',
+                                      [table.__tablename__]).fetchone()
+        return row[0] if row else 0
+
+    def sync(self, tables: Optional[Sequence[Type[Base]]] = None) -> Dict[str, int]:
+        """
+        Copy rows added to SQLite since the last sync into the mirror.
+
+        Each chunk and its watermark update are committed together, so an
+        interrupted sync resumes where it stopped without duplicating rows.
+
+        Args:
+            tables (Optional[Sequence[Type[Base]]]): Subset of the mirrored tables (default: all).
+
+        Returns:
+            dict: Rows copied per table name.
+        """
+        copied: Dict[str, int] = {}
+        with self._lock:
+            engine = get_engine(self.sqlite_url)
+            with engine.connect() as connection:
+                sources = {table: rowid_source(connection, table.__tablename__) for table in tables or self.tables}
+            source = engine.raw_connection()
+            try:
+                for table, from_source in sources.items():
+                    copied[table.__tablename__] = self._sync_table(source.cursor(), table, from_source)
+            finally:
+                source.close()
+
+        if any(copied.values()):
+            self.logger.info(f"DuckDB mirror synced | {copied}")
+        return copied
+
+    def _sync_table(self, cursor, table: Type[Base], source: str) -> int:
+        name = table.__tablename__
+        types = self._column_types(table)
+        select_columns = ", ".join(f'CAST("{column}" AS {cast})' for column, (_, cast) in types.items())
+        placeholders = ", ".join("?" * len(types))
+        last_rowid = self.watermark(table)
+        copied = 0
+
+        while True:
+            rows = cursor.execute(f'SELECT rowid, {select_columns} FROM {source} '
+                                  f'WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                                  (last_rowid, self.chunk_size)).fetchall()
+            if not rows:
+                return copied
+
+            last_rowid = rows[-1][0]
+            self.connection.execute("BEGIN TRANSACTION")
+            try:
+                if pyarrow is not None:
+                    columns = list(zip(*rows))[1:]
+                    chunk = pyarrow.table({column: pyarrow.array(values)
+                                           for column, values in zip(types, columns)})
+                    self.connection.register("mirror_chunk", chunk)
+                    self.connection.execute(f'INSERT INTO "{name}" SELECT * FROM mirror_chunk')
+                    self.connection.unregister("mirror_chunk")
+                else:
+                    self.connection.executemany(f'INSERT INTO "{name}" VALUES ({placeholders})',
+                                                [row[1:] for row in rows])
+                self.connection.execute(f'INSERT OR REPLACE INTO "{self.WATERMARK_TABLE}" VALUES (?, ?)',
+                                        [name, last_rowid])
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            copied += len(rows)
+
+    def attach_to(self, writer) -> "DuckDBMirror":
+        """
+        Sync the mirrored tables after every commit of a GroupCommitWriter.
+
+        The sync runs on the writer thread, right after the commit, so the
+        mirror lags SQLite by at most one commit.
+
+        Args:
+            writer (GroupCommitWriter): Writer of the mirrored SQLite database.
+
+        Returns:
+            DuckDBMirror: The mirror itself, for chaining.
+        """
+        mirrored = set(self.tables)
+
+        def on_commit(tables: List[Type[Base]]) -> None:
+            committed = [table for table in tables if table in mirrored]
+            if committed:
+                self.sync(committed)
+
+        writer.add_commit_listener(on_commit)
+        return self
+
+    def query(self, sql: str, parameters: Optional[list] = None) -> list:
+        """
+        Run an analytical query on the mirror.
+
+        Uses a cursor of its own, so it is safe to call while a sync runs on
+        another thread.
+
+        Args:
+            sql (str): DuckDB SQL using the SQLite table names.
+            parameters (Optional[list]): Positional query parameters.
+
+        Returns:
+            list: Result rows as tuples.
+        """
+        cursor = self.connection.cursor()
+        try:
+            return cursor.execute(sql, parameters or []).fetchall()
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """
+        Close the DuckDB connection.
+        """
+        self.connection.close()
+
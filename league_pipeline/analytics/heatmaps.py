@@ -0,0 +1,309 @@
+import math
+import threading
+from logging import Logger
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from league_pipeline.constants.database_constants import HeatmapConfig
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.dictionary_encoding import rowid_source
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import (Base, HeatmapCells, HeatmapWatermarks, MatchDataParticipants, MatchIDs,
+                                       MatchTimeline, MatchTimelineTracks)
+from league_pipeline.db.timeline_tracks import decode_track
+
+
+def _factorize(values: Sequence[tuple]) -> Tuple[np.ndarray, List[tuple]]:
+    """
+    Return an integer code per value and the distinct values in first-seen order.
+    """
+    codes: Dict[tuple, int] = {}
+    index = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64, count=len(values))
+    return index, list(codes)
+
+
+class HeatmapMaterializer:
+    """
+    Incrementally maintained position and event heatmaps.
+
+    Timeline positions (Match Timeline POSITION rows or packed tracks) and
+    positioned events are binned on a GRID_SIZE x GRID_SIZE grid and counted
+    per (tier, team position, event, time bucket, champion) in the Heatmap
+    Cells table. Binning uses numpy.histogram2d's edges (GRID_SIZE equal bins
+    over [0, MAP_SIZE)) but runs for every key in one vectorized pass, since
+    a histogram2d call per key would dominate the refresh. Counts are merged
+    into the table with INSERT ... ON CONFLICT DO UPDATE, so the table only
+    ever grows by the new rows' cells.
+
+    refresh() reads only source rows above the rowid watermarks in Heatmap
+    Watermarks; each chunk and its watermark commit together. attach_to()
+    refreshes after every GroupCommitWriter commit of a timeline table.
+    pack_existing_positions() calls catch_up() and skip_to_end() in each of
+    its transactions so the positions it moves into tracks are not counted
+    a second time from the tracks.
+    Champion and tier are joined from Match Data (Participants) and Match IDs
+    at refresh time, which the pipeline has stored before the timeline.
+    CHAMPION_KILL cells are keyed by the killer; every kill with a stored
+    victim is counted a second time as a CHAMPION_DEATH cell keyed by the
+    victim's position and champion, e.g. to show where junglers die.
+    Coordinates outside the map are clamped to the edge.
+
+    Attributes:
+        url (str): SQLAlchemy URL of the database.
+        logger (Logger): Logger instance for refresh progress.
+        grid_size (int): Cells per map axis.
+        map_size (int): Map coordinate range per axis.
+        bucket_minutes (int): Width of a time bucket in minutes.
+        chunk_size (int): Source rows binned per transaction.
+    """
+
+    SOURCES = (MatchTimeline, MatchTimelineTracks)
+
+    def __init__(self, url: str, logger: Logger,
+                 grid_size: int = HeatmapConfig.GRID_SIZE.value,
+                 map_size: int = HeatmapConfig.MAP_SIZE.value,
+                 bucket_minutes: int = HeatmapConfig.TIME_BUCKET_MINUTES.value,
+                 chunk_size: int = HeatmapConfig.ROWS_PER_REFRESH_CHUNK.value) -> None:
+        self.url = url
+        self.logger = logger
+        self.grid_size = grid_size
+        self.map_size = map_size
+        self.bucket_minutes = bucket_minutes
+        self.chunk_size = chunk_size
+
+        self.engine = get_engine(url)
+        self._lock = threading.Lock()
+        Base.metadata.create_all(self.engine, tables=[HeatmapCells.__table__, HeatmapWatermarks.__table__],
+                                 checkfirst=True)
+
+    def watermark(self, source: Type[Base]) -> int:
+        """
+        Return the highest rowid of the source table already counted.
+        """
+        with self.engine.connect() as connection:
+            return self._watermark_on(connection, source)
+
+    @staticmethod
+    def _watermark_on(connection, source: Type[Base]) -> int:
+        row = connection.exec_driver_sql(
+            f'SELECT "lastRowid" FROM "{HeatmapWatermarks.__tablename__}" WHERE "sourceTable" = ?',
+            (source.__tablename__,)).first()
+        return row[0] if row else 0
+
+    def refresh(self, sources: Optional[Sequence[Type[Base]]] = None) -> Dict[str, int]:
+        """
+        Count the source rows added since the previous refresh into the heatmaps.
+
+        Args:
+            sources (Optional[Sequence[Type[Base]]]): MatchTimeline and/or MatchTimelineTracks (default: both).
+
+        Returns:
+            dict: Source rows counted per table name.
+        """
+        counted: Dict[str, int] = {}
+        with self._lock:
+            for source in sources or self.SOURCES:
+                counted[source.__tablename__] = self._refresh_source(source)
+
+        if any(counted.values()):
+            self.logger.info(f"Heatmaps refreshed | {counted}")
+        return counted
+
+    @staticmethod
+    def _source_statement(connection, source: Type[Base]) -> str:
+        joins = (f'LEFT JOIN "{MatchIDs.__tablename__}" m ON m."matchId" = s."matchId" '
+                 f'LEFT JOIN "{MatchDataParticipants.__tablename__}" p '
+                 f'ON p."matchId" = s."matchId" AND p."puuId" = s."puuId"')
+        keys = 'COALESCE(m."gameTier", \'\'), COALESCE(s."teamPosition", \'\'), COALESCE(p."championName", \'\')'
+        table = rowid_source(connection, source.__tablename__)
+        if source is MatchTimeline:
+            victims = (f'LEFT JOIN "{MatchDataParticipants.__tablename__}" v '
+                       f'ON v."matchId" = s."matchId" AND v."puuId" = s."victimPuuId"')
+            victim_keys = 's."victimPuuId", COALESCE(v."teamPosition", \'\'), COALESCE(v."championName", \'\')'
+            return (f'SELECT s.rowid, {keys}, s."event", s."timestamp", s."x", s."y", {victim_keys} '
+                    f'FROM {table} s {joins} {victims} '
+                    f'WHERE s.rowid > ? AND s."x" IS NOT NULL AND s."y" IS NOT NULL ORDER BY s.rowid LIMIT ?')
+        return (f'SELECT s.rowid, {keys}, s."track" FROM {table} s {joins} '
+                f'WHERE s.rowid > ? ORDER BY s.rowid LIMIT ?')
+
+    def _refresh_source(self, source: Type[Base]) -> int:
+        counted = 0
+        while True:
+            # The watermark is read in the chunk's transaction, since
+            # pack_existing_positions() may move it in between.
+            with self.engine.begin() as connection:
+                rows, _ = self._count_chunk(connection, source, self._watermark_on(connection, source))
+            if not rows:
+                return counted
+            counted += rows
+
+    def _count_chunk(self, connection, source: Type[Base], last_rowid: int) -> Tuple[int, int]:
+        """
+        Count the next chunk of source rows above last_rowid and move the watermark past it.
+
+        Returns:
+            tuple: (rows counted, new watermark).
+        """
+        # Tracks hold a whole match per row, so fewer of them make a chunk.
+        limit = self.chunk_size if source is MatchTimeline else max(1, self.chunk_size // 40)
+        rows = connection.exec_driver_sql(self._source_statement(connection, source), (last_rowid, limit)).all()
+        if not rows:
+            return 0, last_rowid
+
+        keys, timestamps, xs, ys = self._explode(source, rows)
+        self._merge(connection, *self._bin(keys, timestamps, xs, ys))
+        self._set_watermark(connection, source, rows[-1][0])
+        return len(rows), rows[-1][0]
+
+    @staticmethod
+    def _set_watermark(connection, source: Type[Base], last_rowid: int) -> None:
+        connection.exec_driver_sql(
+            f'INSERT INTO "{HeatmapWatermarks.__tablename__}" ("sourceTable", "lastRowid") VALUES (?, ?) '
+            f'ON CONFLICT ("sourceTable") DO UPDATE SET "lastRowid" = excluded."lastRowid"',
+            (source.__tablename__, last_rowid))
+
+    def catch_up(self, connection) -> None:
+        """
+        Count every source row above the watermarks inside the caller's transaction.
+
+        pack_existing_positions() calls it before it inserts a batch of tracks
+        and deletes the POSITION rows they replace, and skip_to_end() after,
+        all in one transaction: the replaced positions are counted from their
+        rows only and the new tracks are skipped.
+        """
+        for source in self.SOURCES:
+            last_rowid = self._watermark_on(connection, source)
+            rows = 1
+            while rows:
+                rows, last_rowid = self._count_chunk(connection, source, last_rowid)
+
+    def skip_to_end(self, connection) -> None:
+        """
+        Set every watermark to the last rowid of its source inside the caller's transaction, without counting.
+
+        Also lowers a watermark after the rows above it were deleted, so that
+        rowids SQLite hands out again are not taken for counted rows.
+        """
+        for source in self.SOURCES:
+            last_rowid = connection.exec_driver_sql(
+                f'SELECT COALESCE(MAX(rowid), 0) FROM {rowid_source(connection, source.__tablename__)}').scalar()
+            self._set_watermark(connection, source, last_rowid)
+
+    @staticmethod
+    def _explode(source: Type[Base], rows: list) -> Tuple[List[tuple], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Turn source rows into (tier, position, champion, event) keys and position arrays.
+        """
+        if source is MatchTimeline:
+            (_, tiers, positions, champions, events, timestamps, xs, ys,
+             victims, victim_positions, victim_champions) = zip(*rows)
+            keys = list(zip(tiers, positions, champions, events))
+            deaths = [index for index, (event, victim) in enumerate(zip(events, victims))
+                      if victim and event == EventTypes.CHAMPION_KILL]
+            keys += [(tiers[index], victim_positions[index], victim_champions[index], EventTypes.CHAMPION_DEATH)
+                     for index in deaths]
+            points = np.asarray([timestamps, xs, ys], dtype=np.int64)
+            points = np.concatenate([points, points[:, deaths]], axis=1)
+            return keys, points[0], points[1], points[2]
+
+        keys: List[tuple] = []
+        tracks = []
+        for _, tier, position, champion, track in rows:
+            decoded = decode_track(track)
+            keys.extend([(tier, position, champion, EventTypes.POSITION)] * len(decoded))
+            tracks.append(decoded)
+        stacked = np.concatenate(tracks).astype(np.int64) if tracks else np.empty((0, 3), dtype=np.int64)
+        return keys, stacked[:, 0], stacked[:, 1], stacked[:, 2]
+
+    def _bin(self, keys: List[tuple], timestamps: np.ndarray, xs: np.ndarray,
+             ys: np.ndarray) -> Tuple[List[tuple], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count positions per (key, time bucket, cell) in one pass.
+
+        Returns:
+            tuple: (distinct keys, key index, time bucket, cell and count arrays per non-empty cell).
+        """
+        cells_per_map = self.grid_size * self.grid_size
+        x_bins = np.clip(xs * self.grid_size // self.map_size, 0, self.grid_size - 1)
+        y_bins = np.clip(ys * self.grid_size // self.map_size, 0, self.grid_size - 1)
+        buckets = timestamps // (self.bucket_minutes * 60_000)
+
+        key_index, distinct_keys = _factorize(keys)
+        bucket_span = int(buckets.max()) + 1 if len(buckets) else 1
+        combined = (key_index * bucket_span + buckets) * cells_per_map + y_bins * self.grid_size + x_bins
+        occupied, counts = np.unique(combined, return_counts=True)
+
+        return (distinct_keys, occupied // cells_per_map // bucket_span,
+                occupied // cells_per_map % bucket_span, occupied % cells_per_map, counts)
+
+    @staticmethod
+    def _merge(connection, distinct_keys: List[tuple], key_index: np.ndarray, buckets: np.ndarray,
+               cells: np.ndarray, counts: np.ndarray) -> None:
+        rows = [(*distinct_keys[key][:2], distinct_keys[key][3], bucket, distinct_keys[key][2], cell, count)
+                for key, bucket, cell, count in zip(key_index.tolist(), buckets.tolist(),
+                                                    cells.tolist(), counts.tolist())]
+        connection.exec_driver_sql(
+            f'INSERT INTO "{HeatmapCells.__tablename__}" '
+            f'("gameTier", "teamPosition", "event", "timeBucket", "championName", "cell", "count") '
+            f'VALUES (?, ?, ?, ?, ?, ?, ?) '
+            f'ON CONFLICT ("gameTier", "teamPosition", "event", "timeBucket", "championName", "cell") '
+            f'DO UPDATE SET "count" = "count" + excluded."count"', rows)
+
+    def attach_to(self, writer) -> "HeatmapMaterializer":
+        """
+        Refresh the heatmaps after every GroupCommitWriter commit of a timeline table.
+
+        Args:
+            writer (GroupCommitWriter): Writer of the database.
+
+        Returns:
+            HeatmapMaterializer: The materializer itself, for chaining.
+        """
+        def on_commit(tables: List[Type[Base]]) -> None:
+            committed = [table for table in self.SOURCES if table in tables]
+            if committed:
+                self.refresh(committed)
+
+        writer.add_commit_listener(on_commit)
+        return self
+
+    def heatmap(self, game_tier: str, team_position: str, event: str,
+                minute_from: float = 0, minute_to: float = math.inf,
+                champion_name: Optional[str] = None) -> np.ndarray:
+        """
+        Read one heatmap, e.g. heatmap("DIAMOND", "JUNGLE", "CHAMPION_DEATH", 8, 12).
+
+        The time range is widened to whole buckets: every bucket overlapping
+        [minute_from, minute_to) is included.
+
+        Args:
+            game_tier (str): Tier of the matches.
+            team_position (str): Position of the players.
+            event (str): Timeline event name (POSITION for player positions,
+                         CHAMPION_DEATH for kills keyed by the victim).
+            minute_from (float): Start of the game time range in minutes.
+            minute_to (float): End of the game time range in minutes.
+            champion_name (Optional[str]): Restrict to one champion (default: all).
+
+        Returns:
+            np.ndarray: int64 counts of shape (GRID_SIZE, GRID_SIZE), indexed [y_bin, x_bin].
+        """
+        first_bucket = int(minute_from // self.bucket_minutes)
+        last_bucket = (math.ceil(minute_to / self.bucket_minutes) - 1) if math.isfinite(minute_to) else 2**31
+        statement = (f'SELECT "cell", SUM("count") FROM "{HeatmapCells.__tablename__}" '
+                     f'WHERE "gameTier" = ? AND "teamPosition" = ? AND "event" = ? '
+                     f'AND "timeBucket" BETWEEN ? AND ?')
+        parameters: list = [game_tier, team_position, event, first_bucket, last_bucket]
+        if champion_name is not None:
+            statement += ' AND "championName" = ?'
+            parameters.append(champion_name)
+
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql(statement + ' GROUP BY "cell"', tuple(parameters)).all()
+
+        grid = np.zeros(self.grid_size * self.grid_size, dtype=np.int64)
+        if rows:
+            cells, counts = zip(*rows)
+            grid[np.asarray(cells)] = counts
+        return grid.reshape(self.grid_size, self.grid_size)
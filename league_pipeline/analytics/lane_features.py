@@ -0,0 +1,168 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import MatchDataParticipants, MatchTimelineEconomy
+from league_pipeline.db.timeline_tracks import ECONOMY_COLUMNS, SERIES_DTYPE
+
+
+LANE_POSITIONS = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+LANE_METRICS = ("gold", "xp", "cs", "level")
+DEFAULT_MINUTES = (10, 15, 20)
+
+_COLUMN = {name: index for index, name in enumerate(ECONOMY_COLUMNS)}
+BLUE_TEAM_ID = 100
+
+
+class LaneDiffFeatures:
+    """
+    Lane-opponent economy differences for a batch of matches.
+
+    values[m, p, t, k] is blue side minus red side for match m, position p
+    (LANE_POSITIONS), minute t (minutes) and metric k (LANE_METRICS). It is
+    NaN when the match ended before the minute or a side has no player in
+    that position.
+
+    Attributes:
+        match_ids (np.ndarray): Match identifiers in first-seen order, one per row of values.
+        minutes (Tuple[int, ...]): Minutes the differences are taken at.
+        values (np.ndarray): float64 array of shape (matches, 5, minutes, 4).
+    """
+
+    def __init__(self, match_ids: np.ndarray, minutes: Sequence[int], values: np.ndarray) -> None:
+        self.match_ids = match_ids
+        self.minutes = tuple(minutes)
+        self.values = values
+
+    def get(self, position: str, minute: int, metric: str) -> np.ndarray:
+        """
+        Return one feature column, e.g. get("MIDDLE", 15, "gold").
+        """
+        return self.values[:, LANE_POSITIONS.index(position), self.minutes.index(minute), LANE_METRICS.index(metric)]
+
+    def as_records(self) -> List[dict]:
+        """
+        Flatten the features into one dict per match ("<position>_<metric>_diff_<minute>").
+        """
+        names = [f"{position.lower()}_{metric}_diff_{minute}"
+                 for position in LANE_POSITIONS for minute in self.minutes for metric in LANE_METRICS]
+        flat = self.values.reshape(len(self.match_ids), -1)
+        return [{"match_id": match_id, **dict(zip(names, row.tolist()))}
+                for match_id, row in zip(self.match_ids.tolist(), flat)]
+
+
+def sample_series(blobs: Sequence[bytes], frame_counts: np.ndarray, column_count: int,
+                  frames: Sequence[int]) -> np.ndarray:
+    """
+    Read the values at the given frame indexes from many plain int32 series at once.
+
+    All blobs are joined into one buffer, so the value at frame f of every
+    (blob, column) run is a single gather at run start + f. No per-blob
+    decoding happens in Python.
+
+    Args:
+        blobs (Sequence[bytes]): Blobs written by encode_economy().
+        frame_counts (np.ndarray): Number of frames of every blob.
+        column_count (int): Columns per blob.
+        frames (Sequence[int]): Frame indexes to read.
+
+    Returns:
+        np.ndarray: float64 array of shape (blobs, len(frames), column_count),
+                    NaN where a blob has fewer frames.
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    lengths = np.repeat(np.asarray(frame_counts, dtype=np.int64), column_count)
+    if not len(lengths):
+        return np.empty((0, len(frames), column_count))
+
+    flat = np.frombuffer(b"".join(blobs), dtype=SERIES_DTYPE)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    valid = frames[None, :] < lengths[:, None]
+    positions = np.minimum(starts[:, None] + frames[None, :], len(flat) - 1)
+    values = np.where(valid, flat[positions], np.nan)
+
+    return values.reshape(len(blobs), column_count, len(frames)).transpose(0, 2, 1)
+
+
+def lane_diff_features(match_ids: Sequence[str], team_ids: Sequence[int], positions: Sequence[str],
+                       frame_counts: Sequence[int], series: Sequence[bytes],
+                       minutes: Sequence[int] = DEFAULT_MINUTES,
+                       frame_interval_ms: int = 60_000) -> LaneDiffFeatures:
+    """
+    Compute gold/XP/CS/level differences against the lane opponent for a batch of matches.
+
+    Takes one entry per participant (in any order). Participants are placed in
+    a dense (match, side, position) grid, so pairing with the opponent of the
+    same teamPosition is a subtraction of the two sides.
+
+    Args:
+        match_ids (Sequence[str]): Match of every participant.
+        team_ids (Sequence[int]): Team of every participant (100 is blue side).
+        positions (Sequence[str]): teamPosition of every participant; others are ignored.
+        frame_counts (Sequence[int]): Frames in every participant's economy series.
+        series (Sequence[bytes]): Economy blobs (ECONOMY_COLUMNS).
+        minutes (Sequence[int]): Minutes to take the differences at.
+        frame_interval_ms (int): Time between timeline frames.
+
+    Returns:
+        LaneDiffFeatures: Differences per match, position, minute and metric.
+    """
+    frames = [minute * 60_000 // frame_interval_ms for minute in minutes]
+    sampled = sample_series(series, np.asarray(frame_counts), len(ECONOMY_COLUMNS), frames)
+
+    metrics = np.stack([sampled[..., _COLUMN["total_gold"]],
+                        sampled[..., _COLUMN["xp"]],
+                        sampled[..., _COLUMN["minions_killed"]] + sampled[..., _COLUMN["jungle_minions_killed"]],
+                        sampled[..., _COLUMN["level"]]], axis=-1)
+
+    match_numbers: dict = {}
+    match_index = np.fromiter((match_numbers.setdefault(match_id, len(match_numbers)) for match_id in match_ids),
+                              dtype=np.int64, count=len(match_ids))
+    unique_match_ids = np.array(list(match_numbers), dtype=object)
+    position_values = np.asarray(positions, dtype=object)
+    position_index = np.full(len(position_values), -1, dtype=np.int64)
+    for index, position in enumerate(LANE_POSITIONS):
+        position_index[position_values == position] = index
+    side = (np.asarray(team_ids).astype(np.int64) != BLUE_TEAM_ID).astype(np.int64)
+    known = position_index >= 0
+
+    grid = np.full((len(unique_match_ids), 2, len(LANE_POSITIONS), len(minutes), len(LANE_METRICS)), np.nan)
+    grid[match_index[known], side[known], position_index[known]] = metrics[known]
+
+    return LaneDiffFeatures(unique_match_ids, minutes, grid[:, 0] - grid[:, 1])
+
+
+def load_lane_diff_features(url: str, match_ids: Optional[Iterable[str]] = None,
+                            minutes: Sequence[int] = DEFAULT_MINUTES) -> LaneDiffFeatures:
+    """
+    Read economy series joined with team and position and compute lane differences.
+
+    Args:
+        url (str): SQLAlchemy URL of the database.
+        match_ids (Optional[Iterable[str]]): Matches to include (default: every match with economy data).
+        minutes (Sequence[int]): Minutes to take the differences at.
+
+    Returns:
+        LaneDiffFeatures: Differences per match, position, minute and metric.
+    """
+    economy = MatchTimelineEconomy.__tablename__
+    participants = MatchDataParticipants.__tablename__
+    statement = (f'SELECT e."matchId", p."teamId", p."teamPosition", e."frameCount", e."series" '
+                 f'FROM "{economy}" e JOIN "{participants}" p '
+                 f'ON p."matchId" = e."matchId" AND p."puuId" = e."puuId"')
+
+    rows: List[tuple] = []
+    with get_engine(url).connect() as connection:
+        if match_ids is None:
+            rows = connection.exec_driver_sql(statement).all()
+        else:
+            match_ids = list(match_ids)
+            for start in range(0, len(match_ids), 500):
+                batch = match_ids[start:start + 500]
+                rows += connection.exec_driver_sql(
+                    f'{statement} WHERE e."matchId" IN ({", ".join("?" * len(batch))})', tuple(batch)).all()
+
+    columns: Tuple[list, ...] = tuple(map(list, zip(*rows))) if rows else ([], [], [], [], [])
+    return lane_diff_features(*columns, minutes=minutes)
@@ -0,0 +1,83 @@
+from typing import Dict, List, Tuple
+
+from league_pipeline.analytics.duckdb_mirror import DuckDBMirror
+from league_pipeline.benchmarks.harness import BenchmarkResult, run_benchmark
+from league_pipeline.db.engine_registry import get_engine
+
+
+# Typical analyst aggregations as (SQLite SQL, DuckDB SQL). They only differ
+# where the dialects do (integer division / floor).
+ANALYTICAL_QUERIES: Dict[str, Tuple[str, str]] = {
+    "win_rate_by_champion_position": (
+        'SELECT "championName", "teamPosition", COUNT(*), '
+        'ROUND(AVG(CASE WHEN "win" THEN 1.0 ELSE 0.0 END), 6) '
+        'FROM "Match Data (Participants)" GROUP BY 1, 2 ORDER BY 1, 2',
+    ) * 2,
+    "win_rate_by_tier_champion": (
+        'SELECT m."gameTier", p."championName", COUNT(*), '
+        'ROUND(AVG(CASE WHEN p."win" THEN 1.0 ELSE 0.0 END), 6) '
+        'FROM "Match Data (Participants)" p JOIN "Match IDs" m ON m."matchId" = p."matchId" '
+        'GROUP BY 1, 2 ORDER BY 1, 2',
+    ) * 2,
+    "ward_stats_by_position": (
+        'SELECT "teamPosition", ROUND(AVG("wardsPlaced"), 6), ROUND(AVG("wardsKilled"), 6), '
+        'ROUND(AVG("controlWardsPlaced"), 6), ROUND(AVG("visionScore"), 6) '
+        'FROM "Match Data (Participants)" GROUP BY 1 ORDER BY 1',
+    ) * 2,
+    "gold_per_minute_distribution": (
+        'SELECT CAST("goldPerMinute" AS INTEGER) / 50 * 50 AS bucket, COUNT(*) '
+        'FROM "Match Data (Participants)" GROUP BY 1 ORDER BY 1',
+        'SELECT CAST(floor("goldPerMinute" / 50) * 50 AS BIGINT) AS bucket, COUNT(*) '
+        'FROM "Match Data (Participants)" GROUP BY 1 ORDER BY 1',
+    ),
+    "timeline_events_per_minute": (
+        'SELECT "event", "timestamp" / 60000 AS minute, COUNT(*) '
+        'FROM "Match Timeline" GROUP BY 1, 2 ORDER BY 1, 2',
+        'SELECT "event", "timestamp" // 60000 AS minute, COUNT(*) '
+        'FROM "Match Timeline" GROUP BY 1, 2 ORDER BY 1, 2',
+    ),
+}
+
+
+def compare_engines(sqlite_url: str, mirror: DuckDBMirror,
+                    iterations: int = 5) -> Tuple[List[BenchmarkResult], List[str]]:
+    """
+    Time every ANALYTICAL_QUERIES entry on SQLite and on the DuckDB mirror.
+
+    The mirror must be synced with the SQLite database first. Results of both
+    engines are compared, so a speedup never hides a wrong answer.
+
+    Args:
+        sqlite_url (str): SQLAlchemy URL of the SQLite database.
+        mirror (DuckDBMirror): Synced mirror of that database.
+        iterations (int): Timed runs per query and engine.
+
+    Returns:
+        tuple: (benchmark results, names of queries whose results differ).
+    """
+    engine = get_engine(sqlite_url)
+    results: List[BenchmarkResult] = []
+    mismatches: List[str] = []
+
+    with engine.connect() as connection:
+        for name, (sqlite_sql, duckdb_sql) in ANALYTICAL_QUERIES.items():
+            def on_sqlite() -> list:
+                return connection.exec_driver_sql(sqlite_sql).all()
+
+            def on_duckdb() -> list:
+                return mirror.query(duckdb_sql)
+
+            results.append(run_benchmark(f"analytics.sqlite.{name}", on_sqlite, iterations=iterations, warmup=1))
+            results.append(run_benchmark(f"analytics.duckdb.{name}", on_duckdb, iterations=iterations, warmup=1))
+
+            if _normalized(on_sqlite()) != _normalized(on_duckdb()):
+                mismatches.append(name)
+
+    return results, mismatches
+
+
+def _normalized(rows: list) -> List[tuple]:
+    """
+    Round floats so results summed in a different order compare equal.
+    """
+    return [tuple(round(value, 4) if isinstance(value, float) else value for value in row) for row in rows]
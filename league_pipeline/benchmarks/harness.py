@@ -0,0 +1,210 @@
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+class BenchmarkResult:
+    """
+    Timing and allocation summary of a single microbenchmark.
+
+    Attributes:
+        name (str): Unique benchmark identifier (used as the baseline key).
+        timings (List[float]): Per-call latencies in seconds.
+        peak_bytes (int): Peak traced memory of a single call in bytes.
+        items_per_call (int): Number of logical items (rows, requests) handled per call.
+        error (Optional[str]): Error message if the benchmark could not run.
+    """
+
+    def __init__(self, name: str, timings: List[float], peak_bytes: int,
+                 items_per_call: int = 1, error: Optional[str] = None) -> None:
+        self.name = name
+        self.timings = timings
+        self.peak_bytes = peak_bytes
+        self.items_per_call = items_per_call
+        self.error = error
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return the latency at the given percentile using nearest-rank.
+
+        Args:
+            percent (float): Percentile between 0 and 100.
+
+        Returns:
+            float: Latency in seconds, or 0.0 if there are no timings.
+        """
+        if not self.timings:
+            return 0.0
+        ordered = sorted(self.timings)
+        index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @property
+    def ops_per_second(self) -> float:
+        total = sum(self.timings)
+        return len(self.timings) / total if total else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.ops_per_second * self.items_per_call
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the result into the baseline file format.
+
+        Returns:
+            dict: Aggregated metrics of the benchmark.
+        """
+        if self.error:
+            return {"error": self.error}
+
+        return {
+            "iterations": len(self.timings),
+            "ops_per_second": self.ops_per_second,
+            "items_per_second": self.items_per_second,
+            "mean_s": statistics.fmean(self.timings),
+            "p50_s": self.percentile(50),
+            "p90_s": self.percentile(90),
+            "p99_s": self.percentile(99),
+            "peak_alloc_bytes": self.peak_bytes,
+        }
+
+
+def run_benchmark(name: str, function: Callable[..., Any],
+                  setup: Optional[Callable[[], tuple]] = None,
+                  iterations: int = 200, warmup: int = 5,
+                  items_per_call: int = 1) -> BenchmarkResult:
+    """
+    Time a callable repeatedly and measure its peak allocations.
+
+    The setup callable (if given) runs before every call outside of the timed
+    region and returns the positional arguments for the benchmarked function.
+    Allocations are measured in a separate traced call so tracemalloc overhead
+    never leaks into the latency numbers.
+
+    Args:
+        name (str): Unique benchmark identifier.
+        function (Callable): Function under test.
+        setup (Optional[Callable]): Produces fresh arguments for each call.
+        iterations (int): Number of timed calls.
+        warmup (int): Number of untimed calls made first.
+        items_per_call (int): Logical items processed per call (for items/s).
+
+    Returns:
+        BenchmarkResult: Collected timings, or the error that stopped the run.
+    """
+    def arguments() -> tuple:
+        return setup() if setup is not None else ()
+
+    try:
+        for _ in range(warmup):
+            function(*arguments())
+
+        tracemalloc.start()
+        args = arguments()
+        tracemalloc.reset_peak()
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings: List[float] = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(iterations):
+                args = arguments()
+                start = time.perf_counter()
+                function(*args)
+                timings.append(time.perf_counter() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return BenchmarkResult(name, [], 0, items_per_call, error=f"{type(e).__name__}: {str(e).splitlines()[0][:200]}")
+
+    return BenchmarkResult(name, timings, max(0, peak - baseline_current), items_per_call)
+
+
+def load_baseline(path: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """
+    Load stored benchmark results.
+
+    Args:
+        path (Union[str, Path]): Path to the baseline JSON file.
+
+    Returns:
+        dict: Mapping of benchmark name to its stored metrics (empty if missing).
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f_in:
+        return json.load(f_in)["results"]
+
+
+def save_baseline(path: Union[str, Path], results: List[BenchmarkResult]) -> None:
+    """
+    Store benchmark results as the new baseline, keeping entries not re-run.
+
+    Args:
+        path (Union[str, Path]): Path to the baseline JSON file.
+        results (List[BenchmarkResult]): Results to store.
+    """
+    path = Path(path)
+    stored = load_baseline(path)
+    stored.update({result.name: result.to_dict() for result in results})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f_out:
+        json.dump({"recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                   "results": dict(sorted(stored.items()))}, f_out, indent=2)
+        f_out.write("\n")
+
+
+def format_report(results: List[BenchmarkResult],
+                  baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """
+    Render results as a fixed-width table, with deltas against a baseline.
+
+    The delta column compares ops/s (positive is faster) and the allocation
+    column compares peak bytes per call (negative is leaner).
+
+    Args:
+        results (List[BenchmarkResult]): Results to render.
+        baseline (Optional[dict]): Stored metrics keyed by benchmark name.
+
+    Returns:
+        str: The report table.
+    """
+    baseline = baseline or {}
+    header = (f"{'benchmark':<48} {'ops/s':>12} {'items/s':>13} {'p50 ms':>9} "
+              f"{'p90 ms':>9} {'p99 ms':>9} {'peak KiB':>10} {'Δ ops/s':>9} {'Δ alloc':>9}")
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        if result.error:
+            lines.append(f"{result.name:<48} ERROR {result.error}")
+            continue
+
+        stored = baseline.get(result.name, {})
+        delta_ops = delta_alloc = "n/a"
+        if stored.get("ops_per_second"):
+            delta_ops = f"{(result.ops_per_second / stored['ops_per_second'] - 1) * 100:+.1f}%"
+        if stored.get("peak_alloc_bytes"):
+            delta_alloc = f"{(result.peak_bytes / stored['peak_alloc_bytes'] - 1) * 100:+.1f}%"
+
+        lines.append(
+            f"{result.name:<48} {result.ops_per_second:>12,.1f} {result.items_per_second:>13,.1f} "
+            f"{result.percentile(50) * 1e3:>9.3f} {result.percentile(90) * 1e3:>9.3f} "
+            f"{result.percentile(99) * 1e3:>9.3f} {result.peak_bytes / 1024:>10.1f} "
+            f"{delta_ops:>9} {delta_alloc:>9}")
+
+    return "\n".join(lines)
@@ -0,0 +1,290 @@
+import random
+from typing import Any, Dict, List
+
+from league_pipeline.constants.league_ranks import RankedTier, RankedDivision
+
+
+TEAM_POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+CHAMPIONS = [
+    "Aatrox", "Ahri", "Akali", "Ashe", "Braum", "Caitlyn", "Darius", "Ekko",
+    "Ezreal", "Fiora", "Garen", "Graves", "Jinx", "Kaisa", "Karma", "Khazix",
+    "LeeSin", "Leona", "Lulu", "Lux", "Nautilus", "Orianna", "Riven", "Sett",
+    "Sylas", "Thresh", "Viego", "Yasuo", "Yone", "Zed",
+]
+
+# Participant fields that are part of the real payload but not read by the transforms.
+_PARTICIPANT_FILLER_FIELDS = [
+    "baronKills", "basicPings", "bountyLevel", "champExperience", "champLevel",
+    "championId", "championTransform", "commandPings", "consumablesPurchased",
+    "damageDealtToBuildings", "damageDealtToObjectives", "damageDealtToTurrets",
+    "damageSelfMitigated", "dangerPings", "detectorWardsPlaced", "doubleKills",
+    "dragonKills", "eligibleForProgression", "enemyVisionPings", "firstBloodAssist",
+    "firstBloodKill", "firstTowerAssist", "firstTowerKill", "gameEndedInEarlySurrender",
+    "gameEndedInSurrender", "goldSpent", "inhibitorKills", "inhibitorTakedowns",
+    "inhibitorsLost", "item0", "item1", "item2", "item3", "item4", "item5", "item6",
+    "itemsPurchased", "killingSprees", "kills", "largestCriticalStrike",
+    "largestKillingSpree", "largestMultiKill", "longestTimeSpentLiving",
+    "magicDamageDealt", "magicDamageDealtToChampions", "magicDamageTaken",
+    "neutralMinionsKilled", "nexusKills", "nexusLost", "nexusTakedowns",
+    "objectivesStolen", "objectivesStolenAssists", "participantId", "pentaKills",
+    "physicalDamageDealt", "physicalDamageDealtToChampions", "physicalDamageTaken",
+    "profileIcon", "quadraKills", "retreatPings", "sightWardsBoughtInGame",
+    "spell1Casts", "spell2Casts", "spell3Casts", "spell4Casts", "summoner1Casts",
+    "summoner1Id", "summoner2Casts", "summoner2Id", "timeCCingOthers", "timePlayed",
+    "totalAllyJungleMinionsKilled", "totalDamageDealt", "totalDamageDealtToChampions",
+    "totalDamageShieldedOnTeammates", "totalDamageTaken", "totalEnemyJungleMinionsKilled",
+    "totalHeal", "totalHealsOnTeammates", "totalTimeCCDealt", "totalTimeSpentDead",
+    "totalUnitsHealed", "tripleKills", "trueDamageDealt", "trueDamageDealtToChampions",
+    "trueDamageTaken", "turretKills", "turretTakedowns", "turretsLost", "unrealKills",
+]
+
+_CHALLENGE_FILLER_FIELDS = [f"challengeStat{index}" for index in range(110)]
+
+_CHAMPION_STAT_FIELDS = [
+    "abilityHaste", "abilityPower", "armor", "armorPen", "armorPenPercent",
+    "attackDamage", "attackSpeed", "bonusArmorPenPercent", "bonusMagicPenPercent",
+    "ccReduction", "cooldownReduction", "health", "healthMax", "healthRegen",
+    "lifesteal", "magicPen", "magicPenPercent", "magicResist", "movementSpeed",
+    "omnivamp", "physicalVamp", "power", "powerMax", "powerRegen", "spellVamp",
+]
+
+_DAMAGE_STAT_FIELDS = [
+    "magicDamageDone", "magicDamageDoneToChampions", "magicDamageTaken",
+    "physicalDamageDone", "physicalDamageDoneToChampions", "physicalDamageTaken",
+    "totalDamageDone", "totalDamageDoneToChampions", "totalDamageTaken",
+    "trueDamageDone", "trueDamageDoneToChampions", "trueDamageTaken",
+]
+
+
+def make_puuid(rng: random.Random) -> str:
+    """Return a random 78-character string shaped like a Riot PUUID."""
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(78))
+
+
+def build_match_payload(match_id: str, puuids: List[str], seed: int = 0,
+                        game_duration_seconds: int = 1900) -> Dict[str, Any]:
+    """
+    Build a MATCH-V5 match payload with 10 participants and two teams.
+
+    Args:
+        match_id (str): Match identifier (e.g. "EUW1_1234567890").
+        puuids (List[str]): Exactly 10 participant PUUIDs.
+        seed (int): Seed for the deterministic field values.
+        game_duration_seconds (int): Reported game duration.
+
+    Returns:
+        dict: Payload with the same shape as the Riot API response.
+    """
+    rng = random.Random(seed)
+    winning_team = rng.choice([100, 200])
+
+    teams = []
+    for team_id in (100, 200):
+        teams.append({
+            "teamId": team_id,
+            "win": team_id == winning_team,
+            "bans": [{"championId": rng.randint(1, 900), "pickTurn": turn} for turn in range(1, 6)],
+            "objectives": {name: {"first": rng.random() < 0.5, "kills": rng.randint(0, 11)}
+                           for name in ("atakhan", "baron", "champion", "dragon",
+                                        "horde", "inhibitor", "riftHerald", "tower")},
+        })
+
+    participants = []
+    for index, puuid in enumerate(puuids):
+        team_id = 100 if index < 5 else 200
+        participant = {field: rng.randint(0, 5000) for field in _PARTICIPANT_FILLER_FIELDS}
+        participant.update({
+            "puuid": puuid,
+            "participantId": index + 1,
+            "teamId": team_id,
+            "assists": rng.randint(0, 25),
+            "deaths": rng.randint(0, 15),
+            "goldEarned": rng.randint(6000, 20000),
+            "totalMinionsKilled": rng.randint(10, 320),
+            "controlWardsPlaced": rng.randint(0, 8),
+            "wardsPlaced": rng.randint(0, 40),
+            "wardsKilled": rng.randint(0, 15),
+            "visionScore": rng.randint(5, 90),
+            "visionWardsBoughtInGame": rng.randint(0, 8),
+            "assistMePings": rng.randint(0, 10),
+            "allInPings": rng.randint(0, 5),
+            "enemyMissingPings": rng.randint(0, 10),
+            "needVisionPings": rng.randint(0, 5),
+            "onMyWayPings": rng.randint(0, 15),
+            "getBackPings": rng.randint(0, 10),
+            "pushPings": rng.randint(0, 5),
+            "holdPings": rng.randint(0, 5),
+            "championName": rng.choice(CHAMPIONS),
+            "individualPosition": TEAM_POSITIONS[index % 5],
+            "teamPosition": TEAM_POSITIONS[index % 5],
+            "hadOpenNexus": rng.random() < 0.3,
+            "win": team_id == winning_team,
+            "riotIdGameName": f"player{seed}_{index}",
+            "riotIdTagline": "EUW",
+            "perks": {"statPerks": {"defense": 5001, "flex": 5008, "offense": 5005},
+                      "styles": [{"description": "primaryStyle", "style": 8000,
+                                  "selections": [{"perk": 8010 + slot, "var1": rng.randint(0, 900),
+                                                  "var2": 0, "var3": 0} for slot in range(4)]}]},
+        })
+        challenges = {field: rng.random() * 100 for field in _CHALLENGE_FILLER_FIELDS}
+        challenges.update({
+            "takedowns": rng.randint(0, 30),
+            "kda": rng.random() * 10,
+            "maxLevelLeadLaneOpponent": rng.randint(0, 4),
+            "laneMinionsFirst10Minutes": rng.randint(0, 90),
+            "damagePerMinute": rng.random() * 1500,
+            "killParticipation": rng.random(),
+        })
+        participant["challenges"] = challenges
+        participants.append(participant)
+
+    return {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": list(puuids)},
+        "info": {
+            "endOfGameResult": "GameComplete",
+            "gameCreation": 1_700_000_000_000 + seed,
+            "gameDuration": game_duration_seconds,
+            "gameEndTimestamp": 1_700_000_000_000 + seed + game_duration_seconds * 1000,
+            "gameMode": "CLASSIC",
+            "gameVersion": "15.1.1",
+            "mapId": 11,
+            "platformId": match_id.split("_")[0],
+            "queueId": 420,
+            "participants": participants,
+            "teams": teams,
+        },
+    }
+
+
+def _timeline_event(rng: random.Random, timestamp: int) -> Dict[str, Any]:
+    """Return a single random timeline event in the Riot API shape."""
+    kind = rng.random()
+    position = {"x": rng.randint(0, 14800), "y": rng.randint(0, 14800)}
+    killer = rng.randint(0, 10)
+
+    if kind < 0.06:
+        return {"type": "CHAMPION_KILL", "timestamp": timestamp, "killerId": killer,
+                "victimId": rng.randint(1, 10), "bounty": 300, "shutdownBounty": 0,
+                "assistingParticipantIds": rng.sample(range(1, 11), 2),
+                "position": position,
+                "victimDamageDealt": [{"basic": False, "magicDamage": rng.randint(0, 900),
+                                       "name": rng.choice(CHAMPIONS), "participantId": rng.randint(1, 10),
+                                       "physicalDamage": rng.randint(0, 900), "spellName": "spell",
+                                       "spellSlot": rng.randint(0, 3), "trueDamage": 0,
+                                       "type": "OTHER"} for _ in range(4)],
+                "victimDamageReceived": [{"basic": True, "magicDamage": rng.randint(0, 900),
+                                          "name": rng.choice(CHAMPIONS), "participantId": rng.randint(1, 10),
+                                          "physicalDamage": rng.randint(0, 900), "spellName": "spell",
+                                          "spellSlot": rng.randint(0, 3), "trueDamage": 0,
+                                          "type": "OTHER"} for _ in range(6)]}
+    if kind < 0.08:
+        return {"type": "ELITE_MONSTER_KILL", "timestamp": timestamp, "killerId": killer,
+                "killerTeamId": rng.choice([100, 200]), "monsterType": rng.choice(["DRAGON", "BARON_NASHOR", "HORDE"]),
+                "position": position}
+    if kind < 0.10:
+        return {"type": "BUILDING_KILL", "timestamp": timestamp, "killerId": killer,
+                "teamId": rng.choice([100, 200]), "buildingType": "TOWER_BUILDING",
+                "laneType": "MID_LANE", "towerType": "OUTER_TURRET", "position": position,
+                "assistingParticipantIds": []}
+    if kind < 0.45:
+        return {"type": "ITEM_PURCHASED", "timestamp": timestamp,
+                "participantId": rng.randint(1, 10), "itemId": rng.randint(1000, 7000)}
+    if kind < 0.70:
+        return {"type": "WARD_PLACED", "timestamp": timestamp,
+                "creatorId": rng.randint(1, 10), "wardType": "YELLOW_TRINKET"}
+    return {"type": "SKILL_LEVEL_UP", "timestamp": timestamp, "levelUpType": "NORMAL",
+            "participantId": rng.randint(1, 10), "skillSlot": rng.randint(1, 4)}
+
+
+def build_timeline_payload(match_id: str, puuids: List[str], seed: int = 0,
+                           frames: int = 36, events_per_frame: int = 56) -> Dict[str, Any]:
+    """
+    Build a MATCH-V5 timeline payload.
+
+    With the defaults (36 one-minute frames, ~56 events per frame) the JSON
+    encoding is roughly 1 MB, matching a full-length ranked game.
+
+    Args:
+        match_id (str): Match identifier.
+        puuids (List[str]): Exactly 10 participant PUUIDs.
+        seed (int): Seed for the deterministic field values.
+        frames (int): Number of one-minute frames.
+        events_per_frame (int): Average number of events in a frame.
+
+    Returns:
+        dict: Payload with the same shape as the Riot API response.
+    """
+    rng = random.Random(seed)
+    frame_list = []
+
+    for frame_index in range(frames):
+        frame_timestamp = frame_index * 60_000
+        participant_frames = {}
+        for participant_id in range(1, 11):
+            participant_frames[str(participant_id)] = {
+                "championStats": {field: rng.randint(0, 3000) for field in _CHAMPION_STAT_FIELDS},
+                "damageStats": {field: rng.randint(0, 60000) for field in _DAMAGE_STAT_FIELDS},
+                "currentGold": rng.randint(0, 3000),
+                "goldPerSecond": 0,
+                "jungleMinionsKilled": rng.randint(0, 8) * frame_index,
+                "level": min(18, 1 + frame_index // 2),
+                "minionsKilled": rng.randint(5, 9) * frame_index,
+                "participantId": participant_id,
+                "position": {"x": rng.randint(0, 14800), "y": rng.randint(0, 14800)},
+                "timeEnemySpentControlled": rng.randint(0, 60000),
+                "totalGold": 500 + frame_index * rng.randint(300, 500),
+                "xp": frame_index * rng.randint(350, 500),
+            }
+
+        event_count = 1 if frame_index == 0 else rng.randint(events_per_frame // 2, events_per_frame * 3 // 2)
+        events = [{"type": "PAUSE_END", "timestamp": 0, "realTimestamp": 1_700_000_000_000}] if frame_index == 0 else \
+            [_timeline_event(rng, frame_timestamp - 60_000 + rng.randint(0, 59_999)) for _ in range(event_count)]
+
+        frame_list.append({"events": events, "participantFrames": participant_frames,
+                           "timestamp": frame_timestamp})
+
+    return {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": list(puuids)},
+        "info": {
+            "endOfGameResult": "GameComplete",
+            "frameInterval": 60000,
+            "gameId": int(match_id.split("_")[1]),
+            "participants": [{"participantId": index + 1, "puuid": puuid}
+                             for index, puuid in enumerate(puuids)],
+            "frames": frame_list,
+        },
+    }
+
+
+def build_league_entries_page(seed: int = 0, size: int = 205,
+                              tier: str = RankedTier.DIAMOND.value,
+                              division: str = RankedDivision.I.value) -> List[Dict[str, Any]]:
+    """
+    Build one page of LEAGUE-EXP-V4 entries.
+
+    Args:
+        seed (int): Seed for the deterministic field values.
+        size (int): Number of entries on the page (the API returns up to 205).
+        tier (str): Tier of the entries.
+        division (str): Division of the entries.
+
+    Returns:
+        list: League entry dictionaries in the Riot API shape.
+    """
+    rng = random.Random(seed)
+    return [{
+        "leagueId": "c0ffee00-0000-0000-0000-000000000000",
+        "queueType": "RANKED_SOLO_5x5",
+        "tier": tier,
+        "rank": division,
+        "puuid": make_puuid(rng),
+        "leaguePoints": rng.randint(0, 99),
+        "wins": rng.randint(20, 400),
+        "losses": rng.randint(20, 400),
+        "veteran": rng.random() < 0.1,
+        "inactive": False,
+        "freshBlood": rng.random() < 0.1,
+        "hotStreak": rng.random() < 0.1,
+    } for _ in range(size)]
@@ -0,0 +1,750 @@
+import asyncio
+import contextlib
+import itertools
+import json
+import time
+import logging
+import random
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from aiohttp import ClientSession, web
+
+from league_pipeline.benchmarks.harness import BenchmarkResult, run_benchmark
+from league_pipeline.benchmarks.payloads import (build_league_entries_page, build_match_payload,
+                                                 build_timeline_payload, make_puuid)
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.regions import Region
+from league_pipeline.db.bulk_insert import bulk_insert, table_layout
+from league_pipeline.db.data_saving import DataSaver
+from league_pipeline.db.dictionary_encoding import encode_database
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.sharding import ShardedStorage, ShardedWriter
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.models import (Base, DataBase, MatchDataParticipants, MatchIDs, MatchTimeline,
+                                       MatchTimelineTracks, Summoners)
+from league_pipeline.analytics.lane_features import lane_diff_features
+from league_pipeline.db.timeline_tracks import split_timeline_rows
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.riot_api.match_data import MatchData
+from league_pipeline.riot_api.match_timeline import MatchTimelineCall, TimelineProfile, timeline_batches
+from league_pipeline.riot_api.schemas import MatchPayload, TimelinePayload
+from league_pipeline.riot_api.summoner import SummonerEntries
+from league_pipeline.utils.exceptions import StatusCodeError, StatusResponseException
+from league_pipeline.utils.http_client import create_client_session
+from league_pipeline.utils.http_utils import safely_fetch_rate_limited_data
+from league_pipeline.utils.json_decoding import json_decoder
+from league_pipeline.utils.transform_pool import TransformPool
+from league_pipeline.utils.decorators import async_api_call_error_wrapper
+from league_pipeline.utils.workers import run_workers
+
+
+def _benchmark_logger() -> logging.Logger:
+    """
+    Logger that runs the full logging call path at DEBUG level without doing I/O.
+    """
+    logger = logging.getLogger("league_pipeline.benchmarks")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+class BenchmarkSuite:
+    """
+    Microbenchmarks for the pipeline hot paths.
+
+    Covers the token bucket limiter, the match/timeline/summoner transforms and
+    DataSaver batch sizes, the bulk insert path and timeline storage layouts. All database work happens in a temporary directory
+    that is removed by close().
+
+    Attributes:
+        scale (float): Multiplier applied to every iteration count.
+        logger (Logger): Silent DEBUG logger passed to the classes under test.
+        workdir (Path): Temporary directory holding the benchmark database.
+    """
+
+    def __init__(self, scale: float = 1.0) -> None:
+        self.scale = scale
+        self.logger = _benchmark_logger()
+        self._tempdir = tempfile.TemporaryDirectory(prefix="league_pipeline_bench_")
+        # DatabaseConfiguration.url joins location and name with a backslash, so on
+        # POSIX the file lands next to (not inside) the location; nest it one level
+        # down to keep the database inside the temporary directory.
+        self.workdir = Path(self._tempdir.name) / "data"
+
+        DataBase(self.workdir).create_all_tables()
+        self.url = DatabaseConfiguration.url.value.format(location=self.workdir,
+                                                          name=DatabaseName.DATABASE_NAME.value)
+        self._unique_ids = itertools.count()
+        self._query_rows_seeded = False
+        self._timeline_seeded = False
+        self._timeline_participants_saved = False
+
+        rng = random.Random(26)
+        self.match_id = "EUW1_7000000001"
+        self.puuids = [make_puuid(rng) for _ in range(10)]
+        self.match_payload = build_match_payload(self.match_id, self.puuids, seed=1)
+        self.timeline_payload = build_timeline_payload(self.match_id, self.puuids, seed=2)
+        self.league_page = build_league_entries_page(seed=3)
+
+        self.benchmarks: Dict[str, Callable[[], BenchmarkResult]] = {
+            "token_bucket.allow_request.granted": self.bench_allow_request_granted,
+            "token_bucket.allow_request.rejected": self.bench_allow_request_rejected,
+            "token_bucket._refill": self.bench_refill,
+            "token_bucket.contention.64_coroutines": self.bench_token_bucket_contention,
+            "match_data.tranform_results": self.bench_match_data_transform,
+            "match_timeline.transform_results.1mb": self.bench_match_timeline_transform,
+            "match_timeline.transform_results.1mb.kills": lambda: self.bench_match_timeline_transform("kills"),
+            "match_timeline.transform_results.1mb.positions_3min":
+                lambda: self.bench_match_timeline_transform("positions_3min"),
+            "summoner_entries.transform_results.205": self.bench_summoner_transform,
+            **{f"json_decoding.{payload}.{decoder}{'.typed' if typed else ''}":
+               (lambda payload=payload, decoder=decoder, typed=typed:
+                self.bench_json_decoding(payload, decoder, typed))
+               for payload in ("match", "timeline_1mb")
+               for decoder, typed in (("json", False), ("orjson", False), ("msgspec", False), ("msgspec", True))},
+            "transform_pool.timelines_16.inline": lambda: self.bench_transform_pool("inline")[0],
+            "transform_pool.timelines_16.process": lambda: self.bench_transform_pool("process")[0],
+            "transform_pool.loop_lag.inline": lambda: self.bench_transform_pool("inline")[1],
+            "transform_pool.loop_lag.process": lambda: self.bench_transform_pool("process")[1],
+            "http_client.stages_4x100.session_per_stage": lambda: self.bench_http_client("session_per_stage"),
+            "http_client.stages_4x100.shared": lambda: self.bench_http_client("shared"),
+            **{f"adaptive_concurrency.capacity_8.{mode}": (lambda mode=mode: self.bench_adaptive_concurrency(mode))
+               for mode in ("fixed_1", "fixed_32", "aimd")},
+            "circuit_breaker.outage_1_5s.no_breaker": lambda: self.bench_circuit_breaker(breaker=False),
+            "circuit_breaker.outage_1_5s.breaker": lambda: self.bench_circuit_breaker(breaker=True),
+            "retry_scheduler.retry_after_10pct.in_place": lambda: self.bench_retry_scheduler(scheduled=False),
+            "retry_scheduler.retry_after_10pct.scheduled": lambda: self.bench_retry_scheduler(scheduled=True),
+            "data_saver.save_data.dict": self.bench_save_data_dict,
+            "data_saver.save_data.list_10": lambda: self.bench_save_data_list(10, 200),
+            "data_saver.save_data.list_1000": lambda: self.bench_save_data_list(1_000, 50),
+            "data_saver.save_data.list_50000": lambda: self.bench_save_data_list(50_000, 5),
+            "bulk_insert.summoners.tuples_50000": self.bench_bulk_insert_tuples,
+            "bulk_insert.participants.dicts_10000": self.bench_bulk_insert_participants,
+            "bulk_insert.participants.dicts_10000.no_aggregates":
+                lambda: self.bench_bulk_insert_participants(aggregates=False),
+            "bulk_insert.participants.dicts_10000.encoded": lambda: self.bench_bulk_insert_participants(encoded=True),
+            "database_query.match_ids.get_all_100000": lambda: self.bench_match_id_query("get_all"),
+            "database_query.match_ids.iter_all_100000": lambda: self.bench_match_id_query("iter_all"),
+            "database_query.match_ids.iter_first_row_100000": lambda: self.bench_match_id_query("iter_first_row"),
+            "database_query.champion_stats": self.bench_champion_stats,
+            "group_commit.single_file.participants_30000": lambda: self.bench_group_commit(sharded=False),
+            "group_commit.sharded_3.participants_30000": lambda: self.bench_group_commit(sharded=True),
+            "timeline.load_match.rows": lambda: self.bench_timeline_load("rows"),
+            "timeline.load_match.tracks": lambda: self.bench_timeline_load("tracks"),
+            "lane_features.lane_diff.1000_matches": self.bench_lane_diff_features,
+        }
+
+    def _iterations(self, iterations: int) -> int:
+        return max(1, int(iterations * self.scale))
+
+    def run(self, name_filter: Optional[str] = None) -> List[BenchmarkResult]:
+        """
+        Run every benchmark whose name contains the filter string.
+
+        Args:
+            name_filter (Optional[str]): Substring to select benchmarks by name.
+
+        Returns:
+            List[BenchmarkResult]: Results in definition order.
+        """
+        return [benchmark() for name, benchmark in self.benchmarks.items()
+                if not name_filter or name_filter in name]
+
+    def close(self) -> None:
+        """Remove the temporary benchmark database."""
+        self._tempdir.cleanup()
+
+    # Token bucket
+
+    def _token_bucket(self, rate: float, tokens: float) -> TokenBucket:
+        token_bucket = TokenBucket(Region, self.logger)
+        for bucket in token_bucket.token_bucket_regions.values():
+            bucket["fast_bucket_rate"] = bucket["slow_bucket_rate"] = rate
+            bucket["fast_bucket_capacity"] = bucket["slow_bucket_capacity"] = tokens
+            bucket["fast_bucket_tokens"] = bucket["slow_bucket_tokens"] = tokens
+        return token_bucket
+
+    def bench_allow_request_granted(self) -> BenchmarkResult:
+        token_bucket = self._token_bucket(rate=1e9, tokens=1e12)
+        return run_benchmark("token_bucket.allow_request.granted",
+                             lambda: token_bucket.allow_request(Region.EUW1.name),
+                             iterations=self._iterations(20_000))
+
+    def bench_allow_request_rejected(self) -> BenchmarkResult:
+        token_bucket = self._token_bucket(rate=1e-9, tokens=0)
+        return run_benchmark("token_bucket.allow_request.rejected",
+                             lambda: token_bucket.allow_request(Region.EUW1.name),
+                             iterations=self._iterations(20_000))
+
+    def bench_refill(self) -> BenchmarkResult:
+        token_bucket = self._token_bucket(rate=1e9, tokens=1e12)
+        return run_benchmark("token_bucket._refill",
+                             lambda: token_bucket._refill(Region.EUW1.name),
+                             iterations=self._iterations(20_000))
+
+    def bench_token_bucket_contention(self) -> BenchmarkResult:
+        coroutines, acquisitions = 64, 50
+        token_bucket = self._token_bucket(rate=200_000, tokens=20)
+
+        async def consumer(region: str) -> None:
+            for _ in range(acquisitions):
+                while not token_bucket.allow_request(region=region):
+                    await asyncio.sleep(token_bucket.calculate_sleep_time(region=region))
+
+        async def contend() -> None:
+            regions = [Region.EUW1.name, Region.KR.name, Region.NA1.name]
+            await asyncio.gather(*[consumer(regions[index % len(regions)]) for index in range(coroutines)])
+
+        return run_benchmark("token_bucket.contention.64_coroutines",
+                             lambda: asyncio.run(contend()),
+                             iterations=self._iterations(20), warmup=1,
+                             items_per_call=coroutines * acquisitions)
+
+    # Transforms
+
+    def _participant_records(self) -> List[dict]:
+        """Participant rows of the match payload as dicts keyed by ORM attribute."""
+        _, participants = MatchData("benchmark-key", self.logger,
+                                    self._token_bucket(1, 1)).tranform_results(self.match_payload)
+        _, attribute_keys = table_layout(MatchDataParticipants)
+        return [dict(zip(attribute_keys, row)) for row in participants]
+
+    def bench_match_data_transform(self) -> BenchmarkResult:
+        match_data = MatchData("benchmark-key", self.logger, self._token_bucket(1, 1))
+        return run_benchmark("match_data.tranform_results",
+                             lambda: match_data.tranform_results(self.match_payload),
+                             iterations=self._iterations(2_000), items_per_call=12)
+
+    def bench_match_timeline_transform(self, profile: str = "full") -> BenchmarkResult:
+        if not self._timeline_participants_saved:
+            teams, participants = MatchData("benchmark-key", self.logger,
+                                            self._token_bucket(1, 1)).tranform_results(self.match_payload)
+            DataSaver(self.workdir, DatabaseName.DATABASE_NAME.value, self.url,
+                      MatchDataParticipants, self.logger).save_data(participants)
+            self._timeline_participants_saved = True
+
+        timeline = MatchTimelineCall("benchmark-key", self.logger, self._token_bucket(1, 1),
+                                     DatabaseQuery(str(self.workdir), DatabaseName.DATABASE_NAME.value),
+                                     TimelineProfile.named(profile))
+        rows = len(timeline.transform_results(self.timeline_payload, self.match_id))
+
+        name = "match_timeline.transform_results.1mb" + ("" if profile == "full" else f".{profile}")
+        return run_benchmark(name, lambda: timeline.transform_results(self.timeline_payload, self.match_id),
+                             iterations=self._iterations(30), warmup=2, items_per_call=rows)
+
+    def bench_summoner_transform(self) -> BenchmarkResult:
+        summoner_entries = SummonerEntries("benchmark-key", self.logger, self._token_bucket(1, 1))
+        return run_benchmark("summoner_entries.transform_results.205",
+                             lambda: summoner_entries.transform_results(self.league_page, region=Region.EUW1.name),
+                             iterations=self._iterations(2_000), items_per_call=len(self.league_page))
+
+    def bench_json_decoding(self, payload: str, decoder: str, typed: bool) -> BenchmarkResult:
+        # Decodes the response body bytes; typed decodes against the schema the
+        # transforms read, skipping every other field.
+        name = f"json_decoding.{payload}.{decoder}{'.typed' if typed else ''}"
+        if payload == "match":
+            body, schema, iterations = json.dumps(self.match_payload).encode(), MatchPayload, 500
+        else:
+            body, schema, iterations = json.dumps(self.timeline_payload).encode(), TimelinePayload, 50
+        try:
+            decode = json_decoder(decoder, schema if typed else None)
+        except ImportError as e:
+            return BenchmarkResult(name, [], 0, error=f"ImportError: {e}")
+        return run_benchmark(name, lambda: decode(body), iterations=self._iterations(iterations), warmup=2)
+
+    def bench_transform_pool(self, mode: str) -> Tuple[BenchmarkResult, BenchmarkResult]:
+        # Decodes and transforms 16 raw timelines per call while a 1 ms heartbeat
+        # runs on the same event loop. The second result holds the heartbeat's
+        # lateness per tick instead of call latencies: its p99 is how long the
+        # loop could not dispatch anything.
+        timelines, tick = 16, 0.001
+        participants = self._participant_records()
+        team_positions = {row["puuid"]: (row["team_id"], row["team_position"]) for row in participants}
+        payload = json.dumps(self.timeline_payload).encode()
+        profile = TimelineProfile.named()
+        lags: List[float] = []
+
+        async def heartbeat(done: asyncio.Event) -> None:
+            while not done.is_set():
+                expected = time.perf_counter() + tick
+                await asyncio.sleep(tick)
+                lags.append(max(0.0, time.perf_counter() - expected))
+
+        async def transform_all(pool: TransformPool) -> None:
+            done = asyncio.Event()
+            ticker = asyncio.create_task(heartbeat(done))
+            await asyncio.gather(*[pool.run(timeline_batches, payload, self.match_id, team_positions, profile)
+                                   for _ in range(timelines)])
+            done.set()
+            await ticker
+
+        with TransformPool(self.logger, mode=mode) as pool:
+            throughput = run_benchmark(f"transform_pool.timelines_{timelines}.{mode}",
+                                       lambda: asyncio.run(transform_all(pool)),
+                                       iterations=self._iterations(5), warmup=1, items_per_call=timelines)
+            # Heartbeats of the warmup and the traced call do not count.
+            lags.clear()
+            for _ in range(self._iterations(3)):
+                asyncio.run(transform_all(pool))
+        return throughput, BenchmarkResult(f"transform_pool.loop_lag.{mode}", lags, 0, error=throughput.error)
+
+    # HTTP client
+
+    @contextlib.contextmanager
+    def _local_server(self, handler: Callable) -> Iterator[str]:
+        """Serve handler on GET /api from a thread of its own and yield its URL."""
+        server_loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        state: Dict[str, object] = {}
+
+        async def serve() -> None:
+            app = web.Application()
+            app.router.add_get("/api", handler)
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            state["runner"] = runner
+            state["url"] = f"http://127.0.0.1:{runner.addresses[0][1]}/api"
+            ready.set()
+
+        server = threading.Thread(target=lambda: (server_loop.run_until_complete(serve()),
+                                                  server_loop.run_forever()), daemon=True)
+        server.start()
+        ready.wait()
+        try:
+            yield state["url"]
+        finally:
+            asyncio.run_coroutine_threadsafe(state["runner"].cleanup(), server_loop).result()
+            server_loop.call_soon_threadsafe(server_loop.stop)
+            server.join()
+            server_loop.close()
+
+    def bench_http_client(self, mode: str) -> BenchmarkResult:
+        # Four "stages" of 100 requests (10 in flight) against a local server.
+        # session_per_stage is the previous layout, one asyncio.run and one
+        # default ClientSession per stage; shared runs every stage on the
+        # single tuned session of the orchestrator.
+        stages, requests, in_flight = 4, 100, 10
+        body = json.dumps(self.match_payload).encode()
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(body=body, content_type="application/json")
+
+        async def stage(session: ClientSession, url: str) -> None:
+            semaphore = asyncio.Semaphore(in_flight)
+
+            async def fetch() -> None:
+                async with semaphore:
+                    async with session.get(url) as response:
+                        await response.read()
+
+            await asyncio.gather(*[fetch() for _ in range(requests)])
+
+        async def fresh_session_stage(url: str) -> None:
+            async with ClientSession() as session:
+                await stage(session, url)
+
+        async def shared_stages(url: str) -> None:
+            async with create_client_session() as session:
+                for _ in range(stages):
+                    await stage(session, url)
+
+        def run_stages(url: str) -> None:
+            if mode == "shared":
+                asyncio.run(shared_stages(url))
+            else:
+                for _ in range(stages):
+                    asyncio.run(fresh_session_stage(url))
+
+        with self._local_server(handler) as url:
+            return run_benchmark(f"http_client.stages_4x100.{mode}", lambda: run_stages(url),
+                                 iterations=self._iterations(10), warmup=1, items_per_call=stages * requests)
+
+    # Adaptive concurrency
+
+    def bench_adaptive_concurrency(self, mode: str) -> BenchmarkResult:
+        # 300 requests through safely_fetch_rate_limited_data against a local
+        # server that serves 8 requests at a time (5 ms each) and answers 429
+        # beyond that. A rate-limited request is sent again after a 50 ms
+        # penalty (a scaled-down Retry-After). fixed_1 is the previous one
+        # request per region, fixed_32 a hand-picked high limit, aimd the
+        # controller starting from its initial limit on every call.
+        requests, capacity, service_time, penalty, workers = 300, 8, 0.005, 0.05, 32
+        active = [0]
+
+        async def handler(request: web.Request) -> web.Response:
+            if active[0] >= capacity:
+                return web.Response(status=429)
+            active[0] += 1
+            try:
+                await asyncio.sleep(service_time)
+            finally:
+                active[0] -= 1
+            return web.Response(body=b"[]", content_type="application/json")
+
+        token_bucket = self._token_bucket(rate=1e9, tokens=1e12)
+        status_response_exception = StatusResponseException()
+        region = Region.EUW1.name
+
+        async def run_all(url: str) -> None:
+            concurrency = None
+            if mode == "aimd":
+                concurrency = AdaptiveConcurrency(Region, self.logger, max_limit=workers)
+            pending = iter(range(requests))
+
+            async def worker(session: ClientSession) -> None:
+                for _ in pending:
+                    while True:
+                        try:
+                            await safely_fetch_rate_limited_data(url, {}, session, region, token_bucket,
+                                                                 status_response_exception, self.logger,
+                                                                 concurrency=concurrency)
+                            break
+                        except StatusCodeError:
+                            await asyncio.sleep(penalty)
+
+            async with create_client_session() as session:
+                await asyncio.gather(*[worker(session) for _ in range(1 if mode == "fixed_1" else workers)])
+
+        with self._local_server(handler) as url:
+            return run_benchmark(f"adaptive_concurrency.capacity_8.{mode}", lambda: asyncio.run(run_all(url)),
+                                 iterations=self._iterations(5), warmup=1, items_per_call=requests)
+
+    # Circuit breaker
+
+    def bench_circuit_breaker(self, breaker: bool) -> BenchmarkResult:
+        # 200 EUW1 and 200 VN2 requests, interleaved, through the API error
+        # wrapper and run_workers with 8 workers. VN2 answers 503 for the
+        # first 1.5 s of every call, EUW1 answers in 2 ms. Timed is how long
+        # the healthy EUW1 requests take: without a breaker every VN2 request
+        # is sent and retried with backoff, with one the VN2 circuit opens and
+        # its requests are deferred without being sent. The open time is
+        # scaled down to 0.25 s.
+        requests, outage, service_time, workers = 200, 1.5, 0.002, 8
+        healthy, failing = Region.EUW1.name, Region.VN2.name
+        outage_end = [0.0]
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.query["region"] == failing and time.monotonic() < outage_end[0]:
+                return web.Response(status=503)
+            await asyncio.sleep(service_time)
+            return web.Response(body=b"[]", content_type="application/json")
+
+        token_bucket = self._token_bucket(rate=1e9, tokens=1e12)
+        status_response_exception = StatusResponseException()
+        logger = self.logger
+
+        class Endpoint:
+            def __init__(self, url: str, circuit_breaker: Optional[CircuitBreaker]) -> None:
+                self.url = url
+                self.logger = logger
+                self.circuit_breaker = circuit_breaker
+
+            @async_api_call_error_wrapper
+            async def fetch(self, region: str, session: ClientSession):
+                return await safely_fetch_rate_limited_data(f"{self.url}?region={region}", {}, session, region,
+                                                            token_bucket, status_response_exception, self.logger)
+
+        async def run_all(url: str) -> None:
+            circuit_breaker = CircuitBreaker(self.logger, window=10, min_calls=5,
+                                             open_seconds=0.25) if breaker else None
+            endpoint = Endpoint(url, circuit_breaker)
+            remaining = [requests]
+            done = asyncio.Event()
+
+            async def process(region: str) -> None:
+                await endpoint.fetch(region=region, session=session)
+                if region == healthy:
+                    remaining[0] -= 1
+                    if not remaining[0]:
+                        done.set()
+
+            outage_end[0] = time.monotonic() + outage
+            async with create_client_session() as session:
+                runner = asyncio.create_task(run_workers([healthy, failing] * requests, process,
+                                                         workers, self.logger))
+                await done.wait()
+                runner.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await runner
+
+        with self._local_server(handler) as url:
+            return run_benchmark(f"circuit_breaker.outage_1_5s.{'breaker' if breaker else 'no_breaker'}",
+                                 lambda: asyncio.run(run_all(url)),
+                                 iterations=self._iterations(3), warmup=0, items_per_call=requests)
+
+    # Retry scheduler
+
+    def bench_retry_scheduler(self, scheduled: bool) -> BenchmarkResult:
+        # 400 requests with 8 workers against a local server answering in
+        # 2 ms; every tenth request is answered 429 with Retry-After: 0.2 the
+        # first time. in_place is the previous layout, workers sharing an
+        # iterator while the API error wrapper sleeps out the Retry-After;
+        # scheduled runs the items through run_workers, which hands them to
+        # the retry scheduler and keeps its workers busy.
+        requests, service_time, workers = 400, 0.002, 8
+        seen: set = set()
+
+        async def handler(request: web.Request) -> web.Response:
+            item = int(request.query["item"])
+            if item % 10 == 0 and item not in seen:
+                seen.add(item)
+                return web.Response(status=429, headers={"Retry-After": "0.2"})
+            await asyncio.sleep(service_time)
+            return web.Response(body=b"[]", content_type="application/json")
+
+        token_bucket = self._token_bucket(rate=1e9, tokens=1e12)
+        status_response_exception = StatusResponseException()
+        logger = self.logger
+        region = Region.EUW1.name
+
+        class Endpoint:
+            def __init__(self, url: str) -> None:
+                self.url = url
+                self.logger = logger
+
+            @async_api_call_error_wrapper
+            async def fetch(self, item: int, region: str, session: ClientSession):
+                return await safely_fetch_rate_limited_data(f"{self.url}?item={item}", {}, session, region,
+                                                            token_bucket, status_response_exception, self.logger)
+
+        async def run_all(url: str) -> None:
+            seen.clear()
+            endpoint = Endpoint(url)
+            async with create_client_session() as session:
+                async def process(item: int) -> None:
+                    await endpoint.fetch(item, region=region, session=session)
+
+                if scheduled:
+                    await run_workers(range(requests), process, workers, self.logger)
+                    return
+
+                pending = iter(range(requests))
+
+                async def worker() -> None:
+                    for item in pending:
+                        await process(item)
+
+                await asyncio.gather(*[worker() for _ in range(workers)])
+
+        with self._local_server(handler) as url:
+            return run_benchmark(f"retry_scheduler.retry_after_10pct.{'scheduled' if scheduled else 'in_place'}",
+                                 lambda: asyncio.run(run_all(url)),
+                                 iterations=self._iterations(5), warmup=1, items_per_call=requests)
+
+    # DataSaver
+
+    def _summoner_rows(self, count: int) -> list:
+        return [{"puuid": f"bench-{next(self._unique_ids)}", "continental_region": "EUROPE",
+                 "local_region": "EUW1", "current_tier": "DIAMOND", "current_division": "I",
+                 "date_collected": "2025-01-01"} for _ in range(count)]
+
+    def bench_save_data_dict(self) -> BenchmarkResult:
+        data_saver = DataSaver(self.workdir, DatabaseName.DATABASE_NAME.value, self.url, Summoners, self.logger)
+        return run_benchmark("data_saver.save_data.dict", data_saver.save_data,
+                             setup=lambda: (self._summoner_rows(1)[0],),
+                             iterations=self._iterations(200))
+
+    def bench_save_data_list(self, rows: int, iterations: int) -> BenchmarkResult:
+        data_saver = DataSaver(self.workdir, DatabaseName.DATABASE_NAME.value, self.url, Summoners, self.logger)
+        return run_benchmark(f"data_saver.save_data.list_{rows}", data_saver.save_data,
+                             setup=lambda: (self._summoner_rows(rows),),
+                             iterations=self._iterations(iterations), warmup=1, items_per_call=rows)
+
+    # Bulk insert
+
+    def bench_bulk_insert_tuples(self) -> BenchmarkResult:
+        rows, engine = 50_000, get_engine(self.url)
+        _, attribute_keys = table_layout(Summoners)
+
+        def insert_rows(data: list) -> None:
+            with engine.begin() as connection:
+                bulk_insert(connection, Summoners, data)
+
+        return run_benchmark("bulk_insert.summoners.tuples_50000", insert_rows,
+                             setup=lambda: ([tuple(row[key] for key in attribute_keys)
+                                             for row in self._summoner_rows(rows)],),
+                             iterations=self._iterations(5), warmup=1, items_per_call=rows)
+
+    def bench_bulk_insert_participants(self, aggregates: bool = True, encoded: bool = False) -> BenchmarkResult:
+        rows, url = 10_000, self.url
+        if not aggregates:
+            # Same tables without the Champion Aggregates triggers, to measure their cost.
+            url = DatabaseConfiguration.url.value.format(location=Path(self._tempdir.name) / "plain",
+                                                         name=DatabaseName.DATABASE_NAME.value)
+            Base.metadata.create_all(get_engine(url), tables=[MatchIDs.__table__, MatchDataParticipants.__table__],
+                                     checkfirst=True)
+        if encoded:
+            location = Path(self._tempdir.name) / "encoded"
+            DataBase(location).create_all_tables()
+            url = DatabaseConfiguration.url.value.format(location=location, name=DatabaseName.DATABASE_NAME.value)
+            encode_database(url)
+        engine = get_engine(url)
+        participants = self._participant_records()
+
+        def participant_rows() -> list:
+            match_id = f"EUW1_{next(self._unique_ids)}"
+            return [dict(participants[index % len(participants)], match_id=f"{match_id}_{index // 10}")
+                    for index in range(rows)]
+
+        def insert_rows(data: list) -> None:
+            with engine.begin() as connection:
+                bulk_insert(connection, MatchDataParticipants, data)
+
+        name = ("bulk_insert.participants.dicts_10000" + ("" if aggregates else ".no_aggregates")
+                + (".encoded" if encoded else ""))
+        return run_benchmark(name, insert_rows,
+                             setup=lambda: (participant_rows(),),
+                             iterations=self._iterations(5), warmup=1, items_per_call=rows)
+
+    def bench_champion_stats(self) -> BenchmarkResult:
+        database_query = DatabaseQuery(str(self.workdir), DatabaseName.DATABASE_NAME.value)
+        return run_benchmark("database_query.champion_stats", database_query.get_champion_stats,
+                             setup=lambda: ("", "JUNGLE"), iterations=self._iterations(200), warmup=5)
+
+    # DatabaseQuery
+
+    QUERY_CONTINENT = "BENCHMARK"
+    QUERY_ROWS = 100_000
+
+    def _seed_query_rows(self) -> None:
+        """Insert QUERY_ROWS match IDs (10 per summoner) under a continent of their own."""
+        if self._query_rows_seeded:
+            return
+        summoners = self.QUERY_ROWS // 10
+        with get_engine(self.url).begin() as connection:
+            bulk_insert(connection, Summoners,
+                        [(f"query-{index}", self.QUERY_CONTINENT, "EUW1", "GOLD", "I", "2025-01-01")
+                         for index in range(summoners)])
+            bulk_insert(connection, MatchIDs,
+                        [{"match_id": f"EUW1_{index}", "puuid": f"query-{index % summoners}", "game_tier": "GOLD",
+                          "platform_id": "EUW1", "continental_region": self.QUERY_CONTINENT}
+                         for index in range(self.QUERY_ROWS)])
+        self._query_rows_seeded = True
+
+    def bench_match_id_query(self, mode: str) -> BenchmarkResult:
+        self._seed_query_rows()
+        database_query = DatabaseQuery(str(self.workdir), DatabaseName.DATABASE_NAME.value)
+
+        def get_all() -> None:
+            database_query.get_match_ids_by_continent_from_match_id_table(self.QUERY_CONTINENT)
+
+        def iter_all() -> None:
+            for _ in database_query.iter_match_ids_by_continent_from_match_id_table(self.QUERY_CONTINENT):
+                pass
+
+        def iter_first_row() -> None:
+            rows = database_query.iter_match_ids_by_continent_from_match_id_table(self.QUERY_CONTINENT)
+            next(rows)
+            rows.close()
+
+        functions = {"get_all": get_all, "iter_all": iter_all, "iter_first_row": iter_first_row}
+        return run_benchmark(f"database_query.match_ids.{mode}_{self.QUERY_ROWS}", functions[mode],
+                             iterations=self._iterations(10 if mode != "iter_first_row" else 200), warmup=1,
+                             items_per_call=self.QUERY_ROWS if mode != "iter_first_row" else 1)
+
+    # Group commit writers
+
+    def bench_group_commit(self, sharded: bool) -> BenchmarkResult:
+        rows = 30_000
+        participants = self._participant_records()
+        platforms = ["EUW1", "KR", "NA1"]
+
+        if sharded:
+            storage = ShardedStorage(Path(self._tempdir.name) / "shards", DatabaseName.DATABASE_NAME.value,
+                                     self.logger).create()
+            writer = ShardedWriter(storage, self.logger, commit_row_count=rows).start()
+        else:
+            writer = GroupCommitWriter(self.url, self.logger, commit_row_count=rows).start()
+
+        def participant_rows() -> list:
+            batch = next(self._unique_ids)
+            return [dict(participants[index % 10],
+                         match_id=f"{platforms[index // 10 % 3]}_{batch}_{index // 10}")
+                    for index in range(rows)]
+
+        def write(data: list) -> None:
+            for start in range(0, len(data), 10):
+                writer.submit(MatchDataParticipants, data[start:start + 10])
+            writer.flush()
+
+        name = f"group_commit.{'sharded_3' if sharded else 'single_file'}.participants_{rows}"
+        try:
+            return run_benchmark(name, write, setup=lambda: (participant_rows(),),
+                                 iterations=self._iterations(5), warmup=1, items_per_call=rows)
+        finally:
+            writer.close()
+
+    # Timeline storage
+
+    TIMELINE_MATCHES = 200
+    TIMELINE_FRAMES = 36
+
+    def _seed_timeline_rows(self) -> None:
+        """Store the same position frames as Match Timeline rows and as packed tracks."""
+        if self._timeline_seeded:
+            return
+        rng = random.Random(37)
+        rows = [{"match_id": f"KR_{match}", "puuid": puuid, "timestamp": frame * 60_000, "team_id": "100",
+                 "in_game_id": participant, "team_position": "TOP",
+                 "x": rng.randint(0, 14800), "y": rng.randint(0, 14800),
+                 "event": "POSITION", "type": "PARTICIPANT_FRAME"}
+                for match in range(self.TIMELINE_MATCHES)
+                for participant, puuid in enumerate(self.puuids, start=1)
+                for frame in range(self.TIMELINE_FRAMES)]
+        _, tracks = split_timeline_rows(rows)
+        with get_engine(self.url).begin() as connection:
+            bulk_insert(connection, MatchTimeline, rows)
+            bulk_insert(connection, MatchTimelineTracks, tracks)
+        self._timeline_seeded = True
+
+    def bench_timeline_load(self, storage: str) -> BenchmarkResult:
+        self._seed_timeline_rows()
+        database_query = DatabaseQuery(str(self.workdir), DatabaseName.DATABASE_NAME.value)
+        engine = get_engine(self.url)
+        match_ids = itertools.cycle([f"KR_{match}" for match in range(self.TIMELINE_MATCHES)])
+
+        def load_rows() -> dict:
+            with engine.connect() as connection:
+                positions: Dict[str, list] = {}
+                for puuid, timestamp, x, y in connection.exec_driver_sql(
+                        'SELECT "puuId", "timestamp", "x", "y" FROM "Match Timeline" '
+                        'WHERE "matchId" = ? AND "event" = ?', (next(match_ids), "POSITION")):
+                    positions.setdefault(puuid, []).append((timestamp, x, y))
+            return {puuid: np.array(track, dtype=np.int32) for puuid, track in positions.items()}
+
+        def load_tracks() -> dict:
+            return database_query.get_match_tracks(next(match_ids))
+
+        return run_benchmark(f"timeline.load_match.{storage}", load_rows if storage == "rows" else load_tracks,
+                             iterations=self._iterations(500), warmup=5,
+                             items_per_call=10 * self.TIMELINE_FRAMES)
+
+    def bench_lane_diff_features(self) -> BenchmarkResult:
+        matches = 1_000
+        participants = self._participant_records()
+        database_query = DatabaseQuery(str(self.workdir), DatabaseName.DATABASE_NAME.value)
+        economy = MatchTimelineCall("benchmark-key", self.logger, self._token_bucket(1, 1),
+                                    database_query).transform_economy(self.timeline_payload, self.match_id)
+        lanes = {participant["puuid"]: (participant["team_id"], participant["team_position"])
+                 for participant in participants}
+
+        match_ids = [f"EUW1_{match}" for match in range(matches) for _ in economy]
+        team_ids = [lanes[record["puuid"]][0] for record in economy] * matches
+        positions = [lanes[record["puuid"]][1] for record in economy] * matches
+        frame_counts = [record["frame_count"] for record in economy] * matches
+        series = [record["series"] for record in economy] * matches
+
+        return run_benchmark("lane_features.lane_diff.1000_matches",
+                             lambda: lane_diff_features(match_ids, team_ids, positions, frame_counts, series),
+                             iterations=self._iterations(50), warmup=2, items_per_call=matches)
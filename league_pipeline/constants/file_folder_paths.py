@@ -17,6 +17,10 @@ class Paths:
         CONFIG (Path): Directory containing configuration files.
         KEY (Path): Path to the API key environment file.
         LOGGING_CONFIG (Path): Path to the logging configuration JSON file.
+        BENCHMARKS (Path): Directory containing the microbenchmark suite.
+        BENCHMARK_BASELINE (Path): Path to the stored benchmark baseline results.
+        DUCKDB_MIRROR (Path): Path to the DuckDB analytics mirror of the database.
+        EXPORTS (Path): Root directory of the partitioned Parquet exports.
     """
     BASE = Path(__file__).parent.parent.parent
     DATA = BASE / "data"
@@ -25,4 +29,7 @@ class Paths:
     CONFIG = LEAGUE_PIPELINE / "config"
     KEY = LEAGUE_PIPELINE / "key" / "api_key.env"
     LOGGING_CONFIG = CONFIG / "log_config.json"
-
+    BENCHMARKS = LEAGUE_PIPELINE / "benchmarks"
+    BENCHMARK_BASELINE = BENCHMARKS / "baselines" / "baseline.json"
+    DUCKDB_MIRROR = DATA / "analytics.duckdb"
+    EXPORTS = DATA / "exports"
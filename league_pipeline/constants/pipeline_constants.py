@@ -13,10 +13,50 @@ class EventTypes:
     """
     Event type definitions for match timeline processing.
     
-    Note:
-        This class is currently empty but reserved for future event type constants.
+    Attributes:
+        POSITION (str): Event name of the per-frame participant position rows.
+        PARTICIPANT_FRAME (str): Type of the per-frame participant position rows.
+        CHAMPION_KILL (str): Riot event type of champion kills.
+        ELITE_MONSTER_KILL (str): Riot event type of dragon, herald, baron and atakhan kills.
+        BUILDING_KILL (str): Riot event type of destroyed towers and inhibitors.
+        CHAMPION_DEATH (str): Heatmap series of champion kills keyed by the victim.
+        SUPPORTED (list[str]): Riot event types the timeline transform can store.
+    """
+    POSITION = "POSITION"
+    PARTICIPANT_FRAME = "PARTICIPANT_FRAME"
+    CHAMPION_KILL = "CHAMPION_KILL"
+    ELITE_MONSTER_KILL = "ELITE_MONSTER_KILL"
+    BUILDING_KILL = "BUILDING_KILL"
+    CHAMPION_DEATH = "CHAMPION_DEATH"
+    SUPPORTED = [ELITE_MONSTER_KILL, CHAMPION_KILL, BUILDING_KILL]
+
+class TimelineCollectionConfig:
+    """
+    Timeline collection profiles applied by the timeline transform.
+    
+    A profile selects the event types to keep, the interval at which
+    participant positions are sampled and whether positions are kept at all.
+    Dropped events and frames are skipped before any record is built, so they
+    cost neither memory nor database writes.
+    
+    Attributes:
+        PROFILE (str): Name of the profile used by the pipeline.
+        PROFILES (dict): Profile name mapped to its settings:
+                         event_types (list[str]) - subset of EventTypes.SUPPORTED,
+                         position_interval_ms (int) - keep one position frame per
+                         interval (the API sends one frame per 60000 ms),
+                         keep_positions (bool) - store participant positions,
+                         keep_economy (bool) - store per-frame gold/XP/CS/level series.
     """
-    pass
+    PROFILE = "full"
+    PROFILES = {
+        "full": {"event_types": EventTypes.SUPPORTED, "position_interval_ms": 60_000,
+                 "keep_positions": True, "keep_economy": True},
+        "kills": {"event_types": EventTypes.SUPPORTED, "position_interval_ms": 60_000,
+                  "keep_positions": False, "keep_economy": False},
+        "positions_3min": {"event_types": [], "position_interval_ms": 180_000,
+                           "keep_positions": True, "keep_economy": False},
+    }
    
 class DataProcessingConfig:
     """
@@ -36,3 +76,298 @@ class DataProcessingConfig:
     START: int = 0
     COUNT: int = 100
 
+
+class DatabaseWriterConfig:
+    """
+    Configuration of the background group-commit database writer.
+    
+    When enabled, the services hand their rows to a writer thread that commits
+    them in large transactions instead of committing every API response.
+    
+    Attributes:
+        ENABLED (bool): Whether services write through the group-commit writer.
+        MAX_QUEUED_BATCHES (int): Queue capacity in batches before producers wait.
+        COMMIT_ROW_COUNT (int): Number of pending rows that triggers a commit.
+        COMMIT_INTERVAL_SECONDS (float): Maximum time rows wait before being committed.
+        COMMIT_RETRIES (int): Retries of a group whose commit failed with an operational
+                              error (locked database, I/O error) before it is given up.
+        COMMIT_RETRY_DELAY_SECONDS (float): Wait before the first retry, doubled for each further one.
+    """
+    ENABLED = True
+    MAX_QUEUED_BATCHES = 1_000
+    COMMIT_ROW_COUNT = 5_000
+    COMMIT_INTERVAL_SECONDS = 1.0
+    COMMIT_RETRIES = 3
+    COMMIT_RETRY_DELAY_SECONDS = 0.5
+
+class StorageConfig:
+    """
+    Configuration of the database storage layout.
+    
+    In "sharded" mode every continent (and, with SHARD_BY_STAGE, every stage of
+    every continent) writes to its own SQLite file through its own writer, so
+    writes to different shards no longer wait on a single file lock. Reads go
+    through per-continent views over the ATTACHed shards, and
+    scripts/merge_shards.py consolidates the shards into one file.
+    
+    Attributes:
+        MODE (str): "single" for one database file, "sharded" for shard files.
+        SHARD_BY_STAGE (bool): Also split each continent's shard by pipeline stage.
+        STAGE_TABLES (list[list[str]]): Table names written by stages 1-4.
+        DERIVED_TABLES (list[str]): Tables computed from the others, which merges rebuild instead of copying.
+        MAX_ATTACHED (int): SQLite's default limit of ATTACHed databases per connection.
+    """
+    MODE = "single"
+    SHARD_BY_STAGE = False
+    STAGE_TABLES = [
+        ["Summoners"],
+        ["Match IDs"],
+        ["Match Data (Teams)", "Match Data (Participants)"],
+        ["Match Timeline", "Match Timeline (Tracks)", "Match Timeline (Economy)"],
+    ]
+    DERIVED_TABLES = ["Champion Aggregates", "Heatmap Cells", "Heatmap Watermarks"]
+    MAX_ATTACHED = 10
+
+class TimelineStorageConfig:
+    """
+    Configuration of how match timelines are stored.
+    
+    In "rows" mode every participant position of every frame is a Match
+    Timeline row. In "tracks" mode only the events are rows, and each
+    participant's positions are packed into one Match Timeline (Tracks) row
+    per match, which is roughly an order of magnitude smaller and loads a
+    whole match with ten row reads.
+    
+    Attributes:
+        MODE (str): "rows" or "tracks".
+    """
+    MODE = "rows"
+
+class DictionaryEncodingConfig:
+    """
+    Configuration of the dictionary-encoded storage mode.
+    
+    In "encoded" mode the low-cardinality text columns listed in COLUMNS are
+    stored as integer codes into the Dimension Values table. The table itself
+    is renamed with ENCODED_SUFFIX and a view under the original name joins
+    the strings back, so reads are unchanged. Columns sharing a dimension
+    (e.g. both participant positions) share their codes.
+    
+    Attributes:
+        MODE (str): "plain" or "encoded"; applied to new databases by DataBase.create_all_tables.
+        ENCODED_SUFFIX (str): Appended to a table name to name its encoded table.
+        COLUMNS (dict[str, dict[str, str]]): Encoded columns per table name, mapped to their dimension.
+    """
+    MODE = "plain"
+    ENCODED_SUFFIX = " (Encoded)"
+    COLUMNS = {
+        "Summoners": {
+            "continentalRegion": "continent",
+            "localRegion": "platform",
+            "currentTier": "tier",
+            "currentDivision": "division",
+        },
+        "Match Data (Participants)": {
+            "championName": "champion",
+            "individualPosition": "position",
+            "teamPosition": "position",
+            "endOfGameResult": "game_result",
+        },
+        "Match Timeline": {
+            "teamPosition": "position",
+            "event": "event",
+            "type": "event_type",
+        },
+    }
+
+class TransformExecutionConfig:
+    """
+    Configuration of where API responses are decoded and transformed.
+    
+    In "inline" mode the match data and timeline responses are decoded with
+    response.json() and transformed on the event loop thread. In "process"
+    mode the raw response bytes are handed to a process pool that decodes and
+    transforms them and sends back only the database rows, so the event loop
+    keeps dispatching requests while a timeline is parsed and the transforms
+    run on several cores.
+    
+    Attributes:
+        MODE (str): "inline" or "process".
+        WORKERS (int | None): Worker processes (None: one per CPU).
+        START_METHOD (str): multiprocessing start method of the workers; "spawn"
+                            keeps the writer thread and open database
+                            connections out of the workers.
+    """
+    MODE = "inline"
+    WORKERS = None
+    START_METHOD = "spawn"
+
+class JsonDecodingConfig:
+    """
+    Configuration of how API response bodies are decoded.
+    
+    Responses are read as bytes and passed to the decoder named here (see
+    utils/json_decoding.py). "auto" picks msgspec for responses with a typed
+    schema, then orjson, then msgspec, then the standard library json module,
+    depending on what is installed.
+    
+    Attributes:
+        DECODER (str): "auto", "msgspec", "orjson" or "json".
+        TYPED_PAYLOADS (bool): Decode match and timeline responses against their
+                               schemas (riot_api/schemas.py), skipping the fields
+                               the transforms never read. Needs msgspec.
+    """
+    DECODER = "auto"
+    TYPED_PAYLOADS = True
+
+class HttpClientConfig:
+    """
+    Configuration of the HTTP client shared by every pipeline stage.
+    
+    The orchestrator opens one ClientSession for the whole run (see
+    utils/http_client.py), so TCP/TLS connections and DNS lookups of the
+    *.api.riotgames.com hosts are reused from one stage to the next.
+    
+    Attributes:
+        LIMIT (int): Open connections across all hosts (0: unlimited).
+        LIMIT_PER_HOST (int): Open connections per host; requests beyond it
+                              wait for a free connection.
+        KEEPALIVE_TIMEOUT (float): Seconds an idle connection is kept open.
+        DNS_CACHE_TTL (int): Seconds a resolved host address is reused.
+        TOTAL_TIMEOUT (float | None): Seconds for a whole request including the body.
+        CONNECT_TIMEOUT (float | None): Seconds to get a connection (pool wait and handshake).
+        SOCK_READ_TIMEOUT (float | None): Seconds between two reads of the response.
+        ACCEPT_ENCODING (str): Accept-Encoding header; "br" is dropped when no
+                               brotli decoder is installed.
+        PREWARM (bool): Open a connection to every host of the active stages
+                        before the first stage starts.
+    """
+    LIMIT = 100
+    LIMIT_PER_HOST = 20
+    KEEPALIVE_TIMEOUT = 60.0
+    DNS_CACHE_TTL = 600
+    TOTAL_TIMEOUT = 60.0
+    CONNECT_TIMEOUT = 10.0
+    SOCK_READ_TIMEOUT = 30.0
+    ACCEPT_ENCODING = "gzip, br"
+    PREWARM = False
+
+class AdaptiveConcurrencyConfig:
+    """
+    Configuration of the per-region adaptive concurrency controller.
+    
+    Every region (platform or continental routing value) gets its own limit
+    on requests in flight, adjusted by AIMD (see
+    rate_limiting/adaptive_concurrency.py): each successful request with
+    healthy latency raises the limit by ADDITIVE_INCREASE / limit (about
+    +ADDITIVE_INCREASE per round trip of the whole window), a 429 or a
+    smoothed latency above LATENCY_TOLERANCE x the region's baseline
+    multiplies it by MULTIPLICATIVE_DECREASE.
+    
+    Attributes:
+        ENABLED (bool): Run up to MAX_LIMIT requests per region, gated by the
+                        controller; False keeps one request in flight per region.
+        INITIAL_LIMIT (float): Limit every region starts with.
+        MIN_LIMIT (float): Lowest limit a decrease can reach.
+        MAX_LIMIT (int): Highest limit, also the number of workers per region.
+        ADDITIVE_INCREASE (float): Limit gained per window of healthy requests.
+        MULTIPLICATIVE_DECREASE (float): Factor applied to the limit on a 429
+                                         or on rising latency.
+        LATENCY_TOLERANCE (float): Smoothed latency over baseline that counts as rising.
+        LATENCY_SMOOTHING (float): Weight of a new sample in the smoothed latency.
+        BASELINE_DRIFT (float): Weight with which a slower sample raises the
+                                baseline (the lowest latency seen), so it follows
+                                a stage switching to a slower endpoint.
+        LOG_INTERVAL (float | None): Seconds between two snapshot log lines while
+                                     the stages run (None: only after each stage).
+    """
+    ENABLED = True
+    INITIAL_LIMIT = 2.0
+    MIN_LIMIT = 1.0
+    MAX_LIMIT = 32
+    ADDITIVE_INCREASE = 1.0
+    MULTIPLICATIVE_DECREASE = 0.5
+    LATENCY_TOLERANCE = 2.0
+    LATENCY_SMOOTHING = 0.2
+    BASELINE_DRIFT = 0.01
+    LOG_INTERVAL = 60.0
+
+class CircuitBreakerConfig:
+    """
+    Configuration of the per-region, per-endpoint circuit breakers.
+    
+    A circuit opens when at least FAILURE_RATE of its last WINDOW calls (and
+    at least MIN_CALLS) failed with a 5xx, a timeout or a connection error;
+    429 and other 4xx responses do not count. While open, calls fail at once
+    with CircuitOpenError and the services defer their work item. After
+    OPEN_SECONDS the circuit is half-open and lets one probe call through: a
+    success closes it, a failure opens it again for twice as long (at most
+    MAX_OPEN_SECONDS).
+    
+    Attributes:
+        ENABLED (bool): Guard API calls with circuit breakers.
+        WINDOW (int): Recent calls the failure rate is computed over.
+        MIN_CALLS (int): Calls in the window before the circuit may open.
+        FAILURE_RATE (float): Failed share of the window that opens the circuit.
+        OPEN_SECONDS (float): Time open before the first probe.
+        MAX_OPEN_SECONDS (float): Upper bound of the doubled open time.
+        PROBE_WAIT_SECONDS (float): Delay before work refused while a probe is
+                                    in flight is tried again.
+        MAX_DEFERRALS (int): Open periods a work item is deferred through before
+                             it is dropped (and logged) for the rest of the
+                             run; waiting for an in-flight probe does not count,
+                             so an item is dropped only after this many probes
+                             in a row failed.
+    """
+    ENABLED = True
+    WINDOW = 20
+    MIN_CALLS = 10
+    FAILURE_RATE = 0.5
+    OPEN_SECONDS = 30.0
+    MAX_OPEN_SECONDS = 600.0
+    PROBE_WAIT_SECONDS = 1.0
+    MAX_DEFERRALS = 10
+
+class RetrySchedulerConfig:
+    """
+    Configuration of the central retry scheduler.
+    
+    A request that failed with a 429, a 5xx, a timeout or a connection error
+    is not retried inside its worker: the work item goes to a delay queue and
+    is handed back to the workers when it is due, after exactly Retry-After
+    for a 429 (SLEEP_TIME_IF_RATE_LIMIT_EXCEEDED without the header) and after
+    the exponential backoff otherwise. Every attempt, 429s included, counts
+    towards Rates.MAX_API_CALL_RETRIES. All services share one retry budget:
+    at most BUDGET_MIN retries plus BUDGET_RATIO retries per work item
+    started; beyond it failed items are dropped (and logged) instead of
+    retried, so a widespread failure cannot turn into a retry storm. 429s
+    with a Retry-After header are retried outside the budget.
+    
+    Attributes:
+        BUDGET_RATIO (float): Retries allowed per work item started.
+        BUDGET_MIN (int): Retries allowed regardless of the number of items.
+    """
+    BUDGET_RATIO = 0.2
+    BUDGET_MIN = 100
+
+class PlanningConfig:
+    """
+    Assumptions of the dry-run planner (scripts/run_pipeline.py --plan).
+    
+    The planner derives request counts from the stage configuration and,
+    where the database has history, from what earlier runs collected;
+    the values below stand in where it has none.
+    
+    Attributes:
+        ENTRIES_PER_PAGE (int): Summoner entries per league-exp page.
+        APEX_PLAYERS (dict): Players per platform in the apex tiers (None: more than the pages hold).
+        MATCHES_PER_DAY (float): Ranked matches a ladder player plays per day.
+        PLAYERS_PER_MATCH (float): Collected players sharing one match (overlap of their match lists).
+        REQUEST_LATENCY (float): Seconds per request, bounding a bucket to
+                                 workers / REQUEST_LATENCY requests per second.
+    """
+    ENTRIES_PER_PAGE = 205
+    APEX_PLAYERS = {"CHALLENGER": 300, "GRANDMASTER": 700, "MASTER": None}
+    MATCHES_PER_DAY = 2.0
+    PLAYERS_PER_MATCH = 1.0
+    REQUEST_LATENCY = 0.2
@@ -0,0 +1,180 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Connection
+
+from league_pipeline.db.dictionary_encoding import decode_sql, encoded_columns, encoded_table_name
+from league_pipeline.db.models import ChampionAggregates, MatchDataParticipants, MatchIDs
+
+
+# Aggregate column mapped to the participant expression it sums, with "{row}"
+# standing for the row alias (NEW/OLD in the triggers, p in the rebuild).
+AGGREGATE_MEASURES: Dict[str, str] = {
+    "games": "1",
+    "wins": 'COALESCE({row}."win", 0)',
+    "kills": 'COALESCE({row}."championKills", 0)',
+    "deaths": 'COALESCE({row}."deaths", 0)',
+    "assists": 'COALESCE({row}."assists", 0)',
+    "kdaSum": 'COALESCE({row}."KDA", 0)',
+    "kdaSquares": 'COALESCE({row}."KDA" * {row}."KDA", 0)',
+    "goldPerMinuteSum": 'COALESCE({row}."goldPerMinute", 0)',
+    "goldPerMinuteSquares": 'COALESCE({row}."goldPerMinute" * {row}."goldPerMinute", 0)',
+    "damagePerMinuteSum": 'COALESCE({row}."damagePerMinute", 0)',
+    "damagePerMinuteSquares": 'COALESCE({row}."damagePerMinute" * {row}."damagePerMinute", 0)',
+}
+
+AGGREGATE_KEYS = ("gameTier", "teamPosition", "championName")
+
+INSERT_TRIGGER = "champion_aggregates_after_insert"
+DELETE_TRIGGER = "champion_aggregates_after_delete"
+
+_AGGREGATES = ChampionAggregates.__tablename__
+_PARTICIPANTS = MatchDataParticipants.__tablename__
+_MATCH_IDS = MatchIDs.__tablename__
+
+
+def _key_expressions(row: str, encoded: Sequence[str] = ()) -> List[str]:
+    """
+    (tier, position, champion) of a participant row; missing values group under ''.
+
+    Columns listed in encoded hold dictionary codes and are decoded first.
+    """
+    def column(name: str) -> str:
+        return decode_sql(f'{row}."{name}"') if name in encoded else f'{row}."{name}"'
+
+    return [f'COALESCE((SELECT "gameTier" FROM "{_MATCH_IDS}" WHERE "matchId" = {row}."matchId"), \'\')',
+            f'COALESCE({column("teamPosition")}, \'\')',
+            f'COALESCE({column("championName")}, \'\')']
+
+
+def _quoted(names) -> str:
+    return ", ".join(f'"{name}"' for name in names)
+
+
+def create_aggregate_triggers(connection: Connection) -> None:
+    """
+    Create the triggers keeping Champion Aggregates in step with Match Data (Participants).
+
+    The AFTER INSERT trigger upserts the participant into its (tier, position,
+    champion) row and the AFTER DELETE trigger subtracts it again, so the
+    aggregates change in the same transaction as the participants. INSERT OR
+    IGNORE of an already stored participant does not fire the trigger. When
+    the participants are dictionary-encoded, the triggers sit on the encoded
+    table and decode the position and champion codes.
+
+    Args:
+        connection (Connection): Open connection to a database holding both tables and Match IDs.
+    """
+    encoded = encoded_columns(connection, _PARTICIPANTS)
+    source = encoded_table_name(_PARTICIPANTS) if encoded else _PARTICIPANTS
+    measures = AGGREGATE_MEASURES.items()
+    insert_values = ", ".join(_key_expressions("NEW", encoded) + [expression.format(row="NEW")
+                                                                   for _, expression in measures])
+    accumulate = ", ".join(f'"{name}" = "{name}" + excluded."{name}"' for name in AGGREGATE_MEASURES)
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS "{INSERT_TRIGGER}" AFTER INSERT ON "{source}" BEGIN '
+        f'INSERT INTO "{_AGGREGATES}" ({_quoted(AGGREGATE_KEYS + tuple(AGGREGATE_MEASURES))}) '
+        f'SELECT {insert_values} WHERE true '
+        f'ON CONFLICT ({_quoted(AGGREGATE_KEYS)}) DO UPDATE SET {accumulate}; END')
+
+    subtract = ", ".join(f'"{name}" = "{name}" - {expression.format(row="OLD")}' for name, expression in measures)
+    match_key = " AND ".join(f'"{name}" = {expression}'
+                             for name, expression in zip(AGGREGATE_KEYS, _key_expressions("OLD", encoded)))
+    connection.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS "{DELETE_TRIGGER}" AFTER DELETE ON "{source}" BEGIN '
+        f'UPDATE "{_AGGREGATES}" SET {subtract} WHERE {match_key}; END')
+
+
+def drop_aggregate_triggers(connection: Connection) -> None:
+    """
+    Drop the aggregate triggers (e.g. before a bulk load followed by rebuild_champion_aggregates()).
+    """
+    for trigger in (INSERT_TRIGGER, DELETE_TRIGGER):
+        connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS "{trigger}"')
+
+
+def rebuild_champion_aggregates(connection: Connection) -> int:
+    """
+    Recompute Champion Aggregates from Match Data (Participants) with one GROUP BY.
+
+    Used to backfill existing databases and to repair the table after rows
+    were loaded with the triggers dropped. Runs in the caller's transaction.
+
+    Args:
+        connection (Connection): Open connection to the database.
+
+    Returns:
+        int: Number of aggregate rows written.
+    """
+    tier, position, champion = _key_expressions("p")
+    sums = ", ".join(f"SUM({expression.format(row='p')})" for expression in AGGREGATE_MEASURES.values())
+    connection.exec_driver_sql(f'DELETE FROM "{_AGGREGATES}"')
+    return connection.exec_driver_sql(
+        f'INSERT INTO "{_AGGREGATES}" ({_quoted(AGGREGATE_KEYS + tuple(AGGREGATE_MEASURES))}) '
+        f'SELECT {tier}, {position}, {champion}, {sums} FROM "{_PARTICIPANTS}" p '
+        f'GROUP BY 1, 2, 3').rowcount
+
+
+def _mean_and_std(total: float, squares: float, games: int) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Mean and sample standard deviation from a running sum and sum of squares.
+    """
+    if not games:
+        return None, None
+    mean = total / games
+    if games < 2:
+        return mean, None
+    return mean, math.sqrt(max(squares - total * mean, 0.0) / (games - 1))
+
+
+def champion_stats(connection: Connection, game_tier: str, team_position: str,
+                   champion_name: Optional[str] = None) -> List[dict]:
+    """
+    Read champion statistics of a tier and position from Champion Aggregates.
+
+    The rows are summed with GROUP BY, so the query also works when the table
+    is a UNION ALL view over shards holding partial aggregates. The pick rate
+    is games / matches, with matches counted as the games of the tier and
+    position over the two teams.
+
+    Args:
+        connection (Connection): Open connection to the database.
+        game_tier (str): Tier of the matches.
+        team_position (str): Assigned position.
+        champion_name (Optional[str]): Restrict to one champion (default: every champion).
+
+    Returns:
+        list: One dict per champion, ordered by games played.
+    """
+    rows = connection.exec_driver_sql(
+        f'SELECT "championName", {", ".join(f"SUM({_quoted([name])})" for name in AGGREGATE_MEASURES)} '
+        f'FROM "{_AGGREGATES}" WHERE "gameTier" = ? AND "teamPosition" = ? '
+        f'GROUP BY "championName" HAVING SUM("games") > 0', (game_tier, team_position)).all()
+
+    matches = sum(row[1] for row in rows) / 2
+    stats = []
+    for row in rows:
+        if champion_name is not None and row[0] != champion_name:
+            continue
+        values = dict(zip(AGGREGATE_MEASURES, row[1:]))
+        games = values["games"]
+        kda, kda_std = _mean_and_std(values["kdaSum"], values["kdaSquares"], games)
+        gold, gold_std = _mean_and_std(values["goldPerMinuteSum"], values["goldPerMinuteSquares"], games)
+        damage, damage_std = _mean_and_std(values["damagePerMinuteSum"], values["damagePerMinuteSquares"], games)
+        stats.append({
+            "champion_name": row[0],
+            "games": games,
+            "win_rate": values["wins"] / games,
+            "pick_rate": games / matches if matches else None,
+            "kills": values["kills"] / games,
+            "deaths": values["deaths"] / games,
+            "assists": values["assists"] / games,
+            "kda": kda,
+            "kda_std": kda_std,
+            "gold_per_minute": gold,
+            "gold_per_minute_std": gold_std,
+            "damage_per_minute": damage,
+            "damage_per_minute_std": damage_std,
+        })
+
+    return sorted(stats, key=lambda champion: champion["games"], reverse=True)
@@ -0,0 +1,161 @@
+import sqlite3
+from itertools import chain, islice
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import DeclarativeBase
+
+from league_pipeline.constants.database_constants import BulkInsertConfig
+from league_pipeline.db.dictionary_encoding import dictionary_encoder, encoded_table_name
+
+
+# Compile-time default of SQLITE_MAX_VARIABLE_NUMBER since SQLite 3.32.0 (999 before).
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+_layouts: Dict[Type[DeclarativeBase], Tuple[List[str], List[str]]] = {}
+_statements: Dict[Tuple[str, int], str] = {}
+
+
+def table_layout(table: Type[DeclarativeBase]) -> Tuple[List[str], List[str]]:
+    """
+    Return the column names and matching ORM attribute keys of a model, in table order.
+
+    Tuple rows passed to bulk_insert() must follow this column order; dict rows
+    are keyed by the attribute names (e.g. "match_id" for column "matchId").
+
+    Args:
+        table (Type[DeclarativeBase]): SQLAlchemy model class.
+
+    Returns:
+        tuple: (column names, attribute keys).
+    """
+    layout = _layouts.get(table)
+    if layout is None:
+        mapper = inspect(table)
+        attribute_keys = {column.name: attribute.key
+                          for attribute in mapper.column_attrs for column in attribute.columns}
+        column_names = [column.name for column in table.__table__.columns]
+        layout = (column_names, [attribute_keys[name] for name in column_names])
+        _layouts[table] = layout
+    return layout
+
+
+def rows_per_statement(column_count: int) -> int:
+    """
+    Number of rows to pack into one INSERT without exceeding the variable limit.
+
+    Args:
+        column_count (int): Number of bound columns per row.
+
+    Returns:
+        int: Rows per statement (at least 1).
+    """
+    return max(1, min(BulkInsertConfig.ROWS_PER_STATEMENT.value, SQLITE_MAX_VARIABLES // column_count))
+
+
+def insert_statement(table: Type[DeclarativeBase], row_count: int, table_name: Optional[str] = None) -> str:
+    """
+    Return the cached INSERT ... ON CONFLICT DO NOTHING text for a row count.
+
+    bulk_insert() only asks for rows_per_statement() and powers of two below
+    it, so the cache holds a handful of statements per table instead of one
+    per remainder size.
+
+    Args:
+        table (Type[DeclarativeBase]): SQLAlchemy model class.
+        row_count (int): Number of VALUES groups in the statement.
+        table_name (Optional[str]): Table to insert into instead of the model's
+                                    (e.g. its dictionary-encoded table).
+
+    Returns:
+        str: SQL text using qmark parameters.
+    """
+    table_name = table_name or table.__tablename__
+    key = (table_name, row_count)
+    statement = _statements.get(key)
+    if statement is None:
+        column_names, _ = table_layout(table)
+        columns = ", ".join(f'"{name}"' for name in column_names)
+        group = "(" + ", ".join("?" * len(column_names)) + ")"
+        statement = (f'INSERT INTO "{table_name}" ({columns}) '
+                     f'VALUES {", ".join([group] * row_count)} ON CONFLICT DO NOTHING')
+        _statements[key] = statement
+    return statement
+
+
+def as_tuples(table: Type[DeclarativeBase], rows: Sequence[Union[dict, tuple]]) -> List[tuple]:
+    """
+    Convert dict rows (keyed by ORM attribute) to tuples in column order.
+
+    Args:
+        table (Type[DeclarativeBase]): SQLAlchemy model class.
+        rows (Sequence[Union[dict, tuple]]): Rows as dicts or already-ordered tuples.
+
+    Returns:
+        list: Rows as tuples; missing dict keys become NULL.
+    """
+    if not rows or not isinstance(rows[0], dict):
+        return list(rows)
+    _, attribute_keys = table_layout(table)
+    return [tuple(row.get(key) for key in attribute_keys) for row in rows]
+
+
+def bulk_insert(connection: Connection, table: Type[DeclarativeBase],
+                rows: Sequence[Union[dict, tuple]]) -> int:
+    """
+    Insert rows with cached multi-row statements run through executemany.
+
+    Rows are packed rows_per_statement() at a time into one INSERT so each
+    statement stays within SQLite's bound-variable limit, and the packed
+    chunks are executed with executemany. Any remainder is inserted with
+    statements of power-of-two sizes (e.g. 37 rows as 32 + 4 + 1), which
+    keeps the statement cache bounded. Everything runs on the given connection, so the caller
+    decides the transaction (typically one per call, via engine.begin()).
+    Rows for a dictionary-encoded table are encoded and written to its
+    encoded table (see db/dictionary_encoding.py).
+
+    Args:
+        connection (Connection): SQLAlchemy connection inside a transaction.
+        table (Type[DeclarativeBase]): SQLAlchemy model class of the target table.
+        rows (Sequence[Union[dict, tuple]]): Dicts keyed by ORM attribute, or
+                                             tuples in table column order.
+
+    Returns:
+        int: Number of rows submitted (duplicates are skipped by SQLite).
+    """
+    tuples = as_tuples(table, rows)
+    if not tuples:
+        return 0
+
+    table_name = table.__tablename__
+    encoder = dictionary_encoder(connection)
+    if encoder.is_encoded(table_name):
+        tuples = encoder.encode(connection, table_name, table_layout(table)[0], tuples)
+        table_name = encoded_table_name(table_name)
+
+    column_count = len(tuples[0])
+    per_statement = rows_per_statement(column_count)
+    full_rows = len(tuples) - len(tuples) % per_statement
+
+    if full_rows:
+        statement = insert_statement(table, per_statement, table_name)
+        per_call = max(per_statement, BulkInsertConfig.ROWS_PER_EXECUTEMANY.value // per_statement * per_statement)
+        for start in range(0, full_rows, per_call):
+            chunk = iter(tuples[start:min(start + per_call, full_rows)])
+            parameters = []
+            while True:
+                group = tuple(chain.from_iterable(islice(chunk, per_statement)))
+                if not group:
+                    break
+                parameters.append(group)
+            connection.exec_driver_sql(statement, parameters)
+
+    start = full_rows
+    while start < len(tuples):
+        size = 1 << ((len(tuples) - start).bit_length() - 1)
+        connection.exec_driver_sql(insert_statement(table, size, table_name),
+                                   tuple(chain.from_iterable(tuples[start:start + size])))
+        start += size
+
+    return len(tuples)
@@ -1,12 +1,12 @@
 from typing import Union
 from pathlib import Path
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from league_pipeline.db.engine_registry import get_engine
 from typing import Type
 from sqlalchemy.orm import DeclarativeBase
 from logging import Logger
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.dialects.sqlite import insert
+from league_pipeline.db.bulk_insert import bulk_insert
 
 
 class DataSaver:
@@ -19,7 +19,7 @@ class DataSaver:
     Attributes:
         db_location (Union[str, Path]): Path to the database directory.
         database_name (str): Name of the database file.
-        engine: SQLAlchemy engine instance for database connections.
+        engine: Shared SQLAlchemy engine for the database (see engine_registry).
         Session: SQLAlchemy sessionmaker bound to the engine.
         sql_table_object (Type[DeclarativeBase]): SQLAlchemy model class for the target table.
         logger (Logger): Logger instance for recording operations and errors.
@@ -49,7 +49,7 @@ class DataSaver:
         """
         self.db_location = db_location
         self.database_name = database_name
-        self.engine = create_engine(sql_engine_url, echo=False)
+        self.engine = get_engine(sql_engine_url)
         self.Session = sessionmaker(bind=self.engine)
         self.sql_table_object = sql_table_object
         self.logger = logger
@@ -62,33 +62,38 @@ class DataSaver:
         Save data to the database with conflict resolution.
         
         This method handles both single records (dict) and batch inserts (list).
-        For SQLite, it uses INSERT OR IGNORE for conflict resolution on batch inserts
-        and handles IntegrityError exceptions for single record inserts.
+        Batch inserts go through bulk_insert(), which packs rows into cached
+        multi-row INSERT ... ON CONFLICT DO NOTHING statements chunked to stay
+        within SQLite's variable limit, all in one transaction. Single record
+        inserts handle IntegrityError exceptions.
         
         Args:
             data (Union[list, dict]): Data to be saved. Can be a single dictionary
                                     representing one record, or a list of dictionaries
-                                    for batch insertion.
+                                    (or column-ordered tuples) for batch insertion.
         
         Raises:
             Exception: Re-raises any unexpected exceptions after logging and rollback.
             
         Note:
-            - For list input: Uses SQLite's INSERT OR IGNORE for duplicate handling
+            - For list input: Uses ON CONFLICT DO NOTHING for duplicate handling
             - For dict input: Catches IntegrityError and logs warnings for duplicates
             - All database sessions are properly managed with commit/rollback
         """
+        if isinstance(data, list):
+            # Batch insert with conflict resolution, one transaction for all chunks
+            try:
+                with self.engine.begin() as connection:
+                    bulk_insert(connection, self.sql_table_object, data)
+            except Exception as e:
+                self.logger.error(f"Unexpected error has occurred: {str(e)}")
+                raise
+            return
+
         session = self.Session()
 
         try:
-            if isinstance(data, list):
-                # Batch insert with conflict resolution
-                stmt = insert(self.sql_table_object).values(data)
-                stmt = stmt.on_conflict_do_nothing()
-                session.execute(stmt)
-                session.commit()
-                
-            elif isinstance(data, dict):
+            if isinstance(data, dict):
                 # Single record insert with integrity error handling
                 try:
                     record = self.sql_table_object(**data)
@@ -1,8 +1,13 @@
-import sqlalchemy
 from sqlalchemy.orm import sessionmaker
-from league_pipeline.constants.database_constants import DatabaseConfiguration
-from league_pipeline.db.models import Summoners, MatchIDs, MatchDataParticipants
-from sqlalchemy import select, and_
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseQueryConfig
+from league_pipeline.db.models import Summoners, MatchIDs, MatchDataParticipants, MatchTimelineTracks
+from league_pipeline.db.aggregates import champion_stats
+from league_pipeline.db.timeline_tracks import decode_track
+from sqlalchemy import select, and_, func, Select, Row
+from league_pipeline.db.engine_registry import get_engine
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+from sqlalchemy.engine import Engine
 
 
 class DatabaseQuery:
@@ -12,24 +17,35 @@ class DatabaseQuery:
     This class provides methods for connecting to the SQLite database and
     executing common queries used throughout the League of Legends data pipeline.
     
+    Every get_* query has an iter_* counterpart that streams the same rows in
+    chunks of DatabaseQueryConfig.STREAM_CHUNK_SIZE instead of building a list,
+    so memory stays flat and the first row is available right away. Each
+    chunk is a keyset page (key > last key ORDER BY key LIMIT chunk) read in
+    its own short transaction, so a stream consumed over a whole stage does
+    not hold a WAL snapshot open and checkpoints keep up with the writer.
+    Rows committed while a stream runs are returned if their key is past
+    the page already read.
+    
     Attributes:
         url (str): SQLAlchemy database connection URL.
-        engine: SQLAlchemy engine instance.
+        engine: Shared SQLAlchemy engine for the database (see engine_registry).
         Session: SQLAlchemy sessionmaker for creating database sessions.
     """
     
-    def __init__(self, database_location: str, database_name: str):
+    def __init__(self, database_location: str, database_name: str, engine: Optional[Engine] = None):
         """
         Initialize database connection.
         
         Args:
             database_location (str): File system path to the database directory.
             database_name (str): Name of the database file (without extension).
+            engine (Optional[Engine]): Engine to query instead of the shared engine
+                                       of the database file (e.g. a shard reader).
         """
         self.url = DatabaseConfiguration.url.value.format(location=database_location,
                                                name=database_name)
         
-        self.engine = sqlalchemy.create_engine(self.url)
+        self.engine = engine if engine is not None else get_engine(self.url)
         self.Session = sessionmaker(bind=self.engine)
 
     def get_puuids_by_continent_from_summoner_table(self, continent: str):
@@ -46,57 +62,98 @@ class DatabaseQuery:
         # Returns puuid and local region
         
         with self.Session() as session:
-            stmt = select(Summoners.puuid,Summoners.local_region).where(Summoners.continental_region==continent)
+            stmt = self._puuids_by_continent_statement(continent)
             puuids_by_continent = session.execute(statement=stmt).all()
         
         return puuids_by_continent
+
+    def iter_puuids_by_continent_from_summoner_table(self, continent: str,
+                                                     chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                     ) -> Iterator[Row]:
+        """
+        Stream player UUIDs and their local regions by continental region.
+        
+        Args:
+            continent (str): Continental region identifier.
+            chunk_size (int): Rows fetched from SQLite per chunk.
+        
+        Yields:
+            Row: (puuid, local_region) for each summoner in the continent.
+        """
+        yield from self._stream(self._puuids_by_continent_statement(continent), Summoners.puuid, chunk_size)
     
     def get_match_ids_by_continent_from_match_id_table(self,continent:str):
         """
         Retrieve match IDs and continental regions from the Match IDs table.
         
-        This method joins the MatchIDs and Summoners tables to get match IDs
-        associated with players from a specific continental region.
+        The continent is the one stored on each match ID (derived from its
+        platform prefix), so no join with Summoners is needed.
         
         Args:
             continent (str): Continental region identifier to filter by.
         
         Returns:
             list: List of tuples containing (match_id, continental_region)
-                 for matches involving players from the specified continent.
+                 for matches played on the specified continent.
         """
         
         with self.Session() as session:
-            stmt = select(MatchIDs.match_id, Summoners.continental_region)\
-                    .join(Summoners, MatchIDs.puuid == Summoners.puuid)\
-                        .where(Summoners.continental_region==continent)
+            stmt = self._match_ids_by_continent_statement(continent)
             match_ids_by_continent = session.execute(stmt).all()
         return match_ids_by_continent
+
+    def iter_match_ids_by_continent_from_match_id_table(self, continent: str,
+                                                        chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                        ) -> Iterator[Row]:
+        """
+        Stream match IDs and continental regions from the Match IDs table.
+        
+        Args:
+            continent (str): Continental region identifier to filter by.
+            chunk_size (int): Rows fetched from SQLite per chunk.
+        
+        Yields:
+            Row: (match_id, continental_region) for each match of the continent.
+        """
+        yield from self._stream(self._match_ids_by_continent_statement(continent), MatchIDs.match_id, chunk_size)
     
     def get_match_ids_by_continent_from_match_data_table(self,continent:str):
         """
-        Retrieve unique match IDs from the Match Data Participants table by continent.
+        Retrieve match IDs of a continent that already have match data.
         
-        This method joins the MatchDataParticipants and Summoners tables to get
-        distinct match IDs for matches involving players from a specific continental region.
+        Filters the Match IDs table by its stored continent and keeps the matches
+        that have rows in the Match Data Participants table, so each match is
+        returned once without a DISTINCT.
         
         Args:
             continent (str): Continental region identifier to filter by.
         
         Returns:
             list: List of tuples containing (match_id, continental_region)
-                 for unique matches involving players from the specified continent.
+                 for matches of the specified continent that have match data.
         """
         
         with self.Session() as session:
-            stmt = select(MatchDataParticipants.match_id, Summoners.continental_region)\
-                    .join(Summoners, MatchDataParticipants.puuid == Summoners.puuid)\
-                        .where(Summoners.continental_region==continent)\
-                            .distinct()
-
+            stmt = self._match_data_match_ids_by_continent_statement(continent)
             match_ids_by_continent = session.execute(stmt).all()
         return match_ids_by_continent
 
+    def iter_match_ids_by_continent_from_match_data_table(self, continent: str,
+                                                          chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                          ) -> Iterator[Row]:
+        """
+        Stream match IDs of a continent that already have match data.
+        
+        Args:
+            continent (str): Continental region identifier to filter by.
+            chunk_size (int): Rows fetched from SQLite per chunk.
+        
+        Yields:
+            Row: (match_id, continental_region) for each match of the continent with match data.
+        """
+        yield from self._stream(self._match_data_match_ids_by_continent_statement(continent), MatchIDs.match_id,
+                                chunk_size)
+
     def get_team_id_and_position(self, match_id: str, puuid: str):
         """
         Retrieve team ID and team position for a specific player in a specific match.
@@ -116,3 +173,131 @@ class DatabaseQuery:
             team_id_team_position = session.execute(statement=stmt).all()
 
         return team_id_team_position
+
+    def get_team_ids_and_positions(self, match_id: str) -> Dict[str, tuple]:
+        """
+        Retrieve team ID and team position of every player of a match with one query.
+        
+        Args:
+            match_id (str): Unique identifier for the match.
+        
+        Returns:
+            dict: puuid mapped to its (team_id, team_position) tuple.
+        """
+        with self.Session() as session:
+            stmt = select(MatchDataParticipants.puuid, MatchDataParticipants.team_id,
+                          MatchDataParticipants.team_position)\
+                    .where(MatchDataParticipants.match_id==match_id)
+
+            rows = session.execute(statement=stmt).all()
+
+        return {puuid: (team_id, team_position) for puuid, team_id, team_position in rows}
+
+    def get_match_tracks(self, match_id: str) -> Dict[str, np.ndarray]:
+        """
+        Retrieve the packed position tracks of every participant of a match.
+        
+        Args:
+            match_id (str): Unique identifier for the match.
+        
+        Returns:
+            dict: puuid mapped to an int32 array of shape (frames, 3) holding
+                  (timestamp, x, y) per frame (see db/timeline_tracks.py).
+        """
+        with self.Session() as session:
+            stmt = select(MatchTimelineTracks.puuid, MatchTimelineTracks.track)\
+                    .where(MatchTimelineTracks.match_id==match_id)
+            
+            tracks = session.execute(statement=stmt).all()
+
+        return {puuid: decode_track(track) for puuid, track in tracks}
+
+    def get_champion_stats(self, game_tier: str, team_position: str,
+                           champion_name: Optional[str] = None) -> List[dict]:
+        """
+        Retrieve win rate, pick rate and per-game averages of champions in a tier and position.
+        
+        Reads the trigger-maintained Champion Aggregates table (see
+        db/aggregates.py), so the cost does not grow with the number of
+        stored participants.
+        
+        Args:
+            game_tier (str): Tier of the matches (e.g. "DIAMOND").
+            team_position (str): Assigned position (e.g. "JUNGLE").
+            champion_name (Optional[str]): Restrict to one champion (default: every champion).
+        
+        Returns:
+            list: One dict per champion with games, win_rate, pick_rate, average
+                  kills/deaths/assists and the mean and standard deviation of
+                  KDA, gold per minute and damage per minute.
+        """
+        with self.engine.connect() as connection:
+            return champion_stats(connection, game_tier, team_position, champion_name)
+
+    def get_planning_statistics(self) -> dict:
+        """
+        Count what earlier runs collected, for the dry-run planner (see pipeline/planner.py).
+        
+        Returns:
+            dict: summoners (local region mapped to its summoners), match_ids and
+                  match_ids_with_data (continent mapped to its match IDs, and to
+                  those with match data), puuids_with_match_ids (summoners that
+                  contributed a match ID), matches_with_data (matches with
+                  participant rows) and known_participants (participant rows of
+                  collected summoners).
+        """
+        has_match_data = select(MatchDataParticipants.match_id)\
+                            .where(MatchDataParticipants.match_id==MatchIDs.match_id).exists()
+        with self.Session() as session:
+            summoners = session.execute(select(Summoners.local_region, func.count())
+                                        .group_by(Summoners.local_region)).all()
+            match_ids = session.execute(select(MatchIDs.continental_region, func.count())
+                                        .group_by(MatchIDs.continental_region)).all()
+            match_ids_with_data = session.execute(select(MatchIDs.continental_region, func.count())
+                                                  .where(has_match_data)
+                                                  .group_by(MatchIDs.continental_region)).all()
+            puuids_with_match_ids = session.execute(select(func.count(MatchIDs.puuid.distinct()))).scalar()
+            matches_with_data = session.execute(select(func.count(MatchDataParticipants.match_id.distinct()))).scalar()
+            known_participants = session.execute(select(func.count())
+                                                 .select_from(MatchDataParticipants)
+                                                 .join(Summoners, Summoners.puuid==MatchDataParticipants.puuid)
+                                                 ).scalar()
+
+        return {"summoners": dict(summoners), "match_ids": dict(match_ids),
+                "match_ids_with_data": dict(match_ids_with_data),
+                "puuids_with_match_ids": puuids_with_match_ids or 0,
+                "matches_with_data": matches_with_data or 0,
+                "known_participants": known_participants or 0}
+
+    def _stream(self, stmt: Select, key, chunk_size: int) -> Iterator[Row]:
+        """
+        Yield the rows of a statement in keyset pages, one short read transaction per page.
+
+        The key is a unique column selected first by the statement; the
+        transaction is closed before the page's rows are handed out.
+        """
+        last = None
+        while True:
+            page = stmt if last is None else stmt.where(key > last)
+            with self.engine.connect() as connection:
+                rows = connection.execute(page.order_by(key).limit(chunk_size)).all()
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last = rows[-1][0]
+
+    @staticmethod
+    def _puuids_by_continent_statement(continent: str) -> Select:
+        return select(Summoners.puuid,Summoners.local_region).where(Summoners.continental_region==continent)
+
+    @staticmethod
+    def _match_ids_by_continent_statement(continent: str) -> Select:
+        return select(MatchIDs.match_id, MatchIDs.continental_region)\
+                .where(MatchIDs.continental_region==continent)
+
+    @staticmethod
+    def _match_data_match_ids_by_continent_statement(continent: str) -> Select:
+        has_match_data = select(MatchDataParticipants.match_id)\
+                            .where(MatchDataParticipants.match_id==MatchIDs.match_id).exists()
+        return select(MatchIDs.match_id, MatchIDs.continental_region)\
+                .where(MatchIDs.continental_region==continent, has_match_data)
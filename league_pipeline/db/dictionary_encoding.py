@@ -0,0 +1,351 @@
+import threading
+import weakref
+from logging import Logger
+from typing import Dict, Iterable, List, MutableMapping, Optional, Sequence
+
+from sqlalchemy import Column, Index, Integer, MetaData, Table, event
+from sqlalchemy.engine import Connection, Engine
+
+from league_pipeline.constants.pipeline_constants import DictionaryEncodingConfig
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import Base, DimensionValues, MatchDataParticipants
+
+
+_DIMENSIONS = DimensionValues.__tablename__
+
+
+def encoded_table_name(table_name: str) -> str:
+    """
+    Return the name of the integer-coded table behind a dictionary-encoded view.
+    """
+    return f"{table_name}{DictionaryEncodingConfig.ENCODED_SUFFIX}"
+
+
+def encoded_columns(connection: Connection, table_name: str) -> Dict[str, str]:
+    """
+    Return the encoded columns of a table (column -> dimension), empty if the table is stored plain.
+    """
+    columns = DictionaryEncodingConfig.COLUMNS.get(table_name, {})
+    if not columns:
+        return {}
+    exists = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                        (encoded_table_name(table_name),)).first()
+    return columns if exists else {}
+
+
+def decode_sql(expression: str) -> str:
+    """
+    SQL expression decoding an encoded column expression (e.g. 'NEW."teamPosition"') to its string.
+    """
+    return f'(SELECT "value" FROM "{_DIMENSIONS}" WHERE "code" = {expression})'
+
+
+class DictionaryEncoder:
+    """
+    Write-path encoder of the dictionary-encoded tables of one database.
+
+    Keeps every dimension's value -> code mapping in memory, so encoding a
+    batch is a dict lookup per value. Values seen for the first time are
+    interned into Dimension Values on the inserting connection, in the
+    inserting transaction. Their codes are kept apart per connection and
+    only join the shared mapping when that transaction commits; a rollback
+    forgets them, so no connection ever writes a code another connection
+    interned without committing it. SQLAlchemy reports a commit before
+    running it, so a rollback also drops the codes shared by the
+    connection's previous commit, in case that commit failed; dropped codes
+    are simply read back from Dimension Values.
+
+    Attributes:
+        tables (Dict[str, Dict[str, str]]): Encoded columns per encoded table name.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self.tables = {name: columns for name in DictionaryEncodingConfig.COLUMNS
+                       if (columns := encoded_columns(connection, name))}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        # Codes interned by open transactions, per connection and dimension.
+        self._pending: MutableMapping[Connection, Dict[str, Dict[str, int]]] = weakref.WeakKeyDictionary()
+        # Codes shared by each connection's last commit.
+        self._committed: MutableMapping[Connection, Dict[str, Dict[str, int]]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def is_encoded(self, table_name: str) -> bool:
+        return table_name in self.tables
+
+    def invalidate(self) -> None:
+        """
+        Forget every cached code; they are read back from Dimension Values on demand.
+        """
+        with self._lock:
+            self._codes.clear()
+            self._pending.clear()
+            self._committed.clear()
+
+    def committed(self, connection: Connection) -> None:
+        """
+        Share the codes interned by the connection's committed transaction.
+        """
+        with self._lock:
+            pending = self._pending.pop(connection, {})
+            for dimension, codes in pending.items():
+                self._codes.setdefault(dimension, {}).update(codes)
+            self._committed[connection] = pending
+
+    def rolled_back(self, connection: Connection) -> None:
+        """
+        Forget the codes interned by the connection's rolled back transaction.
+        """
+        with self._lock:
+            self._pending.pop(connection, None)
+            for dimension, codes in self._committed.pop(connection, {}).items():
+                shared = self._codes.get(dimension, {})
+                for value in codes:
+                    shared.pop(value, None)
+
+    def encode(self, connection: Connection, table_name: str, column_names: Sequence[str],
+               rows: List[tuple]) -> List[tuple]:
+        """
+        Replace the strings of a table's encoded columns with their codes.
+
+        Args:
+            connection (Connection): Connection inside the inserting transaction.
+            table_name (str): Name of the (view) table the rows are for.
+            column_names (Sequence[str]): Column name of every tuple position.
+            rows (List[tuple]): Rows in column order.
+
+        Returns:
+            list: The rows with codes in the encoded columns (NULL stays NULL).
+        """
+        if not rows:
+            return rows
+        encoded = self.tables[table_name]
+        columns = list(zip(*rows))
+        with self._lock:
+            for index, name in enumerate(column_names):
+                if name in encoded:
+                    codes = self._codes_for(connection, encoded[name], columns[index])
+                    columns[index] = [codes.get(value) for value in columns[index]]
+        return list(zip(*columns))
+
+    def _codes_for(self, connection: Connection, dimension: str, values: Iterable) -> Dict[str, int]:
+        shared = self._codes.setdefault(dimension, {})
+        pending = self._pending.setdefault(connection, {}).setdefault(dimension, {})
+        missing = set(values).difference(shared).difference(pending)
+        missing.discard(None)
+        if missing:
+            missing = list(missing)
+            connection.exec_driver_sql(f'INSERT INTO "{_DIMENSIONS}" ("dimension", "value") VALUES (?, ?) '
+                                       f'ON CONFLICT DO NOTHING', [(dimension, value) for value in missing])
+            rows = connection.exec_driver_sql(
+                f'SELECT "value", "code" FROM "{_DIMENSIONS}" '
+                f'WHERE "dimension" = ? AND "value" IN ({", ".join("?" * len(missing))})',
+                (dimension, *missing)).all()
+            pending.update(rows)
+        return {**shared, **pending} if pending else shared
+
+
+_encoders: Dict[Engine, DictionaryEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def dictionary_encoder(connection: Connection) -> DictionaryEncoder:
+    """
+    Return the encoder of the connection's database, creating it on first use.
+    """
+    engine = connection.engine
+    encoder = _encoders.get(engine)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(engine)
+            if encoder is None:
+                encoder = DictionaryEncoder(connection)
+                event.listen(engine, "commit", encoder.committed)
+                event.listen(engine, "rollback", encoder.rolled_back)
+                _encoders[engine] = encoder
+    return encoder
+
+
+def reset_dictionary_encoder(engine: Engine) -> None:
+    """
+    Drop the cached encoder of an engine, e.g. after tables were converted.
+    """
+    with _encoders_lock:
+        encoder = _encoders.pop(engine, None)
+    if encoder is not None:
+        encoder.invalidate()
+
+
+def _encoded_table(table: Table, columns: Dict[str, str]) -> Table:
+    """
+    Copy of the table (without indexes) under its encoded name, with INTEGER encoded columns.
+    """
+    return Table(encoded_table_name(table.name), MetaData(),
+                 *[Column(column.name, Integer if column.name in columns else column.type,
+                          primary_key=column.primary_key, nullable=column.nullable)
+                   for column in table.columns])
+
+
+def _decoding_select(table: Table, columns: Dict[str, str], with_rowid: bool = False) -> str:
+    """
+    SELECT reading an encoded table with its codes joined back to their strings.
+
+    Every encoded column is decoded through a LEFT JOIN on the Dimension
+    Values primary key. A filter on the string turns its join into an inner
+    join that SQLite runs first, through the value index, so the filter
+    costs one code lookup and an integer comparison per row. Plain SELECTs
+    drop the joins of columns they do not read; aggregates still pay one
+    primary key search per encoded column and row.
+    """
+    aliases = {column: f"d{index}" for index, column in enumerate(columns)}
+    selected = ", ".join(f'{aliases[column.name]}."value" AS "{column.name}"' if column.name in columns
+                         else f'e."{column.name}"' for column in table.columns)
+    joins = "".join(f' LEFT JOIN "{_DIMENSIONS}" {alias} ON {alias}."code" = e."{column}"'
+                    for column, alias in aliases.items())
+    rowid = "e.rowid AS rowid, " if with_rowid else ""
+    return f'SELECT {rowid}{selected} FROM "{encoded_table_name(table.name)}" e{joins}'
+
+
+def rowid_source(connection: Connection, table_name: str) -> str:
+    """
+    FROM clause item reading a table together with its rowid, decoded if the table is encoded.
+
+    The decoding views have exactly the columns of their table, so readers
+    that page by rowid (heatmaps, mirror, export) read an encoded table
+    through this subquery instead, which SQLite flattens into a rowid range
+    search of the encoded table.
+    """
+    columns = encoded_columns(connection, table_name)
+    if not columns:
+        return f'"{table_name}"'
+    return f"({_decoding_select(Base.metadata.tables[table_name], columns, with_rowid=True)})"
+
+
+def _create_view_and_triggers(connection: Connection, table: Table, columns: Dict[str, str]) -> None:
+    """
+    Create the decoding view under the table's name and its INSTEAD OF triggers.
+    """
+    name, encoded = table.name, encoded_table_name(table.name)
+    connection.exec_driver_sql(f'CREATE VIEW "{name}" AS {_decoding_select(table, columns)}')
+
+    interns = " ".join(f'INSERT INTO "{_DIMENSIONS}" ("dimension", "value") '
+                       f'SELECT \'{dimension}\', NEW."{column}" WHERE NEW."{column}" IS NOT NULL '
+                       f'ON CONFLICT DO NOTHING;' for column, dimension in columns.items())
+    values = ", ".join(f'(SELECT "code" FROM "{_DIMENSIONS}" '
+                       f'WHERE "dimension" = \'{columns[column.name]}\' AND "value" = NEW."{column.name}")'
+                       if column.name in columns else f'NEW."{column.name}"' for column in table.columns)
+    column_list = ", ".join(f'"{column.name}"' for column in table.columns)
+    # Primary key columns are never encoded, so OLD's key is the stored one.
+    key = " AND ".join(f'"{column.name}" = OLD."{column.name}"' for column in table.primary_key.columns)
+    connection.exec_driver_sql(f'CREATE TRIGGER "{encoded} insert" INSTEAD OF INSERT ON "{name}" BEGIN '
+                               f'{interns} INSERT INTO "{encoded}" ({column_list}) VALUES ({values}); END')
+    connection.exec_driver_sql(f'CREATE TRIGGER "{encoded} delete" INSTEAD OF DELETE ON "{name}" BEGIN '
+                               f'DELETE FROM "{encoded}" WHERE {key}; END')
+
+
+def add_plain_column(connection: Connection, table: Table, column_name: str) -> None:
+    """
+    Add a model column that is not encoded to an encoded table and rebuild its view.
+
+    The view and its triggers list the table's columns, so they are dropped
+    (the triggers with the view) and created again with the new column.
+    Runs in the caller's transaction.
+
+    Args:
+        connection (Connection): Open connection to the database.
+        table (Table): Encoded table's model table, already holding the column.
+        column_name (str): Name of the new column.
+    """
+    column_type = table.columns[column_name].type.compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f'DROP VIEW "{table.name}"')
+    connection.exec_driver_sql(f'ALTER TABLE "{encoded_table_name(table.name)}" '
+                               f'ADD COLUMN "{column_name}" {column_type}')
+    _create_view_and_triggers(connection, table, DictionaryEncodingConfig.COLUMNS[table.name])
+
+
+def encode_table(connection: Connection, table: Table) -> bool:
+    """
+    Convert one plain table into its encoded table plus a decoding view.
+
+    The strings are interned first, then the rows are copied with their rowid
+    (so rowid watermarks of heatmaps, mirrors and exports stay valid), the
+    plain table is dropped and the view takes its name. The view accepts
+    INSERT and DELETE through INSTEAD OF triggers, for writers other than
+    bulk_insert(); UPDATE and ALTER TABLE are not supported on encoded tables.
+    Runs in the caller's transaction.
+
+    Args:
+        connection (Connection): Open connection to the database.
+        table (Table): Table listed in DictionaryEncodingConfig.COLUMNS.
+
+    Returns:
+        bool: False if the table is missing or already encoded.
+    """
+    columns = DictionaryEncodingConfig.COLUMNS[table.name]
+    is_table = connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                          (table.name,)).first()
+    if not is_table or encoded_columns(connection, table.name):
+        return False
+
+    DimensionValues.__table__.create(connection, checkfirst=True)
+    for column, dimension in columns.items():
+        connection.exec_driver_sql(f'INSERT INTO "{_DIMENSIONS}" ("dimension", "value") '
+                                   f'SELECT DISTINCT \'{dimension}\', "{column}" FROM "{table.name}" '
+                                   f'WHERE "{column}" IS NOT NULL ON CONFLICT DO NOTHING')
+
+    had_aggregates = table.name == MatchDataParticipants.__tablename__ and connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table.name,)).first()
+
+    encoded = _encoded_table(table, columns)
+    encoded.create(connection)
+    aliases = {column: f"d{index}" for index, column in enumerate(columns)}
+    selected = ", ".join(f'{aliases[column.name]}."code"' if column.name in columns else f't."{column.name}"'
+                         for column in table.columns)
+    joins = " ".join(f'LEFT JOIN "{_DIMENSIONS}" {alias} '
+                     f'ON {alias}."dimension" = \'{columns[column]}\' AND {alias}."value" = t."{column}"'
+                     for column, alias in aliases.items())
+    column_list = ", ".join(f'"{column.name}"' for column in table.columns)
+    connection.exec_driver_sql(f'INSERT INTO "{encoded.name}" (rowid, {column_list}) '
+                               f'SELECT t.rowid, {selected} FROM "{table.name}" t {joins}')
+
+    # The indexes keep their names, which are free once the plain table is gone.
+    connection.exec_driver_sql(f'DROP TABLE "{table.name}"')
+    for index in table.indexes:
+        Index(index.name, *[encoded.c[column.name] for column in index.columns],
+              unique=index.unique).create(connection)
+    _create_view_and_triggers(connection, table, columns)
+
+    if had_aggregates:
+        from league_pipeline.db.aggregates import create_aggregate_triggers
+        create_aggregate_triggers(connection)
+    return True
+
+
+def encode_database(url: str, logger: Optional[Logger] = None) -> List[str]:
+    """
+    Dictionary-encode every table of DictionaryEncodingConfig.COLUMNS that is still stored plain.
+
+    Each table is converted in its own transaction. Run VACUUM afterwards to
+    give the freed pages back to the file system.
+
+    Args:
+        url (str): SQLAlchemy URL of the database.
+        logger (Optional[Logger]): Logger for progress messages.
+
+    Returns:
+        list: Names of the tables converted.
+    """
+    engine = get_engine(url)
+    tables = {table.name: table for table in Base.metadata.sorted_tables}
+    converted = []
+    for name in DictionaryEncodingConfig.COLUMNS:
+        with engine.begin() as connection:
+            if encode_table(connection, tables[name]):
+                converted.append(name)
+                if logger:
+                    logger.info(f"Dictionary-encoded {name}")
+    if converted:
+        # Statistics let the planner start a filtered view query from the value index.
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'ANALYZE "{_DIMENSIONS}"')
+    reset_dictionary_encoder(engine)
+    return converted
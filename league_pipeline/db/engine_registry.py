@@ -0,0 +1,101 @@
+import threading
+from typing import Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from league_pipeline.constants.database_constants import SQLitePragmas
+
+
+_engines: Dict[str, Engine] = {}
+# Pragma profile every registered engine was created with.
+_profiles: Dict[str, Dict[str, Union[str, int]]] = {}
+_lock = threading.Lock()
+
+
+def default_pragma_profile() -> Dict[str, Union[str, int]]:
+    """
+    Return the pragma profile defined by SQLitePragmas.
+
+    Returns:
+        dict: Mapping of pragma name (lower case) to its value.
+    """
+    return {pragma.name.lower(): pragma.value for pragma in SQLitePragmas}
+
+
+def get_engine(url: str, pragmas: Optional[Dict[str, Union[str, int]]] = None) -> Engine:
+    """
+    Return the process-wide engine for a database URL, creating it on first use.
+
+    Every component that talks to the same database file shares one engine and
+    therefore one connection pool. For SQLite engines, the pragma profile is
+    applied to each new DBAPI connection when it is opened. Since the engine
+    is shared, every caller must ask for the profile it was created with;
+    work that needs other settings (e.g. a bulk load without journaling)
+    uses create_private_engine() instead.
+
+    Args:
+        url (str): SQLAlchemy database URL.
+        pragmas (Optional[dict]): Pragma profile of the engine. Defaults to
+                                  default_pragma_profile().
+
+    Returns:
+        Engine: Shared SQLAlchemy engine for the URL.
+
+    Raises:
+        ValueError: If the engine for this URL exists with another pragma profile.
+    """
+    profile = default_pragma_profile() if pragmas is None else dict(pragmas)
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_private_engine(url, profile)
+            _engines[url] = engine
+            _profiles[url] = profile
+        elif _profiles[url] != profile:
+            raise ValueError(f"The engine for {url} already exists with the pragmas {_profiles[url]}, "
+                             f"not {profile}")
+        return engine
+
+
+def create_private_engine(url: str, pragmas: Optional[Dict[str, Union[str, int]]] = None) -> Engine:
+    """
+    Create an engine with its own connection pool that is not shared through get_engine().
+
+    Args:
+        url (str): SQLAlchemy database URL.
+        pragmas (Optional[dict]): Pragma profile applied to SQLite connections.
+                                  Defaults to default_pragma_profile().
+
+    Returns:
+        Engine: New SQLAlchemy engine; the caller disposes it.
+    """
+    engine = create_engine(url, echo=False)
+    if engine.dialect.name == "sqlite":
+        _apply_pragmas_on_connect(engine, default_pragma_profile() if pragmas is None else pragmas)
+    return engine
+
+
+def dispose_engines() -> None:
+    """
+    Close all pooled connections and forget every registered engine.
+    """
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _profiles.clear()
+
+
+def _apply_pragmas_on_connect(engine: Engine, pragmas: Dict[str, Union[str, int]]) -> None:
+    """
+    Register a connect listener that runs the pragma profile on new connections.
+    """
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,309 @@
+import asyncio
+import queue
+import threading
+import time
+from logging import Logger
+from typing import Callable, Dict, List, Optional, Type, Union
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import DeclarativeBase
+
+
+from league_pipeline.constants.pipeline_constants import DatabaseWriterConfig
+from league_pipeline.db.bulk_insert import as_tuples, bulk_insert
+from league_pipeline.db.engine_registry import get_engine
+
+
+class _FlushRequest:
+    """Queue marker asking the writer thread to commit everything queued before it."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Background database writer that groups many inserts into few transactions.
+
+    Rows for any table are handed over through a bounded queue and written by a
+    dedicated thread, so the event loop never waits on SQLite. The thread
+    commits once the pending rows reach COMMIT_ROW_COUNT or the oldest pending
+    row is COMMIT_INTERVAL_SECONDS old, whichever happens first. When the queue
+    is full, producers wait (backpressure) instead of growing memory.
+
+    Inserts go through bulk_insert() (INSERT ... ON CONFLICT DO NOTHING),
+    matching DataSaver's batch behaviour, so duplicates are skipped silently.
+
+    A group whose commit fails with an operational error (e.g. a locked
+    database) is retried COMMIT_RETRIES times with a doubling delay. Any
+    other failure comes from the rows themselves, so the group is split:
+    every table is committed on its own and a failing table is halved
+    until the rows that cannot be stored are isolated. Only those rows are
+    dropped. The first error that lost rows is raised to the producers by
+    their next submit(), enqueue(), flush() or close().
+
+    Attributes:
+        engine: Shared SQLAlchemy engine for the database (see engine_registry).
+        logger (Logger): Logger instance for recording commits and errors.
+        commit_row_count (int): Pending row count that triggers a commit.
+        commit_interval_seconds (float): Maximum age of pending rows before a commit.
+        rows_written (int): Total rows committed (including skipped duplicates).
+        rows_dropped (int): Rows given up after retries and splitting.
+        commits (int): Number of committed transactions.
+
+    Raises:
+        ValueError: If the database engine is not SQLite.
+    """
+
+    def __init__(self, sql_engine_url: str, logger: Logger,
+                 max_queued_batches: int = DatabaseWriterConfig.MAX_QUEUED_BATCHES,
+                 commit_row_count: int = DatabaseWriterConfig.COMMIT_ROW_COUNT,
+                 commit_interval_seconds: float = DatabaseWriterConfig.COMMIT_INTERVAL_SECONDS,
+                 commit_retries: int = DatabaseWriterConfig.COMMIT_RETRIES,
+                 commit_retry_delay_seconds: float = DatabaseWriterConfig.COMMIT_RETRY_DELAY_SECONDS) -> None:
+        """
+        Initialize the writer (the thread is started by start()).
+
+        Args:
+            sql_engine_url (str): SQLAlchemy URL string for database connection.
+            logger (Logger): Logger instance for operation tracking.
+            max_queued_batches (int): Capacity of the queue in submitted batches.
+            commit_row_count (int): Pending row count that triggers a commit.
+            commit_interval_seconds (float): Maximum age of pending rows before a commit.
+            commit_retries (int): Retries of a group after an operational error.
+            commit_retry_delay_seconds (float): Wait before the first retry, doubled for each further one.
+        """
+        self.engine = get_engine(sql_engine_url)
+        if self.engine.dialect.name != "sqlite":
+            raise ValueError("Currently only sqlite is available as the engine")
+
+        self.logger = logger
+        self.commit_row_count = commit_row_count
+        self.commit_interval_seconds = commit_interval_seconds
+        self.commit_retries = commit_retries
+        self.commit_retry_delay_seconds = commit_retry_delay_seconds
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.commits = 0
+
+        self._commit_listeners: List[Callable[[List[Type[DeclarativeBase]]], None]] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued_batches)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> "GroupCommitWriter":
+        """
+        Start the writer thread.
+
+        Returns:
+            GroupCommitWriter: The writer itself, for chaining.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def add_commit_listener(self, listener: Callable[[List[Type[DeclarativeBase]]], None]) -> None:
+        """
+        Register a callback run on the writer thread after every successful commit.
+
+        The callback receives the tables written by the commit. Errors raised by
+        it are logged and do not affect the writer.
+
+        Args:
+            listener (Callable): Function taking the list of committed tables.
+        """
+        self._commit_listeners.append(listener)
+
+    def submit(self, table: Type[DeclarativeBase], data: Union[list, dict]) -> None:
+        """
+        Queue rows for insertion, blocking while the queue is full.
+
+        Args:
+            table (Type[DeclarativeBase]): SQLAlchemy model class of the target table.
+            data (Union[list, dict]): One record or a list of records.
+
+        Raises:
+            Exception: The first error that lost rows since it was last raised;
+                       the rows passed here are queued all the same.
+        """
+        rows = [data] if isinstance(data, dict) else data
+        if rows:
+            self._queue.put((table, rows))
+        self._raise_pending_error()
+
+    async def enqueue(self, table: Type[DeclarativeBase], data: Union[list, dict]) -> None:
+        """
+        Queue rows for insertion from a coroutine.
+
+        Returns immediately while the queue has room. When it is full, the
+        blocking put is moved to the default executor so the event loop keeps
+        running while this coroutine waits for the writer to catch up.
+
+        Args:
+            table (Type[DeclarativeBase]): SQLAlchemy model class of the target table.
+            data (Union[list, dict]): One record or a list of records.
+
+        Raises:
+            Exception: The first error that lost rows since it was last raised;
+                       the rows passed here are queued all the same.
+        """
+        rows = [data] if isinstance(data, dict) else data
+        if rows:
+            try:
+                self._queue.put_nowait((table, rows))
+            except queue.Full:
+                await asyncio.get_running_loop().run_in_executor(None, self._queue.put, (table, rows))
+        self._raise_pending_error()
+
+    def flush(self) -> None:
+        """
+        Block until every row queued so far is committed.
+
+        Raises:
+            Exception: The first error that lost rows since it was last raised.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            request = _FlushRequest()
+            self._queue.put(request)
+            request.done.wait()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """
+        Commit everything still queued and stop the writer thread.
+
+        Raises:
+            Exception: The first error that lost rows since it was last raised.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+        self.logger.info(f"Group commit writer closed | Rows: {self.rows_written} | Dropped: {self.rows_dropped} "
+                         f"| Commits: {self.commits}")
+        self._raise_pending_error()
+
+    def _raise_pending_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        """
+        Writer thread loop: collect rows, commit on size/age, honour flush and stop markers.
+        """
+        pending: Dict[Type[DeclarativeBase], List[Union[dict, tuple]]] = {}
+        pending_rows = 0
+        oldest: Optional[float] = None
+
+        while True:
+            timeout = None if oldest is None else max(0.0, oldest + self.commit_interval_seconds - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                table, rows = item
+                # Each batch is converted on its own: batches of dicts and of
+                # tuples for the same table may share a commit.
+                pending.setdefault(table, []).extend(as_tuples(table, rows))
+                pending_rows += len(rows)
+                if oldest is None:
+                    oldest = time.monotonic()
+
+            due = oldest is not None and time.monotonic() - oldest >= self.commit_interval_seconds
+            if pending_rows and (item is None or item is _STOP or isinstance(item, _FlushRequest)
+                                 or pending_rows >= self.commit_row_count or due):
+                self._commit(pending, pending_rows)
+                pending, pending_rows, oldest = {}, 0, None
+
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _commit(self, pending: Dict[Type[DeclarativeBase], List[Union[dict, tuple]]], pending_rows: int) -> None:
+        """
+        Write all pending rows in a single transaction, retrying or splitting the group if that fails.
+        """
+        committed = list(pending)
+        try:
+            self._write_retrying(pending, pending_rows)
+        except OperationalError as e:
+            self._drop(pending_rows, e)
+            return
+        except Exception as e:
+            self.logger.warning(f"Group commit of {pending_rows} rows failed: {str(e)} | "
+                                f"Isolating the failing rows")
+            committed = [table for table, rows in pending.items() if self._write_isolating(table, rows)]
+
+        self.logger.debug(f"Group commit | Rows: {pending_rows} | Tables: {len(pending)}")
+        for listener in self._commit_listeners:
+            try:
+                listener(committed)
+            except Exception as e:
+                self.logger.error(f"Commit listener failed: {str(e)}")
+
+    def _write(self, pending: Dict[Type[DeclarativeBase], List[Union[dict, tuple]]]) -> None:
+        with self.engine.begin() as connection:
+            for table, rows in pending.items():
+                bulk_insert(connection, table, rows)
+        self.rows_written += sum(len(rows) for rows in pending.values())
+        self.commits += 1
+
+    def _write_retrying(self, pending: Dict[Type[DeclarativeBase], List[Union[dict, tuple]]],
+                        pending_rows: int) -> None:
+        """
+        Write the rows in one transaction, retrying transient failures such as a busy database with backoff.
+
+        Raises:
+            OperationalError: If the write still fails after the configured retries.
+        """
+        for attempt in range(self.commit_retries + 1):
+            try:
+                self._write(pending)
+                return
+            except OperationalError as e:
+                if attempt == self.commit_retries:
+                    raise
+                delay = self.commit_retry_delay_seconds * 2 ** attempt
+                self.logger.warning(f"Group commit of {pending_rows} rows failed: {str(e)} | "
+                                    f"Retrying in {delay:.2f} Seconds")
+                time.sleep(delay)
+
+    def _write_isolating(self, table: Type[DeclarativeBase], rows: List[Union[dict, tuple]]) -> bool:
+        """
+        Commit the rows of one table, halving them until the failing rows are isolated and dropped.
+
+        Transient failures are retried like a whole group rather than halved; rows still failing after the retries
+        are dropped together.
+
+        Returns:
+            bool: True if any row was committed.
+        """
+        try:
+            self._write_retrying({table: rows}, len(rows))
+            return True
+        except OperationalError as e:
+            self._drop(len(rows), e, table)
+            return False
+        except Exception as e:
+            if len(rows) == 1:
+                self._drop(1, e, table)
+                return False
+        middle = len(rows) // 2
+        first = self._write_isolating(table, rows[:middle])
+        return self._write_isolating(table, rows[middle:]) or first
+
+    def _drop(self, rows: int, error: Exception, table: Optional[Type[DeclarativeBase]] = None) -> None:
+        where = f" of {table.__tablename__}" if table is not None else ""
+        self.logger.error(f"Dropping {rows} rows{where} that could not be committed: {str(error)}")
+        self.rows_dropped += rows
+        if self._error is None:
+            self._error = error
@@ -0,0 +1,351 @@
+from contextlib import contextmanager
+from logging import Logger
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+
+from league_pipeline.constants.database_constants import DatabaseIndexNames
+from league_pipeline.constants.pipeline_constants import StorageConfig
+from league_pipeline.constants.regions import RegionMapping
+from league_pipeline.db.aggregates import create_aggregate_triggers, rebuild_champion_aggregates
+from league_pipeline.db.dictionary_encoding import add_plain_column, encoded_columns, encoded_table_name
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import Base, ChampionAggregates, MatchDataParticipants, MatchIDs, MatchTimeline
+from league_pipeline.utils.match_routing import continent_from_match_id_sql, match_id_prefix_sql
+
+
+class Migration:
+    """
+    A single versioned schema change.
+
+    Attributes:
+        version (int): Schema version reached after this migration (PRAGMA user_version).
+        description (str): Short human readable summary, written to the log.
+        upgrade (Callable[[Connection], None]): Applies the change on an open connection.
+                                                Must be idempotent so a partially
+                                                migrated database can be re-run.
+    """
+
+    def __init__(self, version: int, description: str, upgrade: Callable[[Connection], None]) -> None:
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+def _declared_index(name: str):
+    """
+    Return the Index object declared in the models under the given name.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name == name:
+                return index
+    raise KeyError(name)
+
+
+def _has_table(connection: Connection, table_name: str) -> bool:
+    """
+    Whether the database holds the table (stage shards only hold their own tables).
+    """
+    return inspect(connection).has_table(table_name)
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    """
+    Build a migration step creating the named model indexes if they are missing.
+    """
+    def upgrade(connection: Connection) -> None:
+        for name in names:
+            index = _declared_index(name)
+            if _has_table(connection, index.table.name):
+                index.create(connection, checkfirst=True)
+    return upgrade
+
+
+def _add_missing_columns(connection: Connection, table: Type[Base], *column_names: str) -> None:
+    """
+    ALTER TABLE ... ADD COLUMN for model columns the existing table does not have yet.
+    """
+    name = table.__tablename__
+    existing = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{name}")')}
+    for column_name in column_names:
+        if column_name not in existing:
+            column = table.__table__.columns[column_name]
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f'ALTER TABLE "{name}" ADD COLUMN "{column_name}" {column_type}')
+
+
+def _match_id_routing_columns(connection: Connection) -> None:
+    """
+    Add platformId/continentalRegion to Match IDs and backfill them from the matchId prefix.
+    """
+    if not _has_table(connection, MatchIDs.__tablename__):
+        return
+    _add_missing_columns(connection, MatchIDs, "platformId", "continentalRegion")
+
+    prefix = match_id_prefix_sql()
+    platforms = ", ".join(repr(platform) for platform in RegionMapping.__members__)
+    connection.exec_driver_sql(
+        f'UPDATE "{MatchIDs.__tablename__}" '
+        f'SET "continentalRegion" = {continent_from_match_id_sql()}, '
+        f'"platformId" = CASE WHEN {prefix} IN ({platforms}) THEN {prefix} END '
+        f'WHERE "continentalRegion" IS NULL')
+
+    _create_indexes(DatabaseIndexNames.MATCH_IDS_CONTINENT.value)(connection)
+
+
+def _champion_aggregates(connection: Connection) -> None:
+    """
+    Create Champion Aggregates with its maintenance triggers and backfill it.
+
+    Skipped for stage shards, where participants and Match IDs live in
+    different files; their aggregates are built when the shards are merged.
+    """
+    if not (_has_table(connection, MatchDataParticipants.__tablename__)
+            and _has_table(connection, MatchIDs.__tablename__)):
+        return
+    ChampionAggregates.__table__.create(connection, checkfirst=True)
+    create_aggregate_triggers(connection)
+    rebuild_champion_aggregates(connection)
+
+
+def _timeline_victims(connection: Connection) -> None:
+    """
+    Add the victimPuuId column to Match Timeline, plain or dictionary encoded.
+
+    Kills stored before have no victim; they stay out of the CHAMPION_DEATH heatmaps.
+    """
+    name = MatchTimeline.__tablename__
+    if encoded_columns(connection, name):
+        encoded = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{encoded_table_name(name)}")')}
+        if "victimPuuId" not in encoded:
+            add_plain_column(connection, MatchTimeline.__table__, "victimPuuId")
+    elif _has_table(connection, name):
+        _add_missing_columns(connection, MatchTimeline, "victimPuuId")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Covering indexes for the DatabaseQuery lookups",
+              _create_indexes(DatabaseIndexNames.SUMMONERS_CONTINENT.value,
+                              DatabaseIndexNames.MATCH_IDS_PUUID.value,
+                              DatabaseIndexNames.PARTICIPANTS_MATCH.value)),
+    Migration(2, "Platform and continental region columns on Match IDs", _match_id_routing_columns),
+    Migration(3, "Trigger-maintained champion aggregates", _champion_aggregates),
+    Migration(4, "Victim column on Match Timeline", _timeline_victims),
+]
+
+
+# DatabaseQuery methods and sample arguments whose query plans are checked by verify_query_plans().
+QUERY_PLAN_CHECKS = {
+    "get_puuids_by_continent_from_summoner_table": ("EUROPE",),
+    "get_match_ids_by_continent_from_match_id_table": ("EUROPE",),
+    "get_match_ids_by_continent_from_match_data_table": ("EUROPE",),
+    "get_team_id_and_position": ("EUW1_0", "puuid"),
+    "get_team_ids_and_positions": ("EUW1_0",),
+    # Small chunks, so the keyset pages after the first are checked too.
+    "iter_puuids_by_continent_from_summoner_table": ("EUROPE", 10),
+    "iter_match_ids_by_continent_from_match_id_table": ("EUROPE", 10),
+    "iter_match_ids_by_continent_from_match_data_table": ("EUROPE", 10),
+}
+
+
+class SchemaMigrator:
+    """
+    Versioned schema migrations and index maintenance for the pipeline database.
+
+    The schema version is stored in SQLite's PRAGMA user_version, so databases
+    created before migrations existed start at version 0 and receive every
+    migration on the first upgrade(). Base.metadata.create_all() only creates
+    missing tables, which is why indexes added to existing tables go through
+    here.
+
+    Attributes:
+        url (str): SQLAlchemy database connection URL.
+        engine: Shared SQLAlchemy engine for the database (see engine_registry).
+        logger (Optional[Logger]): Logger for migration progress.
+    """
+
+    def __init__(self, url: str, logger: Optional[Logger] = None) -> None:
+        self.url = url
+        self.engine = get_engine(url)
+        self.logger = logger
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.info(message)
+
+    def current_version(self) -> int:
+        """
+        Return the schema version of the database.
+
+        Returns:
+            int: Value of PRAGMA user_version (0 for unmigrated databases).
+        """
+        with self.engine.connect() as connection:
+            return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+    @staticmethod
+    def latest_version() -> int:
+        """
+        Return the version the newest migration brings the schema to.
+        """
+        return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+    def upgrade(self, target: Optional[int] = None) -> int:
+        """
+        Apply every pending migration up to the target version, in order.
+
+        Each migration and its version bump run in one transaction.
+
+        Args:
+            target (Optional[int]): Version to stop at; defaults to the latest.
+
+        Returns:
+            int: The schema version after the upgrade.
+        """
+        target = self.latest_version() if target is None else target
+        version = self.current_version()
+
+        for migration in MIGRATIONS:
+            if version < migration.version <= target:
+                with self.engine.begin() as connection:
+                    migration.upgrade(connection)
+                    connection.exec_driver_sql(f"PRAGMA user_version = {migration.version}")
+                version = migration.version
+                self._log(f"Schema migrated to version {version}: {migration.description}")
+
+        return version
+
+    @contextmanager
+    def indexes_dropped(self, tables: Sequence[Type[Base]]) -> Iterator[None]:
+        """
+        Drop the secondary indexes of the given tables and rebuild them on exit.
+
+        Bulk loads into an indexed table pay for a B-tree update per row and
+        index; building the index once afterwards is a single sort. Rebuilding
+        also happens when the load fails, so the schema is never left without
+        its indexes.
+
+        Args:
+            tables (Sequence[Type[Base]]): Models whose declared indexes are dropped.
+        """
+        indexes = [index for table in tables for index in table.__table__.indexes]
+        with self.engine.begin() as connection:
+            for index in indexes:
+                index.drop(connection, checkfirst=True)
+        try:
+            yield
+        finally:
+            with self.engine.begin() as connection:
+                for index in indexes:
+                    if _has_table(connection, index.table.name):
+                        index.create(connection, checkfirst=True)
+                connection.exec_driver_sql("PRAGMA optimize")
+            self._log(f"Rebuilt {len(indexes)} indexes after bulk load")
+
+    def convert_to_without_rowid(self, table: Type[Base]) -> None:
+        """
+        Rebuild a table as WITHOUT ROWID, clustering rows by their primary key.
+
+        Pays off for tables with a composite or text primary key and small rows
+        (e.g. Heatmap Cells), where the rowid table stores the key twice and
+        each lookup needs two B-tree searches. Not part of the migration chain.
+        Follows SQLite's documented create-copy-drop-rename procedure.
+
+        Only derived tables (StorageConfig.DERIVED_TABLES) can be converted:
+        every other table is read by rowid watermarks (Parquet export, DuckDB
+        mirror, heatmap refresh), which stop working without a rowid. Tables
+        with triggers, which the drop would remove, and dictionary-encoded
+        tables, whose view and triggers read the encoded table, are refused
+        as well.
+
+        Args:
+            table (Type[Base]): Model of the table to convert.
+
+        Raises:
+            ValueError: If the table is read by rowid, has triggers or is dictionary encoded.
+        """
+        name = table.__tablename__
+        staging = f"{name}__without_rowid"
+        if name not in StorageConfig.DERIVED_TABLES:
+            raise ValueError(f"{name} is read by rowid watermarks and cannot be converted to WITHOUT ROWID")
+        with self.engine.begin() as connection:
+            if _has_table(connection, encoded_table_name(name)):
+                raise ValueError(f"{name} is dictionary encoded and cannot be converted to WITHOUT ROWID")
+            triggers = [row[0] for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (name,))]
+            if triggers:
+                raise ValueError(f"{name} has triggers ({', '.join(triggers)}) that converting to "
+                                 f"WITHOUT ROWID would drop")
+            ddl = str(CreateTable(table.__table__).compile(connection)).strip()
+            ddl = ddl.replace(f'CREATE TABLE "{name}"', f'CREATE TABLE "{staging}"', 1) + " WITHOUT ROWID"
+            columns = ", ".join(f'"{column.name}"' for column in table.__table__.columns)
+
+            connection.exec_driver_sql(f'DROP TABLE IF EXISTS "{staging}"')
+            connection.exec_driver_sql(ddl)
+            connection.exec_driver_sql(f'INSERT INTO "{staging}" ({columns}) SELECT {columns} FROM "{name}"')
+            connection.exec_driver_sql(f'DROP TABLE "{name}"')
+            # Triggers and views of other tables that use the table (e.g. the
+            # champion aggregate triggers) name it, not the staging table: the
+            # legacy rename leaves them as they are instead of failing on them.
+            connection.exec_driver_sql("PRAGMA legacy_alter_table = ON")
+            try:
+                connection.exec_driver_sql(f'ALTER TABLE "{staging}" RENAME TO "{name}"')
+            finally:
+                connection.exec_driver_sql("PRAGMA legacy_alter_table = OFF")
+            for index in table.__table__.indexes:
+                index.create(connection, checkfirst=True)
+        self._log(f"Converted {name} to WITHOUT ROWID")
+
+
+def verify_query_plans(database_query) -> Dict[str, List[str]]:
+    """
+    Capture the SQL issued by DatabaseQuery methods and return their query plans.
+
+    Each method in QUERY_PLAN_CHECKS is called with sample arguments (streams
+    are read to the end) while a cursor listener records its statements,
+    which are then run through EXPLAIN QUERY PLAN on the same database.
+
+    Args:
+        database_query (DatabaseQuery): Query object bound to the database to check.
+
+    Returns:
+        dict: Method name mapped to the detail lines of its query plan.
+    """
+    plans: Dict[str, List[str]] = {}
+    for method_name, arguments in QUERY_PLAN_CHECKS.items():
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        event.listen(database_query.engine, "before_cursor_execute", capture)
+        try:
+            result = getattr(database_query, method_name)(*arguments)
+            if method_name.startswith("iter_"):
+                list(result)
+        finally:
+            event.remove(database_query.engine, "before_cursor_execute", capture)
+
+        with database_query.engine.connect() as connection:
+            plans[method_name] = [row[-1] for statement, parameters in captured
+                                  for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}",
+                                                                        parameters)]
+    return plans
+
+
+def full_table_scans(plans: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Filter query plans down to steps that scan a whole table without an index.
+
+    Args:
+        plans (dict): Output of verify_query_plans().
+
+    Returns:
+        dict: Method name mapped to its full-scan steps (methods without any are omitted).
+    """
+    scans = {method: [step for step in steps if step.startswith("SCAN") and "INDEX" not in step]
+             for method, steps in plans.items()}
+    return {method: steps for method, steps in scans.items() if steps}
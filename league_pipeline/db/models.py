@@ -1,9 +1,10 @@
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import String, Integer, Boolean, Float, ForeignKey, create_engine
-from league_pipeline.constants.database_constants import DatabaseTableNames, DatabaseName, DatabaseConfiguration
+from sqlalchemy import String, Integer, Boolean, Float, ForeignKey, Index, LargeBinary
+from league_pipeline.constants.database_constants import DatabaseTableNames, DatabaseName, DatabaseConfiguration, DatabaseIndexNames
 from pathlib import Path
 from typing import Union, Type
+from league_pipeline.db.engine_registry import get_engine
 
 
 
@@ -39,6 +40,10 @@ class Summoners(Base):
     current_division: Mapped[str] = mapped_column("currentDivision", String)
     date_collected: Mapped[str] = mapped_column("dateCollected", String)
 
+    __table_args__ = (
+        Index(DatabaseIndexNames.SUMMONERS_CONTINENT.value, "continentalRegion", "puuId", "localRegion"),
+    )
+
 
 class MatchIDs(Base):
     """
@@ -51,11 +56,20 @@ class MatchIDs(Base):
         match_id (str): Primary key - Unique match identifier from Riot API.
         puuid (str): Foreign key - Player identifier, references Summoners table.
         game_tier (str): Competitive tier of the game/player when match was played.
+        platform_id (str): Platform of the match, taken from the match ID prefix (EUW1, NA1, etc.).
+        continental_region (str): Routing region of the platform (AMERICAS, EUROPE, ASIA).
     """
     __tablename__ = DatabaseTableNames.MATCH_IDS_TABLE.value
     match_id: Mapped[str] = mapped_column("matchId", String, primary_key=True)
     puuid: Mapped[str] = mapped_column("puuId", ForeignKey("Summoners.puuId"), nullable=True)
     game_tier: Mapped[str] = mapped_column("gameTier", String)
+    platform_id: Mapped[str] = mapped_column("platformId", String, nullable=True)
+    continental_region: Mapped[str] = mapped_column("continentalRegion", String, nullable=True)
+
+    __table_args__ = (
+        Index(DatabaseIndexNames.MATCH_IDS_PUUID.value, "puuId", "matchId"),
+        Index(DatabaseIndexNames.MATCH_IDS_CONTINENT.value, "continentalRegion", "matchId"),
+    )
 
 class MatchDataTeams(Base):
     """
@@ -203,6 +217,10 @@ class MatchDataParticipants(Base):
     win: Mapped[bool] = mapped_column("win", Boolean)
     end_of_game_result: Mapped[str] = mapped_column("endOfGameResult", String)
 
+    __table_args__ = (
+        Index(DatabaseIndexNames.PARTICIPANTS_MATCH.value, "matchId", "puuId", "teamId", "teamPosition"),
+    )
+
 
 class MatchTimeline(Base):
     """
@@ -224,6 +242,7 @@ class MatchTimeline(Base):
         y (int): Y-coordinate position on the map.
         event (str): Type of event (KILL, POSITION, etc.).
         type (str): Specific event subtype or frame type.
+        victim_puuid (str): Player killed by a CHAMPION_KILL event (NULL for other rows).
     """
     __tablename__ = DatabaseTableNames.MATCH_TIMELINE_TABLE.value
     match_id: Mapped[str] = mapped_column("matchId", ForeignKey(DatabaseTableNames.MATCH_DATA_PARTICIPANTS_TABLE.value, ondelete="SET NULL"), primary_key=True)
@@ -237,8 +256,178 @@ class MatchTimeline(Base):
     y: Mapped[int] = mapped_column("y", Integer)
     event: Mapped[str] = mapped_column("event", String)
     type: Mapped[str] = mapped_column("type", String)
+    victim_puuid: Mapped[str] = mapped_column("victimPuuId", String, nullable=True)
+
+
+class MatchTimelineTracks(Base):
+    """
+    SQLAlchemy model for the Match Timeline (Tracks) table.
+    
+    Compact alternative to the POSITION rows of the Match Timeline table: one
+    row per participant per match, holding the whole (timestamp, x, y) track
+    as a delta-encoded int32 blob (see db/timeline_tracks.py).
+    
+    Composite Primary Key: (match_id, puuid)
+    
+    Attributes:
+        match_id (str): Primary key component - Match identifier.
+        puuid (str): Primary key component - Player identifier.
+        team_id (str): Team identifier for the player.
+        in_game_id (int): In-game participant ID (1-10).
+        team_position (str): Player's assigned position.
+        frame_count (int): Number of (timestamp, x, y) samples in the track.
+        track (bytes): Delta-encoded int32 timestamps, x and y coordinates.
+    """
+    __tablename__ = DatabaseTableNames.MATCH_TIMELINE_TRACKS_TABLE.value
+    match_id: Mapped[str] = mapped_column("matchId", String, primary_key=True)
+    puuid: Mapped[str] = mapped_column("puuId", String, primary_key=True)
+
+    team_id: Mapped[str] = mapped_column("teamId", String)
+    in_game_id: Mapped[int] = mapped_column("inGameId", Integer)
+    team_position: Mapped[str] = mapped_column("teamPosition", String)
+    frame_count: Mapped[int] = mapped_column("frameCount", Integer)
+    track: Mapped[bytes] = mapped_column("track", LargeBinary)
+
+
+class MatchTimelineEconomy(Base):
+    """
+    SQLAlchemy model for the Match Timeline (Economy) table.
+    
+    One row per participant per match holding the per-frame economy read from
+    the timeline's participantFrames (timestamp, total gold, XP, minions,
+    jungle minions, level) as an int32 blob (see db/timeline_tracks.py). Team and position are joined from Match Data
+    (Participants) when needed.
+    
+    Composite Primary Key: (match_id, puuid)
+    
+    Attributes:
+        match_id (str): Primary key component - Match identifier.
+        puuid (str): Primary key component - Player identifier.
+        in_game_id (int): In-game participant ID (1-10).
+        frame_count (int): Number of frames in the series.
+        series (bytes): int32 columns in ECONOMY_COLUMNS order.
+    """
+    __tablename__ = DatabaseTableNames.MATCH_TIMELINE_ECONOMY_TABLE.value
+    match_id: Mapped[str] = mapped_column("matchId", String, primary_key=True)
+    puuid: Mapped[str] = mapped_column("puuId", String, primary_key=True)
+
+    in_game_id: Mapped[int] = mapped_column("inGameId", Integer)
+    frame_count: Mapped[int] = mapped_column("frameCount", Integer)
+    series: Mapped[bytes] = mapped_column("series", LargeBinary)
+
+
+class ChampionAggregates(Base):
+    """
+    SQLAlchemy model for the Champion Aggregates table.
+    
+    Running counts, sums and sums of squares of participant statistics per
+    (tier, team position, champion). Triggers on Match Data (Participants)
+    update the row in the same transaction as the insert (see
+    db/aggregates.py), so win rates, averages and standard deviations are
+    single-row lookups.
+    
+    Composite Primary Key: (game_tier, team_position, champion_name)
+    
+    Attributes:
+        game_tier (str): Tier of the matches (Match IDs).
+        team_position (str): Assigned position.
+        champion_name (str): Champion played.
+        games (int): Number of participants aggregated.
+        wins (int): Number of those participants that won.
+        kills (int): Sum of champion kills.
+        deaths (int): Sum of deaths.
+        assists (int): Sum of assists.
+        kda_sum (float): Sum of KDA.
+        kda_squares (float): Sum of squared KDA.
+        gold_per_minute_sum (float): Sum of gold per minute.
+        gold_per_minute_squares (float): Sum of squared gold per minute.
+        damage_per_minute_sum (float): Sum of damage per minute.
+        damage_per_minute_squares (float): Sum of squared damage per minute.
+    """
+    __tablename__ = DatabaseTableNames.CHAMPION_AGGREGATES_TABLE.value
+    game_tier: Mapped[str] = mapped_column("gameTier", String, primary_key=True)
+    team_position: Mapped[str] = mapped_column("teamPosition", String, primary_key=True)
+    champion_name: Mapped[str] = mapped_column("championName", String, primary_key=True)
+
+    games: Mapped[int] = mapped_column("games", Integer)
+    wins: Mapped[int] = mapped_column("wins", Integer)
+    kills: Mapped[int] = mapped_column("kills", Integer)
+    deaths: Mapped[int] = mapped_column("deaths", Integer)
+    assists: Mapped[int] = mapped_column("assists", Integer)
+    kda_sum: Mapped[float] = mapped_column("kdaSum", Float)
+    kda_squares: Mapped[float] = mapped_column("kdaSquares", Float)
+    gold_per_minute_sum: Mapped[float] = mapped_column("goldPerMinuteSum", Float)
+    gold_per_minute_squares: Mapped[float] = mapped_column("goldPerMinuteSquares", Float)
+    damage_per_minute_sum: Mapped[float] = mapped_column("damagePerMinuteSum", Float)
+    damage_per_minute_squares: Mapped[float] = mapped_column("damagePerMinuteSquares", Float)
+
+
+class HeatmapCells(Base):
+    """
+    SQLAlchemy model for the Heatmap Cells table.
+    
+    Materialized counts of timeline positions and events per map cell, kept
+    up to date incrementally by analytics/heatmaps.py. Only non-empty cells
+    are stored, and the primary key puts all cells of a heatmap next to each
+    other, so reading one is a range scan over at most GRID_SIZE^2 rows.
+    
+    Composite Primary Key: (game_tier, team_position, event, time_bucket, champion_name, cell)
+    
+    Attributes:
+        game_tier (str): Tier of the match (Match IDs).
+        team_position (str): Position of the player the row belongs to.
+        event (str): Timeline event name (POSITION, CHAMPION_KILL, ...).
+        time_bucket (int): Game time // HeatmapConfig.TIME_BUCKET_MINUTES minutes.
+        champion_name (str): Champion of the player the row belongs to.
+        cell (int): Grid cell, y_bin * GRID_SIZE + x_bin.
+        count (int): Number of positions/events in the cell.
+    """
+    __tablename__ = DatabaseTableNames.HEATMAP_CELLS_TABLE.value
+    game_tier: Mapped[str] = mapped_column("gameTier", String, primary_key=True)
+    team_position: Mapped[str] = mapped_column("teamPosition", String, primary_key=True)
+    event: Mapped[str] = mapped_column("event", String, primary_key=True)
+    time_bucket: Mapped[int] = mapped_column("timeBucket", Integer, primary_key=True)
+    champion_name: Mapped[str] = mapped_column("championName", String, primary_key=True)
+    cell: Mapped[int] = mapped_column("cell", Integer, primary_key=True)
+    count: Mapped[int] = mapped_column("count", Integer)
+
+
+class HeatmapWatermarks(Base):
+    """
+    SQLAlchemy model for the Heatmap Watermarks table.
+    
+    Attributes:
+        source_table (str): Primary key - Timeline table counted into the heatmaps.
+        last_rowid (int): Highest rowid of the source table already counted.
+    """
+    __tablename__ = DatabaseTableNames.HEATMAP_WATERMARKS_TABLE.value
+    source_table: Mapped[str] = mapped_column("sourceTable", String, primary_key=True)
+    last_rowid: Mapped[int] = mapped_column("lastRowid", Integer)
 
   
+class DimensionValues(Base):
+    """
+    SQLAlchemy model for the Dimension Values table.
+    
+    Interns the strings of dictionary-encoded columns (see
+    db/dictionary_encoding.py). Codes are unique across dimensions, so an
+    encoded column is decoded with a single primary key lookup.
+    
+    Attributes:
+        code (int): Primary key - Integer stored in the encoded columns.
+        dimension (str): Group of columns sharing the codes (e.g. "position").
+        value (str): Original string.
+    """
+    __tablename__ = DatabaseTableNames.DIMENSION_VALUES_TABLE.value
+    code: Mapped[int] = mapped_column("code", Integer, primary_key=True)
+    dimension: Mapped[str] = mapped_column("dimension", String, nullable=False)
+    value: Mapped[str] = mapped_column("value", String, nullable=False)
+
+    __table_args__ = (
+        Index(DatabaseIndexNames.DIMENSION_VALUES_LOOKUP.value, "value", "dimension", unique=True),
+    )
+
+
 class DataBase:
     """
     Database management utility class.
@@ -248,7 +437,7 @@ class DataBase:
     
     Attributes:
         url (str): SQLAlchemy database connection URL.
-        engine: SQLAlchemy engine instance for database operations.
+        engine: Shared SQLAlchemy engine for the database (see engine_registry).
     """
     
     def __init__(self, location: Union[str, Path]):
@@ -259,16 +448,26 @@ class DataBase:
             location (Union[str, Path]): File system path to the database directory.
         """
         self.url = DatabaseConfiguration.url.value.format(location=location, name=DatabaseName.DATABASE_NAME.value)
-        self.engine = create_engine(self.url, echo=False)
+        self.engine = get_engine(self.url)
     
     def create_all_tables(self):
         """
         Create all database tables defined in the models.
         
         This method creates all tables that inherit from the Base class.
-        Uses checkfirst=True to avoid errors if tables already exist.
+        Uses checkfirst=True to avoid errors if tables already exist, then applies
+        pending schema migrations so existing databases get new indexes too.
+        With DictionaryEncodingConfig.MODE = "encoded" the listed tables are
+        then converted to their dictionary-encoded form.
         """
+        from league_pipeline.constants.pipeline_constants import DictionaryEncodingConfig
+        from league_pipeline.db.dictionary_encoding import encode_database
+        from league_pipeline.db.migrations import SchemaMigrator
+
         Base.metadata.create_all(self.engine, checkfirst=True)
+        SchemaMigrator(self.url).upgrade()
+        if DictionaryEncodingConfig.MODE == "encoded":
+            encode_database(self.url)
 
     def drop_table(self, table: Type[Base]):
         """
@@ -0,0 +1,472 @@
+import os
+from enum import Enum
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from sqlalchemy import Row, Table, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import DeclarativeBase
+
+from league_pipeline.constants.database_constants import (DatabaseConfiguration, DatabaseQueryConfig,
+                                                          SQLitePragmas)
+from league_pipeline.constants.pipeline_constants import DatabaseWriterConfig, StorageConfig
+from league_pipeline.constants.regions import ContinentalRegion
+from league_pipeline.db.bulk_insert import table_layout
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.migrations import SchemaMigrator
+from league_pipeline.db.models import Base, ChampionAggregates
+from league_pipeline.utils.match_routing import platform_and_continent_from_match_id
+
+
+Shard = Tuple[str, Optional[int]]
+
+
+class ShardedStorage:
+    """
+    Layout of a database split into one SQLite file per continent (and optionally per stage).
+
+    Shard files live next to the single-file database and are named
+    "<database_name>_<continent>" or "<database_name>_<continent>_stage<N>".
+    Rows are routed by their continent: the continental_region field when the
+    row has one, otherwise the platform prefix of its match_id. With by_stage,
+    each stage's tables (StorageConfig.STAGE_TABLES) get their own file.
+
+    Attributes:
+        db_location (Union[str, Path]): Directory of the shard files.
+        database_name (str): Base name the shard names are derived from.
+        logger (Logger): Logger instance for shard creation and merges.
+        by_stage (bool): Whether each continent is further split by stage.
+        continents (List[str]): Continental regions that get a shard.
+        stages (List[Optional[int]]): Stage numbers per continent, or [None] without by_stage.
+    """
+
+    def __init__(self, db_location: Union[str, Path], database_name: str, logger: Logger,
+                 by_stage: bool = StorageConfig.SHARD_BY_STAGE,
+                 continents: Type[Enum] = ContinentalRegion) -> None:
+        self.db_location = db_location
+        self.database_name = database_name
+        self.logger = logger
+        self.by_stage = by_stage
+        self.continents = list(continents.__members__)
+        self.stages: List[Optional[int]] = list(range(1, len(StorageConfig.STAGE_TABLES) + 1)) if by_stage else [None]
+        self._readers: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], Engine] = {}
+
+    def shards(self) -> List[Shard]:
+        """
+        Return every (continent, stage) shard key; stage is None without by_stage.
+        """
+        return [(continent, stage) for continent in self.continents for stage in self.stages]
+
+    def shard_name(self, continent: str, stage: Optional[int] = None) -> str:
+        name = f"{self.database_name}_{continent.lower()}"
+        return name if stage is None else f"{name}_stage{stage}"
+
+    def shard_url(self, continent: str, stage: Optional[int] = None) -> str:
+        return DatabaseConfiguration.url.value.format(location=self.db_location,
+                                                      name=self.shard_name(continent, stage))
+
+    def exists(self) -> bool:
+        """
+        Whether every shard file exists, without creating any (ATTACH would create missing ones).
+        """
+        return all(os.path.exists(make_url(self.shard_url(*shard)).database) for shard in self.shards())
+
+    def shard_tables(self, stage: Optional[int]) -> List[Table]:
+        """
+        Return the tables stored in shards of the given stage (all tables for None).
+        """
+        tables = Base.metadata.sorted_tables
+        if stage is None:
+            return tables
+        return [table for table in tables if table.name in StorageConfig.STAGE_TABLES[stage - 1]]
+
+    def stage_of(self, table_name: str) -> Optional[int]:
+        """
+        Return the stage whose shard holds the table, or None without by_stage.
+        """
+        if not self.by_stage:
+            return None
+        for stage, table_names in enumerate(StorageConfig.STAGE_TABLES, start=1):
+            if table_name in table_names:
+                return stage
+        raise KeyError(f"Table {table_name} is not assigned to a stage")
+
+    def shard_for(self, table: Type[DeclarativeBase], row: Union[dict, tuple]) -> Optional[Shard]:
+        """
+        Return the shard a row belongs to, or None if its continent is unknown.
+
+        Args:
+            table (Type[DeclarativeBase]): SQLAlchemy model class of the row.
+            row (dict | tuple): Record keyed by ORM attribute names, or a tuple
+                                in table column order (see table_layout).
+
+        Returns:
+            Optional[tuple]: (continent, stage) shard key.
+        """
+        if not isinstance(row, dict):
+            _, attribute_keys = table_layout(table)
+            row = {key: row[index] for index, key in enumerate(attribute_keys)
+                   if key in ("continental_region", "match_id")}
+        continent = row.get("continental_region")
+        if continent is None and row.get("match_id"):
+            _, continent = platform_and_continent_from_match_id(row["match_id"])
+        if continent not in self.continents:
+            return None
+        return continent, self.stage_of(table.__tablename__)
+
+    def create(self) -> "ShardedStorage":
+        """
+        Create the shard files with their tables and apply pending migrations.
+
+        Returns:
+            ShardedStorage: The storage itself, for chaining.
+        """
+        for continent, stage in self.shards():
+            url = self.shard_url(continent, stage)
+            Base.metadata.create_all(get_engine(url), tables=self.shard_tables(stage), checkfirst=True)
+            SchemaMigrator(url, self.logger).upgrade()
+        self.logger.info(f"Sharded storage ready | Shards: {len(self.shards())} | By stage: {self.by_stage}")
+        return self
+
+    def reader_engine(self, continents: Optional[Sequence[str]] = None,
+                      tables: Optional[Sequence[str]] = None) -> Engine:
+        """
+        Return an engine whose connections see the shards under the original table names.
+
+        Each connection opens an in-memory main database, ATTACHes the shards
+        holding the requested tables and creates TEMP views named like the
+        tables that UNION ALL the shard copies, so existing queries run
+        unchanged. SQLite allows StorageConfig.MAX_ATTACHED databases per
+        connection, so readers over many stage shards should restrict
+        continents or tables.
+
+        Args:
+            continents (Optional[Sequence[str]]): Continents to include (default: all).
+            tables (Optional[Sequence[str]]): Table names to expose (default: all).
+
+        Returns:
+            Engine: Cached reader engine for this combination.
+
+        Raises:
+            ValueError: If more shards than StorageConfig.MAX_ATTACHED would be attached.
+        """
+        continents = tuple(continents or self.continents)
+        table_names = tuple(tables or [table.name for table in Base.metadata.sorted_tables])
+        key = (continents, table_names)
+        if key in self._readers:
+            return self._readers[key]
+
+        attached: List[Tuple[str, str]] = []
+        sources: Dict[str, List[str]] = {}
+        for continent in continents:
+            for stage in self.stages:
+                shard_tables = [table.name for table in self.shard_tables(stage) if table.name in table_names]
+                if not shard_tables:
+                    continue
+                alias = f"shard_{len(attached)}"
+                attached.append((alias, make_url(self.shard_url(continent, stage)).database))
+                for table_name in shard_tables:
+                    sources.setdefault(table_name, []).append(alias)
+
+        if len(attached) > StorageConfig.MAX_ATTACHED:
+            raise ValueError(f"Reader needs {len(attached)} shards but SQLite attaches at most "
+                             f"{StorageConfig.MAX_ATTACHED}; restrict continents or tables")
+
+        engine = create_engine("sqlite+pysqlite://", echo=False)
+
+        @event.listens_for(engine, "connect")
+        def attach_shards(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"PRAGMA busy_timeout = {SQLitePragmas.BUSY_TIMEOUT.value}")
+                for alias, path in attached:
+                    cursor.execute(f'ATTACH DATABASE ? AS "{alias}"', (path,))
+                for table_name, aliases in sources.items():
+                    # Explicit columns, in model order whatever the shard's table layout.
+                    columns = ", ".join(f'"{column.name}"' for column in Base.metadata.tables[table_name].columns)
+                    union = " UNION ALL ".join(f'SELECT {columns} FROM "{alias}"."{table_name}"'
+                                               for alias in aliases)
+                    cursor.execute(f'CREATE TEMP VIEW "{table_name}" AS {union}')
+            finally:
+                cursor.close()
+
+        self._readers[key] = engine
+        return engine
+
+    def merge(self, target_name: str) -> Dict[str, int]:
+        """
+        Consolidate every shard into a single database file.
+
+        Rows are copied shard by shard with INSERT OR IGNORE ... SELECT through
+        ATTACH, inside one transaction per shard, while the target's indexes
+        are dropped and rebuilt once at the end. Derived tables are not copied:
+        the target's triggers maintain the champion aggregates while the
+        participants are copied, and heatmaps are refreshed from the merged
+        timelines.
+
+        Args:
+            target_name (str): Name of the merged database file (without extension).
+
+        Returns:
+            dict: Rows copied per table name.
+        """
+        target_url = DatabaseConfiguration.url.value.format(location=self.db_location, name=target_name)
+        engine = get_engine(target_url)
+        Base.metadata.create_all(engine, checkfirst=True)
+        migrator = SchemaMigrator(target_url, self.logger)
+        migrator.upgrade()
+
+        counts = {table.name: 0 for table in Base.metadata.sorted_tables}
+        models = [mapper.class_ for mapper in Base.registry.mappers]
+        with migrator.indexes_dropped(models):
+            connection = engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                for continent, stage in self.shards():
+                    path = make_url(self.shard_url(continent, stage)).database
+                    if not Path(path).exists():
+                        continue
+                    cursor.execute("ATTACH DATABASE ? AS shard", (path,))
+                    present = {row[0] for row in cursor.execute("SELECT name FROM shard.sqlite_master WHERE type = 'table'")}
+                    for table in self.shard_tables(stage):
+                        if table.name not in present or table.name in StorageConfig.DERIVED_TABLES:
+                            continue
+                        columns = ", ".join(f'"{column.name}"' for column in table.columns)
+                        cursor.execute(f'INSERT OR IGNORE INTO main."{table.name}" ({columns}) '
+                                       f'SELECT {columns} FROM shard."{table.name}"')
+                        counts[table.name] += cursor.rowcount
+                    connection.commit()
+                    cursor.execute("DETACH DATABASE shard")
+                    self.logger.info(f"Merged shard {self.shard_name(continent, stage)} into {target_name}")
+            finally:
+                connection.close()
+        return counts
+
+    def close(self) -> None:
+        """
+        Dispose the reader engines.
+        """
+        for engine in self._readers.values():
+            engine.dispose()
+        self._readers.clear()
+
+
+class ShardedWriter:
+    """
+    Group-commit writer that routes rows to one GroupCommitWriter per shard.
+
+    Offers the GroupCommitWriter interface (start, submit, enqueue, flush,
+    close), so services use it unchanged. Every shard has its own writer
+    thread and file lock, so commits to different continents run in
+    parallel. Rows are dicts keyed by ORM attribute names or tuples in table
+    column order (see table_layout); rows whose continent cannot be read from
+    continental_region or the match_id prefix are logged and dropped.
+
+    Attributes:
+        storage (ShardedStorage): Shard layout used for routing.
+        logger (Logger): Logger instance for routing warnings.
+        writers (Dict[tuple, GroupCommitWriter]): Writer per (continent, stage) shard.
+    """
+
+    def __init__(self, storage: ShardedStorage, logger: Logger,
+                 max_queued_batches: int = DatabaseWriterConfig.MAX_QUEUED_BATCHES,
+                 commit_row_count: int = DatabaseWriterConfig.COMMIT_ROW_COUNT,
+                 commit_interval_seconds: float = DatabaseWriterConfig.COMMIT_INTERVAL_SECONDS) -> None:
+        self.storage = storage
+        self.logger = logger
+        self.writers: Dict[Shard, GroupCommitWriter] = {
+            shard: GroupCommitWriter(storage.shard_url(*shard), logger, max_queued_batches,
+                                     commit_row_count, commit_interval_seconds)
+            for shard in storage.shards()
+        }
+
+    @property
+    def rows_written(self) -> int:
+        return sum(writer.rows_written for writer in self.writers.values())
+
+    @property
+    def rows_dropped(self) -> int:
+        return sum(writer.rows_dropped for writer in self.writers.values())
+
+    @property
+    def commits(self) -> int:
+        return sum(writer.commits for writer in self.writers.values())
+
+    def start(self) -> "ShardedWriter":
+        """
+        Start every shard writer thread.
+
+        Returns:
+            ShardedWriter: The writer itself, for chaining.
+        """
+        for writer in self.writers.values():
+            writer.start()
+        return self
+
+    def _route(self, table: Type[DeclarativeBase], data: Union[list, dict, tuple]) -> Dict[Shard, list]:
+        """
+        Group rows (dicts or column-order tuples) by shard, dropping (and logging) rows whose continent is unknown.
+        """
+        rows = [data] if isinstance(data, (dict, tuple)) else data
+        routed: Dict[Shard, list] = {}
+        for row in rows:
+            if not isinstance(row, (dict, tuple)):
+                raise TypeError("ShardedWriter routes dict or tuple rows only")
+            shard = self.storage.shard_for(table, row)
+            if shard is None:
+                self.logger.warning(f"No shard for {table.__tablename__} row | Skipping Data")
+                continue
+            routed.setdefault(shard, []).append(row)
+        return routed
+
+    def submit(self, table: Type[DeclarativeBase], data: Union[list, dict]) -> None:
+        """
+        Queue rows on their shard writers, blocking while a queue is full.
+
+        Raises:
+            Exception: The first pending shard writer error, after every row was queued.
+        """
+        error: Optional[Exception] = None
+        for shard, rows in self._route(table, data).items():
+            try:
+                self.writers[shard].submit(table, rows)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    async def enqueue(self, table: Type[DeclarativeBase], data: Union[list, dict]) -> None:
+        """
+        Queue rows on their shard writers from a coroutine.
+
+        Raises:
+            Exception: The first pending shard writer error, after every row was queued.
+        """
+        error: Optional[Exception] = None
+        for shard, rows in self._route(table, data).items():
+            try:
+                await self.writers[shard].enqueue(table, rows)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def flush(self) -> None:
+        """
+        Block until every shard committed its queued rows.
+
+        Raises:
+            Exception: Re-raises the first shard writer error, after flushing all shards.
+        """
+        self._for_each_writer("flush")
+
+    def close(self) -> None:
+        """
+        Commit everything still queued and stop every shard writer.
+
+        Raises:
+            Exception: Re-raises the first shard writer error, after closing all shards.
+        """
+        self._for_each_writer("close")
+
+    def _for_each_writer(self, method_name: str) -> None:
+        error: Optional[Exception] = None
+        for writer in self.writers.values():
+            try:
+                getattr(writer, method_name)()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+
+class ShardedDatabaseQuery:
+    """
+    DatabaseQuery facade that answers each query from the shards of its continent.
+
+    Every continent gets a DatabaseQuery over a reader engine that attaches
+    only that continent's shards (at most one per stage), which keeps the
+    attach count low and lets the query planner use the shard indexes.
+
+    Attributes:
+        storage (ShardedStorage): Shard layout providing the reader engines.
+    """
+
+    def __init__(self, storage: ShardedStorage) -> None:
+        self.storage = storage
+        self._queries: Dict[str, DatabaseQuery] = {}
+
+    def for_continent(self, continent: str) -> DatabaseQuery:
+        """
+        Return the DatabaseQuery reading the given continent's shards.
+        """
+        if continent not in self._queries:
+            self._queries[continent] = DatabaseQuery(str(self.storage.db_location), self.storage.database_name,
+                                                     engine=self.storage.reader_engine([continent]))
+        return self._queries[continent]
+
+    def get_puuids_by_continent_from_summoner_table(self, continent: str):
+        return self.for_continent(continent).get_puuids_by_continent_from_summoner_table(continent)
+
+    def iter_puuids_by_continent_from_summoner_table(self, continent: str,
+                                                     chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                     ) -> Iterator[Row]:
+        return self.for_continent(continent).iter_puuids_by_continent_from_summoner_table(continent, chunk_size)
+
+    def get_match_ids_by_continent_from_match_id_table(self, continent: str):
+        return self.for_continent(continent).get_match_ids_by_continent_from_match_id_table(continent)
+
+    def iter_match_ids_by_continent_from_match_id_table(self, continent: str,
+                                                        chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                        ) -> Iterator[Row]:
+        return self.for_continent(continent).iter_match_ids_by_continent_from_match_id_table(continent, chunk_size)
+
+    def get_match_ids_by_continent_from_match_data_table(self, continent: str):
+        return self.for_continent(continent).get_match_ids_by_continent_from_match_data_table(continent)
+
+    def iter_match_ids_by_continent_from_match_data_table(self, continent: str,
+                                                          chunk_size: int = DatabaseQueryConfig.STREAM_CHUNK_SIZE.value
+                                                          ) -> Iterator[Row]:
+        return self.for_continent(continent).iter_match_ids_by_continent_from_match_data_table(continent, chunk_size)
+
+    def get_planning_statistics(self) -> dict:
+        statistics: dict = {}
+        for continent in self.storage.continents:
+            for key, value in self.for_continent(continent).get_planning_statistics().items():
+                if isinstance(value, dict):
+                    merged = statistics.setdefault(key, {})
+                    for name, count in value.items():
+                        merged[name] = merged.get(name, 0) + count
+                else:
+                    statistics[key] = statistics.get(key, 0) + value
+        return statistics
+
+    def get_team_id_and_position(self, match_id: str, puuid: str):
+        _, continent = platform_and_continent_from_match_id(match_id)
+        if continent not in self.storage.continents:
+            return []
+        return self.for_continent(continent).get_team_id_and_position(match_id=match_id, puuid=puuid)
+
+    def get_team_ids_and_positions(self, match_id: str):
+        _, continent = platform_and_continent_from_match_id(match_id)
+        if continent not in self.storage.continents:
+            return {}
+        return self.for_continent(continent).get_team_ids_and_positions(match_id)
+
+    def get_match_tracks(self, match_id: str):
+        _, continent = platform_and_continent_from_match_id(match_id)
+        if continent not in self.storage.continents:
+            return {}
+        return self.for_continent(continent).get_match_tracks(match_id)
+
+    def get_champion_stats(self, game_tier: str, team_position: str, champion_name: Optional[str] = None):
+        # Stage shards keep no aggregates (participants and Match IDs are in
+        # different files); they exist once the shards are merged.
+        if self.storage.by_stage:
+            return []
+        engine = self.storage.reader_engine(tables=[ChampionAggregates.__tablename__])
+        return DatabaseQuery(str(self.storage.db_location), self.storage.database_name,
+                             engine=engine).get_champion_stats(game_tier, team_position, champion_name)
@@ -0,0 +1,363 @@
+import hashlib
+import time
+from itertools import repeat
+from logging import Logger
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Type, Union
+
+import numpy as np
+
+from league_pipeline.constants.database_constants import DatabaseConfiguration
+from league_pipeline.constants.league_ranks import RankedTier, RankedDivision
+from league_pipeline.constants.regions import RegionMapping
+from league_pipeline.db.engine_registry import create_private_engine
+from league_pipeline.db.migrations import SchemaMigrator
+from league_pipeline.db.models import (Base, MatchDataParticipants, MatchDataTeams, MatchIDs,
+                                       MatchTimeline, Summoners)
+
+
+class SyntheticDataDistributions:
+    """
+    Distributions used by the synthetic dataset generator.
+
+    The tier weights approximate the public ranked solo queue distribution and
+    the region weights the relative size of each platform's ladder.
+
+    Attributes:
+        TIER_WEIGHTS (dict): Share of players per ranked tier.
+        REGION_WEIGHTS (dict): Share of players per platform region.
+        TEAM_POSITIONS (list): Team positions in participant order within a team.
+        POSITION_ANCHORS (dict): Typical (x, y) map location of each position.
+        CHAMPIONS (list): Champion names to draw from.
+        MAP_SIZE (int): Upper bound of the map coordinates.
+    """
+    TIER_WEIGHTS = {
+        RankedTier.IRON.value: 0.060,
+        RankedTier.BRONZE.value: 0.180,
+        RankedTier.SILVER.value: 0.220,
+        RankedTier.GOLD.value: 0.200,
+        RankedTier.PLATINUM.value: 0.160,
+        RankedTier.EMERALD.value: 0.120,
+        RankedTier.DIAMOND.value: 0.050,
+        RankedTier.MASTER.value: 0.008,
+        RankedTier.GRANDMASTER.value: 0.0015,
+        RankedTier.CHALLENGER.value: 0.0005,
+    }
+
+    REGION_WEIGHTS = {
+        "EUW1": 0.20, "KR": 0.18, "NA1": 0.12, "EUN1": 0.10, "BR1": 0.08,
+        "VN2": 0.08, "TR1": 0.04, "LA1": 0.04, "LA2": 0.04, "SG2": 0.04,
+        "TW2": 0.03, "JP1": 0.02, "OC1": 0.02, "ME1": 0.01,
+    }
+
+    TEAM_POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+    POSITION_ANCHORS = {
+        "TOP": (1800, 12800),
+        "JUNGLE": (5000, 9000),
+        "MIDDLE": (7400, 7400),
+        "BOTTOM": (12800, 1800),
+        "UTILITY": (12200, 2400),
+    }
+
+    CHAMPIONS = [
+        "Aatrox", "Ahri", "Akali", "Ashe", "Braum", "Caitlyn", "Darius", "Ekko",
+        "Ezreal", "Fiora", "Garen", "Graves", "Jinx", "Kaisa", "Karma", "Khazix",
+        "LeeSin", "Leona", "Lulu", "Lux", "Nautilus", "Orianna", "Riven", "Sett",
+        "Sylas", "Thresh", "Viego", "Yasuo", "Yone", "Zed",
+    ]
+
+    MAP_SIZE = 14870
+
+
+class SyntheticDatasetGenerator:
+    """
+    Deterministic generator of large, statistically realistic pipeline databases.
+
+    Fills Summoners, MatchIDs, MatchDataTeams, MatchDataParticipants and
+    MatchTimeline from a seed: the same seed and sizes always produce the same
+    rows. Values are generated with vectorized NumPy draws per batch of matches
+    and written with executemany in one transaction per batch, with journaling
+    and fsync disabled because the database is disposable.
+
+    Attributes:
+        url (str): SQLAlchemy URL of the target database.
+        engine: Private engine of the target database with BULK_LOAD_PRAGMAS; it is
+                not shared through get_engine(), so no other user of the
+                database inherits the unsafe settings.
+        logger (Logger): Logger instance for progress reporting.
+        seed (int): Seed of the random generator.
+        batch_matches (int): Number of matches generated and committed per batch.
+    """
+
+    BULK_LOAD_PRAGMAS = {
+        "journal_mode": "OFF",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "temp_store": "MEMORY",
+    }
+
+    def __init__(self, db_location: Union[str, Path], database_name: str,
+                 logger: Logger, seed: int = 0, batch_matches: int = 2_000) -> None:
+        self.url = DatabaseConfiguration.url.value.format(location=db_location, name=database_name)
+        self.engine = create_private_engine(self.url, pragmas=self.BULK_LOAD_PRAGMAS)
+        self.logger = logger
+        self.seed = seed
+        self.batch_matches = batch_matches
+        self.rng = np.random.default_rng(seed)
+
+        Base.metadata.create_all(self.engine, checkfirst=True)
+
+    def generate(self, summoners: int, matches: int,
+                 include_timeline: bool = True,
+                 date_collected: str = "2025-01-01") -> Dict[str, int]:
+        """
+        Generate and write the full dataset.
+
+        Args:
+            summoners (int): Number of summoners to create (at least 10 per continent used).
+            matches (int): Number of matches to create.
+            include_timeline (bool): Whether to generate MatchTimeline rows.
+            date_collected (str): Value written to Summoners.date_collected.
+
+        Returns:
+            dict: Number of rows written per table name.
+        """
+        counts = {table.__tablename__: 0 for table in
+                  (Summoners, MatchIDs, MatchDataTeams, MatchDataParticipants, MatchTimeline)}
+        started = time.perf_counter()
+
+        # Indexes are built once after the load instead of being updated per row.
+        migrator = SchemaMigrator(self.url, self.logger)
+        with migrator.indexes_dropped([Summoners, MatchIDs, MatchDataTeams, MatchDataParticipants, MatchTimeline]):
+            connection = self.engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+
+                summoner_rows, pools = self._summoners(summoners, date_collected)
+                counts[Summoners.__tablename__] += self._insert(cursor, Summoners, summoner_rows)
+                connection.commit()
+
+                match_offset = 0
+                while match_offset < matches:
+                    batch = min(self.batch_matches, matches - match_offset)
+                    tables = self._matches(pools, batch, match_offset, include_timeline)
+                    for table, rows in tables:
+                        counts[table.__tablename__] += self._insert(cursor, table, rows)
+                    connection.commit()
+
+                    match_offset += batch
+                    self.logger.info(f"Synthetic data: {match_offset}/{matches} matches written")
+            finally:
+                connection.close()
+                self.engine.dispose()
+        migrator.upgrade()
+
+        self.logger.info(f"Synthetic data generated in {time.perf_counter() - started:.1f}s | {counts}")
+        return counts
+
+    def _insert(self, cursor, table: Type[Base], rows: Sequence[tuple]) -> int:
+        """
+        Insert tuples (in table column order) with a single executemany call.
+        """
+        columns = ", ".join(f'"{column.name}"' for column in table.__table__.columns)
+        placeholders = ", ".join("?" * len(table.__table__.columns))
+        statement = f'INSERT OR IGNORE INTO "{table.__tablename__}" ({columns}) VALUES ({placeholders})'
+        cursor.executemany(statement, rows)
+        return len(rows)
+
+    def _puuid(self, index: int) -> str:
+        """Return a deterministic 78-character PUUID for a summoner index."""
+        return hashlib.blake2b(f"{self.seed}:{index}".encode(), digest_size=39).hexdigest()
+
+    def _summoners(self, count: int, date_collected: str):
+        """
+        Draw summoners and group their indices by continent.
+
+        Returns:
+            tuple: (rows, pools) where pools maps a continent to its summoners'
+                   puuid, tier and platform lists for match sampling.
+        """
+        distributions = SyntheticDataDistributions
+        regions = list(distributions.REGION_WEIGHTS)
+        region_p = np.array(list(distributions.REGION_WEIGHTS.values()))
+        tiers = list(distributions.TIER_WEIGHTS)
+        tier_p = np.array(list(distributions.TIER_WEIGHTS.values()))
+        divisions = list(RankedDivision.__members__)
+        apex = {RankedTier.MASTER.value, RankedTier.GRANDMASTER.value, RankedTier.CHALLENGER.value}
+
+        region_index = self.rng.choice(len(regions), size=count, p=region_p / region_p.sum())
+        tier_index = self.rng.choice(len(tiers), size=count, p=tier_p / tier_p.sum())
+        division_index = self.rng.integers(0, len(divisions), size=count)
+
+        rows: List[tuple] = []
+        pools: Dict[str, Dict[str, list]] = {}
+        for index in range(count):
+            local_region = regions[region_index[index]]
+            continent = RegionMapping[local_region].value
+            tier = tiers[tier_index[index]]
+            division = RankedDivision.I.value if tier in apex else divisions[division_index[index]]
+            puuid = self._puuid(index)
+
+            rows.append((puuid, continent, local_region, tier, division, date_collected))
+            pool = pools.setdefault(continent, {"puuid": [], "tier": [], "platform": []})
+            pool["puuid"].append(puuid)
+            pool["tier"].append(tier)
+            pool["platform"].append(local_region)
+
+        return rows, {continent: pool for continent, pool in pools.items() if len(pool["puuid"]) >= 10}
+
+    def _participants_for(self, pool_size: int, matches: int) -> np.ndarray:
+        """
+        Draw 10 distinct summoner indices per match from a continent pool.
+        """
+        picks = self.rng.integers(0, pool_size, size=(matches, 10))
+        while True:
+            ordered = np.sort(picks, axis=1)
+            duplicated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not duplicated.any():
+                return picks
+            picks[duplicated] = self.rng.integers(0, pool_size, size=(int(duplicated.sum()), 10))
+
+    def _matches(self, pools: Dict[str, Dict[str, list]], count: int,
+                 offset: int, include_timeline: bool) -> Iterable[tuple]:
+        """
+        Generate one batch of matches and every row that depends on them.
+
+        Returns:
+            list: (table, rows) pairs in foreign-key-safe insertion order.
+        """
+        distributions = SyntheticDataDistributions
+        positions = distributions.TEAM_POSITIONS
+        champions = distributions.CHAMPIONS
+        rng = self.rng
+
+        continents = list(pools)
+        continent_p = np.array([len(pools[continent]["puuid"]) for continent in continents], dtype=float)
+        match_continent = rng.choice(len(continents), size=count, p=continent_p / continent_p.sum())
+
+        match_ids: List[str] = []
+        match_puuids: List[List[str]] = []
+        match_tiers: List[str] = []
+        match_platforms: List[str] = []
+        for continent_index, continent in enumerate(continents):
+            selected = np.flatnonzero(match_continent == continent_index)
+            if not len(selected):
+                continue
+            pool = pools[continent]
+            picks = self._participants_for(len(pool["puuid"]), len(selected))
+            for match_number, indices in zip(selected, picks):
+                collector = indices[0]
+                match_ids.append(f"{pool['platform'][collector]}_{7_000_000_000 + offset + int(match_number)}")
+                match_puuids.append([pool["puuid"][i] for i in indices])
+                match_tiers.append(pool["tier"][collector])
+                match_platforms.append(pool["platform"][collector])
+
+        n = len(match_ids)
+        duration_s = rng.normal(1800, 330, size=n).clip(900, 3000).astype(int)
+        duration_min = duration_s / 60.0
+        blue_wins = rng.random(n) < 0.5
+
+        match_id_rows = [(match_id, puuids[0], tier, platform, RegionMapping[platform].value)
+                         for match_id, puuids, tier, platform
+                         in zip(match_ids, match_puuids, match_tiers, match_platforms)]
+
+        # Participant statistics, shape (matches, 10)
+        kills = rng.poisson(5.5, size=(n, 10))
+        deaths = rng.poisson(5.5, size=(n, 10))
+        assists = rng.poisson(7.5, size=(n, 10))
+        team_kills = np.stack([kills[:, :5].sum(axis=1), kills[:, 5:].sum(axis=1)], axis=1)
+        kill_participation = ((kills + assists) / np.maximum(1, np.repeat(team_kills, 5, axis=1))).clip(0, 1)
+        gold = (rng.normal(380, 70, size=(n, 10)) * duration_min[:, None]).clip(3000).astype(int)
+        cs = (rng.normal(6.0, 1.8, size=(n, 10)) * duration_min[:, None]).clip(0).astype(int)
+        cs[:, [1, 4, 6, 9]] //= 5  # junglers and supports farm few lane minions
+        dpm = rng.normal(650, 220, size=(n, 10)).clip(50)
+        wards = rng.poisson(12, size=(n, 10))
+        vision = (wards * rng.uniform(1.5, 3.0, size=(n, 10))).astype(int)
+        champion_index = rng.integers(0, len(champions), size=(n, 10))
+        pings = rng.poisson(3, size=(n, 10, 8))
+        small = rng.integers(0, 5, size=(n, 10, 4))
+
+        team_rows: List[tuple] = []
+        participant_rows: List[tuple] = []
+        team_lookup: Dict[str, tuple] = {}
+        for m in range(n):
+            match_id = match_ids[m]
+            winner = 100 if blue_wins[m] else 200
+            for team_id, side in ((100, 0), (200, 1)):
+                dragons = int(rng.integers(0, 6))
+                team_rows.append((match_id, team_id, int(rng.integers(0, 2)), int(rng.integers(0, 3)),
+                                  int(team_kills[m, side]), dragons, dragons >= 4, int(rng.integers(0, 7)),
+                                  int(rng.integers(0, 2)), int(rng.integers(0, 11)),
+                                  team_id == winner, "GameComplete"))
+
+            for p in range(10):
+                team_id = 100 if p < 5 else 200
+                position = positions[p % 5]
+                puuid = match_puuids[m][p]
+                team_lookup[f"{match_id}:{p + 1}"] = (puuid, team_id, position)
+                participant_rows.append((
+                    puuid, match_id, team_id,
+                    int(kills[m, p]), int(assists[m, p]), int(deaths[m, p]),
+                    float((kills[m, p] + assists[m, p]) / max(1, deaths[m, p])),
+                    int(gold[m, p]), float(gold[m, p] / duration_min[m]), int(cs[m, p]),
+                    int(small[m, p, 0]), int(cs[m, p] * 10 / duration_min[m]),
+                    float(dpm[m, p]), float(kill_participation[m, p]),
+                    int(small[m, p, 1]), int(wards[m, p]), int(small[m, p, 2]), int(vision[m, p]),
+                    int(small[m, p, 3]),
+                    *(int(value) for value in pings[m, p]),
+                    champions[champion_index[m, p]], position, position,
+                    bool(rng.random() < 0.3), team_id == winner, "GameComplete",
+                ))
+
+        tables = [(MatchIDs, match_id_rows), (MatchDataTeams, team_rows),
+                  (MatchDataParticipants, participant_rows)]
+        if include_timeline:
+            tables.append((MatchTimeline, self._timeline_rows(match_ids, duration_s, team_lookup)))
+        return tables
+
+    def _timeline_rows(self, match_ids: List[str], duration_s: np.ndarray,
+                       team_lookup: Dict[str, tuple]) -> List[tuple]:
+        """
+        Generate one-minute position frames per participant and kill events.
+
+        Positions follow a per-participant random walk around the lane anchor of
+        the participant's team position (mirrored for the red side).
+        """
+        distributions = SyntheticDataDistributions
+        rng = self.rng
+        map_size = distributions.MAP_SIZE
+        anchors = np.array([distributions.POSITION_ANCHORS[position]
+                            for position in distributions.TEAM_POSITIONS] * 2, dtype=float)
+        anchors[5:] = map_size - anchors[5:][:, ::-1]
+
+        rows: List[tuple] = []
+        for m, match_id in enumerate(match_ids):
+            frames = int(duration_s[m] // 60) + 1
+            steps = rng.normal(0, 900, size=(frames, 10, 2)).cumsum(axis=0) * 0.35
+            positions = (anchors[None, :, :] + steps).clip(0, map_size).astype(int)
+            positions[0] = np.where(np.arange(10)[:, None] < 5, 560, map_size - 560)
+
+            participants = [team_lookup[f"{match_id}:{p + 1}"] for p in range(10)]
+            puuids, team_ids, team_positions = (list(column) for column in zip(*participants))
+            rows.extend(zip(repeat(match_id), puuids * frames,
+                            np.repeat(np.arange(frames) * 60_000, 10).tolist(),
+                            team_ids * frames, list(range(1, 11)) * frames, team_positions * frames,
+                            positions[:, :, 0].ravel().tolist(), positions[:, :, 1].ravel().tolist(),
+                            repeat("POSITION"), repeat("PARTICIPANT_FRAME"), repeat(None)))
+
+            kill_count = int(rng.poisson(26))
+            killers = rng.integers(1, 11, size=kill_count)
+            # Victims are on the other team.
+            victims = rng.integers(1, 6, size=kill_count) + np.where(killers <= 5, 5, 0)
+            kill_times = np.sort(rng.integers(90_000, int(duration_s[m]) * 1000, size=kill_count))
+            kill_frames = np.minimum(kill_times // 60_000, frames - 1)
+            jitter = rng.normal(0, 700, size=(kill_count, 2))
+            for killer, victim, kill_time, kill_frame, offset in zip(killers, victims, kill_times, kill_frames,
+                                                                     jitter):
+                puuid, team_id, position = participants[killer - 1]
+                x, y = (positions[kill_frame, killer - 1] + offset).clip(0, map_size).astype(int)
+                rows.append((match_id, puuid, int(kill_time), team_id, int(killer), position,
+                             int(x), int(y), "CHAMPION_KILL", "KILL", participants[victim - 1][0]))
+
+        return rows
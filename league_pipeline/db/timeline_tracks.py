@@ -0,0 +1,202 @@
+from collections import defaultdict
+from logging import Logger, getLogger
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import inspect
+
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.bulk_insert import SQLITE_MAX_VARIABLES, as_tuples, bulk_insert, table_layout
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import HeatmapWatermarks, MatchTimeline, MatchTimelineTracks
+
+
+# Column order of the arrays returned by decode_track().
+TRACK_COLUMNS = ("timestamp", "x", "y")
+
+# Column order of the arrays returned by decode_economy(), with the
+# participantFrames field each column is read from.
+ECONOMY_COLUMNS = ("timestamp", "total_gold", "xp", "minions_killed", "jungle_minions_killed", "level")
+ECONOMY_FIELDS = ("totalGold", "xp", "minionsKilled", "jungleMinionsKilled", "level")
+
+SERIES_DTYPE = np.dtype("<i4")
+
+# Positions of the Match Timeline columns in its row tuples (see table_layout).
+(_MATCH_ID, _PUUID, _TIMESTAMP, _TEAM_ID, _IN_GAME_ID,
+ _TEAM_POSITION, _X, _Y, _EVENT, _TYPE, _VICTIM_PUUID) = range(len(table_layout(MatchTimeline)[0]))
+
+
+def encode_series(*columns: Sequence[int], delta: bool = True) -> bytes:
+    """
+    Pack equally long integer series into an int32 blob.
+
+    The blob holds one little-endian int32 run per column. With delta=True
+    each run stores its first value followed by the differences between
+    consecutive values, and reads back with a single prefix sum; without it
+    the values are stored as they are, so any frame can be read directly.
+
+    Args:
+        *columns (Sequence[int]): One sequence per column, one value per frame.
+        delta (bool): Delta-encode the runs.
+
+    Returns:
+        bytes: 4 bytes per column and frame.
+    """
+    series = np.array(columns, dtype=np.int64)
+    if delta:
+        series = np.diff(series, axis=1, prepend=0)
+    return series.astype(SERIES_DTYPE).tobytes()
+
+
+def decode_series(blob: bytes, column_count: int, delta: bool = True) -> np.ndarray:
+    """
+    Unpack a blob written by encode_series().
+
+    The blob is read in place with np.frombuffer; plain series come back as a
+    read-only view of the blob, delta-encoded ones allocate for the prefix sum.
+
+    Args:
+        blob (bytes): Series blob.
+        column_count (int): Number of columns the blob was encoded with.
+        delta (bool): Whether the blob was delta-encoded.
+
+    Returns:
+        np.ndarray: int32 array of shape (frames, column_count).
+    """
+    runs = np.frombuffer(blob, dtype=SERIES_DTYPE).reshape(column_count, -1)
+    if delta:
+        runs = np.cumsum(runs, axis=1, dtype=np.int32)
+    return runs.T
+
+
+def encode_track(timestamps: Sequence[int], xs: Sequence[int], ys: Sequence[int]) -> bytes:
+    """
+    Pack a position track into a delta-encoded int32 blob (12 bytes per frame).
+    """
+    return encode_series(timestamps, xs, ys)
+
+
+def decode_track(blob: bytes) -> np.ndarray:
+    """
+    Unpack a track blob into an int32 array of shape (frames, 3), columns as in TRACK_COLUMNS.
+    """
+    return decode_series(blob, len(TRACK_COLUMNS))
+
+
+def encode_economy(*columns: Sequence[int]) -> bytes:
+    """
+    Pack economy series (ECONOMY_COLUMNS order) without delta encoding.
+
+    Economy values are read at arbitrary frames in bulk (see
+    analytics/lane_features.py), which a plain layout serves with a single
+    gather; deltas would not make the fixed-width int32 blob any smaller.
+    """
+    return encode_series(*columns, delta=False)
+
+
+def decode_economy(blob: bytes) -> np.ndarray:
+    """
+    Unpack an economy blob into an int32 view of shape (frames, 6), columns as in ECONOMY_COLUMNS.
+    """
+    return decode_series(blob, len(ECONOMY_COLUMNS), delta=False)
+
+
+def split_timeline_rows(rows: Iterable[Union[tuple, dict]]) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Separate timeline records into event rows and packed position tracks.
+
+    Position records are grouped per participant, ordered by timestamp and
+    de-duplicated (the rows schema keys them by (match, puuid, timestamp), so
+    a repeated frame would have been ignored on insert as well).
+
+    Args:
+        rows (Iterable[tuple | dict]): Match Timeline rows in column order, as
+                                       produced by transform_timeline (dicts are converted).
+
+    Returns:
+        tuple: (event rows for MatchTimeline, track rows for MatchTimelineTracks),
+               both in table column order.
+    """
+    rows = as_tuples(MatchTimeline, rows if isinstance(rows, list) else list(rows))
+    events: List[tuple] = []
+    positions: Dict[Tuple[str, str], Dict[int, tuple]] = defaultdict(dict)
+
+    for row in rows:
+        if row[_EVENT] == EventTypes.POSITION:
+            positions[(row[_MATCH_ID], row[_PUUID])].setdefault(row[_TIMESTAMP], row)
+        else:
+            events.append(row)
+
+    tracks = []
+    for (match_id, puuid), frames in positions.items():
+        ordered = [frames[timestamp] for timestamp in sorted(frames)]
+        first = ordered[0]
+        tracks.append((match_id, puuid, first[_TEAM_ID], first[_IN_GAME_ID], first[_TEAM_POSITION], len(ordered),
+                       encode_track([frame[_TIMESTAMP] for frame in ordered],
+                                    [frame[_X] for frame in ordered],
+                                    [frame[_Y] for frame in ordered])))
+
+    return events, tracks
+
+
+def pack_existing_positions(url: str, logger: Optional[Logger] = None, batch_matches: int = 1_000,
+                            heatmaps=None) -> int:
+    """
+    Move the POSITION rows of an existing database into the tracks table.
+
+    Matches are converted in batches; each batch inserts its tracks and
+    deletes its position rows in one transaction, so an interrupted run can
+    simply be started again. Run VACUUM afterwards to give the space back.
+
+    If the database has materialized heatmaps, each transaction first counts
+    every row the heatmaps have not counted yet and finally moves the
+    watermarks to the end of both tables, so the packed positions are
+    counted exactly once.
+
+    Args:
+        url (str): SQLAlchemy URL of the database.
+        logger (Optional[Logger]): Logger for progress messages.
+        batch_matches (int): Matches converted per transaction.
+        heatmaps (Optional[HeatmapMaterializer]): Heatmaps to keep exact
+                                                  (default: created when the
+                                                  database has heatmaps).
+
+    Returns:
+        int: Number of tracks written.
+    """
+    engine = get_engine(url)
+    if heatmaps is None and inspect(engine).has_table(HeatmapWatermarks.__tablename__):
+        # Imported here: the heatmaps module decodes tracks with this one.
+        from league_pipeline.analytics.heatmaps import HeatmapMaterializer
+        heatmaps = HeatmapMaterializer(url, logger or getLogger(__name__))
+    timeline = MatchTimeline.__tablename__
+    columns = ", ".join(f'"{name}"' for name in table_layout(MatchTimeline)[0])
+    batch_matches = min(batch_matches, SQLITE_MAX_VARIABLES - 1)
+    written = 0
+
+    with engine.connect() as connection:
+        match_ids = [row[0] for row in connection.exec_driver_sql(
+            f'SELECT DISTINCT "matchId" FROM "{timeline}" WHERE "event" = ?', (EventTypes.POSITION,))]
+
+    for start in range(0, len(match_ids), batch_matches):
+        batch = match_ids[start:start + batch_matches]
+        placeholders = ", ".join("?" * len(batch))
+        with engine.begin() as connection:
+            rows = connection.exec_driver_sql(
+                f'SELECT {columns} FROM "{timeline}" '
+                f'WHERE "event" = ? AND "matchId" IN ({placeholders})', (EventTypes.POSITION, *batch))
+            _, tracks = split_timeline_rows(tuple(row) for row in rows)
+
+            if heatmaps:
+                heatmaps.catch_up(connection)
+            bulk_insert(connection, MatchTimelineTracks, tracks)
+            connection.exec_driver_sql(f'DELETE FROM "{timeline}" '
+                                       f'WHERE "event" = ? AND "matchId" IN ({placeholders})',
+                                       (EventTypes.POSITION, *batch))
+            if heatmaps:
+                heatmaps.skip_to_end(connection)
+        written += len(tracks)
+        if logger:
+            logger.info(f"Packed position tracks | matches: {start + len(batch)}/{len(match_ids)}")
+
+    return written
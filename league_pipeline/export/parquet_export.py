@@ -0,0 +1,261 @@
+import datetime
+import json
+import os
+import re
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Type, Union
+
+from sqlalchemy import Boolean, Float, Integer, LargeBinary, inspect
+
+from league_pipeline.constants.database_constants import (DatabaseConfiguration, DatabaseName,
+                                                          ParquetExportConfig)
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.constants.pipeline_constants import StorageConfig
+from league_pipeline.db.dictionary_encoding import rowid_source
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import Base, DimensionValues, MatchIDs, Summoners
+from league_pipeline.utils.match_routing import continent_from_match_id_sql
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+except ImportError:  # optional dependency
+    pyarrow = None
+
+
+class ParquetExporter:
+    """
+    Incremental export of the pipeline tables to partitioned Parquet datasets.
+
+    Every table becomes a Hive-partitioned dataset under export_root:
+
+        <export_root>/<table>/continent=<REGION>/collection_date=<YYYY-MM-DD>/part-<rowid>-<n>.parquet
+
+    so Spark, pandas or DuckDB can prune partitions and read only the columns
+    they need. The continent comes from the table's continentalRegion column
+    or, failing that, from the matchId prefix. The collection date is the
+    dateCollected of the row's summoner: Summoners' own, or for match tables
+    that of the summoner whose match list the match was found in (Match
+    IDs.puuId). Both partition values depend only on the stored data, so a
+    chunk written again by a later run lands on the same files.
+
+    By default every pipeline table of Base.metadata that exists in the
+    database is exported; derived tables (StorageConfig.DERIVED_TABLES),
+    which are updated in place, and the dictionary of encoded columns are
+    not. Binary columns (tracks, economy series) are exported as binary.
+
+    Each run exports only rows whose SQLite rowid is above the watermark kept
+    in the export state file. The watermark is saved after each chunk is
+    written, and part files are named after the first rowid of their chunk, so
+    re-running after an interrupted export overwrites the unfinished files
+    instead of duplicating rows. Deletes and updates in SQLite are not
+    exported, and WITHOUT ROWID tables cannot be exported incrementally.
+
+    String columns are dictionary encoded, except a table's single-column
+    primary key (unique values gain nothing), and pages are compressed with
+    ParquetExportConfig.COMPRESSION.
+
+    Attributes:
+        sqlite_url (str): SQLAlchemy URL of the source SQLite database.
+        export_root (Path): Directory holding one dataset per table.
+        tables (List[Type[Base]]): Models exported by export().
+        logger (Logger): Logger instance for export progress.
+        chunk_size (int): Rows read from SQLite and written per step.
+        state_path (Path): JSON file with the per-table rowid watermarks.
+
+    Raises:
+        ImportError: If the pyarrow package is not installed.
+    """
+
+    STATE_FILE = "_export_state.json"
+    CONTINENT_PARTITION = "continent"
+    DATE_PARTITION = "collection_date"
+    DEFAULT_TABLES = tuple(mapper.class_ for table in Base.metadata.sorted_tables
+                           for mapper in Base.registry.mappers
+                           if mapper.local_table is table and table.name not in StorageConfig.DERIVED_TABLES
+                           and table is not DimensionValues.__table__)
+
+    def __init__(self, logger: Logger,
+                 sqlite_url: Optional[str] = None,
+                 export_root: Union[str, Path] = Paths.EXPORTS,
+                 tables: Sequence[Type[Base]] = DEFAULT_TABLES,
+                 chunk_size: int = ParquetExportConfig.ROWS_PER_CHUNK.value) -> None:
+        if pyarrow is None:
+            raise ImportError("ParquetExporter requires the optional 'pyarrow' package")
+
+        self.sqlite_url = sqlite_url or DatabaseConfiguration.url.value.format(
+            location=Paths.DATA, name=DatabaseName.DATABASE_NAME.value)
+        self.export_root = Path(export_root)
+        self.tables = list(tables)
+        self.logger = logger
+        self.chunk_size = chunk_size
+        self.state_path = self.export_root / self.STATE_FILE
+
+    @staticmethod
+    def dataset_name(table: Type[Base]) -> str:
+        """
+        Return the directory name of a table's dataset ("Match Data (Teams)" -> "match_data_teams").
+        """
+        return re.sub(r"[^0-9a-z]+", "_", table.__tablename__.lower()).strip("_")
+
+    @staticmethod
+    def _arrow_type(column):
+        if isinstance(column.type, Boolean):
+            return pyarrow.bool_()
+        if isinstance(column.type, Integer):
+            return pyarrow.int64()
+        if isinstance(column.type, Float):
+            return pyarrow.float64()
+        if isinstance(column.type, LargeBinary):
+            return pyarrow.binary()
+        return pyarrow.string()
+
+    @staticmethod
+    def _sqlite_cast(column) -> str:
+        if isinstance(column.type, (Boolean, Integer)):
+            return "INTEGER"
+        if isinstance(column.type, Float):
+            return "REAL"
+        if isinstance(column.type, LargeBinary):
+            return "BLOB"
+        return "TEXT"
+
+    def _schema(self, table: Type[Base]):
+        fields = [pyarrow.field(column.name, self._arrow_type(column)) for column in table.__table__.columns]
+        fields += [pyarrow.field(self.CONTINENT_PARTITION, pyarrow.string()),
+                   pyarrow.field(self.DATE_PARTITION, pyarrow.string())]
+        return pyarrow.schema(fields)
+
+    @staticmethod
+    def _to_arrow(values: Sequence, arrow_type):
+        # SQLite hands booleans back as 0/1, which pyarrow does not convert implicitly.
+        if arrow_type == pyarrow.bool_():
+            return pyarrow.array(values, type=pyarrow.int8()).cast(arrow_type)
+        return pyarrow.array(values, type=arrow_type)
+
+    @staticmethod
+    def _dictionary_columns(table: Type[Base]) -> List[str]:
+        primary_key = list(table.__table__.primary_key.columns)
+        unique_key = primary_key[0].name if len(primary_key) == 1 else None
+        return [column.name for column in table.__table__.columns
+                if not isinstance(column.type, (Boolean, Integer, Float, LargeBinary))
+                and column.name != unique_key]
+
+    def _partition_expressions(self, table: Type[Base]) -> List[str]:
+        """
+        SQL expressions yielding the continent and collection date of each row.
+        """
+        columns = table.__table__.columns
+        continent_sources = []
+        if "continentalRegion" in columns:
+            continent_sources.append('"continentalRegion"')
+        if "matchId" in columns:
+            continent_sources.append(continent_from_match_id_sql())
+        continent_sources.append(f"'{ParquetExportConfig.UNKNOWN_PARTITION.value}'")
+
+        name = table.__tablename__
+        if "dateCollected" in columns:
+            date = '"dateCollected"'
+        elif "puuId" in columns and table is MatchIDs:
+            date = (f'(SELECT s."dateCollected" FROM "{Summoners.__tablename__}" s '
+                    f'WHERE s."puuId" = "{name}"."puuId")')
+        elif "matchId" in columns:
+            date = (f'(SELECT s."dateCollected" FROM "{MatchIDs.__tablename__}" m '
+                    f'JOIN "{Summoners.__tablename__}" s ON s."puuId" = m."puuId" '
+                    f'WHERE m."matchId" = "{name}"."matchId")')
+        else:
+            date = "NULL"
+
+        unknown = f"'{ParquetExportConfig.UNKNOWN_PARTITION.value}'"
+        return [f"COALESCE({', '.join(continent_sources)})", f"COALESCE({date}, {unknown})"]
+
+    def load_state(self) -> Dict[str, int]:
+        """
+        Return the exported rowid watermark of every table exported so far.
+        """
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r", encoding="utf-8") as file:
+            return json.load(file)["watermarks"]
+
+    def _save_state(self, watermarks: Dict[str, int]) -> None:
+        self.export_root.mkdir(parents=True, exist_ok=True)
+        staging = self.state_path.with_suffix(".tmp")
+        with open(staging, "w", encoding="utf-8") as file:
+            json.dump({"watermarks": watermarks,
+                       "updated": datetime.datetime.now().isoformat(timespec="seconds")}, file, indent=2)
+        os.replace(staging, self.state_path)
+
+    def export(self, tables: Optional[Sequence[Type[Base]]] = None) -> Dict[str, int]:
+        """
+        Append the rows added since the previous export to the Parquet datasets.
+
+        Tables missing from the database (e.g. Match Timeline (Tracks) in
+        "rows" mode) are skipped.
+
+        Args:
+            tables (Optional[Sequence[Type[Base]]]): Subset of the exported tables (default: all).
+
+        Returns:
+            dict: Rows exported per table name.
+        """
+        watermarks = self.load_state()
+        exported: Dict[str, int] = {}
+
+        engine = get_engine(self.sqlite_url)
+        inspector = inspect(engine)
+        stored = set(inspector.get_table_names()) | set(inspector.get_view_names())
+        tables = [table for table in tables or self.tables if table.__tablename__ in stored]
+        with engine.connect() as connection:
+            sources = {table: rowid_source(connection, table.__tablename__) for table in tables}
+
+        connection = engine.raw_connection()
+        try:
+            for table in tables:
+                exported[table.__tablename__] = self._export_table(connection.cursor(), table, sources[table],
+                                                                   watermarks)
+        finally:
+            connection.close()
+
+        self.logger.info(f"Parquet export finished | {exported}")
+        return exported
+
+    def _export_table(self, cursor, table: Type[Base], source: str, watermarks: Dict[str, int]) -> int:
+        name = table.__tablename__
+        columns = list(table.__table__.columns)
+        select_columns = ", ".join([f'CAST("{column.name}" AS {self._sqlite_cast(column)})' for column in columns]
+                                   + self._partition_expressions(table))
+        schema = self._schema(table)
+        write_options = pyarrow.dataset.ParquetFileFormat().make_write_options(
+            compression=ParquetExportConfig.COMPRESSION.value,
+            compression_level=ParquetExportConfig.COMPRESSION_LEVEL.value,
+            use_dictionary=self._dictionary_columns(table))
+        partitioning = pyarrow.dataset.partitioning(
+            pyarrow.schema([schema.field(self.CONTINENT_PARTITION), schema.field(self.DATE_PARTITION)]),
+            flavor="hive")
+
+        last_rowid = watermarks.get(name, 0)
+        exported = 0
+        while True:
+            rows = cursor.execute(f'SELECT rowid, {select_columns} FROM {source} AS "{name}" '
+                                  f'WHERE rowid > :last_rowid ORDER BY rowid LIMIT :limit',
+                                  {"last_rowid": last_rowid, "limit": self.chunk_size}).fetchall()
+            if not rows:
+                return exported
+
+            first_rowid = rows[0][0]
+            values = list(zip(*rows))[1:]
+            chunk = pyarrow.table([self._to_arrow(column, field.type) for column, field in zip(values, schema)],
+                                  schema=schema)
+            pyarrow.dataset.write_dataset(chunk, self.export_root / self.dataset_name(table),
+                                          format="parquet",
+                                          partitioning=partitioning,
+                                          basename_template=f"part-{first_rowid:012d}-{{i}}.parquet",
+                                          existing_data_behavior="overwrite_or_ignore",
+                                          file_options=write_options)
+
+            last_rowid = rows[-1][0]
+            watermarks[name] = last_rowid
+            self._save_state(watermarks)
+            exported += len(rows)
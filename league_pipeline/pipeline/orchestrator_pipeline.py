@@ -15,9 +15,14 @@ Example:
 """
 
 import asyncio
+import os
+from sqlalchemy.engine import make_url
 from league_pipeline.constants.pipeline_constants import Stages
 from league_pipeline.config.logger_config_setup import logging_setup
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler
 from league_pipeline.constants.regions import Region, ContinentalRegion
 from league_pipeline.services.summoner_service import SummonerCollectionService
 from league_pipeline.services.match_id_service import MatchIDCollectionService
@@ -27,8 +32,19 @@ from league_pipeline.constants.file_folder_paths import Paths
 from league_pipeline.constants.database_constants import DatabaseName
 from league_pipeline.constants.regions import Region, ContinentalRegion
 from league_pipeline.constants.league_ranks import RankedQueue, QueueMatchV5, RankedTier, RankedDivision
-from league_pipeline.constants.pipeline_constants import DataProcessingConfig
+from league_pipeline.constants.pipeline_constants import (DataProcessingConfig, DatabaseWriterConfig, StorageConfig,
+                                                          TransformExecutionConfig, HttpClientConfig,
+                                                          AdaptiveConcurrencyConfig, CircuitBreakerConfig)
+from league_pipeline.constants.database_constants import DatabaseConfiguration, HeatmapConfig
+from league_pipeline.analytics.heatmaps import HeatmapMaterializer
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.sharding import ShardedStorage, ShardedWriter, ShardedDatabaseQuery
+from league_pipeline.db.db_connection import DatabaseQuery
 from league_pipeline.key.key_handler import load_api_key
+from league_pipeline.utils.transform_pool import TransformPool
+from league_pipeline.pipeline.planner import plan_pipeline
+from league_pipeline.utils.http_client import create_client_session, prewarm_connections
+from typing import List
 
 
 class PipelineOrchestrator:
@@ -47,6 +63,15 @@ class PipelineOrchestrator:
         MatchIDCollectionService: Service for collecting match IDs.
         MatchDataService: Service for collecting match data.
         MatchTimelineService: Service for collecting match timeline data.
+        DatabaseWriter: Background group-commit writer shared by all services (or None).
+        Storage: Shard layout when StorageConfig.MODE is "sharded" (or None).
+        DatabaseReader: Query object shared by the services in sharded mode (or None).
+        TransformPool: Decode/transform executor shared by the match data and timeline services (or None).
+        ConcurrencyLocal: Adaptive in-flight limit per platform region (or None).
+        ConcurrencyContinent: Adaptive in-flight limit per continental region (or None).
+        CircuitBreaker: Circuit breakers per region and endpoint shared by all services (or None).
+        RetryScheduler: Delay queue and retry budget shared by all services.
+        Heatmaps: Heatmap materializer refreshed as timelines are stored (or None).
     """
     
     def __init__(self):
@@ -59,6 +84,13 @@ class PipelineOrchestrator:
         self.logger = logging_setup("log_config.json", "pipeline_logger")
         self.TokenBucketLocal = TokenBucket(Region, self.logger)
         self.TokenBucketContinent = TokenBucket(ContinentalRegion, self.logger)
+        self.ConcurrencyLocal = None
+        self.ConcurrencyContinent = None
+        if AdaptiveConcurrencyConfig.ENABLED:
+            self.ConcurrencyLocal = AdaptiveConcurrency(Region, self.logger)
+            self.ConcurrencyContinent = AdaptiveConcurrency(ContinentalRegion, self.logger)
+        self.CircuitBreaker = CircuitBreaker(self.logger) if CircuitBreakerConfig.ENABLED else None
+        self.RetryScheduler = RetryScheduler(self.logger)
         self.api_key = load_api_key()
         
         # Initialize service attributes
@@ -66,6 +98,11 @@ class PipelineOrchestrator:
         self.MatchIDCollectionService = None
         self.MatchDataService = None
         self.MatchTimelineService = None
+        self.DatabaseWriter = None
+        self.Storage = None
+        self.DatabaseReader = None
+        self.TransformPool = None
+        self.Heatmaps = None
 
     def activate_data_collection_services(self):
         """
@@ -78,12 +115,43 @@ class PipelineOrchestrator:
         - Stage 4: Match timeline data collection
         
         Only services for active stages (marked as 1 in TO_PROCESS) are initialized.
+        If DatabaseWriterConfig.ENABLED is set, a single group-commit writer is
+        started and shared by every service. In sharded storage mode a sharded
+        writer and reader are used instead (the writer is always enabled then).
+        With stage 4 active and HeatmapConfig.INCREMENTAL set, the heatmaps are
+        refreshed after every writer commit of a timeline table (single
+        database mode only; merging the shards refreshes them).
+        Stages 3 and 4 share one TransformPool in TransformExecutionConfig.MODE.
         """
         stage_1 = Stages.TO_PROCESS[0]
         stage_2 = Stages.TO_PROCESS[1]
         stage_3 = Stages.TO_PROCESS[2]
         stage_4 = Stages.TO_PROCESS[3]
 
+        if StorageConfig.MODE == "sharded" and self.Storage is None:
+            self.logger.info("Starting sharded storage with one writer per shard")
+            self.Storage = ShardedStorage(Paths.DATA, DatabaseName.DATABASE_NAME.value, self.logger).create()
+            self.DatabaseWriter = ShardedWriter(self.Storage, self.logger).start()
+            self.DatabaseReader = ShardedDatabaseQuery(self.Storage)
+
+        database_url = DatabaseConfiguration.url.value.format(location=Paths.DATA,
+                                                              name=DatabaseName.DATABASE_NAME.value)
+        if DatabaseWriterConfig.ENABLED and self.DatabaseWriter is None:
+            self.logger.info("Starting group commit database writer")
+            self.DatabaseWriter = GroupCommitWriter(
+                sql_engine_url=database_url,
+                logger=self.logger
+            ).start()
+
+        if stage_4 and HeatmapConfig.INCREMENTAL.value and self.Storage is None and self.Heatmaps is None:
+            self.logger.info("Refreshing heatmaps as timelines are stored")
+            self.Heatmaps = HeatmapMaterializer(database_url, self.logger)
+            if self.DatabaseWriter:
+                self.Heatmaps.attach_to(self.DatabaseWriter)
+
+        if (stage_3 or stage_4) and self.TransformPool is None:
+            self.TransformPool = TransformPool(self.logger, mode=TransformExecutionConfig.MODE)
+
         if stage_1:
             self.logger.info("Activating Stage 1: Summoner Collection Service")
             self.SummonerCollectionService = \
@@ -97,7 +165,11 @@ class PipelineOrchestrator:
                     pages=DataProcessingConfig.PAGE_LIMIT,
                     divisions=RankedDivision,
                     logger=self.logger,
-                    token_bucket=self.TokenBucketLocal
+                    token_bucket=self.TokenBucketLocal,
+                    writer=self.DatabaseWriter,
+                    concurrency=self.ConcurrencyLocal,
+                    circuit_breaker=self.CircuitBreaker,
+                    retry_scheduler=self.RetryScheduler
                 )
             
         if stage_2:
@@ -115,7 +187,13 @@ class PipelineOrchestrator:
                     logger=self.logger,
                     token_bucket_continental=self.TokenBucketContinent,
                     token_bucket_local=self.TokenBucketLocal,
-                    game_type=QueueMatchV5.RANKED.value
+                    game_type=QueueMatchV5.RANKED.value,
+                    writer=self.DatabaseWriter,
+                    database_query=self.DatabaseReader,
+                    concurrency_continental=self.ConcurrencyContinent,
+                    concurrency_local=self.ConcurrencyLocal,
+                    circuit_breaker=self.CircuitBreaker,
+                    retry_scheduler=self.RetryScheduler
                 )
             
         if stage_3:
@@ -127,7 +205,13 @@ class PipelineOrchestrator:
                     continents=ContinentalRegion,
                     api_key=self.api_key,
                     logger=self.logger,
-                    token_bucket=self.TokenBucketContinent
+                    token_bucket=self.TokenBucketContinent,
+                    writer=self.DatabaseWriter,
+                    database_query=self.DatabaseReader,
+                    transform_pool=self.TransformPool,
+                    concurrency=self.ConcurrencyContinent,
+                    circuit_breaker=self.CircuitBreaker,
+                    retry_scheduler=self.RetryScheduler
                 )
             
         if stage_4:
@@ -139,7 +223,13 @@ class PipelineOrchestrator:
                     continents=ContinentalRegion,
                     api_key=self.api_key,
                     logger=self.logger,
-                    token_bucket=self.TokenBucketContinent
+                    token_bucket=self.TokenBucketContinent,
+                    writer=self.DatabaseWriter,
+                    database_query=self.DatabaseReader,
+                    transform_pool=self.TransformPool,
+                    concurrency=self.ConcurrencyContinent,
+                    circuit_breaker=self.CircuitBreaker,
+                    retry_scheduler=self.RetryScheduler
                 )
 
     def start_pipeline(self):
@@ -153,53 +243,158 @@ class PipelineOrchestrator:
         4. Collect match timeline events
         
         Each stage runs asynchronously and only executes if the corresponding
-        service was activated in activate_data_collection_services().
-        
-        The @stage_starter decorator provides additional logging and timing
-        functionality for monitoring pipeline execution.
+        service was activated in activate_data_collection_services(). All
+        stages run in one event loop and share one HTTP session (see
+        HttpClientConfig), so connections and DNS results carry over from
+        one stage to the next.
         """
-        stage_1 = Stages.TO_PROCESS[0]
-        stage_2 = Stages.TO_PROCESS[1]
-        stage_3 = Stages.TO_PROCESS[2]
-        stage_4 = Stages.TO_PROCESS[3]
+        asyncio.run(self._run_stages())
+        self.logger.info("Pipeline execution completed")
 
-        if stage_1 and self.SummonerCollectionService:
-            self.logger.info("Starting Stage 1: Summoner Data Collection")
-            try:
-                asyncio.run(self.SummonerCollectionService.async_get_and_save_summoner_entries())
-                self.logger.info("Stage 1 completed successfully")
-            except Exception as e:
-                self.logger.error(f"Stage 1 failed with error: {str(e)}")
-                raise
+    def _stage_hosts(self) -> List[str]:
+        """
+        Base URLs the active stages call: platform hosts for stages 1-2, continental hosts for stages 2-4.
+        """
+        stage_1, stage_2, stage_3, stage_4 = Stages.TO_PROCESS[:4]
+        hosts = []
+        if stage_1 or stage_2:
+            hosts += [region.value for region in Region]
+        if stage_2 or stage_3 or stage_4:
+            hosts += [continent.value for continent in ContinentalRegion]
+        return hosts
 
-        if stage_2 and self.MatchIDCollectionService:
-            self.logger.info("Starting Stage 2: Match ID Collection")
-            try:
-                asyncio.run(self.MatchIDCollectionService.async_get_and_save_match_ids())
-                self.logger.info("Stage 2 completed successfully")
-            except Exception as e:
-                self.logger.error(f"Stage 2 failed with error: {str(e)}")
-                raise
+    async def _run_stages(self):
+        """
+        Run the active stages one after another on a single shared session.
+        """
+        stages = [
+            ("Summoner Data Collection", self.SummonerCollectionService
+             and self.SummonerCollectionService.async_get_and_save_summoner_entries),
+            ("Match ID Collection", self.MatchIDCollectionService
+             and self.MatchIDCollectionService.async_get_and_save_match_ids),
+            ("Match Data Collection", self.MatchDataService
+             and self.MatchDataService.async_get_and_save_match_data),
+            ("Match Timeline Collection", self.MatchTimelineService
+             and self.MatchTimelineService.async_get_and_save_match_data),
+        ]
+
+        async with create_client_session() as session:
+            if HttpClientConfig.PREWARM:
+                await prewarm_connections(session, self._stage_hosts(), self.logger)
+
+            monitor = None
+            if AdaptiveConcurrencyConfig.LOG_INTERVAL and (self.ConcurrencyLocal or self.ConcurrencyContinent):
+                monitor = asyncio.create_task(self._log_concurrency_periodically())
 
-        if stage_3 and self.MatchDataService:
-            self.logger.info("Starting Stage 3: Match Data Collection")
             try:
-                asyncio.run(self.MatchDataService.async_get_and_save_match_data())
-                self.logger.info("Stage 3 completed successfully")
-            except Exception as e:
-                self.logger.error(f"Stage 3 failed with error: {str(e)}")
-                raise
+                await self._run_active_stages(stages, session)
+            finally:
+                if monitor:
+                    monitor.cancel()
 
-        if stage_4 and self.MatchTimelineService:
-            self.logger.info("Starting Stage 4: Match Timeline Collection")
+    async def _run_active_stages(self, stages: list, session):
+        """
+        Run the collect coroutine of every active stage, flushing the writer after each.
+        """
+        for stage, (active, (description, collect)) in enumerate(zip(Stages.TO_PROCESS, stages), start=1):
+            if not (active and collect):
+                continue
+            self.logger.info(f"Starting Stage {stage}: {description}")
             try:
-                asyncio.run(self.MatchTimelineService.async_get_and_save_match_data())
-                self.logger.info("Stage 4 completed successfully")
+                await collect(session)
+                # The flush blocks until the writer thread has committed;
+                # off the loop so open connections keep being served.
+                await asyncio.to_thread(self._flush_database_writer)
+                self._log_concurrency()
+                self.logger.info(f"Stage {stage} completed successfully")
             except Exception as e:
-                self.logger.error(f"Stage 4 failed with error: {str(e)}")
+                self.logger.error(f"Stage {stage} failed with error: {str(e)}")
                 raise
 
-        self.logger.info("Pipeline execution completed")
+    def _log_concurrency(self):
+        """
+        Log the adaptive concurrency state of every region that has sent requests,
+        every circuit that is not closed or has opened before, and the retry scheduler.
+        """
+        for name, controller in (("Platform", self.ConcurrencyLocal), ("Continental", self.ConcurrencyContinent)):
+            if controller is None:
+                continue
+            for region, state in controller.snapshot().items():
+                if state["successes"] or state["rate_limited"] or state["errors"]:
+                    self.logger.info(f"Concurrency | {name} Region: {region} | {state}")
+        if self.CircuitBreaker:
+            for circuit, state in self.CircuitBreaker.snapshot().items():
+                if state["opened"] or state["state"] != "closed":
+                    self.logger.info(f"Circuit | {circuit} | {state}")
+        self.logger.info(f"Retries | {self.RetryScheduler.snapshot()}")
+
+    async def _log_concurrency_periodically(self):
+        """
+        Log the concurrency snapshot every AdaptiveConcurrencyConfig.LOG_INTERVAL seconds until cancelled.
+        """
+        while True:
+            await asyncio.sleep(AdaptiveConcurrencyConfig.LOG_INTERVAL)
+            self._log_concurrency()
+
+    def _flush_database_writer(self):
+        """
+        Commit every row queued by the finished stage before the next stage reads it.
+        
+        Without a writer the services commit their own rows, so the heatmaps
+        are refreshed here instead of after each commit.
+        """
+        if self.DatabaseWriter:
+            self.DatabaseWriter.flush()
+        elif self.Heatmaps:
+            self.Heatmaps.refresh()
+
+    def close(self):
+        """
+        Flush and stop the group commit writer, release the shard readers and stop the transform pool, if started.
+        """
+        writer, self.DatabaseWriter = self.DatabaseWriter, None
+        if writer:
+            writer.close()
+        storage, self.Storage = self.Storage, None
+        if storage:
+            storage.close()
+        transform_pool, self.TransformPool = self.TransformPool, None
+        if transform_pool:
+            transform_pool.close()
+
+    def plan(self) -> dict:
+        """
+        Predict the requests per stage and bucket and the wall time of the
+        configured run, without any HTTP call (see pipeline/planner.py).
+        
+        The history of earlier runs is read from the database (or every shard
+        file) if it exists; otherwise the plan uses PlanningConfig alone. No
+        database file is created.
+        
+        Returns:
+            dict: The plan_pipeline() result; format_plan() renders it.
+        """
+        database_query = None
+        storage = None
+        if StorageConfig.MODE == "sharded":
+            storage = ShardedStorage(Paths.DATA, DatabaseName.DATABASE_NAME.value, self.logger)
+            if storage.exists():
+                database_query = ShardedDatabaseQuery(storage)
+        else:
+            url = DatabaseConfiguration.url.value.format(location=Paths.DATA, name=DatabaseName.DATABASE_NAME.value)
+            if os.path.exists(make_url(url).database):
+                database_query = DatabaseQuery(str(Paths.DATA), DatabaseName.DATABASE_NAME.value)
+        if database_query is None:
+            self.logger.info("No database found | Planning from PlanningConfig only")
+
+        try:
+            plan = plan_pipeline(database_query, Stages.TO_PROCESS, self.logger)
+        finally:
+            if storage:
+                storage.close()
+        self.logger.info(f"Planned run | Wall time: {plan['wall_time']:.0f} Seconds | "
+                         f"Bottleneck: {plan['bottleneck']}")
+        return plan
 
     def run_full_pipeline(self):
         """
@@ -220,4 +415,6 @@ class PipelineOrchestrator:
         except Exception as e:
             self.logger.error(f"Full pipeline execution failed: {str(e)}")
             raise
+        finally:
+            self.close()
 
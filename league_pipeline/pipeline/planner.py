@@ -0,0 +1,256 @@
+"""
+Dry-run cost planner for the pipeline.
+
+Predicts how many requests every stage sends to every rate limit bucket
+(the platform bucket of each Region, the continental bucket of each
+ContinentalRegion) and how long the run takes, without any HTTP call:
+
+1. Request counts follow the stage configuration (regions, tiers, divisions,
+   PAGE_LIMIT, DAY_LIMIT, COUNT) and what the stages read from the database.
+   Stage 2 queries every stored summoner, stage 3 every stored match ID and
+   stage 4 every match with match data, so earlier runs add to the counts.
+2. Where the database has history, the matches per summoner and the overlap
+   of summoners' match lists (collected players per match) are taken from
+   it; PlanningConfig supplies them otherwise. The history reflects the
+   DAY_LIMIT of the runs that collected it.
+3. The token buckets are simulated with the parameters TokenBucket uses:
+   stages run one after another, the buckets of a stage in parallel, and
+   a bucket's tokens carry over (and refill) between stages. A bucket
+   cannot go faster than its workers allow at PlanningConfig.REQUEST_LATENCY.
+
+Retries, 429s and outages are not modeled, so the prediction is a lower bound.
+"""
+import logging
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from league_pipeline.constants.league_ranks import RankedDivision, RankedTier
+from league_pipeline.constants.pipeline_constants import (AdaptiveConcurrencyConfig, DataProcessingConfig,
+                                                          PlanningConfig, Stages)
+from league_pipeline.constants.regions import ContinentalRegion, Region, RegionMapping
+from league_pipeline.rate_limiting.rate_manager import TokenBucket
+
+STAGE_NAMES = ["Summoner Data Collection", "Match ID Collection", "Match Data Collection",
+               "Match Timeline Collection"]
+
+# Tiers without divisions; the summoner service requests only their first division.
+APEX_TIERS = ["CHALLENGER", "GRANDMASTER", "MASTER"]
+
+Bucket = Tuple[str, str]  # ("platform", region) or ("continental", continent)
+
+
+def history_parameters(statistics: Optional[dict]) -> dict:
+    """
+    Derive matches per summoner and collected players per match from database history.
+
+    Args:
+        statistics (Optional[dict]): DatabaseQuery.get_planning_statistics(), or None.
+
+    Returns:
+        dict: matches_per_puuid (match IDs one summoner's request returns),
+              players_per_match and source ("history" or "config") of each.
+    """
+    players_per_match, players_source = PlanningConfig.PLAYERS_PER_MATCH, "config"
+    if statistics and statistics["matches_with_data"] and statistics["known_participants"]:
+        players_per_match = max(1.0, statistics["known_participants"] / statistics["matches_with_data"])
+        players_source = "history"
+
+    matches_per_puuid = PlanningConfig.MATCHES_PER_DAY * DataProcessingConfig.DAY_LIMIT
+    matches_source = "config"
+    if statistics and statistics["puuids_with_match_ids"]:
+        # Each stored match ID is kept once, for the first summoner that returned
+        # it; the overlap restores what every summoner's request returned.
+        unique_per_puuid = sum(statistics["match_ids"].values()) / statistics["puuids_with_match_ids"]
+        matches_per_puuid = unique_per_puuid * players_per_match
+        matches_source = "history"
+
+    return {"matches_per_puuid": min(DataProcessingConfig.COUNT, matches_per_puuid),
+            "matches_source": matches_source,
+            "players_per_match": players_per_match, "players_source": players_source}
+
+
+def estimate_requests(statistics: Optional[dict] = None, stages: Sequence[bool] = Stages.TO_PROCESS,
+                      regions: Type[Enum] = Region, tiers: Type[Enum] = RankedTier,
+                      divisions: Type[Enum] = RankedDivision,
+                      pages: int = DataProcessingConfig.PAGE_LIMIT) -> List[dict]:
+    """
+    Estimate the requests every active stage sends to every bucket.
+
+    Args:
+        statistics (Optional[dict]): DatabaseQuery.get_planning_statistics(), or None.
+        stages (Sequence[bool]): Active stages (Stages.TO_PROCESS).
+        regions (Type[Enum]): Platform regions of stage 1.
+        tiers (Type[Enum]): Tiers of stage 1.
+        divisions (Type[Enum]): Divisions of stage 1.
+        pages (int): Pages per tier and division (PAGE_LIMIT).
+
+    Returns:
+        list: One dict per stage with stage, name, active, items (work items)
+              and requests (bucket mapped to its request count).
+    """
+    statistics = statistics or {}
+    history = history_parameters(statistics or None)
+    stored_summoners = statistics.get("summoners", {})
+    stored_match_ids = statistics.get("match_ids", {})
+    stored_with_data = statistics.get("match_ids_with_data", {})
+    continent_of = {name: region.value for name, region in RegionMapping.__members__.items()}
+    continents = list(ContinentalRegion.__members__)
+
+    # Stage 1: one request per page of every tier and division.
+    summoner_requests: Dict[Bucket, float] = {}
+    new_summoners: Dict[str, float] = {}
+    for region in regions.__members__:
+        requests = entries = 0.0
+        for tier in tiers.__members__:
+            if tier in APEX_TIERS:
+                players = PlanningConfig.APEX_PLAYERS.get(tier)
+                requests += pages
+                entries += min(pages * PlanningConfig.ENTRIES_PER_PAGE,
+                               players if players is not None else float("inf"))
+            else:
+                requests += pages * len(divisions.__members__)
+                entries += pages * PlanningConfig.ENTRIES_PER_PAGE * len(divisions.__members__)
+        summoner_requests[("platform", region)] = requests
+        new_summoners[region] = entries
+
+    # Stage 2: every stored summoner (the ladder mostly holds the same players
+    # as last time, so new ones count only beyond the stored ones).
+    summoners = {region: max(stored_summoners.get(region, 0), new_summoners.get(region, 0) if stages[0] else 0)
+                 for region in set(stored_summoners) | set(new_summoners)}
+    match_id_requests: Dict[Bucket, float] = {}
+    new_match_ids: Dict[str, float] = {continent: 0.0 for continent in continents}
+    for region, count in summoners.items():
+        continent = continent_of.get(region)
+        if continent is None or not count:
+            continue
+        match_id_requests[("continental", continent)] = match_id_requests.get(("continental", continent), 0) + count
+        match_id_requests[("platform", region)] = match_id_requests.get(("platform", region), 0) + count
+        new_match_ids[continent] += count * history["matches_per_puuid"] / history["players_per_match"]
+
+    # Stage 3: every stored match ID; new ones are counted in full since the
+    # DAY_LIMIT window has mostly moved on since the last run.
+    match_ids = {continent: stored_match_ids.get(continent, 0) + (new_match_ids[continent] if stages[1] else 0)
+                 for continent in continents}
+    match_data_requests = {("continental", continent): count for continent, count in match_ids.items() if count}
+
+    # Stage 4: every match with match data.
+    timeline_requests = {("continental", continent): (match_ids[continent] if stages[2]
+                                                      else stored_with_data.get(continent, 0))
+                         for continent in continents}
+    timeline_requests = {bucket: count for bucket, count in timeline_requests.items() if count}
+
+    items = [sum(summoner_requests.values()), sum(summoners.values()), sum(match_ids.values()),
+             sum(timeline_requests.values())]
+    return [{"stage": stage, "name": name, "active": bool(active), "items": count, "requests": requests}
+            for stage, (name, active, count, requests)
+            in enumerate(zip(STAGE_NAMES, stages, items,
+                             [summoner_requests, match_id_requests, match_data_requests, timeline_requests]),
+                         start=1)]
+
+
+def simulate(stages: List[dict], workers: int, latency: float = PlanningConfig.REQUEST_LATENCY,
+             logger: Optional[logging.Logger] = None) -> dict:
+    """
+    Simulate the token buckets over the active stages and predict their wall time.
+
+    Every bucket starts with the tokens, capacities and refill rates of a new
+    TokenBucket. In a stage, a bucket granting N requests needs N tokens from
+    both its fast and slow bucket and at least N * latency / workers seconds;
+    the stage ends with its slowest bucket, which is its bottleneck.
+
+    Args:
+        stages (List[dict]): estimate_requests() result; seconds, wall_time
+                             and bottleneck are added to every active stage.
+        workers (int): Requests a bucket may have in flight.
+        latency (float): Seconds per request.
+        logger (Optional[logging.Logger]): Logger for the TokenBucket instances.
+
+    Returns:
+        dict: wall_time of the run and the bucket (bottleneck) that kept it busiest.
+    """
+    logger = logger or logging.getLogger(__name__)
+    parameters = {("platform", region): bucket for region, bucket
+                  in TokenBucket(Region, logger).token_bucket_regions.items()}
+    parameters.update({("continental", continent): bucket for continent, bucket
+                       in TokenBucket(ContinentalRegion, logger).token_bucket_regions.items()})
+    # Per bucket: [tokens, capacity, rate] of the fast and the slow bucket, and the time they were computed.
+    state = {key: {"limits": [[bucket[f"{kind}_bucket_tokens"], bucket[f"{kind}_bucket_capacity"],
+                               bucket[f"{kind}_bucket_rate"]] for kind in ("fast", "slow")], "at": 0.0}
+             for key, bucket in parameters.items()}
+
+    clock = 0.0
+    busy: Dict[Bucket, float] = {}
+    for stage in stages:
+        if not stage["active"]:
+            continue
+        seconds: Dict[Bucket, float] = {}
+        for bucket, requests in stage["requests"].items():
+            limits = state[bucket]["limits"]
+            for limit in limits:
+                limit[0] = min(limit[1], limit[0] + limit[2] * (clock - state[bucket]["at"]))
+            duration = max([requests * latency / workers]
+                           + [max(0.0, (requests - tokens) / rate) for tokens, _, rate in limits])
+            for limit in limits:
+                limit[0] = max(0.0, min(limit[1], limit[0] + limit[2] * duration) - requests)
+            state[bucket]["at"] = clock + duration
+            seconds[bucket] = duration
+            busy[bucket] = busy.get(bucket, 0.0) + duration
+
+        stage["seconds"] = seconds
+        stage["wall_time"] = max(seconds.values(), default=0.0)
+        stage["bottleneck"] = max(seconds, key=seconds.get) if seconds else None
+        clock += stage["wall_time"]
+
+    return {"wall_time": clock, "bottleneck": max(busy, key=busy.get) if busy else None}
+
+
+def plan_pipeline(database_query=None, stages: Sequence[bool] = Stages.TO_PROCESS,
+                  logger: Optional[logging.Logger] = None) -> dict:
+    """
+    Estimate the requests and wall time of a pipeline run.
+
+    Args:
+        database_query: DatabaseQuery (or ShardedDatabaseQuery) to read the
+                        history from, or None to plan from the configuration only.
+        stages (Sequence[bool]): Active stages (Stages.TO_PROCESS).
+        logger (Optional[logging.Logger]): Logger for the simulated token buckets.
+
+    Returns:
+        dict: stages (estimate_requests() with the simulated times), history
+              (history_parameters()), workers, wall_time and bottleneck.
+    """
+    statistics = database_query.get_planning_statistics() if database_query is not None else None
+    workers = AdaptiveConcurrencyConfig.MAX_LIMIT if AdaptiveConcurrencyConfig.ENABLED else 1
+    planned_stages = estimate_requests(statistics, stages)
+    totals = simulate(planned_stages, workers, logger=logger)
+    return {"stages": planned_stages, "history": history_parameters(statistics), "workers": workers, **totals}
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m {seconds:02d}s" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def format_plan(plan: dict) -> str:
+    """
+    Render a plan_pipeline() result as a text report.
+    """
+    history = plan["history"]
+    lines = [f"Matches per summoner: {history['matches_per_puuid']:.1f} ({history['matches_source']}) | "
+             f"Collected players per match: {history['players_per_match']:.2f} ({history['players_source']}) | "
+             f"Workers per bucket: {plan['workers']}"]
+    for stage in plan["stages"]:
+        lines.append("")
+        if not stage["active"]:
+            lines.append(f"Stage {stage['stage']}: {stage['name']} (inactive)")
+            continue
+        bottleneck = " ".join(stage["bottleneck"]) if stage["bottleneck"] else "-"
+        lines.append(f"Stage {stage['stage']}: {stage['name']} | Work items: {stage['items']:,.0f} | "
+                     f"Wall time: {_duration(stage['wall_time'])} | Bottleneck: {bottleneck}")
+        lines.append(f"  {'bucket':<24}{'requests':>12}{'time':>16}")
+        for bucket, requests in sorted(stage["requests"].items(), key=lambda item: -stage["seconds"][item[0]]):
+            lines.append(f"  {' '.join(bucket):<24}{requests:>12,.0f}{_duration(stage['seconds'][bucket]):>16}")
+    bottleneck = " ".join(plan["bottleneck"]) if plan["bottleneck"] else "-"
+    lines += ["", f"Total wall time: {_duration(plan['wall_time'])} | Busiest bucket: {bottleneck}"]
+    return "\n".join(lines)
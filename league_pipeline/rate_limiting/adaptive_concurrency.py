@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from logging import Logger
+from typing import Dict, Type
+
+from league_pipeline.constants.pipeline_constants import AdaptiveConcurrencyConfig
+
+
+class AdaptiveConcurrency:
+    """
+    Per-region limit on requests in flight, tuned by additive increase / multiplicative decrease.
+    
+    A request takes a slot with acquire() once the token bucket let it
+    through and gives it back with release() and its outcome. Successes
+    with healthy latency grow the region's limit by additive_increase / limit,
+    so the limit climbs by about additive_increase per full window of
+    requests. A 429, or a smoothed latency above latency_tolerance times the
+    region's baseline, multiplies the limit by multiplicative_decrease; only
+    requests sent after the previous decrease can trigger the next one, so a
+    burst of 429s from one window halves the limit once. Other errors leave
+    the limit alone.
+    
+    The controller is not thread-safe; all requests of a region must run in
+    one event loop.
+    
+    Attributes:
+        logger (Logger): Logger instance for limit decreases.
+        regions (dict): Region mapped to its controller state.
+    """
+
+    def __init__(self, regions: Type[Enum], logger: Logger,
+                 initial_limit: float = AdaptiveConcurrencyConfig.INITIAL_LIMIT,
+                 min_limit: float = AdaptiveConcurrencyConfig.MIN_LIMIT,
+                 max_limit: int = AdaptiveConcurrencyConfig.MAX_LIMIT,
+                 additive_increase: float = AdaptiveConcurrencyConfig.ADDITIVE_INCREASE,
+                 multiplicative_decrease: float = AdaptiveConcurrencyConfig.MULTIPLICATIVE_DECREASE,
+                 latency_tolerance: float = AdaptiveConcurrencyConfig.LATENCY_TOLERANCE,
+                 latency_smoothing: float = AdaptiveConcurrencyConfig.LATENCY_SMOOTHING,
+                 baseline_drift: float = AdaptiveConcurrencyConfig.BASELINE_DRIFT) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < multiplicative_decrease < 1:
+            raise ValueError("multiplicative_decrease must be between 0 and 1")
+
+        self.logger = logger
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.latency_tolerance = latency_tolerance
+        self.latency_smoothing = latency_smoothing
+        self.baseline_drift = baseline_drift
+
+        now = time.monotonic()
+        self.regions = {
+            f"{region}": {
+                "limit": float(initial_limit),
+                "in_flight": 0,
+                "waiters": deque(),
+                "latency": None,
+                "baseline": None,
+                "last_decrease": now,
+                "successes": 0,
+                "rate_limited": 0,
+                "errors": 0,
+                "decreases": 0,
+            }
+            for region in regions.__members__.keys()
+        }
+
+    async def acquire(self, region: str) -> float:
+        """
+        Wait for a free slot of the region and take it.
+
+        Args:
+            region (str): Region identifier of the request.
+
+        Returns:
+            float: Start time of the request, to be passed to release().
+        """
+        state = self.regions[region]
+        while state["in_flight"] >= int(state["limit"]):
+            waiter = asyncio.get_running_loop().create_future()
+            state["waiters"].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in state["waiters"]:
+                    state["waiters"].remove(waiter)
+                else:
+                    # Woken but cancelled: hand the wake-up on.
+                    self._wake(state)
+                raise
+        state["in_flight"] += 1
+        return time.monotonic()
+
+    def release(self, region: str, started: float, outcome: str) -> None:
+        """
+        Give a slot back and adjust the region's limit by the request's outcome.
+
+        Args:
+            region (str): Region identifier of the request.
+            started (float): Value returned by acquire().
+            outcome (str): "success", "rate_limited" (HTTP 429) or "error".
+        """
+        state = self.regions[region]
+        state["in_flight"] -= 1
+        now = time.monotonic()
+
+        if outcome == "rate_limited":
+            state["rate_limited"] += 1
+            self._decrease(region, state, started, now, "rate limited")
+        elif outcome == "success":
+            state["successes"] += 1
+            latency = now - started
+            if state["latency"] is None:
+                state["latency"] = state["baseline"] = latency
+            else:
+                state["latency"] += (latency - state["latency"]) * self.latency_smoothing
+                if latency < state["baseline"]:
+                    state["baseline"] = latency
+                else:
+                    state["baseline"] += (latency - state["baseline"]) * self.baseline_drift
+
+            if state["latency"] > state["baseline"] * self.latency_tolerance:
+                self._decrease(region, state, started, now, "latency rising")
+            else:
+                state["limit"] = min(self.max_limit, state["limit"] + self.additive_increase / state["limit"])
+        else:
+            state["errors"] += 1
+
+        self._wake(state)
+
+    def _decrease(self, region: str, state: dict, started: float, now: float, reason: str) -> None:
+        if started < state["last_decrease"]:
+            return
+        state["limit"] = max(self.min_limit, state["limit"] * self.multiplicative_decrease)
+        state["last_decrease"] = now
+        state["decreases"] += 1
+        self.logger.warning(f"Concurrency limit decreased | Region: {region} | Reason: {reason} | "
+                            f"Limit: {state['limit']:.2f}")
+
+    def _wake(self, state: dict) -> None:
+        free = int(state["limit"]) - state["in_flight"]
+        while free > 0 and state["waiters"]:
+            waiter = state["waiters"].popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Return the current state of every region for monitoring.
+
+        Returns:
+            dict: Region mapped to its limit, in_flight and waiting request
+                  counts, smoothed and baseline latency (ms, None before the
+                  first success) and successes / rate_limited / errors /
+                  decreases counters.
+        """
+        def milliseconds(seconds):
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {region: {"limit": round(state["limit"], 2),
+                         "in_flight": state["in_flight"],
+                         "waiting": len(state["waiters"]),
+                         "latency_ms": milliseconds(state["latency"]),
+                         "baseline_ms": milliseconds(state["baseline"]),
+                         "successes": state["successes"],
+                         "rate_limited": state["rate_limited"],
+                         "errors": state["errors"],
+                         "decreases": state["decreases"]}
+                for region, state in self.regions.items()}
@@ -0,0 +1,186 @@
+import time
+from collections import deque
+from logging import Logger
+from typing import Dict, Optional, Tuple
+
+from league_pipeline.constants.pipeline_constants import CircuitBreakerConfig
+from league_pipeline.utils.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breakers for every (region, endpoint) pair, created on first use.
+
+    A closed circuit lets every call through and remembers the outcome of
+    the last window calls. Once enough of them failed it opens: before_call()
+    raises CircuitOpenError without touching the network, so a platform in an
+    outage costs neither retries with backoff nor rate limit tokens. After
+    the open time the circuit turns half-open and admits a single probe; the
+    probe's success closes the circuit, its failure opens it again for twice
+    as long. Circuits of other regions and endpoints are independent, so a
+    healthy region keeps its full throughput.
+
+    Only before_call() changes the state of a circuit, and only the call that
+    is about to be sent may use it: the half-open probe is claimed by the
+    call it returns True to, and only that call's record(probe=True) ends
+    the probe. Code that merely needs to know whether calls are refused
+    (e.g. after a failure) uses check() or is_open().
+
+    The breaker is not thread-safe; all calls must run in one event loop.
+
+    Attributes:
+        logger (Logger): Logger instance for state changes.
+        circuits (dict): (region, endpoint) mapped to the circuit's state.
+    """
+
+    def __init__(self, logger: Logger, window: int = CircuitBreakerConfig.WINDOW,
+                 min_calls: int = CircuitBreakerConfig.MIN_CALLS,
+                 failure_rate: float = CircuitBreakerConfig.FAILURE_RATE,
+                 open_seconds: float = CircuitBreakerConfig.OPEN_SECONDS,
+                 max_open_seconds: float = CircuitBreakerConfig.MAX_OPEN_SECONDS,
+                 probe_wait_seconds: float = CircuitBreakerConfig.PROBE_WAIT_SECONDS) -> None:
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if min_calls > window:
+            raise ValueError("min_calls cannot exceed the window")
+
+        self.logger = logger
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_wait_seconds = probe_wait_seconds
+        self.circuits: Dict[Tuple[str, str], dict] = {}
+
+    def _circuit(self, region: str, endpoint: str) -> dict:
+        circuit = self.circuits.get((region, endpoint))
+        if circuit is None:
+            circuit = {
+                "state": CLOSED,
+                "outcomes": deque(maxlen=self.window),
+                "open_seconds": self.open_seconds,
+                "retry_at": 0.0,
+                "probing": False,
+                "opened": 0,
+            }
+            self.circuits[(region, endpoint)] = circuit
+        return circuit
+
+    def before_call(self, region: str, endpoint: str) -> bool:
+        """
+        Let a call that is about to be sent through, or refuse it.
+
+        Args:
+            region (str): Region the call is routed to.
+            endpoint (str): Endpoint name, e.g. the API method's name.
+
+        Returns:
+            bool: True if the call is the half-open circuit's probe; its
+                  outcome must be recorded with probe=True.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its probe in flight.
+        """
+        circuit = self._circuit(region, endpoint)
+        if circuit["state"] == CLOSED:
+            return False
+
+        now = time.monotonic()
+        if circuit["state"] == OPEN and now >= circuit["retry_at"]:
+            circuit["state"] = HALF_OPEN
+            self.logger.info(f"Circuit half-open | Region: {region} | Endpoint: {endpoint} | Sending probe")
+
+        if circuit["state"] == HALF_OPEN:
+            if not circuit["probing"]:
+                circuit["probing"] = True
+                return True
+            raise CircuitOpenError(region, endpoint, now + self.probe_wait_seconds, probing=True)
+        raise CircuitOpenError(region, endpoint, circuit["retry_at"])
+
+    def check(self, region: str, endpoint: str) -> None:
+        """
+        Raise if calls to the endpoint are refused right now, without changing the circuit.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its probe in flight.
+        """
+        circuit = self.circuits.get((region, endpoint))
+        if circuit is None or circuit["state"] == CLOSED:
+            return
+        now = time.monotonic()
+        if circuit["state"] == OPEN and now < circuit["retry_at"]:
+            raise CircuitOpenError(region, endpoint, circuit["retry_at"])
+        if circuit["state"] == HALF_OPEN and circuit["probing"]:
+            raise CircuitOpenError(region, endpoint, now + self.probe_wait_seconds, probing=True)
+
+    def record(self, region: str, endpoint: str, success: Optional[bool], probe: bool = False) -> None:
+        """
+        Record the outcome of a call let through by before_call().
+
+        Args:
+            region (str): Region the call was routed to.
+            endpoint (str): Endpoint name passed to before_call().
+            success (Optional[bool]): True for a response, False for a failure
+                                      that counts against the endpoint (5xx,
+                                      timeout, connection error), None for an
+                                      outcome that says nothing about its
+                                      health (429, 4xx, cancellation).
+            probe (bool): Whether before_call() returned True for the call. Outcomes
+                          of other calls that were in flight when the circuit
+                          opened do not decide the probe.
+        """
+        circuit = self._circuit(region, endpoint)
+
+        if probe and circuit["state"] == HALF_OPEN and circuit["probing"]:
+            circuit["probing"] = False
+            if success:
+                circuit["state"] = CLOSED
+                circuit["outcomes"].clear()
+                circuit["open_seconds"] = self.open_seconds
+                self.logger.info(f"Circuit closed | Region: {region} | Endpoint: {endpoint}")
+            elif success is False:
+                circuit["open_seconds"] = min(self.max_open_seconds, circuit["open_seconds"] * 2)
+                self._open(region, endpoint, circuit)
+            return
+
+        if success is None or circuit["state"] != CLOSED:
+            return
+        outcomes = circuit["outcomes"]
+        outcomes.append(success)
+        if len(outcomes) >= self.min_calls and outcomes.count(False) >= self.failure_rate * len(outcomes):
+            self._open(region, endpoint, circuit)
+
+    def _open(self, region: str, endpoint: str, circuit: dict) -> None:
+        circuit["state"] = OPEN
+        circuit["retry_at"] = time.monotonic() + circuit["open_seconds"]
+        circuit["opened"] += 1
+        self.logger.warning(f"Circuit open | Region: {region} | Endpoint: {endpoint} | "
+                            f"Probing in: {circuit['open_seconds']:.0f} Seconds")
+
+    def is_open(self, region: str, endpoint: str) -> bool:
+        """
+        Whether calls to the endpoint are currently refused (open, or half-open with a probe in flight).
+        """
+        try:
+            self.check(region, endpoint)
+        except CircuitOpenError:
+            return True
+        return False
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        Return the state of every circuit used so far, keyed "region/endpoint", for monitoring.
+        """
+        now = time.monotonic()
+        return {f"{region}/{endpoint}": {"state": circuit["state"],
+                                         "failures": circuit["outcomes"].count(False),
+                                         "calls": len(circuit["outcomes"]),
+                                         "opened": circuit["opened"],
+                                         "probe_in": round(max(0.0, circuit["retry_at"] - now), 1)
+                                         if circuit["state"] == OPEN else None}
+                for (region, endpoint), circuit in self.circuits.items()}
@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from logging import Logger
+from typing import Dict, List, Optional, Tuple
+
+from league_pipeline.constants.pipeline_constants import CircuitBreakerConfig, RetrySchedulerConfig
+from league_pipeline.utils.exceptions import CircuitOpenError, RetryLater
+
+# Attempts already made for the work item being processed; set by
+# run_workers() while it runs an item. The API error wrapper raises
+# RetryLater instead of sleeping when it is set.
+current_attempt: ContextVar[Optional[int]] = ContextVar("current_attempt", default=None)
+# Results of the steps the work item being processed already completed; set
+# by run_workers() to a dict kept with the item across retries, so a step
+# that succeeded is not repeated when a later one raises RetryLater or
+# CircuitOpenError.
+completed_steps: ContextVar[Optional[dict]] = ContextVar("completed_steps", default=None)
+
+
+class RetryScheduler:
+    """
+    Central delay queue for work items waiting to be retried.
+
+    Items are kept in one heap keyed by the time they are due. A single
+    event loop timer is armed for the earliest of them; when it fires,
+    every due item is put back on the ready queue of the run_workers() call
+    it came from, and its workers take it up before any new item. No worker
+    sleeps while an item waits, so healthy work keeps flowing.
+
+    Retries draw from a budget shared by every service using the scheduler:
+    budget_min retries plus budget_ratio retries per work item started.
+    A 429 retried after its Retry-After is the server pacing the client,
+    not a failure, so it does not draw from the budget; however heavy the
+    rate limiting, it slows the run down instead of dropping items. Items
+    deferred by an open circuit cost no requests and do not draw from
+    it, but are dropped after being deferred through max_deferrals open
+    periods. Deferrals while a half-open circuit waits for its probe are not
+    counted, however long the probe takes.
+
+    The scheduler is not thread-safe; all calls must run in one event loop.
+
+    Attributes:
+        logger (Logger): Logger for scheduled and dropped items.
+        delayed (list): Heap of (due, sequence, ready queue, item entry).
+        started (int): Work items started.
+        retries (int): Retries scheduled (429s included).
+        rate_limited (int): Retries scheduled after a 429.
+        paced (int): Retries scheduled after a 429 with Retry-After (outside the budget).
+        deferred (int): Deferrals scheduled for an open circuit.
+        dropped (int): Items given up because of the budget or max_deferrals.
+    """
+
+    def __init__(self, logger: Logger, budget_ratio: float = RetrySchedulerConfig.BUDGET_RATIO,
+                 budget_min: int = RetrySchedulerConfig.BUDGET_MIN,
+                 max_deferrals: int = CircuitBreakerConfig.MAX_DEFERRALS) -> None:
+        self.logger = logger
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.max_deferrals = max_deferrals
+
+        self.delayed: List[Tuple[float, int, asyncio.Queue, dict]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._armed_for: Optional[float] = None
+
+        self.started = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.paced = 0
+        self.deferred = 0
+        self.dropped = 0
+
+    def budget_left(self) -> float:
+        """
+        Retries that may still be scheduled, 429s with Retry-After aside.
+        """
+        return self.budget_min + self.budget_ratio * self.started - (self.retries - self.paced)
+
+    def retry(self, ready: asyncio.Queue, entry: dict, error: RetryLater) -> bool:
+        """
+        Schedule a failed item to be retried after the delay of the error.
+
+        Args:
+            ready (asyncio.Queue): Ready queue of the run the item belongs to.
+            entry (dict): The item's entry ("item", "attempts", "deferrals").
+            error (RetryLater): The failure, with the delay and attempt.
+
+        Returns:
+            bool: True if scheduled, False if the retry budget is spent and the item is dropped.
+        """
+        if not error.paced and self.budget_left() < 1:
+            self.dropped += 1
+            self.logger.error(f"Retry budget exhausted | Dropping work item: {entry['item']} | {error.error}")
+            return False
+
+        entry["attempts"] = error.attempt + 1
+        self.retries += 1
+        if error.rate_limited:
+            self.rate_limited += 1
+        if error.paced:
+            self.paced += 1
+        self.logger.warning(f"{str(error)} | Work item: {entry['item']}")
+        self.schedule(ready, entry, time.monotonic() + error.delay)
+        return True
+
+    def defer(self, ready: asyncio.Queue, entry: dict, error: CircuitOpenError) -> bool:
+        """
+        Schedule an item refused by an open circuit for when the circuit admits calls again.
+
+        Args:
+            ready (asyncio.Queue): Ready queue of the run the item belongs to.
+            entry (dict): The item's entry ("item", "attempts", "deferrals").
+            error (CircuitOpenError): The refusal, with the circuit's retry time.
+
+        Returns:
+            bool: True if scheduled, False if the item was deferred too often and is dropped.
+        """
+        if not error.probing:
+            entry["deferrals"] += 1
+        if entry["deferrals"] >= self.max_deferrals:
+            self.dropped += 1
+            self.logger.error(f"{str(error)} | Dropping work item after {entry['deferrals']} deferrals: "
+                              f"{entry['item']}")
+            return False
+
+        self.deferred += 1
+        self.logger.debug(f"{str(error)} | Deferring work item")
+        self.schedule(ready, entry, error.retry_at)
+        return True
+
+    def schedule(self, ready: asyncio.Queue, entry: dict, due: float) -> None:
+        """
+        Put an entry on the delay queue until due (a time.monotonic() value).
+        """
+        heapq.heappush(self.delayed, (due, next(self._order), ready, entry))
+        self._arm()
+
+    def discard(self, ready: asyncio.Queue) -> None:
+        """
+        Remove the waiting entries of a run, e.g. one that was cancelled.
+        """
+        self.delayed = [delayed for delayed in self.delayed if delayed[2] is not ready]
+        heapq.heapify(self.delayed)
+        self._arm()
+
+    def _arm(self) -> None:
+        due = self.delayed[0][0] if self.delayed else None
+        if due == self._armed_for:
+            return
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._armed_for = due
+        if due is not None:
+            self._timer = asyncio.get_running_loop().call_later(max(0.0, due - time.monotonic()),
+                                                                self._release)
+
+    def _release(self) -> None:
+        self._timer = None
+        self._armed_for = None
+        now = time.monotonic()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, ready, entry = heapq.heappop(self.delayed)
+            ready.put_nowait(entry)
+        self._arm()
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Return the scheduler's counters and queue state for monitoring.
+        """
+        return {"started": self.started, "retries": self.retries, "rate_limited": self.rate_limited,
+                "paced": self.paced, "deferred": self.deferred, "dropped": self.dropped, "waiting": len(self.delayed),
+                "budget_left": round(self.budget_left(), 1),
+                "next_due_in": round(max(0.0, self.delayed[0][0] - time.monotonic()), 2)
+                if self.delayed else None}
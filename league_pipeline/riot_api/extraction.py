@@ -0,0 +1,168 @@
+"""
+Declarative extraction of database rows from decoded API responses.
+
+A spec maps every ORM attribute of a table to where its value comes from:
+
+- Path("challenges.takedowns", 0): a dotted path into the JSON object of the
+  item; missing or null intermediate objects count as empty, the leaf falls
+  back to the default when missing (coalesce=True also replaces a null or 0).
+- Context("match_id"): a value shared by the whole batch, passed to the extractor.
+- Constant("KILL"): a literal.
+- Expression("{gold_earned} / game_duration_minutes"): a Python expression over
+  other columns of the row ({name}), the batch context names, the item and
+  (for mappings) its key; evaluated after every Path, Context and Constant.
+
+compile_extractor() turns a spec into the source of one function that loops
+over the items and appends a tuple per item in table column order, ready for
+bulk_insert(). Every intermediate object is read once per item, no per-row
+dict is built and no spec is interpreted at run time. Variants select the
+spec per item by a discriminator value; items without a variant are skipped.
+"""
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Type
+
+from sqlalchemy.orm import DeclarativeBase
+
+from league_pipeline.db.bulk_insert import table_layout
+
+
+class Path:
+    """Value at a dotted JSON path of the item."""
+    def __init__(self, path: str, default: Any = None, coalesce: bool = False) -> None:
+        self.keys = path.split(".")
+        self.default = default
+        self.coalesce = coalesce
+
+
+class Context:
+    """Value passed to the extractor for the whole batch."""
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class Constant:
+    """Literal value."""
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class Expression:
+    """Python expression over the row's other columns, the context and the item."""
+    def __init__(self, template: str) -> None:
+        self.template = template
+
+
+Spec = Dict[str, Any]
+
+
+def _context_names(specs: Iterable[Spec]) -> List[str]:
+    names: List[str] = []
+    for spec in specs:
+        for source in spec.values():
+            if isinstance(source, Context) and source.name not in names:
+                names.append(source.name)
+    return names
+
+
+def _row_statements(table: Type[DeclarativeBase], spec: Spec, indent: str) -> List[str]:
+    """
+    Statements computing one row of the spec into local variables and appending its tuple.
+    """
+    _, attribute_keys = table_layout(table)
+    unknown = set(spec) - set(attribute_keys)
+    if unknown:
+        raise ValueError(f"{table.__tablename__} has no attributes {', '.join(sorted(unknown))}")
+
+    lines: List[str] = []
+    objects: Dict[tuple, str] = {(): "item"}
+
+    def parent_of(keys: Sequence[str]) -> str:
+        # Intermediate objects are read once per item and shared by every path below them.
+        for depth in range(1, len(keys) + 1):
+            prefix = tuple(keys[:depth])
+            if prefix not in objects:
+                name = "o_" + "_".join(prefix)
+                lines.append(f"{indent}{name} = {objects[prefix[:-1]]}.get({prefix[-1]!r}) or {{}}")
+                objects[prefix] = name
+        return objects[tuple(keys)]
+
+    # Values read by an Expression go to a local first; all others are built
+    # inside the row tuple.
+    referenced = {name for source in spec.values() if isinstance(source, Expression)
+                  for name in re.findall(r"{(\w+)}", source.template)}
+    values: Dict[str, str] = {}
+    for key, source in spec.items():
+        if isinstance(source, Path):
+            value = f"{parent_of(source.keys[:-1])}.get({source.keys[-1]!r}, {source.default!r})"
+            if source.coalesce:
+                value = f"({value} or {source.default!r})"
+        elif isinstance(source, Context):
+            value = source.name
+        elif isinstance(source, Constant):
+            value = repr(source.value)
+        elif isinstance(source, Expression):
+            continue
+        else:
+            raise TypeError(f"Unknown extraction source for {key}: {source!r}")
+        values[key] = value
+
+    for key, source in spec.items():
+        if isinstance(source, Expression):
+            values[key] = source.template.format(**{name: values[name] for name in spec if name in values})
+        if key in referenced:
+            lines.append(f"{indent}c_{key} = {values[key]}")
+            values[key] = f"c_{key}"
+
+    columns = ", ".join(values.get(key, "None") for key in attribute_keys)
+    lines.append(f"{indent}append(({columns},))")
+    return lines
+
+
+def compile_extractor(table: Type[DeclarativeBase], spec: Optional[Spec] = None,
+                      variants: Optional[Dict[str, Spec]] = None, discriminator: Optional[str] = None,
+                      mapping: bool = False, context: Sequence[str] = (),
+                      namespace: Optional[Dict[str, Any]] = None) -> Callable[..., List[tuple]]:
+    """
+    Compile a spec into a function extracting a list of row tuples from a list of items.
+
+    The function is called as extract(items, **context) with every Context
+    name (and every name in context) as a keyword argument and returns the tuples in table column order
+    (attributes missing from the spec are NULL). Its source is kept in the
+    function's __source__ attribute.
+
+    Args:
+        table (Type[DeclarativeBase]): Model the rows are for.
+        spec (Optional[Spec]): Columns shared by every item (and every variant).
+        variants (Optional[Dict[str, Spec]]): Extra columns per discriminator value.
+        discriminator (Optional[str]): Top-level key of the item selecting the variant.
+        mapping (bool): Items are a mapping; Path reads its values and
+                        Expressions may use its keys as "key".
+        context (Sequence[str]): Batch values used only by Expressions.
+        namespace (Optional[Dict[str, Any]]): Names the Expressions may call.
+
+    Returns:
+        Callable: The compiled extractor.
+    """
+    spec = spec or {}
+    specs = [spec] if not variants else [{**spec, **variant} for variant in variants.values()]
+    context = _context_names(specs) + [name for name in context if name not in _context_names(specs)]
+
+    lines = [f"def extract(items{''.join(f', {name}' for name in context)}):",
+             "    rows = []",
+             "    append = rows.append",
+             "    for key, item in items.items():" if mapping else "    for item in items:"]
+    if not variants:
+        lines += _row_statements(table, spec, " " * 8)
+    else:
+        lines.append(f"        kind = item.get({discriminator!r})")
+        for index, (value, variant) in enumerate(variants.items()):
+            lines.append(f"        {'if' if index == 0 else 'elif'} kind == {value!r}:")
+            lines += _row_statements(table, {**spec, **variant}, " " * 12)
+    lines.append("    return rows")
+
+    source = "\n".join(lines) + "\n"
+    scope: Dict[str, Any] = dict(namespace or {})
+    exec(compile(source, f"<extractor {table.__tablename__}>", "exec"), scope)
+    extract = scope["extract"]
+    extract.__source__ = source
+    return extract
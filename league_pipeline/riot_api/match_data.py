@@ -4,10 +4,129 @@ from aiohttp import ClientSession
 from league_pipeline.utils.decorators import async_api_call_error_wrapper
 from league_pipeline.utils.exceptions import StatusResponseException
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from typing import Optional
 from league_pipeline.utils.http_utils import safely_fetch_rate_limited_data
+from league_pipeline.utils.json_decoding import decode_payload, payload_decoder
+from league_pipeline.riot_api.schemas import MatchPayload
 from league_pipeline.db.models import MatchDataParticipants, MatchDataTeams
 from league_pipeline.riot_api.summoner import SummonerEntries
-from typing import List, Dict, Any
+from league_pipeline.riot_api.extraction import Context, Expression, Path, compile_extractor
+
+
+# Extraction specs of the two match data tables (see riot_api/extraction.py).
+TEAM_SPEC = {
+    "match_id": Context("match_id"),
+    "team_id": Path("teamId", 0),
+    "killed_atakhan": Path("objectives.atakhan.kills", 0),
+    "baron_kills": Path("objectives.baron.kills", 0),
+    "champion_kills": Path("objectives.champion.kills", 0),
+    "dragon_kills": Path("objectives.dragon.kills", 0),
+    "dragon_soul": Expression("{dragon_kills} >= 4"),
+    "horde_kills": Path("objectives.horde.kills", 0),
+    "rift_herald_kills": Path("objectives.riftHerald.kills", 0),
+    "tower_kills": Path("objectives.tower.kills", 0),
+    "team_win": Expression('bool(item.get("win", False))'),
+    "end_of_game_result": Context("end_of_game_result"),
+}
+
+PARTICIPANT_SPEC = {
+    "puuid": Path("puuid", ""),
+    "match_id": Context("match_id"),
+    "team_id": Path("teamId", 0),
+
+    "champion_kills": Path("challenges.takedowns", 0),
+    "assists": Path("assists", 0),
+    "deaths": Path("deaths", 0),
+    "kda": Path("challenges.kda", 0.0),
+
+    "gold_earned": Path("goldEarned", 0, coalesce=True),
+    "gold_per_minute": Expression("{gold_earned} / game_duration_minutes"),
+    "total_minions_killed": Path("totalMinionsKilled", 0),
+    "max_level_lead_lane_opponent": Path("challenges.maxLevelLeadLaneOpponent", 0),
+    "lane_minions_first_10_minutes": Path("challenges.laneMinionsFirst10Minutes", 0),
+
+    "damage_per_minute": Path("challenges.damagePerMinute", 0.0),
+    "kill_participation": Path("challenges.killParticipation", 0.0),
+
+    "control_wards_placed": Path("controlWardsPlaced", 0),
+    "wards_placed": Path("wardsPlaced", 0),
+    "wards_killed": Path("wardsKilled", 0),
+    "vision_score": Path("visionScore", 0),
+    "vision_wards_bought": Path("visionWardsBoughtInGame", 0),
+
+    "assist_me_pings": Path("assistMePings", 0),
+    "all_in_pings": Path("allInPings", 0),
+    "enemy_missing_pings": Path("enemyMissingPings", 0),
+    "need_vision_pings": Path("needVisionPings", 0),
+    "on_my_way_pings": Path("onMyWayPings", 0),
+    "get_back_pings": Path("getBackPings", 0),
+    "push_pings": Path("pushPings", 0),
+    "hold_pings": Path("holdPings", 0),
+
+    "champion_name": Path("championName", ""),
+    "individual_position": Path("individualPosition", ""),
+    "team_position": Path("teamPosition", ""),
+
+    "had_open_nexus": Path("hadOpenNexus", False),
+    "win": Path("win", False),
+    "end_of_game_result": Context("end_of_game_result"),
+}
+
+extract_teams = compile_extractor(MatchDataTeams, TEAM_SPEC)
+extract_participants = compile_extractor(MatchDataParticipants, PARTICIPANT_SPEC,
+                                         context=["game_duration_minutes"])
+
+
+def transform_match_data(data: dict) -> list:
+    """
+    Transform raw match data into database-ready format.
+
+    Rows are tuples in table column order (see TEAM_SPEC and PARTICIPANT_SPEC),
+    which bulk_insert() binds as they are. Module-level so it can run in a
+    worker process.
+
+    Args:
+        data: Raw match data from Riot API
+
+    Returns:
+        list: [team_rows, participant_rows] ready for database insertion
+    """
+    match_id = data["metadata"]["matchId"]
+    info = data["info"]
+    end_of_game_result = info.get("endOfGameResult", "") or ""
+
+    teams = info.get("teams", [])
+    if len(teams) != 2:
+        return []
+
+    if info.get("gameEndTimestamp", 0):
+        game_duration_minutes = (info.get("gameDuration", 0) or 0) / 60.0
+    else:
+        game_duration_minutes = (info.get("gameDuration", 0) or 0) * 0.1 / 60.0
+
+    if not game_duration_minutes:
+        game_duration_minutes = 1e-9
+
+    team_rows = extract_teams(teams, match_id=match_id, end_of_game_result=end_of_game_result)
+    participant_rows = extract_participants(info.get("participants", []), match_id=match_id,
+                                            end_of_game_result=end_of_game_result,
+                                            game_duration_minutes=game_duration_minutes)
+    return [team_rows, participant_rows]
+
+
+def match_data_batches(payload) -> list:
+    """
+    Decode a match response and transform it (the "process" transform mode's unit of work).
+
+    Args:
+        payload: Raw JSON bytes of the response, or the already decoded match
+
+    Returns:
+        list: [team_rows, participant_rows] ready for database insertion
+    """
+    return transform_match_data(decode_payload(payload, MatchPayload))
 
 
 class MatchData:
@@ -19,20 +138,26 @@ class MatchData:
     """
 
     def __init__(self, api_key: str, logger: Logger, 
-                 token_bucket: TokenBucket) -> None:
+                 token_bucket: TokenBucket,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
         self.api_key = api_key
         self.logger = logger
         self.token_bucket = token_bucket
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
 
         self.sql_table_object: list = [MatchDataTeams, MatchDataParticipants]
 
         self.status_response_exception = StatusResponseException()
         self.request_header = {"X-Riot-Token": api_key}
 
-        self.SummonerEntries = SummonerEntries(self.api_key,self.logger,self.token_bucket)
+        self.SummonerEntries = SummonerEntries(self.api_key,self.logger,self.token_bucket,self.concurrency,
+                                               self.circuit_breaker)
 
     @async_api_call_error_wrapper
-    async def match_data_from_match_id(self, region: str, match_id: str, session: ClientSession):
+    async def match_data_from_match_id(self, region: str, match_id: str, session: ClientSession,
+                                       raw: bool = False):
         """
         Retrieve detailed match data for a specific match ID.
         
@@ -40,16 +165,19 @@ class MatchData:
             region: Continental region for API routing
             match_id: Unique match identifier
             session: aiohttp session for making requests
+            raw: Return the undecoded response bytes (for a transform worker)
             
         Returns:
-            dict: Raw match data from Riot API
+            dict: Raw match data from Riot API (bytes when raw is set)
         """
 
         match_endpoint = MatchEndpoint.BY_MATCH_ID.value.format(matchId=match_id)
         url = BaseEndpoint.BASE_RIOT_URL.value.format(region=region) + match_endpoint
         content = await safely_fetch_rate_limited_data(url, self.request_header, session, 
                                                        region,self.token_bucket,self.status_response_exception,
-                                                       logger = self.logger)
+                                                       logger = self.logger, raw=raw,
+                                                       decoder=payload_decoder(MatchPayload),
+                                                       concurrency=self.concurrency)
         return content
 
     def tranform_results(self, data) -> list:
@@ -62,91 +190,4 @@ class MatchData:
         Returns:
             list: [team_data_list, participant_data_list] ready for database insertion
         """
-
-        match_id = data["metadata"]["matchId"]
-        info = data["info"]
-        end_of_game_result = info.get("endOfGameResult", "")
-
-        teams = info.get("teams", [])
-        if len(teams) != 2:
-            return []  
-
-        team_rows: List[Dict[str, Any]] = []
-        for team in teams:
-            obj = team.get("objectives", {}) or {}
-            dragon_kills = (obj.get("dragon", {}) or {}).get("kills", 0)
-            team_rows.append({
-                "match_id": match_id,
-                "team_id": team.get("teamId", 0),
-                "killed_atakhan": (obj.get("atakhan", {}) or {}).get("kills", 0),
-                "baron_kills": (obj.get("baron", {}) or {}).get("kills", 0),
-                "champion_kills": (obj.get("champion", {}) or {}).get("kills", 0),
-                "dragon_kills": dragon_kills,
-                "dragon_soul": dragon_kills >= 4, 
-                "horde_kills": (obj.get("horde", {}) or {}).get("kills", 0),
-                "rift_herald_kills": (obj.get("riftHerald", {}) or {}).get("kills", 0),
-                "tower_kills": (obj.get("tower", {}) or {}).get("kills", 0),
-                "team_win": bool(team.get("win", False)),
-                "end_of_game_result": end_of_game_result or "",
-            })
-        
-
-
-        if info.get("gameEndTimestamp", 0):
-            game_duration_minutes = (info.get("gameDuration", 0) or 0) / 60.0
-        else:
-            game_duration_minutes = (info.get("gameDuration", 0) or 0) * 0.1 / 60.0
-
-        if not game_duration_minutes:
-            game_duration_minutes = 1e-9  
-
-
-        participant_rows: List[Dict[str, Any]] = []
-        for p in info.get("participants", []):
-            gold_earned = p.get("goldEarned", 0) or 0
-            gold_per_minute = gold_earned / game_duration_minutes
-
-            participant_rows.append({
-                "puuid": p.get("puuid", ""),
-                "match_id": match_id,
-                "team_id": p.get("teamId", 0),
-
-                "champion_kills": (p.get("challenges", {}) or {}).get("takedowns", 0),
-                "assists": p.get("assists", 0),
-                "deaths": p.get("deaths", 0),
-                "kda": (p.get("challenges", {}) or {}).get("kda", 0.0),
-
-                "gold_earned": gold_earned,
-                "gold_per_minute": gold_per_minute,
-                "total_minions_killed": p.get("totalMinionsKilled", 0),
-                "max_level_lead_lane_opponent": (p.get("challenges", {}) or {}).get("maxLevelLeadLaneOpponent", 0),
-                "lane_minions_first_10_minutes": (p.get("challenges", {}) or {}).get("laneMinionsFirst10Minutes", 0),
-
-                "damage_per_minute": (p.get("challenges", {}) or {}).get("damagePerMinute", 0.0),
-                "kill_participation": (p.get("challenges", {}) or {}).get("killParticipation", 0.0),
-
-                "control_wards_placed": p.get("controlWardsPlaced", 0),
-                "wards_placed": p.get("wardsPlaced", 0),
-                "wards_killed": p.get("wardsKilled", 0),
-                "vision_score": p.get("visionScore", 0),
-                "vision_wards_bought": p.get("visionWardsBoughtInGame", 0),
-
-                "assist_me_pings": p.get("assistMePings", 0),
-                "all_in_pings": p.get("allInPings", 0),
-                "enemy_missing_pings": p.get("enemyMissingPings", 0),
-                "need_vision_pings": p.get("needVisionPings", 0),
-                "on_my_way_pings": p.get("onMyWayPings", 0),
-                "get_back_pings": p.get("getBackPings", 0),
-                "push_pings": p.get("pushPings", 0),
-                "hold_pings": p.get("holdPings", 0),
-           
-                "champion_name": p.get("championName", ""),
-                "individual_position": p.get("individualPosition", ""),
-                "team_position": p.get("teamPosition", ""),
-
-                "had_open_nexus": p.get("hadOpenNexus", False),
-                "win": p.get("win", False),
-                "end_of_game_result": end_of_game_result or "",
-            })
-
-        return [team_rows, participant_rows]
\ No newline at end of file
+        return transform_match_data(data)
@@ -4,11 +4,15 @@ from aiohttp import ClientSession
 from league_pipeline.utils.decorators import async_api_call_error_wrapper
 from league_pipeline.utils.exceptions import StatusResponseException
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from typing import Optional
 from league_pipeline.utils.http_utils import safely_fetch_rate_limited_data
 from league_pipeline.db.models import MatchIDs
 from league_pipeline.constants.pipeline_constants import DataProcessingConfig
 from time import time
 from league_pipeline.utils.time_converter import unix_time_converter
+from league_pipeline.utils.match_routing import platform_and_continent_from_match_id
 
 class MatchIDsCall:
     """
@@ -19,10 +23,14 @@ class MatchIDsCall:
     """
     def __init__(self, api_key: str, logger: Logger, 
                  token_bucket: TokenBucket,
-                 day_limit: int = DataProcessingConfig.DAY_LIMIT) -> None:
+                 day_limit: int = DataProcessingConfig.DAY_LIMIT,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
         self.api_key = api_key
         self.logger = logger
         self.token_bucket = token_bucket
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
 
         self.day_limit_in_seconds = unix_time_converter(day_limit,"d","s")
         self.sql_table_object = MatchIDs
@@ -61,13 +69,17 @@ class MatchIDsCall:
         url = BaseEndpoint.BASE_RIOT_URL.value.format(region=region) + match_endpoint
         content = await safely_fetch_rate_limited_data(url, self.request_header, session, 
                                                        region,self.token_bucket,self.status_response_exception,
-                                                       logger = self.logger, parameters=api_parameters)
+                                                       logger = self.logger, parameters=api_parameters,
+                                                       concurrency=self.concurrency)
         return content
     
     def transfom_results(self, data: list, game_tier: str, puuid: str) -> list:
         """
         Transform match ID list into database records.
         
+        The platform and continental routing region are derived from the
+        match ID prefix, so later stages can route without joining Summoners.
+        
         Args:
             data: List of match IDs from API
             game_tier: Player's competitive tier
@@ -82,5 +94,8 @@ class MatchIDsCall:
             temp_dict_for_results["match_id"] = match_id
             temp_dict_for_results["puuid"] = puuid
             temp_dict_for_results["game_tier"] = game_tier 
+            platform_id, continental_region = platform_and_continent_from_match_id(match_id)
+            temp_dict_for_results["platform_id"] = platform_id
+            temp_dict_for_results["continental_region"] = continental_region
             transformed_results.extend([temp_dict_for_results])
         return transformed_results
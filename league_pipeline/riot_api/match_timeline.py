@@ -1,32 +1,273 @@
 from league_pipeline.constants.endpoints import *
 from logging import Logger
 from aiohttp import ClientSession
-from league_pipeline.db.models import MatchTimeline
+from league_pipeline.db.models import MatchTimeline, MatchTimelineEconomy, MatchTimelineTracks
+from league_pipeline.db.timeline_tracks import ECONOMY_FIELDS, encode_economy, split_timeline_rows
 from league_pipeline.db.db_connection import DatabaseQuery
 from league_pipeline.utils.decorators import async_api_call_error_wrapper
 from league_pipeline.utils.exceptions import StatusResponseException
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
 from league_pipeline.utils.http_utils import safely_fetch_rate_limited_data
-from league_pipeline.constants.file_folder_paths import DatabaseName, Paths
+from league_pipeline.utils.json_decoding import decode_payload, payload_decoder
+from league_pipeline.riot_api.schemas import TimelinePayload
+from league_pipeline.riot_api.extraction import Constant, Context, Expression, Path, compile_extractor
+from league_pipeline.constants.pipeline_constants import EventTypes, TimelineCollectionConfig
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class TimelineProfile:
+    """
+    Selection of timeline data kept by MatchTimelineCall.transform_results.
+    
+    Attributes:
+        event_types (frozenset): Riot event types stored as event records.
+        position_interval_ms (int): Participant positions are kept for one frame
+                                    per interval; frames are 60000 ms apart.
+        keep_positions (bool): Whether participant positions are stored at all.
+        keep_economy (bool): Whether per-frame gold/XP/CS/level series are stored.
+    """
+    def __init__(self, event_types: Iterable[str] = EventTypes.SUPPORTED,
+                 position_interval_ms: int = 60_000, keep_positions: bool = True,
+                 keep_economy: bool = True) -> None:
+        unsupported = set(event_types) - set(EventTypes.SUPPORTED)
+        if unsupported:
+            raise ValueError(f"Unsupported timeline event types: {', '.join(sorted(unsupported))}")
+        if position_interval_ms <= 0:
+            raise ValueError("position_interval_ms must be positive")
+
+        self.event_types = frozenset(event_types)
+        self.position_interval_ms = position_interval_ms
+        self.keep_positions = keep_positions
+        self.keep_economy = keep_economy
+
+    @classmethod
+    def named(cls, name: str = TimelineCollectionConfig.PROFILE) -> "TimelineProfile":
+        """
+        Build a profile from TimelineCollectionConfig.PROFILES.
+        
+        Args:
+            name: Profile name (default: TimelineCollectionConfig.PROFILE)
+            
+        Returns:
+            TimelineProfile: The configured profile
+        """
+        return cls(**TimelineCollectionConfig.PROFILES[name])
+
+    def frame_step(self, frame_interval_ms: int) -> int:
+        """
+        Return how many frames apart two kept position frames are.
+        """
+        return max(1, round(self.position_interval_ms / frame_interval_ms))
+
+
+# Extraction specs of the Match Timeline rows (see riot_api/extraction.py).
+# Events share EVENT_SPEC and add the columns of their Riot event type; the
+# killer's and victim's puuids are looked up by participant id (0 is "Minion").
+EVENT_SPEC = {
+    "match_id": Context("match_id"),
+    "puuid": Expression('participant_ids.get(item.get("killerId"), "")'),
+    "timestamp": Path("timestamp"),
+    "in_game_id": Path("killerId"),
+    "team_position": Expression("team_positions[{puuid}][1]"),
+    "x": Path("position.x"),
+    "y": Path("position.y"),
+    "event": Path("type"),
+}
+
+EVENT_VARIANTS = {
+    EventTypes.ELITE_MONSTER_KILL: {
+        "team_id": Path("killerTeamId"),
+        "type": Path("monsterType"),
+    },
+    EventTypes.CHAMPION_KILL: {
+        "team_id": Expression("team_positions[{puuid}][0]"),
+        "type": Constant("KILL"),
+        "victim_puuid": Expression('participant_ids.get(item.get("victimId"), "")'),
+    },
+    EventTypes.BUILDING_KILL: {
+        # This is the team that LOST the building
+        "team_id": Path("teamId"),
+        "type": Path("buildingType"),
+    },
+}
+
+# One row per entry of a frame's participantFrames (participant id -> frame).
+POSITION_SPEC = {
+    "in_game_id": Expression("int(key)"),
+    "match_id": Context("match_id"),
+    "puuid": Expression('participant_ids.get({in_game_id}, "")'),
+    "timestamp": Context("timestamp"),
+    "team_id": Expression("team_positions[{puuid}][0]"),
+    "team_position": Expression("team_positions[{puuid}][1]"),
+    "x": Path("position.x"),
+    "y": Path("position.y"),
+    "event": Constant(EventTypes.POSITION),
+    "type": Constant(EventTypes.PARTICIPANT_FRAME),
+}
+
+extract_positions = compile_extractor(MatchTimeline, POSITION_SPEC, mapping=True,
+                                      context=["participant_ids", "team_positions"])
+
+
+@lru_cache(maxsize=None)
+def event_extractor(event_types: frozenset) -> Callable[..., List[tuple]]:
+    """
+    Return the compiled extractor of the given event types; other events are skipped.
+    """
+    return compile_extractor(MatchTimeline, EVENT_SPEC, discriminator="type",
+                             variants={event_type: variant for event_type, variant in EVENT_VARIANTS.items()
+                                       if event_type in event_types},
+                             context=["participant_ids", "team_positions"])
+
+
+def transform_timeline(data: dict, match_id: str, team_positions: Dict[str, tuple],
+                       profile: TimelineProfile) -> list:
+    """
+    Transform raw timeline data into database-ready events.
+    
+    Rows are tuples in Match Timeline column order, built by the extractors
+    compiled from EVENT_SPEC and POSITION_SPEC. Free of database access, so
+    it can run in a worker process; the participants' team and position are
+    passed in.
+    
+    Args:
+        data: Raw timeline data from API
+        match_id: Match identifier for the timeline
+        team_positions: puuid mapped to its (team_id, team_position)
+        profile: Selection of the events and position frames to keep
+        
+    Returns:
+        list: Database-ready timeline event records
+    """
+    participant_ids = {0: "Minion"}
+    team_id_team_pos = {"Minion": (999, "")}
+
+    info = data["info"]
+    for participant in info['participants']:
+        puuid = participant['puuid']
+        participant_ids[participant['participantId']] = puuid
+        team_id_team_pos[puuid] = team_positions[puuid]
+
+    extract_events = event_extractor(profile.event_types) if profile.event_types else None
+    frame_step = profile.frame_step(info.get("frameInterval", 60_000))
+
+    event_list: list = []
+    for frame_index, frame in enumerate(info["frames"]):
+        if extract_events:
+            event_list += extract_events(frame["events"], match_id=match_id,
+                                         participant_ids=participant_ids, team_positions=team_id_team_pos)
+
+        # Participant positions belong to the frame, not to its events, so
+        # they are read once per (sampled) frame.
+        if not profile.keep_positions or frame_index % frame_step:
+            continue
+
+        event_list += extract_positions(frame["participantFrames"], match_id=match_id, timestamp=frame["timestamp"],
+                                        participant_ids=participant_ids, team_positions=team_id_team_pos)
+
+    return event_list
+
+
+def transform_timeline_economy(data: dict, match_id: str, profile: TimelineProfile) -> list:
+    """
+    Pack each participant's per-frame economy into one database-ready record.
+
+    Reads totalGold, xp, minionsKilled, jungleMinionsKilled and level from
+    every frame's participantFrames (all frames, independent of the
+    position sampling) and stores them with the frame timestamps as
+    int32 series. Returns nothing when the profile drops economy.
+
+    Args:
+        data: Raw timeline data from API
+        match_id: Match identifier for the timeline
+        profile: Selection of events, position frames and economy to keep
+
+    Returns:
+        list: One Match Timeline (Economy) record per participant
+    """
+    if not profile.keep_economy:
+        return []
+
+    info = data["info"]
+    frames = info["frames"]
+    timestamps = [frame["timestamp"] for frame in frames]
+
+    economy_list: list = []
+    for participant in info["participants"]:
+        participant_key = str(participant["participantId"])
+        participant_frames = [frame["participantFrames"][participant_key] for frame in frames]
+        columns = [[participant_frame.get(field, 0) for participant_frame in participant_frames]
+                   for field in ECONOMY_FIELDS]
+
+        economy_list.append({
+            "match_id": match_id,
+            "puuid": participant["puuid"],
+            "in_game_id": participant["participantId"],
+            "frame_count": len(frames),
+            "series": encode_economy(timestamps, *columns),
+        })
+
+    return economy_list
+
+
+def timeline_batches(payload, match_id: str, team_positions: Dict[str, tuple], profile: TimelineProfile,
+                     timeline_storage: str = "rows") -> List[Tuple[type, list]]:
+    """
+    Decode a timeline response and turn it into the rows of every timeline table.
+    
+    This is the unit of work of the "process" transform mode: the raw bytes go
+    in, and only the rows come back out of the worker.
+    
+    Args:
+        payload: Raw JSON bytes of the response, or the already decoded timeline
+        match_id: Match identifier for the timeline
+        team_positions: puuid mapped to its (team_id, team_position)
+        profile: Selection of events, position frames and economy to keep
+        timeline_storage: "rows" or "tracks" (see TimelineStorageConfig)
+        
+    Returns:
+        list: (table, rows) pairs in insertion order
+    """
+    data = decode_payload(payload, TimelinePayload)
+    rows = transform_timeline(data, match_id, team_positions, profile)
+    batches = [(MatchTimeline, rows)]
+    if timeline_storage == "tracks":
+        events, tracks = split_timeline_rows(rows)
+        batches = [(MatchTimeline, events), (MatchTimelineTracks, tracks)]
+    economy = transform_timeline_economy(data, match_id, profile)
+    if economy:
+        batches.append((MatchTimelineEconomy, economy))
+    return batches
+
 
 class MatchTimelineCall:
     """
     Handles retrieval and transformation of match timeline data from Riot API.
     
     This class fetches detailed timeline information including player movements,
-    kills, objectives, and other timestamped events during matches.
+    kills, objectives, and other timestamped events during matches. Which of
+    them are kept is decided by a TimelineProfile.
     """
-    def __init__(self, api_key: str, logger: Logger, token_bucket: TokenBucket) -> None:
+    def __init__(self, api_key: str, logger: Logger, token_bucket: TokenBucket,
+                 database_query: DatabaseQuery,
+                 profile: Optional[TimelineProfile] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
         """
-        Retrieve timeline data for a specific match.
+        Initialize the match timeline API client.
         
         Args:
-            match_id: Unique match identifier
-            region: Continental region for API routing
-            session: aiohttp session
-            
-        Returns:
-            dict: Raw timeline data from Riot API
+            api_key: Riot Games API key
+            logger: Logger instance
+            token_bucket: Rate limiter shared by the pipeline's API calls
+            database_query: Query object for the database holding the match data
+                (looks up each participant's team and position)
+            profile: Events, frames and series to collect (defaults to the configured profile)
+            concurrency: Adaptive limit on requests in flight per region
+            circuit_breaker: Breaker that stops calls to failing endpoints
         """
         self.api_key = api_key
         self.logger = logger
@@ -34,11 +275,16 @@ class MatchTimelineCall:
         self.request_header = {"X-Riot-Token": api_key}
         self.status_response_exception = StatusResponseException()
         self.token_bucket = token_bucket
-        self.DatabaseQuery = DatabaseQuery(str(Paths.DATA),DatabaseName.DATABASE_NAME.value)
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
+        self.DatabaseQuery = database_query
         self.sql_table_object = MatchTimeline
+        self.economy_table_object = MatchTimelineEconomy
+        self.profile = profile or TimelineProfile.named()
 
     @async_api_call_error_wrapper
-    async def match_timestamps_from_match_id(self, match_id: str, region: str, session: ClientSession):
+    async def match_timestamps_from_match_id(self, match_id: str, region: str, session: ClientSession,
+                                             raw: bool = False):
         """
         Retrieve timeline data for a specific match.
         
@@ -46,15 +292,18 @@ class MatchTimelineCall:
             match_id: Unique match identifier
             region: Continental region for API routing
             session: aiohttp session
+            raw: Return the undecoded response bytes (for a transform worker)
             
         Returns:
-            dict: Raw timeline data from Riot API
+            dict: Raw timeline data from Riot API (bytes when raw is set)
         """
         match_endpoint = MatchEndpoint.MATCH_TIMELINE_BY_MATCH_ID.value.format(matchId=match_id) 
         url = BaseEndpoint.BASE_RIOT_URL.value.format(region=region) + match_endpoint
         content = await safely_fetch_rate_limited_data(url, self.request_header, session, 
                                                        region, self.token_bucket, self.status_response_exception, 
-                                                       self.logger)
+                                                       self.logger, raw=raw,
+                                                       decoder=payload_decoder(TimelinePayload),
+                                                       concurrency=self.concurrency)
         return content
     
     def transform_results(self, data, match_id) -> list:
@@ -68,113 +317,18 @@ class MatchTimelineCall:
         Returns:
             list: Database-ready timeline event records
         """
-    
-        participant_ids = dict()
-        participant_ids[0] = "Minion"
-
-        team_id_team_pos: dict = {}
-        team_id_team_pos["Minion"] = (999, "")
-
-
-        info = data["info"]
-        for participant in info['participants']:
-            in_game_id = participant['participantId']
-            puuid = participant['puuid']
-            participant_ids[in_game_id] = puuid
-            team_id_team_pos[f"{puuid}"] = (self.DatabaseQuery.get_team_id_and_position(match_id=match_id,puuid=puuid)[0])
-
-
-
-
-        event_list: list = []
-        frames = info["frames"]
-        for frame in frames:
-            events = frame["events"]
-            for event in events:
-                if event["type"] in ["ELITE_MONSTER_KILL", "CHAMPION_KILL", "BUILDING_KILL"]:
-                    in_game_id_e = event.get('killerId')
-
-                    if in_game_id_e == 0:
-                        puuid_e = "Minion"
-                    else:
-                        puuid_e: str = participant_ids.get(in_game_id_e, "")
-
-                    position = event.get('position', {})
-                    position_x_e, position_y_e = position.get('x'), position.get('y')
-                    timestamp_e = event.get('timestamp')
-                    teamId_teamPos_e = team_id_team_pos[puuid_e]
-
-                    if teamId_teamPos_e == None and puuid_e != "Minion":
-                        self.logger.warning(f"Excluding this frame data |\n puuid: {puuid_e}, event: {event['type']}, matchId: {match_id}")
-                   
-
-                    team_position_e = teamId_teamPos_e[1]
-
-                    if event['type'] == "ELITE_MONSTER_KILL":
-                        team_id_e = event.get('killerTeamId')
-                        event_type_e = event.get('monsterType')
-
-                    elif event['type'] == "CHAMPION_KILL":
-                        team_id_e = teamId_teamPos_e[0]
-                        event_type_e = "KILL"
-
-                    elif event['type'] == "BUILDING_KILL":
-                        # This is the team that LOST the building
-                        team_id_e = event.get('teamId')
-                        event_type_e = event.get('buildingType')
-
-
-                    event_name_e = event['type']
-
-                    frame_event = {
-                        "match_id": match_id,         
-                        "puuid": puuid_e,            
-                        "timestamp": timestamp_e,      
-                        "team_id": team_id_e,        
-                        "in_game_id": in_game_id_e,  
-                        "team_position": team_position_e,
-                        "x": position_x_e,           
-                        "y": position_y_e,           
-                        "event": event_name_e,       
-                        "type": event_type_e           
-                    }
-
-                    event_list.append(frame_event)
+        team_positions = self.DatabaseQuery.get_team_ids_and_positions(match_id)
+        return transform_timeline(data, match_id, team_positions, self.profile)
 
+    def transform_economy(self, data, match_id) -> list:
+        """
+        Pack each participant's per-frame economy into one database-ready record.
         
-
-                general_timestamp = frame['timestamp']
-
-                
-                for participantId, participantFrame in frame['participantFrames'].items():
-                    in_game_id_p = int(participantId)
-                    puuid_p: str = participant_ids.get(in_game_id_p, "")
-                    teamId_teamPos_p = team_id_team_pos[puuid_p]
-
-         
-
-                    team_id_p, team_position_p = teamId_teamPos_p[0], teamId_teamPos_p[1]
-
-                    position_x_p = participantFrame['position']['x']
-                    position_y_p = participantFrame['position']['y']
-                    timestamp_p = general_timestamp
-                    event_type_p = "PARTICIPANT_FRAME"
-                    event_name_p = "POSITION"
-
-                    participant_event = {
-                        "match_id": match_id,
-                        "puuid": puuid_p,
-                        "timestamp": timestamp_p,
-                        "team_id": team_id_p,
-                        "in_game_id": in_game_id_p,
-                        "team_position": team_position_p,
-                        "x": position_x_p,
-                        "y": position_y_p,
-                        "event": event_name_p,
-                        "type": event_type_p,
-                    }
-
-                    event_list.append(participant_event)
-
-    
-        return event_list
\ No newline at end of file
+        Args:
+            data: Raw timeline data from API
+            match_id: Match identifier for the timeline
+            
+        Returns:
+            list: One Match Timeline (Economy) record per participant (see transform_timeline_economy)
+        """
+        return transform_timeline_economy(data, match_id, self.profile)
@@ -0,0 +1,136 @@
+"""
+Typed shapes of the match and timeline responses.
+
+Only the fields read by transform_match_data, transform_timeline and
+transform_timeline_economy are declared. A schema-aware decoder (msgspec,
+see utils/json_decoding.py) skips every other field while parsing, so the
+hundreds of unused participant, challenge and frame fields are never turned
+into Python objects. The results are plain dicts, so the transforms read them
+exactly like a full decode. Leaf values are typed Any to accept whatever the
+API sends (ints, floats, nulls) the same way json.loads does.
+
+A field added to a transform must be added here as well, or it decodes as missing.
+"""
+from typing import Any, Dict, List, Optional, TypedDict
+
+
+class Objective(TypedDict, total=False):
+    kills: Any
+
+
+class Objectives(TypedDict, total=False):
+    atakhan: Optional[Objective]
+    baron: Optional[Objective]
+    champion: Optional[Objective]
+    dragon: Optional[Objective]
+    horde: Optional[Objective]
+    riftHerald: Optional[Objective]
+    tower: Optional[Objective]
+
+
+class Team(TypedDict, total=False):
+    teamId: Any
+    win: Any
+    objectives: Optional[Objectives]
+
+
+class Challenges(TypedDict, total=False):
+    takedowns: Any
+    kda: Any
+    maxLevelLeadLaneOpponent: Any
+    laneMinionsFirst10Minutes: Any
+    damagePerMinute: Any
+    killParticipation: Any
+
+
+class Participant(TypedDict, total=False):
+    puuid: Any
+    teamId: Any
+    challenges: Optional[Challenges]
+    assists: Any
+    deaths: Any
+    goldEarned: Any
+    totalMinionsKilled: Any
+    controlWardsPlaced: Any
+    wardsPlaced: Any
+    wardsKilled: Any
+    visionScore: Any
+    visionWardsBoughtInGame: Any
+    assistMePings: Any
+    allInPings: Any
+    enemyMissingPings: Any
+    needVisionPings: Any
+    onMyWayPings: Any
+    getBackPings: Any
+    pushPings: Any
+    holdPings: Any
+    championName: Any
+    individualPosition: Any
+    teamPosition: Any
+    hadOpenNexus: Any
+    win: Any
+
+
+class MatchInfo(TypedDict, total=False):
+    endOfGameResult: Any
+    gameDuration: Any
+    gameEndTimestamp: Any
+    teams: List[Team]
+    participants: List[Participant]
+
+
+class MatchMetadata(TypedDict, total=False):
+    matchId: Any
+
+
+class MatchPayload(TypedDict, total=False):
+    """Match-v5 match response as read by transform_match_data."""
+    metadata: MatchMetadata
+    info: MatchInfo
+
+
+class Position(TypedDict, total=False):
+    x: Any
+    y: Any
+
+
+class TimelineEvent(TypedDict, total=False):
+    type: Any
+    timestamp: Any
+    killerId: Any
+    killerTeamId: Any
+    teamId: Any
+    monsterType: Any
+    buildingType: Any
+    position: Position
+
+
+class ParticipantFrame(TypedDict, total=False):
+    position: Position
+    totalGold: Any
+    xp: Any
+    minionsKilled: Any
+    jungleMinionsKilled: Any
+    level: Any
+
+
+class TimelineFrame(TypedDict, total=False):
+    timestamp: Any
+    events: List[TimelineEvent]
+    participantFrames: Dict[str, ParticipantFrame]
+
+
+class TimelineParticipant(TypedDict, total=False):
+    participantId: Any
+    puuid: Any
+
+
+class TimelineInfo(TypedDict, total=False):
+    frameInterval: Any
+    frames: List[TimelineFrame]
+    participants: List[TimelineParticipant]
+
+
+class TimelinePayload(TypedDict, total=False):
+    """Match-v5 timeline response as read by the timeline transforms."""
+    info: TimelineInfo
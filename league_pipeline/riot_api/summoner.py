@@ -4,6 +4,9 @@ from aiohttp import ClientSession
 from league_pipeline.utils.decorators import async_api_call_error_wrapper
 from league_pipeline.utils.exceptions import StatusResponseException
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from typing import Optional
 from league_pipeline.utils.http_utils import safely_fetch_rate_limited_data
 from league_pipeline.db.models import Summoners
 from league_pipeline.constants.regions import RegionMapping
@@ -17,7 +20,9 @@ class SummonerEntries:
     tier information, and transforms the data for database storage.
     """
     def __init__(self, api_key: str, logger: Logger,
-                 token_bucket: TokenBucket) -> None:
+                 token_bucket: TokenBucket,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None) -> None:
         
         self.sql_table_object = Summoners
 
@@ -27,6 +32,8 @@ class SummonerEntries:
         self.request_header = {"X-Riot-Token": api_key}
         self.status_response_exception = StatusResponseException()
         self.token_bucket = token_bucket
+        self.concurrency = concurrency
+        self.circuit_breaker = circuit_breaker
 
 
     @async_api_call_error_wrapper
@@ -59,7 +66,8 @@ class SummonerEntries:
                                                        session,region,
                                                        self.token_bucket,
                                                        self.status_response_exception,
-                                                       logger=self.logger)
+                                                       logger=self.logger,
+                                                       concurrency=self.concurrency)
         
 
         
@@ -92,7 +100,8 @@ class SummonerEntries:
 
         content = await safely_fetch_rate_limited_data(url,self.request_header,session,region,
                                                        self.token_bucket,self.status_response_exception,
-                                                       logger=self.logger)
+                                                       logger=self.logger,
+                                                       concurrency=self.concurrency)
         
 
         if not content:
@@ -1,15 +1,23 @@
 from enum import Enum
 from typing import Type
-from league_pipeline.riot_api.match_data import MatchData
+from league_pipeline.riot_api.match_data import MatchData, match_data_batches
 from league_pipeline.constants.database_constants import DatabaseConfiguration
 from typing import Union
 from pathlib import Path
 from logging import Logger
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler
 from league_pipeline.db.data_saving import DataSaver
 from aiohttp import ClientSession
+from league_pipeline.utils.http_client import create_client_session
 import asyncio
 from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from typing import Optional
+from league_pipeline.utils.transform_pool import TransformPool
+from league_pipeline.utils.workers import run_workers
 
 
 class MatchDataService:
@@ -18,22 +26,34 @@ class MatchDataService:
     
     This service orchestrates the collection of detailed match data from the Riot API
     and saves it to the database using asynchronous processing across multiple regions.
+    With a "process" transform pool the responses are decoded and transformed in
+    a worker process (see TransformExecutionConfig).
     """
 
     def __init__(self, db_location: Union[str, Path],
                     database_name: str, continents: Type[Enum],
-                    api_key: str, logger:  Logger, token_bucket: TokenBucket) -> None:
+                    api_key: str, logger:  Logger, token_bucket: TokenBucket,
+                    writer: Optional[GroupCommitWriter] = None,
+                    database_query: Optional[DatabaseQuery] = None,
+                    transform_pool: Optional[TransformPool] = None,
+                    concurrency: Optional[AdaptiveConcurrency] = None,
+                    circuit_breaker: Optional[CircuitBreaker] = None,
+                    retry_scheduler: Optional[RetryScheduler] = None) -> None:
         
             self.continent_list = continents.__members__.keys()
             self.logger = logger
+            self.writer = writer
+            self.retry_scheduler = retry_scheduler
+            self.transform_pool = transform_pool or TransformPool(self.logger, mode="inline")
             
             self.api_key = api_key
             
-            self.MatchData = MatchData(api_key,self.logger,token_bucket)
+            self.MatchData = MatchData(api_key,self.logger,token_bucket,concurrency,circuit_breaker)
+            self.workers = concurrency.max_limit if concurrency else 1
         
 
             self.url = DatabaseConfiguration.url.value.format(location=db_location, name=database_name)
-            self.DataBaseManager = DatabaseQuery(str(db_location), database_name)
+            self.DataBaseManager = database_query or DatabaseQuery(str(db_location), database_name)
             
             self.DataSaverTeams = DataSaver(db_location, database_name,self.url,
                                             self.MatchData.sql_table_object[0],
@@ -53,24 +73,41 @@ class MatchDataService:
             session: aiohttp session for API requests
         """
 
-        data = self.DataBaseManager.get_match_ids_by_continent_from_match_id_table(continent=continent)
-        
-        for entry in data:
-            match_id = entry[0]
-            result = await self.MatchData.match_data_from_match_id(region=continent,match_id=match_id,session=session)
-            teams, participants = self.MatchData.tranform_results(result)
+        data = self.DataBaseManager.iter_match_ids_by_continent_from_match_id_table(continent=continent)
+        await run_workers(data, lambda entry: self._process(continent, entry, session),
+                          self.workers, self.logger, self.retry_scheduler)
 
-            self.logger.info(f"{teams}\n{participants}")
+    async def _process(self, continent: str, entry: tuple, session: ClientSession) -> None:
+        """
+        Fetch and save the match of one match ID row.
+        """
+        match_id = entry[0]
+        result = await self.MatchData.match_data_from_match_id(region=continent,match_id=match_id,session=session,
+                                                               raw=self.transform_pool.raw)
+        teams, participants = await self.transform_pool.run(match_data_batches, result)
+
+        self.logger.info(f"{teams}\n{participants}")
+        if self.writer:
+            await self.writer.enqueue(self.MatchData.sql_table_object[0], teams)
+            await self.writer.enqueue(self.MatchData.sql_table_object[1], participants)
+        else:
             self.DataSaverTeams.save_data(teams)
             self.DataSaverParticipants.save_data(participants)
             
 
     
 
-    async def async_get_and_save_match_data(self):
-        """Execute asynchronous match data collection across all configured continents."""
-        
-        async with ClientSession() as session:
-            await asyncio.gather(*[self.process_continent(continent, session)
-                                for continent in self.continent_list]) 
+    async def async_get_and_save_match_data(self, session: Optional[ClientSession] = None):
+        """
+        Execute asynchronous match data collection across all configured continents.
+
+        Args:
+            session: Shared session to use; a tuned session of its own is opened if omitted
+        """
+        if session is None:
+            async with create_client_session() as session:
+                return await self.async_get_and_save_match_data(session)
+
+        await asyncio.gather(*[self.process_continent(continent, session)
+                               for continent in self.continent_list])
 
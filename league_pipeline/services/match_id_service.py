@@ -7,12 +7,19 @@ from typing import Union
 from pathlib import Path
 from logging import Logger
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler, completed_steps
 from league_pipeline.db.data_saving import DataSaver
 from aiohttp import ClientSession
+from league_pipeline.utils.http_client import create_client_session
 import asyncio
 from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from typing import Optional
 
 from league_pipeline.utils.time_converter import unix_time_converter
+from league_pipeline.utils.workers import run_workers
 
 
 class MatchIDCollectionService:
@@ -27,7 +34,13 @@ class MatchIDCollectionService:
                  queue:str, api_key: str, tiers: Type[Enum],
                  pages: int, divisions: Type[Enum],
                  logger:  Logger, token_bucket_continental: TokenBucket,
-                 token_bucket_local: TokenBucket, game_type: str) -> None:
+                 token_bucket_local: TokenBucket, game_type: str,
+                 writer: Optional[GroupCommitWriter] = None,
+                 database_query: Optional[DatabaseQuery] = None,
+                 concurrency_continental: Optional[AdaptiveConcurrency] = None,
+                 concurrency_local: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 retry_scheduler: Optional[RetryScheduler] = None) -> None:
         
         self.tier_list = tiers.__members__.keys()
         self.continent_list = continents.__members__.keys()
@@ -36,15 +49,21 @@ class MatchIDCollectionService:
         self.pages = pages
         self.logger = logger
         self.game_type = game_type
+        self.writer = writer
+        self.retry_scheduler = retry_scheduler
         
         self.api_key = api_key
         
-        self.MatchIDsCall = MatchIDsCall(api_key,self.logger,token_bucket_continental)
+        self.MatchIDsCall = MatchIDsCall(api_key,self.logger,token_bucket_continental,
+                                         concurrency=concurrency_continental,
+                                         circuit_breaker=circuit_breaker)
         self.SummonersEntries = SummonerEntries(self.api_key,self.logger,
-                                         token_bucket_local) 
+                                         token_bucket_local, concurrency_local,
+                                         circuit_breaker) 
+        self.workers = concurrency_continental.max_limit if concurrency_continental else 1
 
         self.url = DatabaseConfiguration.url.value.format(location=db_location, name=database_name)
-        self.DataBaseManager = DatabaseQuery(str(db_location), database_name)
+        self.DataBaseManager = database_query or DatabaseQuery(str(db_location), database_name)
         
         self.DataSaver = DataSaver(db_location, database_name,self.url,
                                     self.MatchIDsCall.sql_table_object,
@@ -60,39 +79,56 @@ class MatchIDCollectionService:
             continent: Continental region identifier
             session: aiohttp session for API requests
         """
-        data = self.DataBaseManager.get_puuids_by_continent_from_summoner_table(continent)
-    
+        data = self.DataBaseManager.iter_puuids_by_continent_from_summoner_table(continent)
+        await run_workers(data, lambda entry: self._process(continent, entry, session),
+                          self.workers, self.logger, self.retry_scheduler)
 
-        for entry in data:
+    async def _process(self, continent: str, entry: tuple, session: ClientSession) -> None:
+        """
+        Fetch and save the match IDs of one summoner row.
 
-            puuid = entry[0]
-            local_region = entry[1]
-        
+        The match IDs (continental endpoint) are kept with the work item, so a
+        retry or deferral of the tier call (platform endpoint) does not fetch
+        them again.
+        """
+        puuid = entry[0]
+        local_region = entry[1]
+        steps = completed_steps.get()
+        steps = {} if steps is None else steps
+    
+        if "match_ids" not in steps:
+            steps["match_ids"] = await self.MatchIDsCall.match_ids_from_puuids(region=continent,puuid=puuid,
+                                                                               game_type=self.game_type, 
+                                                                               session=session)
+        result = steps["match_ids"]
+        if not result:
+            return
+
+        tier = await self.SummonersEntries.summoner_tier_from_puuid(
+                                                        region=local_region,
+                                                        queue=self.queue,
+                                                        puuid=puuid,
+                                                        session=session)
         
-            result = await self.MatchIDsCall.match_ids_from_puuids(region=continent,puuid=puuid,
-                                                                   game_type=self.game_type, 
-                                                                   session=session)
-            
-            tier = await self.SummonersEntries.summoner_tier_from_puuid(
-                                                            region=local_region,
-                                                            queue=self.queue,
-                                                            puuid=puuid,
-                                                            session=session)
+        transformed_data = self.MatchIDsCall.transfom_results(data=result, game_tier=tier,puuid=puuid)    
+        if self.writer:
+            await self.writer.enqueue(self.MatchIDsCall.sql_table_object, transformed_data)
+        else:
+            self.DataSaver.save_data(transformed_data)
             
+  
 
-            if not result:
-                continue
-            else:
-                
-                transformed_data = self.MatchIDsCall.transfom_results(data=result, game_tier=tier,puuid=puuid)    
-                self.DataSaver.save_data(transformed_data)
-                
-      
+    async def async_get_and_save_match_ids(self, session: Optional[ClientSession] = None):
+        """
+        Execute asynchronous match ID collection across all configured continents.
 
-    async def async_get_and_save_match_ids(self):
-        """Execute asynchronous match ID collection across all configured continents."""
+        Args:
+            session: Shared session to use; a tuned session of its own is opened if omitted
+        """
+        if session is None:
+            async with create_client_session() as session:
+                return await self.async_get_and_save_match_ids(session)
 
-        async with ClientSession() as session:
-            await asyncio.gather(*[self.process_continent(continent, session)
-                                   for continent in self.continent_list]) 
+        await asyncio.gather(*[self.process_continent(continent, session)
+                               for continent in self.continent_list])
 
@@ -1,16 +1,25 @@
 from enum import Enum
 from typing import Type
-from league_pipeline.riot_api.match_timeline import MatchTimelineCall
-from league_pipeline.riot_api.match_data import MatchData
+from league_pipeline.riot_api.match_timeline import MatchTimelineCall, TimelineProfile, timeline_batches
 from league_pipeline.constants.database_constants import DatabaseConfiguration
 from typing import Union
 from pathlib import Path
 from logging import Logger
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler
 from league_pipeline.db.data_saving import DataSaver
 from aiohttp import ClientSession
+from league_pipeline.utils.http_client import create_client_session
 import asyncio
 from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from typing import Optional
+from league_pipeline.constants.pipeline_constants import TimelineStorageConfig
+from league_pipeline.db.models import MatchTimelineTracks
+from league_pipeline.utils.transform_pool import TransformPool
+from league_pipeline.utils.workers import run_workers
 
 
 class MatchTimelineService:
@@ -19,25 +28,49 @@ class MatchTimelineService:
     
     This service retrieves detailed timeline information for matches and processes
     the event data for database storage across multiple continental regions.
+    
+    With timeline_storage="tracks" the participant positions are packed into
+    one Match Timeline (Tracks) row per participant instead of one Match
+    Timeline row per frame (see TimelineStorageConfig). The profile decides
+    which events, position frames and economy series are collected (see
+    TimelineCollectionConfig). With a "process" transform pool the responses
+    are fetched as bytes and decoded and transformed in a worker process (see
+    TransformExecutionConfig).
     """
     def __init__(self, db_location: Union[str, Path],
                     database_name: str, continents: Type[Enum],
-                    api_key: str, logger:  Logger, token_bucket: TokenBucket) -> None:
+                    api_key: str, logger:  Logger, token_bucket: TokenBucket,
+                    writer: Optional[GroupCommitWriter] = None,
+                    database_query: Optional[DatabaseQuery] = None,
+                    timeline_storage: str = TimelineStorageConfig.MODE,
+                    profile: Optional[TimelineProfile] = None,
+                    transform_pool: Optional[TransformPool] = None,
+                    concurrency: Optional[AdaptiveConcurrency] = None,
+                    circuit_breaker: Optional[CircuitBreaker] = None,
+                    retry_scheduler: Optional[RetryScheduler] = None) -> None:
         
             self.continent_list = continents.__members__.keys()
             self.logger = logger
+            self.writer = writer
+            self.retry_scheduler = retry_scheduler
+            self.timeline_storage = timeline_storage
+            self.transform_pool = transform_pool or TransformPool(self.logger, mode="inline")
             
             self.api_key = api_key
             
-            self.MatchTimelineCall = MatchTimelineCall(api_key,self.logger,token_bucket)
-            self.MatchData = MatchData(api_key,self.logger,token_bucket)
-
             self.url = DatabaseConfiguration.url.value.format(location=db_location, name=database_name)
-            self.DataBaseManager = DatabaseQuery(str(db_location), database_name)
+            self.DataBaseManager = database_query or DatabaseQuery(str(db_location), database_name)
+
+            self.MatchTimelineCall = MatchTimelineCall(api_key,self.logger,token_bucket,self.DataBaseManager,
+                                                       profile,concurrency,circuit_breaker)
+            self.workers = concurrency.max_limit if concurrency else 1
             
             self.DataSaver = DataSaver(db_location, database_name,self.url,
                                        self.MatchTimelineCall.sql_table_object,
                                        self.logger)
+            self.data_savers = {table: DataSaver(db_location, database_name, self.url, table, self.logger)
+                                for table in (MatchTimelineTracks, self.MatchTimelineCall.economy_table_object)}
+            self.data_savers[self.MatchTimelineCall.sql_table_object] = self.DataSaver
 
 
     async def process_continent(self, continent: str, session: ClientSession) -> None:
@@ -48,25 +81,38 @@ class MatchTimelineService:
             continent: Continental region identifier
             session: aiohttp session for API requests
         """
-        data = self.DataBaseManager.get_match_ids_by_continent_from_match_data_table(continent=continent)
-        
-        for entry in data:
-            match_id = entry[0]
-            result = await self.MatchTimelineCall.match_timestamps_from_match_id(region=continent,match_id=match_id,session=session)
-            transformed_results = self.MatchTimelineCall.transform_results(result, match_id)
-     
-            self.DataSaver.save_data(transformed_results)
-        
-     
+        data = self.DataBaseManager.iter_match_ids_by_continent_from_match_data_table(continent=continent)
+        await run_workers(data, lambda entry: self._process(continent, entry, session),
+                          self.workers, self.logger, self.retry_scheduler)
 
-            
+    async def _process(self, continent: str, entry: tuple, session: ClientSession) -> None:
+        """
+        Fetch and save the timeline of one match ID row.
+        """
+        match_id = entry[0]
+        result = await self.MatchTimelineCall.match_timestamps_from_match_id(region=continent,match_id=match_id,session=session,
+                                                                             raw=self.transform_pool.raw)
+        team_positions = self.DataBaseManager.get_team_ids_and_positions(match_id)
+        batches = await self.transform_pool.run(timeline_batches, result, match_id, team_positions,
+                                                self.MatchTimelineCall.profile, self.timeline_storage)
+ 
+        for table, rows in batches:
+            if self.writer:
+                await self.writer.enqueue(table, rows)
+            else:
+                self.data_savers[table].save_data(rows)
 
-    
+    async def async_get_and_save_match_data(self, session: Optional[ClientSession] = None):
+        """
+        Execute asynchronous timeline data collection across all configured continents.
 
-    async def async_get_and_save_match_data(self):
-        """Execute asynchronous timeline data collection across all configured continents."""
+        Args:
+            session: Shared session to use; a tuned session of its own is opened if omitted
+        """
+        if session is None:
+            async with create_client_session() as session:
+                return await self.async_get_and_save_match_data(session)
 
-        async with ClientSession() as session:
-            await asyncio.gather(*[self.process_continent(continent, session)
-                                for continent in self.continent_list]) 
+        await asyncio.gather(*[self.process_continent(continent, session)
+                               for continent in self.continent_list])
 
@@ -6,9 +6,16 @@ from typing import Union
 from pathlib import Path
 from logging import Logger
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler
 from league_pipeline.db.data_saving import DataSaver
 from aiohttp import ClientSession
+from league_pipeline.utils.http_client import create_client_session
 import asyncio
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from typing import Optional
+from league_pipeline.utils.workers import run_workers
 
 class SummonerCollectionService:
     """
@@ -21,7 +28,11 @@ class SummonerCollectionService:
                  database_name: str, regions: Type[Enum],
                  queue:str, api_key: str, tiers: Type[Enum],
                  pages: int, divisions: Type[Enum],
-                 logger:  Logger, token_bucket: TokenBucket) -> None:
+                 logger:  Logger, token_bucket: TokenBucket,
+                 writer: Optional[GroupCommitWriter] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 retry_scheduler: Optional[RetryScheduler] = None) -> None:
         
         self.tier_list = tiers.__members__.keys()
         self.region_list = regions.__members__.keys()
@@ -29,10 +40,13 @@ class SummonerCollectionService:
         self.queue = queue
         self.pages = pages
         self.logger = logger
+        self.writer = writer
+        self.retry_scheduler = retry_scheduler
 
         self.api_key = api_key
         
-        self.SummonerEntries = SummonerEntries(api_key,self.logger, token_bucket)
+        self.SummonerEntries = SummonerEntries(api_key,self.logger, token_bucket, concurrency, circuit_breaker)
+        self.workers = concurrency.max_limit if concurrency else 1
 
         self.url = DatabaseConfiguration.url.value.format(location=db_location, name=database_name)
         
@@ -50,50 +64,48 @@ class SummonerCollectionService:
             region: Regional server identifier
             session: aiohttp session for API requests
         """
-        semaphore = asyncio.Semaphore()
-        tasks = []
+        pages = []
 
         for page in range(self.pages):
             for tier in self.tier_list:
                 for division in self.division_list:
-                    tasks.append(self._limited_summoner_call(semaphore=semaphore, 
-                                                             tier=tier,queue=self.queue,
-                                                             division=division,page=page, 
-                                                             region=region,session=session))
+                    pages.append((tier, division, page))
                     if tier in ["CHALLENGER", "GRANDMASTER", "MASTER"]:
                         break
 
-
-        for future in asyncio.as_completed(tasks):
-            result = await future
-            self.data_saver.save_data(result)
+        await run_workers(pages, lambda item: self._process(region, *item, session=session),
+                          self.workers, self.logger, self.retry_scheduler)
     
-    async def _limited_summoner_call(self, semaphore: asyncio.Semaphore, 
-                                     tier:str, queue: str, division: str,
-                                     page: int,region: str, 
-                                     session: ClientSession):
+    async def _process(self, region: str, tier: str, division: str, page: int,
+                       session: ClientSession) -> None:
         """
-        Make rate-limited summoner API call with semaphore control.
+        Fetch and save one ladder page.
         
         Args:
-            semaphore: Asyncio semaphore for concurrency control
+            region: Regional server identifier
             tier: Competitive tier to query
-            queue: Queue type
             division: Division within tier
             page: Page number for pagination
-            region: Regional server identifier
             session: aiohttp session
         """
-
-        async with semaphore:
-            result = await self.SummonerEntries.summoner_entries_by_tier(tier=tier,queue=queue,
-                                                                 division=division,pages=page,
-                                                                 region=region,session=session)
-            return result
+        result = await self.SummonerEntries.summoner_entries_by_tier(tier=tier,queue=self.queue,
+                                                             division=division,pages=page,
+                                                             region=region,session=session)
+        if self.writer:
+            await self.writer.enqueue(self.SummonerEntries.sql_table_object, result)
+        else:
+            self.data_saver.save_data(result)
     
-    async def async_get_and_save_summoner_entries(self):
-        """Execute asynchronous summoner data collection across all configured regions."""
+    async def async_get_and_save_summoner_entries(self, session: Optional[ClientSession] = None):
+        """
+        Execute asynchronous summoner data collection across all configured regions.
+
+        Args:
+            session: Shared session to use; a tuned session of its own is opened if omitted
+        """
+        if session is None:
+            async with create_client_session() as session:
+                return await self.async_get_and_save_summoner_entries(session)
 
-        async with ClientSession() as session:
-           tasks = [self.process_region(region, session) for region in self.region_list]
-           await asyncio.gather(*tasks)
+        tasks = [self.process_region(region, session) for region in self.region_list]
+        await asyncio.gather(*tasks)
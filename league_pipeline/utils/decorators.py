@@ -2,10 +2,13 @@ import asyncio
 from aiohttp.client_exceptions import ClientResponseError, ClientConnectorDNSError, ClientConnectorError, ClientOSError
 from logging import Logger
 from league_pipeline.constants.rates import Rates
-from league_pipeline.utils.exceptions import StatusCodeError
+from league_pipeline.utils.exceptions import StatusCodeError, RetryLater
 from league_pipeline.utils.http_utils import retry_api_call, exponential_back_off
 from league_pipeline.constants.rates import Rates
+from league_pipeline.rate_limiting.circuit_breaker import CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import current_attempt
 from functools import wraps
+from typing import Optional
 
 
 def async_api_call_error_wrapper(function):
@@ -14,9 +17,16 @@ def async_api_call_error_wrapper(function):
     
     This decorator wraps async functions that make API calls and provides:
     - Automatic retry for server errors (5xx)
-    - Rate limit handling (429 errors)
+    - Rate limit handling (429 errors), waiting exactly Retry-After when the
+      response has one; 429s count towards the retry limit like any failure
     - Exponential backoff for transient failures
+    - Retries through the retry scheduler inside run_workers(): instead of
+      sleeping, a retryable failure raises RetryLater with the delay and the
+      work item is retried from the scheduler's delay queue
     - Comprehensive error logging and classification
+    - Circuit breaking per (region, endpoint) when the instance has a
+      circuit_breaker: calls fail with CircuitOpenError while the circuit is
+      open, and a failure that opens it ends the retries at once
     
     Args:
         function: Async function that makes API calls
@@ -30,60 +40,78 @@ def async_api_call_error_wrapper(function):
         self_instance = args[0]  # First Argument is Self
         region = kwargs["region"]
         logger: Logger = self_instance.logger
+        circuit_breaker: Optional[CircuitBreaker] = getattr(self_instance, "circuit_breaker", None)
+        endpoint = function.__name__
         max_retries = Rates.MAX_API_CALL_RETRIES.value
-        for attempt in range(0, max_retries):
+        # Attempts the work item already made, when run by run_workers().
+        scheduled_attempt = current_attempt.get()
+        for attempt in range(scheduled_attempt or 0, max_retries):
+            probe = circuit_breaker.before_call(region, endpoint) if circuit_breaker else False
+
+            # True: the endpoint answered, False: it failed (5xx, timeout,
+            # connection error), None: neither (429, other 4xx, cancellation).
+            outcome = None
+            wait_time = 0
+            failure = None
             try:
                 
                 content = await function(*args,**kwargs)
+                outcome = True
                 return content
        
             except StatusCodeError as e:
+                failure = e
                 if e.status_code >= 500 :
-             
+                    outcome = False
                     retry = retry_api_call(e, attempt, max_retries, logger)
 
                     if retry:
                         wait_time = exponential_back_off(Rates.EXPONENTIAL_BACK_OFF_BASE_VALUE.value,
                                                          Rates.MAX_WAITING_TIME_BETWEEN_RETRIES.value,
                                                          attempt = attempt, jitter=Rates.JITTER.value)
-                        await asyncio.sleep(wait_time)
                     else:
                         raise
                 elif e.status_code == 429:
-                    logger.warning(f"{str(e)} \n Region: {region} \n Waiting for: {Rates.SLEEP_TIME_IF_RATE_LIMIT_EXCEEDED.value} Seconds")
-                    await asyncio.sleep(Rates.SLEEP_TIME_IF_RATE_LIMIT_EXCEEDED.value)
+                    retry = retry_api_call(e, attempt, max_retries, logger)
+                    if not retry:
+                        raise
+                    wait_time = (e.retry_after if e.retry_after is not None
+                                 else Rates.SLEEP_TIME_IF_RATE_LIMIT_EXCEEDED.value)
+                    logger.warning(f"{str(e)} \n Region: {region} \n Waiting for: {wait_time} Seconds")
                     
                 else:
                     logger.error(f"{str(e)}")
                     raise
             
             except ClientResponseError as e:
+                failure = e
                 if e.status >= 500:
+                    outcome = False
                     logger.warning(f"HTTP {e.status}: {e.message}")
                     retry = retry_api_call(e, attempt, max_retries, logger)
                     if retry:
                         wait_time = exponential_back_off(Rates.EXPONENTIAL_BACK_OFF_BASE_VALUE.value,
                                                          Rates.MAX_WAITING_TIME_BETWEEN_RETRIES.value,
                                                          attempt = attempt, jitter=Rates.JITTER.value)
-                        await asyncio.sleep(wait_time)
                     else:
                         raise
                 else:
                     raise
             
             except (ClientConnectorDNSError, ClientConnectorError,ClientOSError) as e:
+                failure = e
+                outcome = False
                 retry = retry_api_call(e, attempt,max_retries,logger)
                 
                 if retry:
                     wait_time = exponential_back_off(Rates.EXPONENTIAL_BACK_OFF_BASE_VALUE.value,
                                                      Rates.MAX_WAITING_TIME_BETWEEN_RETRIES.value,
                                                      attempt = attempt, jitter=Rates.JITTER.value)
-
-                    await asyncio.sleep(wait_time)
                 else:
                     raise
             except asyncio.TimeoutError as e:
-                
+                failure = e
+                outcome = False
                 logger.warning("System Timeout occurred")
                 retry = retry_api_call(e, attempt, max_retries, logger)
 
@@ -91,7 +119,6 @@ def async_api_call_error_wrapper(function):
                     wait_time = exponential_back_off(Rates.EXPONENTIAL_BACK_OFF_BASE_VALUE.value,
                                                         Rates.MAX_WAITING_TIME_BETWEEN_RETRIES.value,
                                                         attempt = attempt, jitter=Rates.JITTER.value)
-                    await asyncio.sleep(wait_time)
                 else:
                     raise
 
@@ -100,6 +127,8 @@ def async_api_call_error_wrapper(function):
                 raise
 
             except asyncio.IncompleteReadError as e:
+                failure = e
+                outcome = False
                 logger.warning(f"Incomplete read: {e}. Retrying may help.")
                 retry = retry_api_call(e, attempt, max_retries, logger)
 
@@ -107,9 +136,17 @@ def async_api_call_error_wrapper(function):
                     wait_time = exponential_back_off(Rates.EXPONENTIAL_BACK_OFF_BASE_VALUE.value,
                                                         Rates.MAX_WAITING_TIME_BETWEEN_RETRIES.value,
                                                         attempt = attempt, jitter= Rates.JITTER.value)
-                    await asyncio.sleep(wait_time)
                 else:
                     raise
+            finally:
+                if circuit_breaker:
+                    circuit_breaker.record(region, endpoint, outcome, probe=probe)
+
+            if outcome is False and circuit_breaker:
+                # Raises CircuitOpenError instead of backing off if this failure opened the circuit.
+                circuit_breaker.check(region, endpoint)
+            if scheduled_attempt is not None:
+                raise RetryLater(wait_time, attempt, failure) from failure
+            await asyncio.sleep(wait_time)
     
     return wrap
-
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class StatusCodeError(Exception):
     """
     Custom exception for handling HTTP status code errors.
@@ -8,11 +11,14 @@ class StatusCodeError(Exception):
     Attributes:
         status_code (int): HTTP status code that caused the error.
         message (str): Descriptive error message.
+        retry_after (Optional[float]): Seconds from the response's Retry-After
+                                       header, if it had one.
     """
-    def __init__(self, status_code, message=""):
+    def __init__(self, status_code, message="", retry_after=None):
         super().__init__(f"HTTP {status_code}: {message}")
         self.status_code = status_code
         self.message = message
+        self.retry_after = retry_after
 
 class StatusResponseException:
     """
@@ -108,12 +114,13 @@ class StatusResponseException:
         """
         return list(self.response_code_dict.keys())
         
-    def raise_error(self, status_code: int) -> None:
+    def raise_error(self, status_code: int, retry_after: Optional[float] = None) -> None:
         """
         Raise StatusCodeError for non-200 status codes.
         
         Args:
             status_code: HTTP status code to handle
+            retry_after: Seconds the server asked to wait (Retry-After), if any
             
         Raises:
             StatusCodeError: If status code is not 200, with detailed message.
@@ -122,5 +129,45 @@ class StatusResponseException:
 
         if status_code != 200:
             raise StatusCodeError(
-                status_code, self.response_code_dict[status_code])
+                status_code, self.response_code_dict[status_code], retry_after)
         
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an endpoint whose circuit breaker is open.
+    
+    Attributes:
+        region (str): Region of the open circuit.
+        endpoint (str): Endpoint of the open circuit.
+        retry_at (float): time.monotonic() value from which a call may go through again.
+        probing (bool): The circuit is half-open and only waits for its probe's
+                        outcome, not for an open period to end.
+    """
+    def __init__(self, region: str, endpoint: str, retry_at: float, probing: bool = False):
+        super().__init__(f"Circuit {'half-open, probe in flight' if probing else 'open'} | "
+                         f"Region: {region} | Endpoint: {endpoint}")
+        self.region = region
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+        self.probing = probing
+
+
+class RetryLater(Exception):
+    """
+    Raised by the API error wrapper inside run_workers() instead of sleeping
+    before a retry; the work item goes to the retry scheduler.
+    
+    Attributes:
+        delay (float): Seconds until the item may be retried.
+        attempt (int): Attempt that failed, counted over all dispatches of the item.
+        error (Exception): The failure.
+        rate_limited (bool): Whether the failure was a 429.
+        paced (bool): Whether the failure was a 429 with a Retry-After header, which the delay honors.
+    """
+    def __init__(self, delay: float, attempt: int, error: Exception):
+        super().__init__(f"Retrying in {delay:.2f} Seconds after: {error}")
+        self.delay = delay
+        self.attempt = attempt
+        self.error = error
+        self.rate_limited = isinstance(error, StatusCodeError) and error.status_code == 429
+        self.paced = self.rate_limited and error.retry_after is not None
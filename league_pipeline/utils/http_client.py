@@ -0,0 +1,76 @@
+import asyncio
+from logging import Logger
+from typing import Iterable
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+
+from league_pipeline.constants.pipeline_constants import HttpClientConfig
+
+try:
+    import brotli
+except ImportError:  # optional dependency, needed to accept br responses
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+def accept_encoding(encodings: str = HttpClientConfig.ACCEPT_ENCODING) -> str:
+    """
+    Return the Accept-Encoding header value, without "br" if aiohttp could not decode it.
+    """
+    names = [name.strip() for name in encodings.split(",") if name.strip()]
+    return ", ".join(name for name in names if name != "br" or brotli is not None)
+
+
+def create_client_session() -> ClientSession:
+    """
+    Create the ClientSession configured by HttpClientConfig.
+
+    The connector keeps idle connections alive and caches DNS results, so a
+    host's TCP and TLS handshakes are paid once per run instead of once per
+    stage. Must be called (and closed) inside the event loop that uses it.
+
+    Returns:
+        ClientSession: The tuned session.
+    """
+    connector = TCPConnector(limit=HttpClientConfig.LIMIT,
+                             limit_per_host=HttpClientConfig.LIMIT_PER_HOST,
+                             keepalive_timeout=HttpClientConfig.KEEPALIVE_TIMEOUT,
+                             ttl_dns_cache=HttpClientConfig.DNS_CACHE_TTL)
+    timeout = ClientTimeout(total=HttpClientConfig.TOTAL_TIMEOUT,
+                            connect=HttpClientConfig.CONNECT_TIMEOUT,
+                            sock_read=HttpClientConfig.SOCK_READ_TIMEOUT)
+    return ClientSession(connector=connector, timeout=timeout,
+                         headers={"Accept-Encoding": accept_encoding()})
+
+
+async def prewarm_connections(session: ClientSession, base_urls: Iterable[str], logger: Logger) -> int:
+    """
+    Open a kept-alive connection to every host before the first API call.
+
+    Sends one HEAD request without the API key to each base URL, which costs
+    no rate limit; the response status is irrelevant, only the resolved
+    address and the established connection are kept.
+
+    Args:
+        session (ClientSession): Session the stages will use.
+        base_urls (Iterable[str]): Base URLs, e.g. the values of Region and ContinentalRegion.
+        logger (Logger): Logger for hosts that could not be reached.
+
+    Returns:
+        int: Number of hosts connected.
+    """
+    async def warm(url: str) -> bool:
+        try:
+            async with session.head(url, allow_redirects=False) as response:
+                await response.read()
+            return True
+        except (ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Could not pre-warm connection to {url}: {str(e)}")
+            return False
+
+    urls = list(dict.fromkeys(base_urls))
+    connected = sum(await asyncio.gather(*[warm(url) for url in urls]))
+    logger.info(f"Pre-warmed connections | hosts: {connected}/{len(urls)}")
+    return connected
@@ -1,15 +1,23 @@
 import asyncio
 from league_pipeline.rate_limiting.rate_manager import TokenBucket
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
 from aiohttp import ClientSession
 from league_pipeline.utils.exceptions import StatusResponseException
 import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from logging import Logger
+from typing import Any, Callable, Optional
+from league_pipeline.utils.json_decoding import payload_decoder
 
 async def safely_fetch_rate_limited_data(url:str, request_header: dict, session: ClientSession, 
                                          region:str, token_bucket: TokenBucket, 
                                          status_response_exception: StatusResponseException,
                                          logger: Logger,
-                                         parameters: dict = {"no_parameters": None}):
+                                         parameters: dict = {"no_parameters": None},
+                                         raw: bool = False,
+                                         decoder: Optional[Callable[[bytes], Any]] = None,
+                                         concurrency: Optional[AdaptiveConcurrency] = None):
     
 
     
@@ -28,9 +36,14 @@ async def safely_fetch_rate_limited_data(url:str, request_header: dict, session:
         status_response_exception: Exception handler for status codes
         logger: Logger instance for request tracking
         parameters: Optional parameters for the request
+        raw: Return the undecoded response body instead of its JSON
+        decoder: Function decoding the body bytes (default: the configured
+                 schema-less decoder, see JsonDecodingConfig)
+        concurrency: Per-region limit on requests in flight; the request holds
+                     a slot from after the token bucket until its body is read
         
     Returns:
-        dict: JSON response from the API
+        dict: JSON response from the API (bytes when raw is set)
         
     Raises:
         StatusCodeError: For non-successful HTTP status codes
@@ -40,23 +53,60 @@ async def safely_fetch_rate_limited_data(url:str, request_header: dict, session:
             sleep_time = token_bucket.calculate_sleep_time(region=region)
             await asyncio.sleep(sleep_time)
 
-    async with session.get(url,headers=request_header,
-                           **{key:value for key,value
-                              in parameters.items() if value != None}) as response:
-                
-                status = response.status
-                
-                if status == 200:
-                    content = await response.json()
-                    return content
+    started = await concurrency.acquire(region) if concurrency else None
+    outcome = "error"
+    try:
+        async with session.get(url,headers=request_header,
+                               **{key:value for key,value
+                                  in parameters.items() if value != None}) as response:
 
-                elif status in status_response_exception.get_response_codes():
-                    status_response_exception.raise_error(status)
-                else:
-                    response.raise_for_status()
-                
-                return await response.json()
+            status = response.status
+
+            if status == 200:
+                body = await response.read()
+                outcome = "success"
+                if raw:
+                    return body
+                content = (decoder or payload_decoder())(body)
+                return content
+
+            elif status == 429:
+                outcome = "rate_limited"
+
+            if status in status_response_exception.get_response_codes():
+                status_response_exception.raise_error(status, parse_retry_after(response.headers.get("Retry-After")))
+            else:
+                response.raise_for_status()
+
+            return (decoder or payload_decoder())(await response.read())
+    finally:
+        if concurrency:
+            concurrency.release(region, started, outcome)
+    
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a Retry-After header to seconds from now.
     
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+        
+    Returns:
+        Optional[float]: Seconds to wait (never negative), or None without a usable header
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 def retry_api_call(error: Exception, attempt: int, max_retries: int, logger: Logger) -> bool:
     """
     Determine if an API call should be retried based on attempt count.
@@ -97,4 +147,4 @@ def exponential_back_off(base: float, max_wait_time: float, attempt:int, jitter:
         sleep_time = random.uniform(0, sleep_raw)
         return sleep_time
     else:
-        return sleep_raw
\ No newline at end of file
+        return sleep_raw
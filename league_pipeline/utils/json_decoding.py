@@ -0,0 +1,83 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+from league_pipeline.constants.pipeline_constants import JsonDecodingConfig
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency, needed for typed payloads
+    msgspec = None
+
+
+def available_decoders() -> List[str]:
+    """
+    Return the names of the installed decoders in "auto" preference order (schema-less).
+    """
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    return [name for name, present in installed.items() if present]
+
+
+@lru_cache(maxsize=None)
+def json_decoder(name: str = JsonDecodingConfig.DECODER, schema: Optional[type] = None) -> Callable[[bytes], Any]:
+    """
+    Return a function decoding a JSON body (bytes or str).
+
+    With a schema (a TypedDict from riot_api/schemas.py) msgspec decodes only
+    the declared fields and skips the rest of the document without building
+    objects for it; orjson and json ignore the schema and decode everything.
+    Decoders are built once per (name, schema) and reused, in every process.
+
+    Args:
+        name (str): "auto", "msgspec", "orjson" or "json" (see JsonDecodingConfig).
+        schema (Optional[type]): Expected shape of the document.
+
+    Returns:
+        Callable: The decode function.
+
+    Raises:
+        ImportError: If the named decoder is not installed.
+        ValueError: If the name is unknown.
+    """
+    if name == "auto":
+        name = "msgspec" if schema is not None and msgspec is not None else available_decoders()[0]
+
+    if name == "msgspec":
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        return (msgspec.json.Decoder(schema) if schema is not None else msgspec.json.Decoder()).decode
+    if name == "orjson":
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        return orjson.loads
+    if name == "json":
+        return json.loads
+    raise ValueError(f"Unknown JSON decoder: {name}")
+
+
+def payload_decoder(schema: Optional[type] = None) -> Callable[[bytes], Any]:
+    """
+    Return the configured decoder, typed with the schema if JsonDecodingConfig.TYPED_PAYLOADS is set.
+    """
+    return json_decoder(JsonDecodingConfig.DECODER, schema if JsonDecodingConfig.TYPED_PAYLOADS else None)
+
+
+def decode_payload(payload: Any, schema: Optional[type] = None) -> Any:
+    """
+    Decode a response body fetched with raw=True; already decoded content is returned unchanged.
+
+    Args:
+        payload: Raw JSON bytes/str or already decoded content.
+        schema (Optional[type]): Expected shape of the document (see payload_decoder).
+
+    Returns:
+        The decoded JSON content.
+    """
+    if isinstance(payload, (bytes, bytearray, str)):
+        return payload_decoder(schema)(payload)
+    return payload
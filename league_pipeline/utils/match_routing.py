@@ -0,0 +1,52 @@
+from typing import Optional, Tuple
+from league_pipeline.constants.regions import RegionMapping
+
+
+def platform_and_continent_from_match_id(match_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Derive the platform and continental routing region from a match ID prefix.
+    
+    Match IDs are issued as "<PLATFORM>_<number>" (e.g. "EUW1_7012345678"), and
+    RegionMapping maps the platform to its MATCH-V5 routing region.
+    
+    Args:
+        match_id: Match identifier from the Riot API
+        
+    Returns:
+        tuple: (platform, continental_region), or (None, None) if the prefix
+               is not a known platform
+        
+    Example:
+        >>> platform_and_continent_from_match_id("EUW1_7012345678")
+        ('EUW1', 'EUROPE')
+    """
+    platform = match_id.partition("_")[0].upper()
+    mapping = RegionMapping.__members__.get(platform)
+    if mapping is None:
+        return None, None
+    return platform, mapping.value
+
+
+def match_id_prefix_sql(column: str = "matchId") -> str:
+    """
+    SQLite expression for the upper-cased platform prefix of a match ID column.
+    """
+    return f"upper(substr(\"{column}\", 1, instr(\"{column}\", '_') - 1))"
+
+
+def continent_from_match_id_sql(column: str = "matchId") -> str:
+    """
+    SQLite CASE expression deriving the continental region from a match ID column.
+    
+    The SQL counterpart of platform_and_continent_from_match_id(), for deriving
+    the region of many rows inside a single statement.
+    
+    Args:
+        column: Name of the column holding match IDs
+        
+    Returns:
+        str: Expression evaluating to the continental region, or NULL for unknown prefixes
+    """
+    cases = " ".join(f"WHEN '{platform}' THEN '{mapping.value}'"
+                     for platform, mapping in RegionMapping.__members__.items())
+    return f"CASE {match_id_prefix_sql(column)} {cases} END"
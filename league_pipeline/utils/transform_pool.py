@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from logging import Logger
+from typing import Any, Callable, Optional
+
+from league_pipeline.constants.pipeline_constants import TransformExecutionConfig
+
+
+class TransformPool:
+    """
+    Runs response decoding and transforms inline or in a process pool.
+
+    In "process" mode the services fetch raw response bytes (see the raw
+    flag of safely_fetch_rate_limited_data) and await run(), which hands the
+    bytes to a worker process. The worker decodes and transforms them and
+    pickles back only the row batches, which are unpickled by the executor's
+    management thread; the event loop thread neither parses JSON nor builds
+    rows. In "inline" mode run() calls the function directly, so both modes
+    share one code path in the services.
+
+    The functions run must be module-level (picklable) and must not touch the
+    database; whatever they need from it is looked up before run() is called.
+
+    Attributes:
+        mode (str): "inline" or "process".
+        workers (int | None): Worker processes in "process" mode (None: one per CPU).
+        logger (Logger): Logger instance for pool lifecycle messages.
+    """
+
+    def __init__(self, logger: Logger, mode: str = TransformExecutionConfig.MODE,
+                 workers: Optional[int] = TransformExecutionConfig.WORKERS,
+                 start_method: str = TransformExecutionConfig.START_METHOD) -> None:
+        if mode not in ("inline", "process"):
+            raise ValueError(f"Unknown transform execution mode: {mode}")
+
+        self.mode = mode
+        self.workers = workers
+        self.logger = logger
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers,
+                                                 mp_context=multiprocessing.get_context(start_method))
+            self.logger.info(f"Started transform process pool | workers: {self._executor._max_workers}")
+
+    @property
+    def raw(self) -> bool:
+        """
+        Whether responses should be fetched as undecoded bytes for this pool.
+        """
+        return self.mode == "process"
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run function(*args) in a worker process ("process") or right here ("inline").
+
+        Args:
+            function (Callable): Module-level function, e.g. timeline_batches.
+            *args: Picklable arguments, typically the raw response bytes first.
+
+        Returns:
+            The function's result.
+        """
+        if self._executor is None:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def close(self) -> None:
+        """
+        Wait for running transforms and stop the worker processes.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            self.logger.info("Stopped transform process pool")
+
+    def __enter__(self) -> "TransformPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,83 @@
+import asyncio
+from logging import Logger
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler, completed_steps, current_attempt
+from league_pipeline.utils.exceptions import CircuitOpenError, RetryLater
+
+
+async def run_workers(items: Iterable, process: Callable[[Any], Awaitable[None]], workers: int,
+                      logger: Logger, scheduler: Optional[RetryScheduler] = None) -> None:
+    """
+    Process items with a fixed number of worker coroutines sharing one iterator.
+
+    No worker sleeps before a retry. An item whose request failed (RetryLater
+    from the API error wrapper) or was refused by an open circuit
+    (CircuitOpenError) goes to the retry scheduler's delay queue, and the
+    worker takes the next item right away. When the item is due the
+    scheduler hands it back and the workers take it up before any new item.
+    The call returns once the iterator is exhausted and every item is done
+    or dropped. Results an item stores in completed_steps stay with it
+    across its retries and are discarded with it.
+
+    Args:
+        items (Iterable): Work items, e.g. rows of a database iterator.
+        process (Callable): Coroutine function handling one item.
+        workers (int): Number of items processed at once.
+        logger (Logger): Logger for the scheduler created if none is given.
+        scheduler (Optional[RetryScheduler]): Delay queue and retry budget,
+                                              shared by every run using it.
+    """
+    scheduler = scheduler or RetryScheduler(logger)
+    iterator = iter(items)
+    ready: asyncio.Queue = asyncio.Queue()
+    # Items taken from the iterator and neither done nor dropped yet.
+    outstanding = [0]
+    drained = [False]
+    wake = object()
+
+    def finish() -> None:
+        outstanding[0] -= 1
+        if drained[0] and not outstanding[0]:
+            # Nothing can be retried any more: release the workers waiting
+            # for a retry, one wake each.
+            for _ in range(workers):
+                ready.put_nowait(wake)
+
+    async def worker() -> None:
+        while True:
+            if not ready.empty():
+                entry = ready.get_nowait()
+            else:
+                item = next(iterator, wake)
+                if item is not wake:
+                    entry = {"item": item, "attempts": 0, "deferrals": 0, "steps": {}}
+                    outstanding[0] += 1
+                    scheduler.started += 1
+                else:
+                    drained[0] = True
+                    if not outstanding[0]:
+                        return
+                    entry = await ready.get()
+            if entry is wake:
+                return
+
+            token = current_attempt.set(entry["attempts"])
+            steps_token = completed_steps.set(entry["steps"])
+            try:
+                await process(entry["item"])
+            except RetryLater as e:
+                if scheduler.retry(ready, entry, e):
+                    continue
+            except CircuitOpenError as e:
+                if scheduler.defer(ready, entry, e):
+                    continue
+            finally:
+                current_attempt.reset(token)
+                completed_steps.reset(steps_token)
+            finish()
+
+    try:
+        await asyncio.gather(*[worker() for _ in range(workers)])
+    finally:
+        scheduler.discard(ready)
@@ -0,0 +1,72 @@
+import argparse
+import time
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.constants.pipeline_constants import DictionaryEncodingConfig
+from league_pipeline.db.dictionary_encoding import encode_database, encoded_table_name
+from league_pipeline.db.engine_registry import get_engine
+
+# Scans reading no encoded column, filtering on one and grouping by one.
+SAMPLE_SCANS = (
+    'SELECT COUNT(*), SUM("x"), SUM("y") FROM "Match Timeline"',
+    'SELECT COUNT(*) FROM "Match Timeline" WHERE "teamPosition" = \'JUNGLE\'',
+    'SELECT "championName", COUNT(*), AVG("win") FROM "Match Data (Participants)" GROUP BY 1',
+)
+
+
+def table_bytes(url: str) -> dict:
+    """
+    Return the on-disk size of the encodable tables and their indexes (dbstat), by original table name.
+    """
+    names = {name: name for name in DictionaryEncodingConfig.COLUMNS}
+    names.update({encoded_table_name(name): name for name in DictionaryEncodingConfig.COLUMNS})
+    with get_engine(url).connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT m.tbl_name, SUM(s.pgsize) FROM dbstat s JOIN sqlite_schema m ON m.name = s.name "
+            "GROUP BY m.tbl_name").all()
+    return {names[name]: size for name, size in rows if name in names}
+
+
+def scan_seconds(url: str) -> list:
+    timings = []
+    with get_engine(url).connect() as connection:
+        for statement in SAMPLE_SCANS:
+            start = time.perf_counter()
+            connection.exec_driver_sql(statement).all()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    """
+    Dictionary-encode the low-cardinality text columns of an existing database.
+
+    Use together with DictionaryEncodingConfig.MODE = "encoded" so new
+    databases are created encoded as well.
+    """
+    parser = argparse.ArgumentParser(description="Intern repeated strings into the Dimension Values table")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database name without extension")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to shrink the file")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "dictionary_encoding_logger")
+    url = DatabaseConfiguration.url.value.format(location=args.location, name=args.name)
+
+    before, scans_before = table_bytes(url), scan_seconds(url)
+    converted = encode_database(url, logger)
+    if args.vacuum:
+        with get_engine(url).connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+    after, scans_after = table_bytes(url), scan_seconds(url)
+
+    print(f"Tables encoded: {', '.join(converted) or 'none'}")
+    for name in DictionaryEncodingConfig.COLUMNS:
+        print(f"{name:<28} {before.get(name, 0) / 2**20:>10.1f} MiB -> {after.get(name, 0) / 2**20:>10.1f} MiB")
+    for statement, seconds_before, seconds_after in zip(SAMPLE_SCANS, scans_before, scans_after):
+        print(f"{seconds_before * 1000:>9.1f} ms -> {seconds_after * 1000:>9.1f} ms  {statement}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.export.parquet_export import ParquetExporter
+
+
+def main():
+    """
+    Export the rows collected since the previous run to partitioned Parquet datasets.
+
+    Run it after each collection; only rows above the stored watermarks are
+    written. Delete the export directory to start over with a full export.
+    """
+    parser = argparse.ArgumentParser(description="Incremental Parquet export of the pipeline database")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the SQLite database")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database name without extension")
+    parser.add_argument("--output", default=str(Paths.EXPORTS), help="Root directory of the Parquet datasets")
+    parser.add_argument("--tables", nargs="+", default=None,
+                        help="Table names to export (default: all)")
+    args = parser.parse_args()
+
+    tables = ParquetExporter.DEFAULT_TABLES
+    if args.tables:
+        tables = [table for table in tables if table.__tablename__ in args.tables]
+        unknown = set(args.tables) - {table.__tablename__ for table in tables}
+        if unknown:
+            parser.error(f"Unknown tables: {', '.join(sorted(unknown))}")
+
+    logger = logging_setup("log_config.json", "parquet_export_logger")
+    exporter = ParquetExporter(logger,
+                               sqlite_url=DatabaseConfiguration.url.value.format(location=args.location,
+                                                                                 name=args.name),
+                               export_root=args.output, tables=tables)
+    counts = exporter.export()
+
+    for table, rows in counts.items():
+        print(f"{table:<28} {rows:>14,}")
+
+
+if __name__ == "__main__":
+    main()
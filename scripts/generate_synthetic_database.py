@@ -0,0 +1,35 @@
+import argparse
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.synthetic_data import SyntheticDatasetGenerator
+
+
+def main():
+    """
+    Build a synthetic database for query and storage benchmarking.
+
+    The output is fully determined by --seed and the requested sizes, so two
+    machines generating with the same arguments benchmark identical data.
+    """
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic pipeline database")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database file")
+    parser.add_argument("--name", default="synthetic", help="Database file name without extension")
+    parser.add_argument("--summoners", type=int, default=100_000)
+    parser.add_argument("--matches", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-matches", type=int, default=2_000)
+    parser.add_argument("--no-timeline", action="store_true", help="Skip MatchTimeline rows")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "synthetic_data_logger")
+    generator = SyntheticDatasetGenerator(args.location, args.name, logger,
+                                          seed=args.seed, batch_matches=args.batch_matches)
+    counts = generator.generate(summoners=args.summoners, matches=args.matches,
+                                include_timeline=not args.no_timeline)
+
+    for table, rows in counts.items():
+        print(f"{table:<28} {rows:>14,}")
+
+
+if __name__ == "__main__":
+    main()
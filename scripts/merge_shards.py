@@ -0,0 +1,33 @@
+import argparse
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.constants.pipeline_constants import StorageConfig
+from league_pipeline.db.sharding import ShardedStorage
+
+
+def main():
+    """
+    Consolidate the per-continent (and per-stage) shard files into one database.
+
+    Rows already present in the target are kept (INSERT OR IGNORE), so merging
+    again after more collection only adds the new rows.
+    """
+    parser = argparse.ArgumentParser(description="Merge sharded pipeline databases into a single file")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the shard files")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Base name of the shards")
+    parser.add_argument("--target", default=None, help="Merged database name (default: --name)")
+    parser.add_argument("--by-stage", action="store_true", default=StorageConfig.SHARD_BY_STAGE,
+                        help="Shards are split per stage as well as per continent")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "merge_shards_logger")
+    storage = ShardedStorage(args.location, args.name, logger, by_stage=args.by_stage)
+    counts = storage.merge(args.target or args.name)
+
+    for table, rows in counts.items():
+        print(f"{table:<28} {rows:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import sys
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.migrations import SchemaMigrator, full_table_scans, verify_query_plans
+from league_pipeline.db.models import Base
+
+
+def main():
+    """
+    Upgrade the database schema and optionally check the DatabaseQuery query plans.
+
+    --verify-plans prints the EXPLAIN QUERY PLAN of every checked query and
+    exits with status 1 if any of them scans a whole table without an index.
+    """
+    parser = argparse.ArgumentParser(description="Apply schema migrations to the pipeline database")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database file")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database file name without extension")
+    parser.add_argument("--target", type=int, default=None, help="Schema version to migrate to (default: latest)")
+    parser.add_argument("--without-rowid", metavar="TABLE", default=None,
+                        help="Rebuild the given derived table as WITHOUT ROWID after migrating")
+    parser.add_argument("--verify-plans", action="store_true", help="Check the query plans of DatabaseQuery")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "migrations_logger")
+    url = DatabaseConfiguration.url.value.format(location=args.location, name=args.name)
+    migrator = SchemaMigrator(url, logger)
+    Base.metadata.create_all(migrator.engine, checkfirst=True)
+
+    print(f"Schema version {migrator.current_version()} -> {migrator.upgrade(args.target)}")
+
+    if args.without_rowid:
+        models = {mapper.class_.__tablename__: mapper.class_ for mapper in Base.registry.mappers}
+        migrator.convert_to_without_rowid(models[args.without_rowid])
+
+    if args.verify_plans:
+        plans = verify_query_plans(DatabaseQuery(args.location, args.name))
+        for method, steps in plans.items():
+            print(method)
+            for step in steps:
+                print(f"    {step}")
+        scans = full_table_scans(plans)
+        if scans:
+            print(f"Full table scans found in: {', '.join(scans)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import MatchTimeline, MatchTimelineTracks
+from league_pipeline.db.timeline_tracks import pack_existing_positions
+
+
+def table_bytes(url: str) -> dict:
+    """
+    Return the on-disk size of the timeline tables and their indexes (dbstat).
+    """
+    names = (MatchTimeline.__tablename__, MatchTimelineTracks.__tablename__)
+    with get_engine(url).connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT m.tbl_name, SUM(s.pgsize) FROM dbstat s JOIN sqlite_schema m ON m.name = s.name "
+            "GROUP BY m.tbl_name").all()
+    return {name: size for name, size in rows if name in names}
+
+
+def main():
+    """
+    Move the POSITION rows of an existing database into Match Timeline (Tracks).
+
+    Use together with TimelineStorageConfig.MODE = "tracks" so new timelines
+    are stored packed as well.
+    """
+    parser = argparse.ArgumentParser(description="Pack timeline position rows into delta-encoded tracks")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database name without extension")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to shrink the file")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "pack_timeline_tracks_logger")
+    url = DatabaseConfiguration.url.value.format(location=args.location, name=args.name)
+    MatchTimelineTracks.__table__.create(get_engine(url), checkfirst=True)
+
+    before = table_bytes(url)
+    tracks = pack_existing_positions(url, logger)
+    if args.vacuum:
+        with get_engine(url).connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+    after = table_bytes(url)
+
+    print(f"Tracks written: {tracks:,}")
+    for name in sorted(set(before) | set(after)):
+        print(f"{name:<28} {before.get(name, 0) / 2**20:>10.1f} MiB -> {after.get(name, 0) / 2**20:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.aggregates import create_aggregate_triggers, rebuild_champion_aggregates
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.migrations import SchemaMigrator
+
+
+def main():
+    """
+    Recompute the Champion Aggregates table from the stored participants and optionally print a dashboard.
+
+    The triggers keep the table current during normal operation; rebuilding is
+    needed after participants were loaded with the triggers dropped or edited
+    outside the pipeline.
+    """
+    parser = argparse.ArgumentParser(description="Rebuild the trigger-maintained champion aggregates")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database name without extension")
+    parser.add_argument("--show", nargs=2, metavar=("TIER", "POSITION"),
+                        help="Print the champion statistics of a tier and position, e.g. DIAMOND JUNGLE")
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "aggregates_logger")
+    url = DatabaseConfiguration.url.value.format(location=args.location, name=args.name)
+    SchemaMigrator(url, logger).upgrade()
+
+    with get_engine(url).begin() as connection:
+        create_aggregate_triggers(connection)
+        rows = rebuild_champion_aggregates(connection)
+    logger.info(f"Champion aggregates rebuilt | Rows: {rows}")
+    print(f"Champion aggregates rebuilt: {rows:,} rows")
+
+    if args.show:
+        print(f"\n{'champion':<16}{'games':>8}{'win':>8}{'pick':>8}{'kda':>8}{'gpm':>9}{'dpm':>9}")
+        for stats in DatabaseQuery(args.location, args.name).get_champion_stats(*args.show):
+            print(f"{stats['champion_name']:<16}{stats['games']:>8,}{stats['win_rate']:>8.1%}"
+                  f"{stats['pick_rate']:>8.1%}{stats['kda']:>8.2f}"
+                  f"{stats['gold_per_minute']:>9.1f}{stats['damage_per_minute']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import numpy as np
+from league_pipeline.analytics.heatmaps import HeatmapMaterializer
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration, DatabaseName
+from league_pipeline.constants.file_folder_paths import Paths
+
+
+def main():
+    """
+    Count the timeline rows added since the last refresh into the heatmaps and optionally print one.
+
+    The first run on an existing database backfills every timeline row;
+    later runs only read the rows inserted since.
+    """
+    parser = argparse.ArgumentParser(description="Refresh and query materialized timeline heatmaps")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the database")
+    parser.add_argument("--name", default=DatabaseName.DATABASE_NAME.value, help="Database name without extension")
+    parser.add_argument("--show", nargs=3, metavar=("TIER", "POSITION", "EVENT"),
+                        help="Print a heatmap after refreshing, e.g. DIAMOND JUNGLE CHAMPION_DEATH")
+    parser.add_argument("--minutes", nargs=2, type=float, default=[0, 60], metavar=("FROM", "TO"))
+    parser.add_argument("--champion", default=None)
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "heatmap_logger")
+    materializer = HeatmapMaterializer(DatabaseConfiguration.url.value.format(location=args.location,
+                                                                              name=args.name), logger)
+    for table, rows in materializer.refresh().items():
+        print(f"{table:<28} {rows:>14,}")
+
+    if args.show:
+        grid = materializer.heatmap(*args.show, *args.minutes, champion_name=args.champion)
+        print(f"\n{int(grid.sum()):,} {args.show[2]} in {args.minutes[0]:g}-{args.minutes[1]:g} min")
+        with np.printoptions(linewidth=250, threshold=grid.size):
+            print(grid[::-1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import time
+from league_pipeline.analytics.duckdb_mirror import DuckDBMirror
+from league_pipeline.benchmarks.analytics import compare_engines
+from league_pipeline.benchmarks.harness import format_report
+from league_pipeline.config.logger_config_setup import logging_setup
+from league_pipeline.constants.database_constants import DatabaseConfiguration
+from league_pipeline.constants.file_folder_paths import Paths
+from league_pipeline.db.models import MatchIDs
+
+
+def main():
+    """
+    Compare typical analytical aggregations on SQLite and on the DuckDB mirror.
+
+    Intended for a database built by scripts/generate_synthetic_database.py.
+    The mirror is synced incrementally first, so re-runs only copy new rows.
+    """
+    parser = argparse.ArgumentParser(description="SQLite vs DuckDB analytical query benchmark")
+    parser.add_argument("--location", default=str(Paths.DATA), help="Directory of the SQLite database")
+    parser.add_argument("--name", default="synthetic", help="SQLite database name without extension")
+    parser.add_argument("--mirror", default=None, help="DuckDB mirror file (default: <location>/<name>.duckdb)")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging_setup("log_config.json", "analytics_benchmark_logger")
+    sqlite_url = DatabaseConfiguration.url.value.format(location=args.location, name=args.name)
+    mirror = DuckDBMirror(logger, sqlite_url=sqlite_url,
+                          duckdb_path=args.mirror or f"{args.location}/{args.name}.duckdb",
+                          tables=DuckDBMirror.DEFAULT_TABLES + (MatchIDs,))
+    try:
+        started = time.perf_counter()
+        copied = mirror.sync()
+        print(f"Mirror sync: {sum(copied.values()):,} rows in {time.perf_counter() - started:.2f}s\n")
+
+        results, mismatches = compare_engines(sqlite_url, mirror, iterations=args.iterations)
+    finally:
+        mirror.close()
+
+    print(format_report(results))
+    if mismatches:
+        print(f"\nResults differ between engines for: {', '.join(mismatches)}")
+
+
+if __name__ == "__main__":
+    main()
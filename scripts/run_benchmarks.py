@@ -0,0 +1,39 @@
+import argparse
+from league_pipeline.benchmarks.harness import format_report, load_baseline, save_baseline
+from league_pipeline.benchmarks.suites import BenchmarkSuite
+from league_pipeline.constants.file_folder_paths import Paths
+
+
+def main():
+    """
+    Run the microbenchmark suite and compare it against the stored baseline.
+
+    Use --save-baseline on the base branch, then run without it on a PR branch
+    to see the ops/s and allocation deltas of the change.
+    """
+    parser = argparse.ArgumentParser(description="League pipeline microbenchmarks")
+    parser.add_argument("--filter", default=None,
+                        help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplier for the iteration counts (e.g. 0.1 for a quick run)")
+    parser.add_argument("--baseline", default=str(Paths.BENCHMARK_BASELINE),
+                        help="Baseline JSON file to compare against / write to")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    suite = BenchmarkSuite(scale=args.scale)
+    try:
+        results = suite.run(args.filter)
+    finally:
+        suite.close()
+
+    print(format_report(results, load_baseline(args.baseline)))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,26 @@
+import argparse
 from league_pipeline.pipeline.orchestrator_pipeline import PipelineOrchestrator
+from league_pipeline.pipeline.planner import format_plan
 
 def main():
     """
     Main entry point for pipeline execution.
     
     Creates and runs the pipeline orchestrator, handling any top-level exceptions
-    and providing appropriate logging.
+    and providing appropriate logging. With --plan the run is only planned:
+    the requests per stage and rate limit bucket and the wall time are
+    predicted from the configuration and the database, without any HTTP call.
     """
+    parser = argparse.ArgumentParser(description="League of Legends data pipeline")
+    parser.add_argument("--plan", action="store_true",
+                        help="Predict requests and wall time of the configured run instead of running it")
+    args = parser.parse_args()
+
     try:
         orchestrator = PipelineOrchestrator()
+        if args.plan:
+            print(format_plan(orchestrator.plan()))
+            return
         orchestrator.run_full_pipeline()
     except Exception as e:
         print(f"Pipeline execution failed: {str(e)}")
@@ -16,4 +28,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,32 @@
+import logging
+
+import pytest
+
+from league_pipeline.constants.database_constants import DatabaseConfiguration
+from league_pipeline.db.engine_registry import dispose_engines
+from league_pipeline.db.synthetic_data import SyntheticDatasetGenerator
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("tests")
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """
+    URL of an empty database in the test's temporary directory.
+    """
+    yield DatabaseConfiguration.url.value.format(location=tmp_path, name="test")
+    dispose_engines()
+
+
+@pytest.fixture
+def synthetic_database(tmp_path, logger):
+    """
+    Small synthetic database with timelines; returns (location, name, url).
+    """
+    generator = SyntheticDatasetGenerator(tmp_path, "synthetic", logger, seed=7)
+    generator.generate(summoners=60, matches=12, include_timeline=True)
+    yield tmp_path, "synthetic", generator.url
+    dispose_engines()
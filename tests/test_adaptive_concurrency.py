@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from enum import Enum
+
+import pytest
+
+from league_pipeline.rate_limiting.adaptive_concurrency import AdaptiveConcurrency
+
+logger = logging.getLogger("tests")
+
+
+class Regions(Enum):
+    EUW1 = "euw1"
+
+
+def make_controller(**kwargs) -> AdaptiveConcurrency:
+    settings = dict(initial_limit=4, min_limit=1, max_limit=8, additive_increase=1.0, multiplicative_decrease=0.5,
+                    latency_tolerance=2.0, latency_smoothing=0.5, baseline_drift=0.0)
+    settings.update(kwargs)
+    return AdaptiveConcurrency(Regions, logger, **settings)
+
+
+def healthy() -> float:
+    """
+    Start time of a request answered after 10 ms, far above the timing noise.
+    """
+    return time.monotonic() - 0.01
+
+
+def limit(controller: AdaptiveConcurrency) -> float:
+    return controller.regions["EUW1"]["limit"]
+
+
+def test_successes_increase_the_limit_by_about_one_per_window():
+    controller = make_controller()
+    controller.release("EUW1", healthy(), "success")
+    assert limit(controller) == pytest.approx(4.25)
+
+    for _ in range(3):
+        controller.release("EUW1", healthy(), "success")
+    assert 4.8 < limit(controller) < 5
+
+
+def test_rate_limits_of_one_window_decrease_the_limit_once():
+    controller = make_controller()
+    started = [asyncio.run(controller.acquire("EUW1")) for _ in range(3)]
+    for start in started:
+        controller.release("EUW1", start, "rate_limited")
+    assert limit(controller) == 2
+    assert controller.regions["EUW1"]["decreases"] == 1
+
+    # A request sent after the decrease can decrease the limit again.
+    controller.release("EUW1", time.monotonic(), "rate_limited")
+    assert limit(controller) == 1
+
+
+def test_errors_leave_the_limit_alone():
+    controller = make_controller()
+    controller.release("EUW1", time.monotonic(), "error")
+    assert limit(controller) == 4
+    assert controller.regions["EUW1"]["errors"] == 1
+
+
+def test_rising_latency_decreases_the_limit():
+    controller = make_controller()
+    time.sleep(0.05)
+    controller.release("EUW1", healthy(), "success")
+    # Far slower than the baseline set by the first response.
+    controller.release("EUW1", time.monotonic() - 0.04, "success")
+
+    assert limit(controller) == pytest.approx(4.25 * 0.5)
+    assert controller.regions["EUW1"]["decreases"] == 1
+
+
+def test_limit_stays_between_min_and_max():
+    controller = make_controller()
+    for _ in range(100):
+        controller.release("EUW1", healthy(), "success")
+    assert limit(controller) == 8
+
+    for _ in range(10):
+        controller.release("EUW1", time.monotonic(), "rate_limited")
+    assert limit(controller) == 1
+
+
+def test_released_slot_wakes_a_waiter():
+    controller = make_controller(initial_limit=1)
+
+    async def main():
+        started = await controller.acquire("EUW1")
+        waiter = asyncio.ensure_future(controller.acquire("EUW1"))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert controller.snapshot()["EUW1"]["waiting"] == 1
+
+        controller.release("EUW1", started, "error")
+        await asyncio.wait_for(waiter, 1)
+        assert controller.regions["EUW1"]["in_flight"] == 1
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("woken", [False, True])
+def test_cancelled_waiter_passes_the_slot_on(woken):
+    controller = make_controller(initial_limit=1)
+
+    async def main():
+        started = await controller.acquire("EUW1")
+        first = asyncio.ensure_future(controller.acquire("EUW1"))
+        second = asyncio.ensure_future(controller.acquire("EUW1"))
+        await asyncio.sleep(0)
+
+        if woken:
+            # The first waiter is woken, then cancelled before it takes the slot.
+            controller.release("EUW1", started, "error")
+            first.cancel()
+        else:
+            first.cancel()
+            await asyncio.sleep(0)
+            controller.release("EUW1", started, "error")
+
+        await asyncio.wait_for(second, 1)
+        assert first.cancelled()
+        assert controller.regions["EUW1"]["in_flight"] == 1
+        assert not controller.regions["EUW1"]["waiters"]
+
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import pytest
+
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db import bulk_insert as bulk_insert_module
+from league_pipeline.db.bulk_insert import bulk_insert, rows_per_statement, table_layout
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import Base, MatchTimeline
+
+TIMELINE = MatchTimeline.__tablename__
+
+
+def timeline_rows(timestamps) -> list:
+    return [("EUW1_1", "p1", timestamp, "100", 1, "TOP", timestamp, timestamp, EventTypes.POSITION,
+             EventTypes.PARTICIPANT_FRAME, None) for timestamp in timestamps]
+
+
+def stored_timestamps(engine) -> list:
+    with engine.connect() as connection:
+        return [row[0] for row in connection.exec_driver_sql(f'SELECT "timestamp" FROM "{TIMELINE}" '
+                                                             f'ORDER BY "timestamp"')]
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = get_engine(database_url)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_statements_stay_within_the_variable_limit():
+    for column_count in (1, 11, 400, 20_000):
+        assert 1 <= rows_per_statement(column_count)
+        assert rows_per_statement(column_count) * column_count <= bulk_insert_module.SQLITE_MAX_VARIABLES
+
+
+def test_more_rows_than_one_statement_binds_all_land_once(engine, monkeypatch):
+    # A low limit makes the variable limit, not ROWS_PER_STATEMENT, size the statements.
+    monkeypatch.setattr(bulk_insert_module, "SQLITE_MAX_VARIABLES", 50)
+    column_count = len(table_layout(MatchTimeline)[0])
+    per_statement = rows_per_statement(column_count)
+    assert per_statement * column_count <= 50
+    rows = timeline_rows(range(1_000))
+    assert len(rows) * column_count > bulk_insert_module.SQLITE_MAX_VARIABLES
+
+    with engine.begin() as connection:
+        assert bulk_insert(connection, MatchTimeline, rows[:600]) == 600
+    with engine.begin() as connection:
+        # Rows already stored are skipped by ON CONFLICT DO NOTHING.
+        assert bulk_insert(connection, MatchTimeline, rows) == 1_000
+
+    assert stored_timestamps(engine) == list(range(1_000))
+
+
+def test_statement_cache_is_bounded(engine, monkeypatch):
+    monkeypatch.setattr(bulk_insert_module, "_statements", {})
+    per_statement = rows_per_statement(len(table_layout(MatchTimeline)[0]))
+    inserted = 0
+    for size in range(1, 2 * per_statement + 2):
+        with engine.begin() as connection:
+            bulk_insert(connection, MatchTimeline, timeline_rows(range(inserted, inserted + size)))
+        inserted += size
+
+    assert stored_timestamps(engine) == list(range(inserted))
+    sizes = {row_count for table_name, row_count in bulk_insert_module._statements if table_name == TIMELINE}
+    assert sizes <= {per_statement} | {1 << power for power in range(per_statement.bit_length())}
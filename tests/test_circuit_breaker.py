@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from league_pipeline.rate_limiting.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler, current_attempt
+from league_pipeline.utils.decorators import async_api_call_error_wrapper
+from league_pipeline.utils.exceptions import CircuitOpenError, RetryLater, StatusCodeError
+from league_pipeline.utils.workers import run_workers
+
+logger = logging.getLogger("tests")
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    settings = dict(window=4, min_calls=4, failure_rate=0.5, open_seconds=0.05,
+                    max_open_seconds=0.2, probe_wait_seconds=0.01)
+    settings.update(kwargs)
+    return CircuitBreaker(logger, **settings)
+
+
+def test_opens_after_failure_rate_and_refuses_calls():
+    breaker = make_breaker()
+    for success in (True, False, True, False):
+        breaker.before_call("EUW1", "get")
+        breaker.record("EUW1", "get", success)
+
+    assert breaker.circuits[("EUW1", "get")]["state"] == OPEN
+    with pytest.raises(CircuitOpenError) as refused:
+        breaker.before_call("EUW1", "get")
+    assert not refused.value.probing
+    # Other regions and endpoints are independent.
+    breaker.before_call("NA1", "get")
+    breaker.before_call("EUW1", "other")
+
+
+def test_outcomes_without_health_information_are_ignored():
+    breaker = make_breaker()
+    for _ in range(10):
+        breaker.before_call("EUW1", "get")
+        breaker.record("EUW1", "get", None)
+    assert breaker.circuits[("EUW1", "get")]["state"] == CLOSED
+    assert not breaker.circuits[("EUW1", "get")]["outcomes"]
+
+
+def test_half_open_admits_one_probe_and_doubles_open_time_on_failure():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.before_call("EUW1", "get")
+        breaker.record("EUW1", "get", False)
+    time.sleep(0.06)
+
+    assert breaker.before_call("EUW1", "get")  # the probe
+    assert breaker.circuits[("EUW1", "get")]["state"] == HALF_OPEN
+    with pytest.raises(CircuitOpenError) as refused:
+        breaker.before_call("EUW1", "get")
+    assert refused.value.probing
+
+    breaker.record("EUW1", "get", False, probe=True)
+    circuit = breaker.circuits[("EUW1", "get")]
+    assert circuit["state"] == OPEN
+    assert circuit["open_seconds"] == pytest.approx(0.1)
+    assert circuit["opened"] == 2
+
+
+def test_successful_probe_closes_and_resets_open_time():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.before_call("EUW1", "get")
+        breaker.record("EUW1", "get", False)
+    time.sleep(0.06)
+
+    assert breaker.before_call("EUW1", "get")
+    breaker.record("EUW1", "get", True, probe=True)
+    circuit = breaker.circuits[("EUW1", "get")]
+    assert circuit["state"] == CLOSED
+    assert circuit["open_seconds"] == pytest.approx(0.05)
+    breaker.before_call("EUW1", "get")
+
+
+def test_late_outcomes_do_not_decide_the_probe():
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.before_call("EUW1", "get")
+        breaker.record("EUW1", "get", False)
+    time.sleep(0.06)
+
+    assert breaker.before_call("EUW1", "get")
+    # A call admitted before the circuit opened answers while the probe is in flight.
+    breaker.record("EUW1", "get", True)
+    assert breaker.circuits[("EUW1", "get")]["state"] == HALF_OPEN
+    breaker.record("EUW1", "get", True, probe=True)
+    assert breaker.circuits[("EUW1", "get")]["state"] == CLOSED
+
+
+def test_failure_after_the_open_period_does_not_claim_the_probe():
+    # A slow call admitted while the circuit was closed fails after the
+    # circuit opened and its open period ended. The check that follows the
+    # failure must not leave the circuit half-open with a probe nobody sends.
+    breaker = make_breaker()
+
+    class Api:
+        def __init__(self):
+            self.logger = logger
+            self.circuit_breaker = breaker
+
+        @async_api_call_error_wrapper
+        async def get(self, region):
+            for _ in range(4):
+                breaker.before_call(region, "get")
+                breaker.record(region, "get", False)
+            await asyncio.sleep(0.06)
+            raise StatusCodeError(503, "down")
+
+    async def main():
+        current_attempt.set(0)
+        await Api().get(region="EUW1")
+
+    with pytest.raises(RetryLater):
+        asyncio.run(main())
+    circuit = breaker.circuits[("EUW1", "get")]
+    assert circuit["state"] == OPEN
+    assert not circuit["probing"]
+    assert breaker.before_call("EUW1", "get")
+    breaker.record("EUW1", "get", True, probe=True)
+    assert circuit["state"] == CLOSED
+
+
+def test_slow_probe_does_not_drop_the_queue():
+    # A region is down for a while and every failing call takes as long as a
+    # connect timeout; while a probe hangs, the other items wait for it. Once
+    # the region is back every item must be processed.
+    breaker = make_breaker(window=10, min_calls=10, open_seconds=0.05, max_open_seconds=0.1)
+    scheduler = RetryScheduler(logger, budget_min=1000, max_deferrals=10)
+    outage_end = time.monotonic() + 0.6
+    done = []
+
+    async def process(item):
+        probe = breaker.before_call("EUW1", "get")
+        success = None
+        try:
+            if time.monotonic() < outage_end:
+                await asyncio.sleep(0.1)
+                success = False
+                raise RetryLater(0.01, 0, StatusCodeError(503, "down"))
+            success = True
+            done.append(item)
+        finally:
+            breaker.record("EUW1", "get", success, probe=probe)
+
+    asyncio.run(run_workers(range(200), process, 8, logger, scheduler))
+
+    assert sorted(done) == list(range(200))
+    assert scheduler.dropped == 0
+    assert not scheduler.delayed
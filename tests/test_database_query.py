@@ -0,0 +1,30 @@
+import pytest
+
+from league_pipeline.db.db_connection import DatabaseQuery
+
+STREAMS = [
+    ("iter_puuids_by_continent_from_summoner_table", "get_puuids_by_continent_from_summoner_table"),
+    ("iter_match_ids_by_continent_from_match_id_table", "get_match_ids_by_continent_from_match_id_table"),
+    ("iter_match_ids_by_continent_from_match_data_table", "get_match_ids_by_continent_from_match_data_table"),
+]
+
+
+@pytest.mark.parametrize("stream, listing", STREAMS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_streams_return_the_listed_rows(synthetic_database, stream, listing, chunk_size):
+    location, name, _ = synthetic_database
+    query = DatabaseQuery(location, name)
+    for continent in ("AMERICAS", "EUROPE", "ASIA"):
+        streamed = [tuple(row) for row in getattr(query, stream)(continent, chunk_size)]
+        assert len(set(streamed)) == len(streamed)
+        assert sorted(streamed) == sorted(tuple(row) for row in getattr(query, listing)(continent))
+
+
+def test_streams_hold_no_connection_between_chunks(synthetic_database):
+    location, name, _ = synthetic_database
+    query = DatabaseQuery(location, name)
+    stream = query.iter_puuids_by_continent_from_summoner_table("EUROPE", chunk_size=2)
+
+    for _ in range(5):
+        next(stream)
+        assert query.engine.pool.checkedout() == 0
@@ -0,0 +1,113 @@
+from league_pipeline.db.aggregates import create_aggregate_triggers, rebuild_champion_aggregates
+from league_pipeline.db.bulk_insert import bulk_insert
+from league_pipeline.db.dictionary_encoding import dictionary_encoder, encode_database, rowid_source
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import ChampionAggregates, MatchDataParticipants, MatchTimeline, Summoners
+
+SUMMONERS = Summoners.__tablename__
+
+
+def table_rows(connection, name: str) -> list:
+    return sorted(connection.exec_driver_sql(f'SELECT * FROM "{name}"').all(), key=repr)
+
+
+def column_names(connection, name: str) -> list:
+    return list(connection.exec_driver_sql(f'SELECT * FROM "{name}" LIMIT 0').keys())
+
+
+def played_aggregates(connection) -> list:
+    # The delete trigger leaves emptied rows behind, a rebuild does not write them;
+    # running sums and a fresh SUM() may differ in the last bits.
+    rows = connection.exec_driver_sql(f'SELECT * FROM "{ChampionAggregates.__tablename__}" '
+                                      f'WHERE "games" > 0').all()
+    return sorted(tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+                  for row in rows)
+
+
+def test_views_read_like_the_plain_tables(synthetic_database):
+    _, _, url = synthetic_database
+    names = (SUMMONERS, MatchDataParticipants.__tablename__, MatchTimeline.__tablename__)
+    with get_engine(url).connect() as connection:
+        before = {name: (column_names(connection, name), table_rows(connection, name)) for name in names}
+
+    assert set(encode_database(url)) == set(names)
+
+    with get_engine(url).connect() as connection:
+        for name in names:
+            assert (column_names(connection, name), table_rows(connection, name)) == before[name]
+
+
+def test_inserts_and_deletes_through_the_view(synthetic_database):
+    _, _, url = synthetic_database
+    encode_database(url)
+    engine = get_engine(url)
+    with engine.connect() as connection:
+        row = list(connection.exec_driver_sql(f'SELECT * FROM "{SUMMONERS}" LIMIT 1').one())
+
+    written = [("bulk-insert", "NEW_TIER"), ("trigger", "OTHER_TIER")]
+    with engine.begin() as connection:
+        bulk_insert(connection, Summoners, [tuple(["bulk-insert"] + row[1:3] + ["NEW_TIER"] + row[4:])])
+        connection.exec_driver_sql(f'INSERT INTO "{SUMMONERS}" VALUES (?, ?, ?, ?, ?, ?)',
+                                   tuple(["trigger"] + row[1:3] + ["OTHER_TIER"] + row[4:]))
+
+    with engine.begin() as connection:
+        assert connection.exec_driver_sql(
+            f'SELECT "puuId", "currentTier" FROM "{SUMMONERS}" WHERE "puuId" IN (?, ?) ORDER BY "puuId"',
+            ("bulk-insert", "trigger")).all() == written
+        connection.exec_driver_sql(f'DELETE FROM "{SUMMONERS}" WHERE "currentTier" = ?', ("OTHER_TIER",))
+        assert connection.exec_driver_sql(
+            f'SELECT COUNT(*) FROM "{SUMMONERS} (Encoded)" WHERE "puuId" = ?', ("trigger",)).scalar() == 0
+
+
+def test_rolled_back_codes_are_not_shared(synthetic_database):
+    _, _, url = synthetic_database
+    encode_database(url)
+    engine = get_engine(url)
+    with engine.connect() as connection:
+        row = list(connection.exec_driver_sql(f'SELECT * FROM "{SUMMONERS}" LIMIT 1').one())
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        bulk_insert(connection, Summoners, [tuple(["rolled-back"] + row[1:3] + ["GHOST_TIER"] + row[4:])])
+        transaction.rollback()
+        assert "GHOST_TIER" not in dictionary_encoder(connection)._codes.get("tier", {})
+
+    with engine.begin() as connection:
+        bulk_insert(connection, Summoners, [tuple(["committed"] + row[1:3] + ["GHOST_TIER"] + row[4:])])
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql(f'SELECT "currentTier" FROM "{SUMMONERS}" WHERE "puuId" = ?',
+                                          ("committed",)).scalar() == "GHOST_TIER"
+        assert dictionary_encoder(connection)._codes["tier"]["GHOST_TIER"]
+
+
+def test_rowid_source_pages_encoded_tables_by_stored_rowid(synthetic_database):
+    _, _, url = synthetic_database
+    name = MatchTimeline.__tablename__
+    with get_engine(url).connect() as connection:
+        assert rowid_source(connection, name) == f'"{name}"'
+        before = connection.exec_driver_sql(f'SELECT rowid, "event" FROM "{name}" WHERE rowid > 10 '
+                                            f'ORDER BY rowid LIMIT 50').all()
+
+    encode_database(url)
+    with get_engine(url).connect() as connection:
+        source = rowid_source(connection, name)
+        assert connection.exec_driver_sql(f'SELECT s.rowid, s."event" FROM {source} s WHERE s.rowid > 10 '
+                                          f'ORDER BY s.rowid LIMIT 50').all() == before
+
+
+def test_aggregate_triggers_follow_encoded_participants(synthetic_database):
+    _, _, url = synthetic_database
+    engine = get_engine(url)
+    participants = MatchDataParticipants.__tablename__
+    ChampionAggregates.__table__.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        rebuild_champion_aggregates(connection)
+        create_aggregate_triggers(connection)
+
+    encode_database(url)
+    with engine.begin() as connection:
+        match_id = connection.exec_driver_sql(f'SELECT "matchId" FROM "{participants}" LIMIT 1').scalar()
+        connection.exec_driver_sql(f'DELETE FROM "{participants}" WHERE "matchId" = ?', (match_id,))
+        maintained = played_aggregates(connection)
+        rebuild_champion_aggregates(connection)
+        assert played_aggregates(connection) == maintained
@@ -0,0 +1,72 @@
+import pytest
+
+from league_pipeline.analytics import duckdb_mirror
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.bulk_insert import bulk_insert
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.models import Base, MatchDataTeams, MatchTimeline
+
+pytest.importorskip("duckdb")
+
+TEAMS = MatchDataTeams.__tablename__
+
+
+@pytest.fixture(params=["pyarrow", "executemany"])
+def loader(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(duckdb_mirror, "pyarrow", None)
+    return request.param
+
+
+def test_sync_copies_only_new_rows(synthetic_database, tmp_path, logger, loader):
+    _, _, url = synthetic_database
+    engine = get_engine(url)
+    mirror = duckdb_mirror.DuckDBMirror(logger, url, tmp_path / "mirror.duckdb", tables=[MatchDataTeams],
+                                        chunk_size=5)
+    try:
+        with engine.connect() as connection:
+            stored = connection.exec_driver_sql(f'SELECT COUNT(*), MAX(rowid) FROM "{TEAMS}"').one()
+        assert mirror.sync() == {TEAMS: stored[0]}
+        assert mirror.watermark(MatchDataTeams) == stored[1]
+
+        with engine.begin() as connection:
+            rows = [tuple(row) for row in connection.exec_driver_sql(f'SELECT * FROM "{TEAMS}" LIMIT 3')]
+            bulk_insert(connection, MatchDataTeams, [(f"EUW1_new{index}",) + row[1:]
+                                                     for index, row in enumerate(rows)])
+        assert mirror.sync() == {TEAMS: 3}
+        assert mirror.sync() == {TEAMS: 0}
+        assert mirror.watermark(MatchDataTeams) == stored[1] + 3
+        assert mirror.query(f'SELECT COUNT(*), COUNT(DISTINCT "matchId" || "teamId") FROM "{TEAMS}"') == \
+            [(stored[0] + 3, stored[0] + 3)]
+    finally:
+        mirror.close()
+
+    # The watermark is stored in the mirror file.
+    reopened = duckdb_mirror.DuckDBMirror(logger, url, tmp_path / "mirror.duckdb", tables=[MatchDataTeams])
+    try:
+        assert reopened.sync() == {TEAMS: 0}
+    finally:
+        reopened.close()
+
+
+def test_attach_to_syncs_after_writer_commits(database_url, tmp_path, logger):
+    Base.metadata.create_all(get_engine(database_url))
+    mirror = duckdb_mirror.DuckDBMirror(logger, database_url, tmp_path / "mirror.duckdb", tables=[MatchTimeline])
+    writer = GroupCommitWriter(database_url, logger, commit_interval_seconds=0.01).start()
+    mirror.attach_to(writer)
+    try:
+        writer.submit(MatchTimeline, [
+            {"match_id": "EUW1_1", "puuid": "a", "timestamp": 60_000 * minute, "team_id": "100", "in_game_id": 1,
+             "team_position": "JUNGLE", "x": 7_000, "y": 7_000, "event": EventTypes.POSITION,
+             "type": EventTypes.PARTICIPANT_FRAME}
+            for minute in range(5)])
+        writer.flush()
+
+        assert mirror.query(f'SELECT COUNT(*) FROM "{MatchTimeline.__tablename__}"') == [(5,)]
+        assert mirror.watermark(MatchTimeline) == 5
+    finally:
+        writer.close()
+        mirror.close()
@@ -0,0 +1,33 @@
+import pytest
+
+from league_pipeline.db.engine_registry import create_private_engine, default_pragma_profile, get_engine
+from league_pipeline.db.synthetic_data import SyntheticDatasetGenerator
+
+
+def pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_one_engine_per_url_and_profile(database_url):
+    engine = get_engine(database_url)
+    assert get_engine(database_url, pragmas=default_pragma_profile()) is engine
+    with pytest.raises(ValueError, match="already exists"):
+        get_engine(database_url, pragmas=SyntheticDatasetGenerator.BULK_LOAD_PRAGMAS)
+
+
+def test_private_engines_are_not_shared(database_url):
+    private = create_private_engine(database_url, pragmas={"synchronous": "OFF"})
+    try:
+        assert private is not get_engine(database_url)
+        assert pragma(private, "synchronous") == 0
+    finally:
+        private.dispose()
+    assert pragma(get_engine(database_url), "synchronous") == 1
+
+
+def test_bulk_load_settings_do_not_leak_into_the_shared_engine(synthetic_database):
+    _, _, url = synthetic_database
+    engine = get_engine(url)
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1
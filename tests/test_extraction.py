@@ -0,0 +1,89 @@
+import pytest
+
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.bulk_insert import table_layout
+from league_pipeline.db.models import MatchDataTeams, MatchTimeline
+from league_pipeline.riot_api.extraction import Constant, Context, Expression, Path, compile_extractor
+from league_pipeline.riot_api.match_timeline import TimelineProfile, transform_timeline
+
+
+def as_dicts(table, rows: list) -> list:
+    return [dict(zip(table_layout(table)[1], row)) for row in rows]
+
+
+def test_paths_defaults_and_unset_columns():
+    extract = compile_extractor(MatchDataTeams, {
+        "match_id": Context("match_id"),
+        "team_id": Path("teamId"),
+        "baron_kills": Path("objectives.baron.kills", 0),
+        "dragon_kills": Path("objectives.dragon.kills", 0, coalesce=True),
+    })
+    rows = as_dicts(MatchDataTeams, extract([
+        {"teamId": 100, "objectives": {"baron": {"kills": 2}, "dragon": {"kills": None}}},
+        {"teamId": 200, "objectives": None},
+    ], match_id="EUW1_1"))
+
+    assert [(row["match_id"], row["team_id"], row["baron_kills"], row["dragon_kills"]) for row in rows] == [
+        ("EUW1_1", 100, 2, 0), ("EUW1_1", 200, 0, 0)]
+    assert rows[0]["tower_kills"] is None
+
+
+def test_expressions_read_other_columns_context_and_namespace():
+    extract = compile_extractor(MatchDataTeams, {
+        "dragon_kills": Path("dragons", 0),
+        "dragon_soul": Expression("{dragon_kills} >= threshold"),
+        "team_win": Expression('verdict(item.get("win"))'),
+    }, context=["threshold"], namespace={"verdict": bool})
+    rows = as_dicts(MatchDataTeams, extract([{"dragons": 4, "win": 1}, {"dragons": 3}], threshold=4))
+
+    assert [(row["dragon_soul"], row["team_win"]) for row in rows] == [(True, True), (False, False)]
+
+
+def test_variants_select_columns_and_skip_unknown_items():
+    extract = compile_extractor(MatchTimeline, {"event": Path("type")}, discriminator="type", variants={
+        "A": {"type": Constant("first")},
+        "B": {"type": Path("detail")},
+    })
+    rows = as_dicts(MatchTimeline, extract([{"type": "A"}, {"type": "C"}, {"type": "B", "detail": "second"}]))
+
+    assert [(row["event"], row["type"]) for row in rows] == [("A", "first"), ("B", "second")]
+
+
+def test_mapping_items_expose_their_key():
+    extract = compile_extractor(MatchTimeline, {"in_game_id": Expression("int(key)"), "x": Path("position.x")},
+                                mapping=True)
+    rows = as_dicts(MatchTimeline, extract({"3": {"position": {"x": 10}}, "7": {}}))
+
+    assert [(row["in_game_id"], row["x"]) for row in rows] == [(3, 10), (7, None)]
+
+
+def test_unknown_attributes_are_rejected():
+    with pytest.raises(ValueError, match="no attributes"):
+        compile_extractor(MatchDataTeams, {"not_a_column": Constant(1)})
+
+
+def test_transform_timeline_rows():
+    data = {"info": {
+        "participants": [{"participantId": 1, "puuid": "p1"}, {"participantId": 2, "puuid": "p2"}],
+        "frames": [
+            {"timestamp": 0, "events": [],
+             "participantFrames": {"1": {"position": {"x": 1, "y": 2}}, "2": {"position": {"x": 3, "y": 4}}}},
+            {"timestamp": 60000,
+             "events": [{"type": EventTypes.CHAMPION_KILL, "timestamp": 61000, "killerId": 2,
+                         "victimId": 1, "position": {"x": 5, "y": 6}},
+                        {"type": "WARD_PLACED", "timestamp": 62000}],
+             "participantFrames": {"1": {"position": {"x": 7, "y": 8}}}},
+        ]}}
+    team_positions = {"p1": (100, "TOP"), "p2": (200, "JUNGLE")}
+    rows = as_dicts(MatchTimeline, transform_timeline(data, "EUW1_1", team_positions, TimelineProfile()))
+
+    summary = [(row["puuid"], row["timestamp"], row["team_id"], row["team_position"], row["x"], row["y"],
+                row["event"], row["type"]) for row in rows]
+    assert summary == [
+        ("p1", 0, 100, "TOP", 1, 2, EventTypes.POSITION, EventTypes.PARTICIPANT_FRAME),
+        ("p2", 0, 200, "JUNGLE", 3, 4, EventTypes.POSITION, EventTypes.PARTICIPANT_FRAME),
+        ("p2", 61000, 200, "JUNGLE", 5, 6, EventTypes.CHAMPION_KILL, "KILL"),
+        ("p1", 60000, 100, "TOP", 7, 8, EventTypes.POSITION, EventTypes.PARTICIPANT_FRAME),
+    ]
+    assert all(row["match_id"] == "EUW1_1" for row in rows)
+    assert [row["victim_puuid"] for row in rows] == [None, None, "p1", None]
@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.models import Base, MatchTimeline
+
+
+def timeline_row(index: int, event_type=EventTypes.PARTICIPANT_FRAME) -> dict:
+    return {"match_id": "EUW1_1", "puuid": "p1", "timestamp": index, "team_id": 100, "in_game_id": 1,
+            "team_position": "TOP", "x": index, "y": index, "event": EventTypes.POSITION, "type": event_type}
+
+
+def stored_timestamps(url: str) -> list:
+    with get_engine(url).connect() as connection:
+        return [row[0] for row in connection.exec_driver_sql(
+            f'SELECT "timestamp" FROM "{MatchTimeline.__tablename__}" ORDER BY "timestamp"')]
+
+
+@pytest.fixture
+def writer(database_url, logger):
+    Base.metadata.create_all(get_engine(database_url))
+    writer = GroupCommitWriter(database_url, logger, commit_row_count=1_000, commit_interval_seconds=0.05,
+                               commit_retry_delay_seconds=0.01).start()
+    yield writer
+    try:
+        writer.close()
+    except Exception:
+        pass
+
+
+def test_batches_are_grouped_into_few_commits(writer, database_url):
+    committed = []
+    writer.add_commit_listener(committed.append)
+    for index in range(50):
+        writer.submit(MatchTimeline, [timeline_row(index)])
+    writer.flush()
+
+    assert stored_timestamps(database_url) == list(range(50))
+    assert writer.rows_written == 50
+    assert writer.commits < 10
+    assert committed and all(tables == [MatchTimeline] for tables in committed)
+
+
+def test_dict_and_tuple_batches_share_a_commit(writer, database_url):
+    writer.submit(MatchTimeline, [timeline_row(0)])
+    writer.submit(MatchTimeline, [tuple(timeline_row(1).values()) + (None,)])
+    writer.submit(MatchTimeline, timeline_row(2))
+    writer.flush()
+
+    assert stored_timestamps(database_url) == [0, 1, 2]
+
+
+def test_only_the_failing_rows_of_a_group_are_dropped(writer, database_url):
+    rows = [timeline_row(index) for index in range(10)]
+    rows[6] = timeline_row(6, event_type=None)
+    writer.submit(MatchTimeline, rows)
+
+    with pytest.raises(IntegrityError):
+        writer.flush()
+    assert stored_timestamps(database_url) == [0, 1, 2, 3, 4, 5, 7, 8, 9]
+    assert writer.rows_dropped == 1
+    writer.flush()
+
+
+def test_lost_rows_are_raised_to_the_next_producer(writer, database_url):
+    writer.submit(MatchTimeline, [timeline_row(0, event_type=None)])
+    deadline = time.monotonic() + 5
+    while not writer.rows_dropped and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    async def produce():
+        await writer.enqueue(MatchTimeline, [timeline_row(1)])
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(produce())
+    writer.flush()
+    # The producer's own rows were queued before the error was raised.
+    assert stored_timestamps(database_url) == [1]
+
+
+def test_operational_errors_retry_the_whole_group(writer, database_url):
+    write, failures = writer._write, [2]
+
+    def flaky_write(pending):
+        if failures[0]:
+            failures[0] -= 1
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        write(pending)
+
+    writer._write = flaky_write
+    writer.submit(MatchTimeline, [timeline_row(index) for index in range(5)])
+    writer.flush()
+
+    assert stored_timestamps(database_url) == list(range(5))
+    assert writer.rows_dropped == 0
+
+
+def test_groups_are_dropped_once_the_retries_are_spent(writer, database_url):
+    def locked_write(pending):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    writer._write = locked_write
+    writer.submit(MatchTimeline, [timeline_row(index) for index in range(5)])
+
+    with pytest.raises(OperationalError):
+        writer.flush()
+    assert writer.rows_dropped == 5
+
+
+def test_busy_database_while_isolating_is_retried(writer, database_url):
+    write, busy = writer._write, [1]
+
+    def flaky_write(pending):
+        # The group hits a bad row, then the first single row written on its own finds the database busy.
+        if busy[0] and sum(len(rows) for rows in pending.values()) == 1:
+            busy[0] -= 1
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        write(pending)
+
+    rows = [timeline_row(index) for index in range(3)]
+    rows[2] = timeline_row(2, event_type=None)
+    writer._write = flaky_write
+    writer.submit(MatchTimeline, rows)
+
+    with pytest.raises(IntegrityError):
+        writer.flush()
+    assert stored_timestamps(database_url) == [0, 1]
+    assert writer.rows_dropped == 1
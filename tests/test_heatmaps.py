@@ -0,0 +1,108 @@
+from league_pipeline.analytics.heatmaps import HeatmapMaterializer
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.group_commit_writer import GroupCommitWriter
+from league_pipeline.db.models import Base, HeatmapCells, MatchDataParticipants, MatchTimeline, MatchTimelineTracks
+from league_pipeline.db.timeline_tracks import pack_existing_positions
+
+
+def position_count(url: str) -> int:
+    with get_engine(url).connect() as connection:
+        return connection.exec_driver_sql(
+            f'SELECT COALESCE(SUM("count"), 0) FROM "{HeatmapCells.__tablename__}" WHERE "event" = ?',
+            (EventTypes.POSITION,)).scalar()
+
+
+def position_rows(url: str) -> int:
+    with get_engine(url).connect() as connection:
+        return connection.exec_driver_sql(
+            f'SELECT COUNT(*) FROM "{MatchTimeline.__tablename__}" '
+            f'WHERE "event" = ? AND "x" IS NOT NULL AND "y" IS NOT NULL', (EventTypes.POSITION,)).scalar()
+
+
+def test_refresh_counts_every_position_once(synthetic_database, logger):
+    _, _, url = synthetic_database
+    materializer = HeatmapMaterializer(url, logger)
+    expected = position_rows(url)
+
+    assert materializer.refresh()[MatchTimeline.__tablename__] > 0
+    assert position_count(url) == expected
+    assert not any(materializer.refresh().values())
+    assert position_count(url) == expected
+
+
+def test_deaths_are_keyed_by_the_victim(synthetic_database, logger):
+    _, _, url = synthetic_database
+    with get_engine(url).connect() as connection:
+        deaths = dict(connection.exec_driver_sql(
+            f'SELECT v."teamPosition", COUNT(*) FROM "{MatchTimeline.__tablename__}" s '
+            f'JOIN "{MatchDataParticipants.__tablename__}" v ON v."matchId" = s."matchId" '
+            f'AND v."puuId" = s."victimPuuId" WHERE s."event" = ? GROUP BY v."teamPosition"',
+            (EventTypes.CHAMPION_KILL,)).all())
+    materializer = HeatmapMaterializer(url, logger)
+    materializer.refresh()
+
+    assert deaths
+    with get_engine(url).connect() as connection:
+        counted = dict(connection.exec_driver_sql(
+            f'SELECT "teamPosition", SUM("count") FROM "{HeatmapCells.__tablename__}" '
+            f'WHERE "event" = ? GROUP BY "teamPosition"', (EventTypes.CHAMPION_DEATH,)).all())
+    assert counted == deaths
+
+    with get_engine(url).connect() as connection:
+        tier, position, count = connection.exec_driver_sql(
+            f'SELECT "gameTier", "teamPosition", SUM("count") FROM "{HeatmapCells.__tablename__}" '
+            f'WHERE "event" = ? GROUP BY "gameTier", "teamPosition" LIMIT 1', (EventTypes.CHAMPION_DEATH,)).one()
+    assert materializer.heatmap(tier, position, EventTypes.CHAMPION_DEATH).sum() == count
+
+
+def test_packing_counted_positions_does_not_count_them_again(synthetic_database, logger):
+    _, _, url = synthetic_database
+    MatchTimelineTracks.__table__.create(get_engine(url), checkfirst=True)
+    materializer = HeatmapMaterializer(url, logger)
+    expected = position_rows(url)
+
+    materializer.refresh()
+    assert pack_existing_positions(url, logger, batch_matches=5) > 0
+    materializer.refresh()
+
+    assert position_rows(url) == 0
+    assert position_count(url) == expected
+
+
+def test_packing_counts_positions_stored_after_the_last_refresh(synthetic_database, logger):
+    _, _, url = synthetic_database
+    MatchTimelineTracks.__table__.create(get_engine(url), checkfirst=True)
+    materializer = HeatmapMaterializer(url, logger)
+    expected = position_rows(url)
+
+    # Count only the first part of the timeline before packing.
+    with get_engine(url).begin() as connection:
+        half = connection.exec_driver_sql(f'SELECT MAX(rowid) / 2 FROM "{MatchTimeline.__tablename__}"').scalar()
+        connection.exec_driver_sql('INSERT INTO "Heatmap Watermarks" ("sourceTable", "lastRowid") VALUES (?, ?)',
+                                   (MatchTimeline.__tablename__, 0))
+    materializer.chunk_size = half
+    with materializer.engine.begin() as connection:
+        materializer._count_chunk(connection, MatchTimeline, 0)
+
+    pack_existing_positions(url, logger, batch_matches=5)
+    materializer.refresh()
+
+    assert position_count(url) == expected
+
+
+def test_attach_to_refreshes_after_writer_commits(database_url, logger):
+    Base.metadata.create_all(get_engine(database_url))
+    materializer = HeatmapMaterializer(database_url, logger)
+    writer = GroupCommitWriter(database_url, logger).start()
+    materializer.attach_to(writer)
+    try:
+        writer.submit(MatchTimeline, [
+            {"match_id": "EUW1_1", "puuid": "a", "timestamp": 60_000 * minute, "team_id": "100", "in_game_id": 1,
+             "team_position": "JUNGLE", "x": 7_000, "y": 7_000, "event": EventTypes.POSITION, "type": EventTypes.POSITION}
+            for minute in range(5)])
+        writer.flush()
+    finally:
+        writer.close()
+
+    assert position_count(database_url) == 5
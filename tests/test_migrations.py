@@ -0,0 +1,81 @@
+import pytest
+
+from league_pipeline.analytics.heatmaps import HeatmapMaterializer
+from league_pipeline.db.dictionary_encoding import encode_database, encoded_table_name
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.migrations import SchemaMigrator
+from league_pipeline.db.models import (ChampionAggregates, HeatmapCells, HeatmapWatermarks, MatchDataParticipants,
+                                       MatchTimeline)
+
+
+def table_sql(url: str, name: str) -> str:
+    with get_engine(url).connect() as connection:
+        return connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                          (name,)).scalar()
+
+
+@pytest.fixture
+def migrator(synthetic_database, logger):
+    _, _, url = synthetic_database
+    migrator = SchemaMigrator(url, logger)
+    migrator.upgrade()
+    return migrator
+
+
+@pytest.mark.parametrize("table", [MatchTimeline, MatchDataParticipants])
+def test_tables_read_by_rowid_are_refused(migrator, table):
+    with pytest.raises(ValueError, match="rowid"):
+        migrator.convert_to_without_rowid(table)
+    assert "WITHOUT ROWID" not in table_sql(migrator.url, table.__tablename__)
+
+
+def test_tables_with_triggers_are_refused(migrator):
+    with migrator.engine.begin() as connection:
+        connection.exec_driver_sql(f'CREATE TRIGGER "watermark_moved" AFTER UPDATE ON '
+                                   f'"{HeatmapWatermarks.__tablename__}" BEGIN SELECT 1; END')
+    with pytest.raises(ValueError, match="watermark_moved"):
+        migrator.convert_to_without_rowid(HeatmapWatermarks)
+
+
+def test_derived_tables_keep_their_rows_and_writers(migrator, logger):
+    materializer = HeatmapMaterializer(migrator.url, logger)
+    materializer.refresh()
+    with migrator.engine.connect() as connection:
+        cells = sorted(connection.exec_driver_sql(f'SELECT * FROM "{HeatmapCells.__tablename__}"').all())
+
+    migrator.convert_to_without_rowid(HeatmapCells)
+    migrator.convert_to_without_rowid(ChampionAggregates)
+
+    assert table_sql(migrator.url, HeatmapCells.__tablename__).endswith("WITHOUT ROWID")
+    with migrator.engine.begin() as connection:
+        assert sorted(connection.exec_driver_sql(f'SELECT * FROM "{HeatmapCells.__tablename__}"').all()) == cells
+        # The aggregate triggers on Match Data (Participants) still write into the rebuilt table.
+        games = f'SELECT SUM("games") FROM "{ChampionAggregates.__tablename__}"'
+        before = connection.exec_driver_sql(games).scalar()
+        connection.exec_driver_sql(f'DELETE FROM "{MatchDataParticipants.__tablename__}" WHERE rowid = 1')
+        assert connection.exec_driver_sql(games).scalar() == before - 1
+
+
+@pytest.mark.parametrize("encoded", [False, True])
+def test_victim_column_is_added_to_existing_timelines(synthetic_database, encoded):
+    _, _, url = synthetic_database
+    name = MatchTimeline.__tablename__
+    if encoded:
+        encode_database(url)
+    with get_engine(url).begin() as connection:
+        # The timeline as stored before schema version 4.
+        if encoded:
+            connection.exec_driver_sql(f'DROP VIEW "{name}"')
+            connection.exec_driver_sql(f'ALTER TABLE "{encoded_table_name(name)}" DROP COLUMN "victimPuuId"')
+            connection.exec_driver_sql(f'CREATE VIEW "{name}" AS SELECT * FROM "{encoded_table_name(name)}"')
+        else:
+            connection.exec_driver_sql(f'ALTER TABLE "{name}" DROP COLUMN "victimPuuId"')
+        connection.exec_driver_sql("PRAGMA user_version = 3")
+
+    assert SchemaMigrator(url).upgrade() >= 4
+    with get_engine(url).begin() as connection:
+        connection.exec_driver_sql(
+            f'INSERT INTO "{name}" VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ("EUW1_1", "killer", 1, "100", 1, "TOP", 5, 6, "CHAMPION_KILL", "KILL", "victim"))
+        assert connection.exec_driver_sql(f'SELECT "victimPuuId", "event" FROM "{name}" WHERE "puuId" = ?',
+                                          ("killer",)).one() == ("victim", "CHAMPION_KILL")
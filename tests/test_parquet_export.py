@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import MatchTimelineTracks
+from league_pipeline.db.timeline_tracks import pack_existing_positions
+from league_pipeline.export.parquet_export import ParquetExporter
+
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.dataset  # noqa: E402
+
+
+def row_count(url: str, table_name: str) -> int:
+    with get_engine(url).connect() as connection:
+        return connection.exec_driver_sql(f'SELECT COUNT(*) FROM "{table_name}"').scalar()
+
+
+def exported_rows(root, table) -> int:
+    return pyarrow.dataset.dataset(root / ParquetExporter.dataset_name(table), format="parquet",
+                                   partitioning="hive").count_rows()
+
+
+def test_default_tables_cover_every_stored_table():
+    names = {table.__tablename__ for table in ParquetExporter.DEFAULT_TABLES}
+    assert {"Summoners", "Match IDs", "Match Data (Teams)", "Match Data (Participants)", "Match Timeline",
+            "Match Timeline (Tracks)", "Match Timeline (Economy)"} <= names
+    assert not names & {"Champion Aggregates", "Heatmap Cells", "Heatmap Watermarks", "Dimension Values"}
+
+
+def test_export_is_complete_and_partitioned_by_stored_dates(synthetic_database, tmp_path, logger):
+    _, _, url = synthetic_database
+    MatchTimelineTracks.__table__.create(get_engine(url), checkfirst=True)
+    pack_existing_positions(url, logger, batch_matches=4)
+    root = tmp_path / "export"
+
+    exported = ParquetExporter(logger, sqlite_url=url, export_root=root, chunk_size=500).export()
+
+    for table in ParquetExporter.DEFAULT_TABLES:
+        assert exported[table.__tablename__] == row_count(url, table.__tablename__)
+        if exported[table.__tablename__]:
+            assert exported_rows(root, table) == row_count(url, table.__tablename__)
+    assert exported[MatchTimelineTracks.__tablename__] > 0
+    dates = {path.name for path in root.glob("match_timeline/*/collection_date=*")}
+    assert dates == {"collection_date=2025-01-01"}
+    track = pyarrow.dataset.dataset(root / "match_timeline_tracks", format="parquet").to_table(columns=["track"])
+    assert track.schema.field("track").type == pyarrow.binary()
+
+
+def test_rerun_after_an_interrupted_export_does_not_duplicate_rows(synthetic_database, tmp_path, logger):
+    _, _, url = synthetic_database
+    root = tmp_path / "export"
+    exporter = ParquetExporter(logger, sqlite_url=url, export_root=root, chunk_size=500)
+    exporter.export()
+
+    # Lose the watermarks, as if the run had crashed before saving them.
+    state = json.loads(exporter.state_path.read_text())
+    state["watermarks"] = {name: 0 for name in state["watermarks"]}
+    exporter.state_path.write_text(json.dumps(state))
+    exporter.export()
+
+    for table in ParquetExporter.DEFAULT_TABLES:
+        if row_count(url, table.__tablename__):
+            assert exported_rows(root, table) == row_count(url, table.__tablename__)
@@ -0,0 +1,34 @@
+import os
+
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.sharding import ShardedDatabaseQuery, ShardedStorage
+from league_pipeline.pipeline.planner import format_plan, plan_pipeline
+
+
+def test_plan_without_database(logger):
+    plan = plan_pipeline(None, [True, True, True, True], logger)
+
+    assert plan["wall_time"] > 0
+    assert "Total wall time" in format_plan(plan)
+
+
+def test_plan_uses_the_history_of_the_database(synthetic_database, logger):
+    location, name, _ = synthetic_database
+    with_history = plan_pipeline(DatabaseQuery(str(location), name), [False, False, True, True], logger)
+    without = plan_pipeline(None, [False, False, True, True], logger)
+
+    assert with_history["wall_time"] != without["wall_time"]
+
+
+def test_sharded_storage_exists_creates_no_file(tmp_path, logger):
+    storage = ShardedStorage(tmp_path, "planned", logger)
+    before = set(os.listdir(tmp_path.parent))
+
+    assert not storage.exists()
+    assert set(os.listdir(tmp_path.parent)) == before
+
+    storage.create()
+    assert storage.exists()
+    plan = plan_pipeline(ShardedDatabaseQuery(storage), [True, True, True, True], logger)
+    storage.close()
+    assert plan["wall_time"] > 0
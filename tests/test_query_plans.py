@@ -0,0 +1,38 @@
+import pytest
+
+from league_pipeline.constants.database_constants import DatabaseIndexNames
+from league_pipeline.db.db_connection import DatabaseQuery
+from league_pipeline.db.migrations import QUERY_PLAN_CHECKS, SchemaMigrator, full_table_scans, verify_query_plans
+
+# Index every checked DatabaseQuery method is expected to search.
+EXPECTED_INDEXES = {
+    "get_puuids_by_continent_from_summoner_table": DatabaseIndexNames.SUMMONERS_CONTINENT.value,
+    "get_match_ids_by_continent_from_match_id_table": DatabaseIndexNames.MATCH_IDS_CONTINENT.value,
+    "get_match_ids_by_continent_from_match_data_table": DatabaseIndexNames.PARTICIPANTS_MATCH.value,
+    "get_team_id_and_position": "sqlite_autoindex_Match Data (Participants)_1",
+    "get_team_ids_and_positions": DatabaseIndexNames.PARTICIPANTS_MATCH.value,
+    "iter_puuids_by_continent_from_summoner_table": DatabaseIndexNames.SUMMONERS_CONTINENT.value,
+    "iter_match_ids_by_continent_from_match_id_table": DatabaseIndexNames.MATCH_IDS_CONTINENT.value,
+    "iter_match_ids_by_continent_from_match_data_table": DatabaseIndexNames.PARTICIPANTS_MATCH.value,
+}
+
+
+@pytest.fixture
+def plans(synthetic_database):
+    location, name, url = synthetic_database
+    SchemaMigrator(url).upgrade()
+    return verify_query_plans(DatabaseQuery(location, name))
+
+
+def test_every_checked_method_has_an_expected_index():
+    assert set(EXPECTED_INDEXES) == set(QUERY_PLAN_CHECKS)
+
+
+@pytest.mark.parametrize("method", sorted(EXPECTED_INDEXES))
+def test_query_plan_searches_the_expected_index(plans, method):
+    assert any(step.startswith("SEARCH") and f"INDEX {EXPECTED_INDEXES[method]} " in step
+               for step in plans[method]), plans[method]
+
+
+def test_no_checked_query_scans_a_whole_table(plans):
+    assert full_table_scans(plans) == {}
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+from league_pipeline.rate_limiting.retry_scheduler import RetryScheduler, completed_steps
+from league_pipeline.utils.exceptions import RetryLater, StatusCodeError
+from league_pipeline.utils.workers import run_workers
+
+logger = logging.getLogger("tests")
+
+
+def run(items, failures, scheduler: RetryScheduler) -> list:
+    """
+    Process items, failing attempt n of an item with failures(item, n) if it returns an error.
+    """
+    attempts: dict = {}
+    done = []
+
+    async def process(item):
+        attempt = attempts[item] = attempts.get(item, 0) + 1
+        error = failures(item, attempt)
+        if error is not None:
+            raise RetryLater(0.005, attempt, error)
+        done.append(item)
+
+    asyncio.run(run_workers(items, process, 4, logger, scheduler))
+    return done
+
+
+def test_failures_beyond_the_budget_are_dropped():
+    scheduler = RetryScheduler(logger, budget_ratio=0.0, budget_min=3)
+    done = run(range(10), lambda item, attempt: StatusCodeError(503, "down") if attempt == 1 else None, scheduler)
+
+    assert len(done) == 3
+    assert scheduler.dropped == 7
+    assert scheduler.retries == 3
+    assert not scheduler.delayed
+
+
+def test_rate_limits_with_retry_after_do_not_spend_the_budget():
+    scheduler = RetryScheduler(logger, budget_ratio=0.0, budget_min=0)
+
+    def failures(item, attempt):
+        return StatusCodeError(429, "slow down", retry_after=0.005) if attempt <= 3 else None
+
+    done = run(range(20), failures, scheduler)
+
+    assert sorted(done) == list(range(20))
+    assert scheduler.dropped == 0
+    assert scheduler.rate_limited == scheduler.paced == 60
+    assert scheduler.budget_left() == 0
+
+
+def test_rate_limits_without_retry_after_spend_the_budget():
+    scheduler = RetryScheduler(logger, budget_ratio=0.0, budget_min=2)
+    done = run(range(5), lambda item, attempt: StatusCodeError(429, "slow down") if attempt == 1 else None,
+               scheduler)
+
+    assert len(done) == 2
+    assert scheduler.dropped == 3
+    assert scheduler.paced == 0
+
+
+def test_completed_steps_are_not_repeated_on_retry():
+    scheduler = RetryScheduler(logger, budget_min=100)
+    first_calls: dict = {}
+    second_calls: dict = {}
+    done = []
+
+    async def process(item):
+        steps = completed_steps.get()
+        if "first" not in steps:
+            first_calls[item] = first_calls.get(item, 0) + 1
+            steps["first"] = item * 10
+        attempt = second_calls[item] = second_calls.get(item, 0) + 1
+        if attempt <= 2:
+            raise RetryLater(0.005, attempt, StatusCodeError(503, "down"))
+        done.append(steps["first"])
+
+    asyncio.run(run_workers(range(10), process, 4, logger, scheduler))
+
+    assert sorted(done) == [item * 10 for item in range(10)]
+    assert set(first_calls.values()) == {1}
+    assert set(second_calls.values()) == {3}
+
+
+def test_items_are_released_in_due_order():
+    scheduler = RetryScheduler(logger)
+    released = []
+
+    async def main():
+        ready: asyncio.Queue = asyncio.Queue()
+        for item, delay in (("late", 0.03), ("early", 0.01), ("middle", 0.02)):
+            error = RetryLater(delay, 1, StatusCodeError(503, "down"))
+            scheduler.retry(ready, {"item": item, "attempts": 1, "deferrals": 0}, error)
+        for _ in range(3):
+            released.append((await ready.get())["item"])
+
+    asyncio.run(main())
+    assert released == ["early", "middle", "late"]
+    assert scheduler.retries == 3
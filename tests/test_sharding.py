@@ -0,0 +1,130 @@
+import pytest
+
+from league_pipeline.constants.database_constants import DatabaseConfiguration
+from league_pipeline.constants.pipeline_constants import StorageConfig
+from league_pipeline.db.aggregates import rebuild_champion_aggregates
+from league_pipeline.db.bulk_insert import table_layout
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import (ChampionAggregates, MatchDataParticipants, MatchDataTeams, MatchIDs,
+                                       MatchTimeline, Summoners)
+from league_pipeline.db.sharding import ShardedStorage, ShardedWriter
+from league_pipeline.utils.match_routing import platform_and_continent_from_match_id
+
+TABLES = (Summoners, MatchIDs, MatchDataTeams, MatchDataParticipants, MatchTimeline)
+
+
+def stored_rows(url: str, table) -> list:
+    columns = ", ".join(f'"{name}"' for name in table_layout(table)[0])
+    with get_engine(url).connect() as connection:
+        rows = connection.exec_driver_sql(f'SELECT {columns} FROM "{table.__tablename__}"')
+        return sorted(tuple(row) for row in rows)
+
+
+def continent_of(table, row: tuple) -> str:
+    columns = table_layout(table)[0]
+    if "continentalRegion" in columns:
+        return row[columns.index("continentalRegion")]
+    return platform_and_continent_from_match_id(row[columns.index("matchId")])[1]
+
+
+def aggregate_rows(url: str) -> list:
+    with get_engine(url).connect() as connection:
+        rows = connection.exec_driver_sql(f'SELECT * FROM "{ChampionAggregates.__tablename__}" '
+                                          f'WHERE "games" > 0').all()
+    return sorted(tuple(round(value, 6) if isinstance(value, float) else value for value in row) for row in rows)
+
+
+class Recording:
+    """
+    Connection or cursor proxy recording the statements executed through its cursors.
+    """
+
+    def __init__(self, wrapped, statements: list) -> None:
+        self.wrapped = wrapped
+        self.statements = statements
+
+    def cursor(self):
+        return Recording(self.wrapped.cursor(), self.statements)
+
+    def execute(self, statement, *args):
+        self.statements.append(statement)
+        return self.wrapped.execute(statement, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+
+@pytest.fixture(params=[False, True], ids=["by_continent", "by_stage"])
+def sharded(request, synthetic_database, logger):
+    """
+    The synthetic database written through a ShardedWriter; returns (source url, storage, writer).
+    """
+    location, _, url = synthetic_database
+    storage = ShardedStorage(location, "sharded", logger, by_stage=request.param).create()
+    writer = ShardedWriter(storage, logger, commit_interval_seconds=0.01).start()
+    try:
+        for table in TABLES:
+            rows = stored_rows(url, table)
+            # Half the rows as tuples in column order, half as dicts keyed by attribute.
+            _, attribute_keys = table_layout(table)
+            half = len(rows) // 2
+            writer.submit(table, rows[:half])
+            writer.submit(table, [dict(zip(attribute_keys, row)) for row in rows[half:]])
+        writer.flush()
+        yield url, storage, writer
+    finally:
+        writer.close()
+        storage.close()
+
+
+def test_rows_are_routed_to_the_shard_of_their_continent(sharded):
+    url, storage, writer = sharded
+    for table in TABLES:
+        stage = storage.stage_of(table.__tablename__)
+        routed = [row for row in stored_rows(url, table) if continent_of(table, row) in storage.continents]
+        assert routed
+        for continent in storage.continents:
+            expected = [row for row in routed if continent_of(table, row) == continent]
+            assert stored_rows(storage.shard_url(continent, stage), table) == expected
+
+
+def test_rows_of_unknown_continents_are_dropped(sharded):
+    url, storage, writer = sharded
+    row = stored_rows(url, MatchDataTeams)[0]
+    unknown = ("XX9_1",) + row[1:]
+    written = writer.rows_written
+
+    writer.submit(MatchDataTeams, [unknown, dict(zip(table_layout(MatchDataTeams)[1], unknown))])
+    writer.flush()
+
+    assert writer.rows_written == written
+    stage = storage.stage_of(MatchDataTeams.__tablename__)
+    assert all("XX9_1" not in {row[0] for row in stored_rows(storage.shard_url(continent, stage), MatchDataTeams)}
+               for continent in storage.continents)
+
+
+def test_merge_copies_each_table_once_and_rebuilds_the_aggregates(sharded, monkeypatch):
+    url, storage, _ = sharded
+    target_url = DatabaseConfiguration.url.value.format(location=storage.db_location, name="merged")
+    engine = get_engine(target_url)
+    statements = []
+    raw_connection = engine.raw_connection
+    monkeypatch.setattr(engine, "raw_connection", lambda: Recording(raw_connection(), statements))
+    counts = storage.merge("merged")
+
+    for table in TABLES:
+        copies = [statement for statement in statements
+                  if statement.startswith(f'INSERT OR IGNORE INTO main."{table.__tablename__}"')]
+        assert len(copies) == len(storage.continents)
+        merged = stored_rows(target_url, table)
+        assert merged == [row for row in stored_rows(url, table) if continent_of(table, row) in storage.continents]
+        assert counts[table.__tablename__] == len(merged)
+    for name in StorageConfig.DERIVED_TABLES:
+        assert not any(f'INTO main."{name}"' in statement for statement in statements)
+        assert counts[name] == 0
+
+    maintained = aggregate_rows(target_url)
+    assert maintained
+    with engine.begin() as connection:
+        rebuild_champion_aggregates(connection)
+    assert aggregate_rows(target_url) == maintained
@@ -0,0 +1,80 @@
+import numpy as np
+
+from league_pipeline.analytics.lane_features import lane_diff_features, sample_series
+from league_pipeline.constants.pipeline_constants import EventTypes
+from league_pipeline.db.bulk_insert import table_layout
+from league_pipeline.db.engine_registry import get_engine
+from league_pipeline.db.models import MatchTimeline, MatchTimelineTracks
+from league_pipeline.db.timeline_tracks import (ECONOMY_COLUMNS, decode_economy, decode_track, encode_economy,
+                                                encode_track, pack_existing_positions, split_timeline_rows)
+
+
+def timeline_row(puuid: str, timestamp: int, x: int, y: int, event: str = EventTypes.POSITION) -> tuple:
+    return ("EUW1_1", puuid, timestamp, 100, 1, "TOP", x, y, event, EventTypes.PARTICIPANT_FRAME, None)
+
+
+def test_track_round_trip_with_negative_steps():
+    timestamps, xs, ys = [0, 60000, 120000], [14000, 300, 14870], [500, 14000, 0]
+    blob = encode_track(timestamps, xs, ys)
+
+    assert len(blob) == 4 * 3 * len(timestamps)
+    np.testing.assert_array_equal(decode_track(blob), np.array([timestamps, xs, ys]).T)
+
+
+def test_split_groups_orders_and_deduplicates_positions():
+    kill = timeline_row("p1", 61000, 5, 6, event=EventTypes.CHAMPION_KILL)
+    events, tracks = split_timeline_rows([
+        timeline_row("p1", 60000, 3, 4), kill, timeline_row("p1", 0, 1, 2),
+        timeline_row("p1", 60000, 9, 9), timeline_row("p2", 0, 7, 8),
+    ])
+
+    assert events == [kill]
+    tracks = {track[1]: track for track in tracks}
+    assert tracks["p1"][5] == 2
+    np.testing.assert_array_equal(decode_track(tracks["p1"][6]), [[0, 1, 2], [60000, 3, 4]])
+    np.testing.assert_array_equal(decode_track(tracks["p2"][6]), [[0, 7, 8]])
+
+
+def test_packing_keeps_every_position(synthetic_database, logger):
+    _, _, url = synthetic_database
+    engine = get_engine(url)
+    MatchTimelineTracks.__table__.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        positions = sorted(connection.exec_driver_sql(
+            f'SELECT "matchId", "puuId", "timestamp", "x", "y" FROM "{MatchTimeline.__tablename__}" '
+            f'WHERE "event" = ?', (EventTypes.POSITION,)).all())
+
+    pack_existing_positions(url, logger, batch_matches=5)
+
+    columns = table_layout(MatchTimelineTracks)[0]
+    with engine.connect() as connection:
+        tracks = connection.exec_driver_sql(f'SELECT * FROM "{MatchTimelineTracks.__tablename__}"').all()
+    unpacked = sorted((track[columns.index("matchId")], track[columns.index("puuId")], *map(int, frame))
+                      for track in tracks for frame in decode_track(track[columns.index("track")]))
+    assert unpacked == positions
+
+
+def test_economy_round_trip_and_sampling():
+    short = [[0, 60000], [500, 900], [0, 280], [0, 12], [0, 0], [1, 2]]
+    long = [[0, 60000, 120000], [500, 800, 1500], [0, 250, 600], [0, 10, 20], [0, 4, 4], [1, 2, 3]]
+    blobs = [encode_economy(*short), encode_economy(*long)]
+
+    np.testing.assert_array_equal(decode_economy(blobs[1]), np.array(long).T)
+    sampled = sample_series(blobs, np.array([2, 3]), len(ECONOMY_COLUMNS), [1, 2])
+    np.testing.assert_array_equal(sampled[0, 0], np.array(short)[:, 1])
+    assert np.isnan(sampled[0, 1]).all()
+    np.testing.assert_array_equal(sampled[1, 1], np.array(long)[:, 2])
+
+
+def test_lane_diff_features_subtract_the_red_side():
+    def series(gold: int, xp: int, cs: int, jungle: int, level: int) -> bytes:
+        return encode_economy([0, 60000], [500, gold], [0, xp], [0, cs], [0, jungle], [1, level])
+
+    features = lane_diff_features(
+        ["M1", "M1", "M1"], [100, 200, 100], ["MIDDLE", "MIDDLE", "TOP"], [2, 2, 2],
+        [series(900, 300, 10, 2, 2), series(700, 350, 8, 0, 3), series(800, 280, 9, 0, 2)], minutes=[1])
+
+    assert features.get("MIDDLE", 1, "gold").tolist() == [200]
+    assert features.get("MIDDLE", 1, "cs").tolist() == [4]
+    assert features.get("MIDDLE", 1, "level").tolist() == [-1]
+    assert np.isnan(features.get("TOP", 1, "gold")).all()